@@ -0,0 +1,341 @@
+#!/usr/bin/env python
+import os
+import sys
+import json
+import math
+import time
+import argparse
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from keyword_extractor import default_extractor
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# 조각 크기(문자 수)와 이웃 조각과 겹치는 길이
+CHUNK_CHARS = int(os.environ.get("DOCUMENT_CHUNK_CHARS", "1200"))
+CHUNK_OVERLAP = 150
+
+# 질문마다 프롬프트에 넣을 문서 조각의 토큰 예산 (문서 전체가 이보다 작으면 색인 없이 전체 사용)
+CONTEXT_TOKEN_BUDGET = int(os.environ.get("DOCUMENT_CONTEXT_TOKENS", "6000"))
+
+# 임베딩 모델 (설정하지 않으면 BM25만 사용)
+EMBEDDING_MODEL = os.environ.get("DOCUMENT_EMBEDDING_MODEL", "")
+
+# BM25 파라미터
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+# 하이브리드 검색에서 순위 결합(RRF) 상수
+RRF_K = 60
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    토큰 수 추정 (영문/숫자 약 4자당 1토큰, 한글 등 비ASCII 문자는 약 1.5자당 1토큰)
+    
+    Args:
+        text: 입력 텍스트
+    
+    Returns:
+        추정 토큰 수
+    """
+    # 큰 문서도 빠르게 계산하도록 UTF-8 인코딩 길이로 비ASCII 문자 수를 근사 (한글은 3바이트)
+    non_ascii = min((len(text.encode("utf-8", "ignore")) - len(text)) // 2, len(text))
+    return math.ceil((len(text) - non_ascii) / 4 + non_ascii / 1.5)
+
+
+def chunk_spans(text: str, chunk_chars: int = CHUNK_CHARS, overlap: int = CHUNK_OVERLAP) -> List[Tuple[int, int]]:
+    """
+    문단 경계를 우선하여 텍스트를 조각 범위로 분할 (앞뒤 공백을 제외한 문자 위치)
+    
+    Args:
+        text: 문서 텍스트
+        chunk_chars: 조각 최대 길이(문자 수)
+        overlap: 이전 조각 끝부분을 다음 조각 앞에 겹쳐 넣는 길이
+    
+    Returns:
+        (시작, 끝) 문자 위치 리스트
+    """
+    spans = []
+    start = 0
+    length = len(text)
+    while start < length:
+        end = min(start + chunk_chars, length)
+        if end < length:
+            # 조각 후반부의 문단/줄/문장 경계에서 자름
+            window_start = start + chunk_chars // 2
+            for separator in ("\n\n", "\n", ". ", " "):
+                cut = text.rfind(separator, window_start, end)
+                if cut != -1:
+                    end = cut + len(separator)
+                    break
+        segment = text[start:end]
+        stripped = segment.strip()
+        if stripped:
+            chunk_start = start + len(segment) - len(segment.lstrip())
+            spans.append((chunk_start, chunk_start + len(stripped)))
+        if end >= length:
+            break
+        start = max(end - overlap, start + 1)
+    return spans
+
+
+def chunk_text(text: str, chunk_chars: int = CHUNK_CHARS, overlap: int = CHUNK_OVERLAP) -> List[str]:
+    """
+    문단 경계를 우선하여 텍스트를 조각으로 분할
+    
+    Args:
+        text: 문서 텍스트
+        chunk_chars: 조각 최대 길이(문자 수)
+        overlap: 이전 조각 끝부분을 다음 조각 앞에 겹쳐 넣는 길이
+    
+    Returns:
+        조각 리스트
+    """
+    return [text[start:end] for start, end in chunk_spans(text, chunk_chars, overlap)]
+
+
+def bedrock_embedder(bedrock_client, model_id: str = EMBEDDING_MODEL, max_workers: int = 8) -> Callable[[List[str]], List[List[float]]]:
+    """
+    Bedrock Titan 임베딩 함수 생성 (텍스트마다 한 번씩 호출하므로 동시에 실행)
+    
+    Args:
+        bedrock_client: boto3 bedrock-runtime 클라이언트
+        model_id: 임베딩 모델 ID (예: amazon.titan-embed-text-v2:0)
+        max_workers: 동시 호출 수
+    
+    Returns:
+        텍스트 리스트 -> 벡터 리스트 함수
+    """
+    def embed_one(text: str) -> List[float]:
+        response = bedrock_client.invoke_model(modelId=model_id, body=json.dumps({"inputText": text}))
+        return json.loads(response["body"].read())["embedding"]
+    
+    def embed(texts: List[str]) -> List[List[float]]:
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="embed") as executor:
+            return list(executor.map(embed_one, texts))
+    
+    # 저장된 임베딩이 같은 모델로 만든 것인지 확인하는 데 사용
+    embed.model_id = model_id
+    return embed
+
+
+def normalize_rows(matrix):
+    """임베딩 행렬의 각 행을 단위 벡터로 정규화 (코사인 유사도를 내적으로 계산)"""
+    return matrix / np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12)
+
+
+class DocumentIndex:
+    """문서 조각에 대한 BM25 역색인 (임베딩 함수가 있으면 NumPy 행렬로 의미 검색을 결합)"""
+    
+    def __init__(self, text: str, embed: Optional[Callable[[List[str]], List[List[float]]]] = None,
+                 chunk_chars: int = CHUNK_CHARS):
+        """
+        DocumentIndex 초기화 - 조각 분할, 역색인 및 임베딩 행렬 생성
+        
+        Args:
+            text: 문서 텍스트
+            embed: 텍스트 리스트를 벡터 리스트로 바꾸는 함수 (없거나 NumPy가 없으면 BM25만 사용)
+            chunk_chars: 조각 최대 길이(문자 수)
+        """
+        start = time.perf_counter()
+        spans = chunk_spans(text, chunk_chars)
+        chunks = [text[chunk_start:chunk_end] for chunk_start, chunk_end in spans]
+        
+        # 역색인: 용어 -> [(조각 번호, 빈도)]
+        postings: Dict[str, List[tuple]] = {}
+        lengths: List[int] = []
+        for chunk_id, chunk in enumerate(chunks):
+            terms = Counter(default_extractor.terms(chunk))
+            lengths.append(sum(terms.values()))
+            for term, freq in terms.items():
+                postings.setdefault(term, []).append((chunk_id, freq))
+        
+        matrix = None
+        if embed and np is not None and chunks:
+            matrix = normalize_rows(np.asarray(embed(chunks), dtype=np.float32))
+        
+        self._setup(chunks, [estimate_tokens(chunk) for chunk in chunks], postings, lengths,
+                    estimate_tokens(text), matrix, embed)
+        # 조각의 문서 내 문자 위치 (문서 저장소에 조각을 바이트 위치로 저장할 때 사용)
+        self.spans = spans
+        self.build_ms = round((time.perf_counter() - start) * 1000, 1)
+    
+    @classmethod
+    def from_parts(cls, chunks: Sequence[str], chunk_tokens: Sequence[int], postings, lengths: Sequence[int],
+                   document_tokens: int, matrix=None, embed: Optional[Callable[[List[str]], List[List[float]]]] = None,
+                   build_ms: float = 0.0) -> "DocumentIndex":
+        """
+        이미 만들어진 조각/역색인으로 DocumentIndex 생성 (문서 저장소의 메모리 매핑 데이터 사용)
+        
+        Args:
+            chunks: 조각 시퀀스 (번호로 조회)
+            chunk_tokens: 조각별 추정 토큰 수
+            postings: 용어 -> [(조각 번호, 빈도)] 조회를 지원하는 매핑 (get, len)
+            lengths: 조각별 용어 수
+            document_tokens: 문서 전체 추정 토큰 수
+            matrix: 정규화된 임베딩 행렬 (없으면 BM25만 사용)
+            embed: 질의 임베딩 함수
+            build_ms: 색인 생성(또는 불러오기) 시간(ms)
+        
+        Returns:
+            DocumentIndex 인스턴스
+        """
+        index = cls.__new__(cls)
+        index._setup(chunks, chunk_tokens, postings, lengths, document_tokens, matrix, embed)
+        index.spans = None
+        index.build_ms = build_ms
+        return index
+    
+    def _setup(self, chunks, chunk_tokens, postings, lengths, document_tokens, matrix, embed):
+        self.chunks = chunks
+        self.chunk_tokens = chunk_tokens
+        self.document_tokens = document_tokens
+        self._postings = postings
+        self._lengths = lengths
+        self._avg_length = (sum(lengths) / len(lengths)) if len(lengths) else 0.0
+        self._embed = embed if np is not None and matrix is not None else None
+        self._matrix = matrix if self._embed else None
+        self._lock = threading.Lock()
+        self._stats = {"queries": 0, "retrieval_ms": 0.0, "context_tokens": 0, "tokens_saved": 0}
+    
+    def bm25(self, query: str) -> Dict[int, float]:
+        """
+        질의에 대한 조각별 BM25 점수 (질의 용어가 하나라도 있는 조각만)
+        
+        Args:
+            query: 질의
+        
+        Returns:
+            조각 번호 -> 점수
+        """
+        scores: Dict[int, float] = {}
+        count = len(self.chunks)
+        for term in set(default_extractor.terms(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for chunk_id, freq in postings:
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * self._lengths[chunk_id] / self._avg_length)
+                scores[chunk_id] = scores.get(chunk_id, 0.0) + idf * freq * (BM25_K1 + 1) / (freq + norm)
+        return scores
+    
+    def rank(self, query: str) -> List[int]:
+        """
+        관련도 순 조각 번호 (임베딩이 있으면 BM25와 코사인 유사도 순위를 RRF로 결합)
+        
+        Args:
+            query: 질의
+        
+        Returns:
+            조각 번호 리스트
+        """
+        scores = self.bm25(query)
+        ranked = sorted(scores, key=scores.get, reverse=True)
+        if self._matrix is None:
+            return ranked
+        
+        query_vector = np.asarray(self._embed([query])[0], dtype=np.float32)
+        similarity = self._matrix @ (query_vector / max(float(np.linalg.norm(query_vector)), 1e-12))
+        dense = np.argsort(-similarity)[:max(len(ranked), 20)].tolist()
+        fused: Dict[int, float] = {}
+        for ranking in (ranked, dense):
+            for position, chunk_id in enumerate(ranking):
+                fused[chunk_id] = fused.get(chunk_id, 0.0) + 1.0 / (RRF_K + position + 1)
+        return sorted(fused, key=fused.get, reverse=True)
+    
+    def retrieve(self, query: str, token_budget: int = CONTEXT_TOKEN_BUDGET) -> Dict[str, Any]:
+        """
+        토큰 예산 안에서 질의와 관련된 조각을 골라 문서 순서대로 연결
+        
+        Args:
+            query: 질의
+            token_budget: 선택할 조각의 최대 토큰 수
+        
+        Returns:
+            {"text", "chunks": 선택된 조각 번호, "tokens", "tokens_saved", "elapsed_ms"}
+        """
+        start = time.perf_counter()
+        selected = []
+        tokens = 0
+        for chunk_id in self.rank(query):
+            if tokens + self.chunk_tokens[chunk_id] > token_budget:
+                continue
+            selected.append(chunk_id)
+            tokens += self.chunk_tokens[chunk_id]
+        
+        if not selected and self.chunks:
+            # 질의 용어가 문서에 없으면 문서 앞부분으로 대체
+            for chunk_id, chunk_tokens in enumerate(self.chunk_tokens):
+                if tokens + chunk_tokens > token_budget:
+                    break
+                selected.append(chunk_id)
+                tokens += chunk_tokens
+        
+        selected.sort()
+        text = "\n\n[...]\n\n".join(self.chunks[chunk_id] for chunk_id in selected)
+        elapsed_ms = round((time.perf_counter() - start) * 1000, 2)
+        tokens_saved = max(self.document_tokens - tokens, 0)
+        
+        with self._lock:
+            self._stats["queries"] += 1
+            self._stats["retrieval_ms"] += elapsed_ms
+            self._stats["context_tokens"] += tokens
+            self._stats["tokens_saved"] += tokens_saved
+        
+        return {"text": text, "chunks": selected, "tokens": tokens, "tokens_saved": tokens_saved, "elapsed_ms": elapsed_ms}
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        색인 및 검색 지표 반환
+        
+        Returns:
+            조각 수, 색인 생성 시간, 질의당 평균 검색 시간/컨텍스트 토큰/절감 토큰
+        """
+        with self._lock:
+            queries = self._stats["queries"]
+            return {
+                "chunks": len(self.chunks),
+                "terms": len(self._postings),
+                "document_tokens": self.document_tokens,
+                "embeddings": self._matrix is not None,
+                "build_ms": self.build_ms,
+                "queries": queries,
+                "avg_retrieval_ms": round(self._stats["retrieval_ms"] / queries, 2) if queries else 0.0,
+                "avg_context_tokens": round(self._stats["context_tokens"] / queries) if queries else 0,
+                "avg_tokens_saved": round(self._stats["tokens_saved"] / queries) if queries else 0
+            }
+
+
+def main():
+    """CLI 인터페이스로 문서 검색 확인"""
+    parser = argparse.ArgumentParser(description="문서 조각 검색 (BM25)")
+    parser.add_argument('path', help='문서 파일 경로')
+    parser.add_argument('query', help='질의')
+    parser.add_argument('--budget', type=int, default=CONTEXT_TOKEN_BUDGET, help='컨텍스트 토큰 예산')
+    
+    args = parser.parse_args()
+    
+    from document_parser import parse_document
+    with open(args.path, "rb") as f:
+        data = f.read()
+    try:
+        text = parse_document(data, os.path.splitext(args.path)[1])
+    except Exception as e:
+        print(str(e), file=sys.stderr)
+        sys.exit(1)
+    
+    index = DocumentIndex(text)
+    result = index.retrieve(args.query, args.budget)
+    print(json.dumps({**index.get_stats(), **{k: v for k, v in result.items() if k != "text"}}, ensure_ascii=False, indent=2))
+    print(result["text"][:2000])
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+#!/usr/bin/env python
+import io
+import os
+import sys
+import json
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+Buffer = Union[bytes, bytearray, memoryview]
+ProgressCallback = Callable[[int, int], None]
+
+# 이 페이지 수 이상인 PDF는 프로세스 풀에서 페이지를 나눠 추출
+PDF_PARALLEL_MIN_PAGES = int(os.environ.get("PDF_PARALLEL_MIN_PAGES", "200"))
+PDF_WORKERS = int(os.environ.get("PDF_WORKERS", str(min(4, os.cpu_count() or 1))))
+# 워커에 한 번에 넘기는 페이지 수
+PDF_PAGE_BATCH = 16
+
+# 워커 프로세스에서 연 PDF (_init_pdf_worker에서 설정)
+_worker_reader = None
+
+
+class BufferStream(io.RawIOBase):
+    """업로드 버퍼(memoryview)를 복사하지 않고 읽는 탐색 가능한 바이너리 스트림 (read 호출마다 요청한 구간만 복사)"""
+    
+    def __init__(self, data: Buffer):
+        """
+        BufferStream 초기화
+        
+        Args:
+            data: bytes, bytearray 또는 memoryview (예: UploadedFile.getbuffer())
+        """
+        self._view = memoryview(data).cast("B")
+        self._pos = 0
+    
+    def readable(self) -> bool:
+        return True
+    
+    def seekable(self) -> bool:
+        return True
+    
+    def tell(self) -> int:
+        return self._pos
+    
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._pos + offset
+        elif whence == io.SEEK_END:
+            position = len(self._view) + offset
+        else:
+            raise ValueError(f"잘못된 whence 값: {whence}")
+        if position < 0:
+            raise ValueError("음수 위치로 이동할 수 없습니다.")
+        self._pos = position
+        return position
+    
+    def read(self, size: int = -1) -> bytes:
+        end = len(self._view) if size is None or size < 0 else min(self._pos + size, len(self._view))
+        if self._pos >= end:
+            return b""
+        data = self._view[self._pos:end].tobytes()
+        self._pos = end
+        return data
+    
+    def readall(self) -> bytes:
+        return self.read()
+    
+    def getbuffer(self) -> memoryview:
+        """원본 버퍼 뷰 반환 (복사 없음)"""
+        return self._view
+    
+    def readinto(self, buffer) -> int:
+        target = memoryview(buffer).cast("B")
+        size = max(0, min(len(target), len(self._view) - self._pos))
+        target[:size] = self._view[self._pos:self._pos + size]
+        self._pos += size
+        return size
+    
+    def close(self):
+        # 원본 버퍼(UploadedFile)가 크기를 바꿀 수 있도록 참조 해제
+        if not self.closed:
+            self._view.release()
+        super().close()
+
+
+def _init_pdf_worker(data: bytes):
+    """PDF 추출 워커 초기화 - 워커마다 문서를 한 번만 열어 둠"""
+    global _worker_reader
+    from PyPDF2 import PdfReader
+    _worker_reader = PdfReader(io.BytesIO(data))
+
+
+def _extract_pdf_pages(page_range: Tuple[int, int]) -> List[str]:
+    """워커 프로세스에서 페이지 구간의 텍스트 추출"""
+    return [_worker_reader.pages[index].extract_text() or "" for index in range(*page_range)]
+
+
+def iter_pdf(data: Buffer, progress: Optional[ProgressCallback] = None) -> Iterator[str]:
+    """PDF 페이지 텍스트를 페이지 순서대로 생성 (큰 문서는 프로세스 풀에서 페이지 구간별로 추출)"""
+    from PyPDF2 import PdfReader
+    with BufferStream(data) as stream:
+        reader = PdfReader(stream)
+        # PDF 파일이 암호화되어 있는 경우 처리되지 않음
+        if reader.is_encrypted:
+            raise ValueError("암호화된 PDF 파일은 처리할 수 없습니다.")
+        total = len(reader.pages)
+        
+        if total < PDF_PARALLEL_MIN_PAGES or PDF_WORKERS < 2:
+            for index, page in enumerate(reader.pages, start=1):
+                yield (page.extract_text() or "") + "\n"
+                if progress:
+                    progress(index, total)
+            return
+        
+        # spawn 방식 - Streamlit 서버처럼 스레드가 많은 프로세스에서 fork하지 않음
+        pool = ProcessPoolExecutor(
+            max_workers=PDF_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_pdf_worker,
+            initargs=(bytes(stream.getbuffer()),)
+        )
+        try:
+            ranges = [(start, min(start + PDF_PAGE_BATCH, total)) for start in range(0, total, PDF_PAGE_BATCH)]
+            done = 0
+            for pages in pool.map(_extract_pdf_pages, ranges):
+                for text in pages:
+                    yield text + "\n"
+                done += len(pages)
+                if progress:
+                    progress(done, total)
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+def iter_docx(data: Buffer, progress: Optional[ProgressCallback] = None) -> Iterator[str]:
+    """Word 문서 문단 텍스트 생성"""
+    from docx import Document
+    with BufferStream(data) as stream:
+        paragraphs = Document(stream).paragraphs
+        for index, para in enumerate(paragraphs, start=1):
+            yield para.text + "\n"
+            if progress and (index % 100 == 0 or index == len(paragraphs)):
+                progress(index, len(paragraphs))
+
+
+def iter_text(data: Buffer, progress: Optional[ProgressCallback] = None) -> Iterator[str]:
+    """UTF-8 텍스트 디코딩 (버퍼에서 바로 디코딩)"""
+    yield str(memoryview(data), "utf-8")
+    if progress:
+        progress(1, 1)
+
+
+def iter_csv(data: Buffer, progress: Optional[ProgressCallback] = None) -> Iterator[str]:
+    """CSV를 표 문자열로 변환"""
+    import pandas as pd
+    with BufferStream(data) as stream:
+        yield pd.read_csv(stream).to_string()
+    if progress:
+        progress(1, 1)
+
+
+def iter_excel(data: Buffer, progress: Optional[ProgressCallback] = None) -> Iterator[str]:
+    """Excel 첫 시트를 표 문자열로 변환"""
+    import pandas as pd
+    with BufferStream(data) as stream:
+        yield pd.read_excel(stream).to_string()
+    if progress:
+        progress(1, 1)
+
+
+def iter_pptx(data: Buffer, progress: Optional[ProgressCallback] = None) -> Iterator[str]:
+    """PowerPoint 슬라이드의 도형 텍스트를 슬라이드 순서대로 생성"""
+    from pptx import Presentation
+    with BufferStream(data) as stream:
+        slides = Presentation(stream).slides
+        first = True
+        for index, slide in enumerate(slides, start=1):
+            for shape in slide.shapes:
+                if hasattr(shape, "text"):
+                    # 도형 텍스트 사이를 빈 줄로 구분
+                    yield shape.text if first else "\n\n" + shape.text
+                    first = False
+            if progress:
+                progress(index, len(slides))
+
+
+# 확장자별 텍스트 생성기
+PARSERS: Dict[str, Callable[[Buffer, Optional[ProgressCallback]], Iterator[str]]] = {
+    ".pdf": iter_pdf,
+    ".doc": iter_docx,
+    ".docx": iter_docx,
+    ".txt": iter_text,
+    ".md": iter_text,
+    ".html": iter_text,
+    ".csv": iter_csv,
+    ".xls": iter_excel,
+    ".xlsx": iter_excel,
+    ".ppt": iter_pptx,
+    ".pptx": iter_pptx,
+}
+
+
+def iter_document(data: Buffer, file_ext: str, progress: Optional[ProgressCallback] = None) -> Iterator[str]:
+    """
+    업로드 버퍼에서 페이지/섹션 단위 텍스트 조각을 순서대로 생성
+    
+    Args:
+        data: 파일 내용 (bytes 또는 UploadedFile.getbuffer()의 memoryview)
+        file_ext: 파일 확장자 (예: '.pdf')
+        progress: (처리한 단위 수, 전체 단위 수)로 호출되는 진행률 콜백
+    
+    Returns:
+        텍스트 조각 생성기
+    """
+    file_ext = file_ext.lower()
+    parser = PARSERS.get(file_ext)
+    
+    try:
+        if parser is None:
+            raise ValueError(f"지원하지 않는 파일 형식입니다: {file_ext}")
+        yield from parser(data, progress)
+    except Exception as e:
+        raise Exception(f"파일 처리 중 오류가 발생했습니다 ({file_ext}): {str(e)}")
+
+
+def parse_document(data: Buffer, file_ext: str, progress: Optional[ProgressCallback] = None) -> str:
+    """
+    업로드 버퍼를 임시 파일 없이 텍스트로 변환 (조각을 모아 한 번에 연결)
+    
+    Args:
+        data: 파일 내용 (bytes 또는 UploadedFile.getbuffer()의 memoryview)
+        file_ext: 파일 확장자 (예: '.pdf')
+        progress: (처리한 단위 수, 전체 단위 수)로 호출되는 진행률 콜백
+    
+    Returns:
+        추출된 텍스트
+    """
+    return "".join(iter_document(data, file_ext, progress))
+
+
+def main():
+    """CLI 인터페이스로 문서 파싱 확인"""
+    parser = argparse.ArgumentParser(description="문서 텍스트 추출")
+    parser.add_argument('path', help='문서 파일 경로')
+    parser.add_argument('--chars', type=int, default=1000, help='출력할 최대 문자 수')
+    parser.add_argument('--progress', action='store_true', help='진행률을 stderr에 출력')
+    
+    args = parser.parse_args()
+    
+    with open(args.path, "rb") as f:
+        data = f.read()
+    try:
+        progress = (lambda done, total: print(f"{done}/{total}", file=sys.stderr)) if args.progress else None
+        text = parse_document(data, os.path.splitext(args.path)[1], progress)
+    except Exception as e:
+        print(str(e), file=sys.stderr)
+        sys.exit(1)
+    print(json.dumps({"chars": len(text), "preview": text[:args.chars]}, ensure_ascii=False, indent=2))
+
+if __name__ == "__main__":
+    main()
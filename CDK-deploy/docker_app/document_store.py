@@ -0,0 +1,529 @@
+#!/usr/bin/env python
+import os
+import re
+import sys
+import json
+import mmap
+import time
+import shutil
+import hashlib
+import argparse
+import tempfile
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from document_index import DocumentIndex, estimate_tokens, normalize_rows, np
+from text_normalizer import TEXT_VERSION
+
+# 문서 저장 위치 (컨테이너 재시작 후에도 유지하려면 볼륨을 마운트한 경로로 지정)
+STORE_DIR = os.environ.get("DOCUMENT_STORE_DIR", os.path.join(tempfile.gettempdir(), "bedrock-chatbot-documents"))
+
+# 저장소 최대 크기, 초과 시 가장 오래 사용되지 않은 문서부터 삭제
+STORE_MAX_BYTES = int(os.environ.get("DOCUMENT_STORE_MB", "2048")) * 1024 * 1024
+
+# 프로세스에서 열어 둘 문서/색인 수 (메모리 매핑만 유지하므로 문서 크기와 무관하게 작음)
+MAX_OPEN_DOCUMENTS = 64
+MAX_OPEN_INDEXES = 16
+
+# 문서 디렉터리의 파일
+TEXT_FILE = "text.bin"              # UTF-8 텍스트
+META_FILE = "meta.json"             # 문자 수, 추정 토큰 수, 파싱 시간, 텍스트 형식 버전
+INDEX_FILE = "index.json"           # 색인 메타데이터 (다른 색인 파일을 모두 쓴 뒤 마지막에 씀)
+CHUNKS_FILE = "chunks.bin"          # int64 (시작, 끝) 바이트 위치 쌍
+CHUNK_TOKENS_FILE = "chunk_tokens.bin"  # int32 조각별 추정 토큰 수
+LENGTHS_FILE = "lengths.bin"        # int32 조각별 용어 수
+POSTINGS_FILE = "postings.bin"      # int32 (조각 번호, 빈도) 쌍, 용어 순서로 연속 저장
+TERMS_FILE = "terms.json"           # 용어 -> [postings 시작 위치, 개수]
+
+# 파서가 만든 짝 없는 서로게이트 문자도 그대로 저장/복원
+TEXT_ERRORS = "surrogatepass"
+
+KEY_PATTERN = re.compile(r"[0-9a-f]{64}(\.[\w-]+)?")
+
+
+def content_key(data: bytes, file_ext: str) -> str:
+    """
+    업로드 바이트의 SHA-256과 확장자로 문서 키 생성 (같은 바이트라도 형식이 다르면 다르게 파싱됨)
+    텍스트 형식 버전(TEXT_VERSION)을 해시에 포함하여 파서/정리 규칙이 바뀌면 이전 결과를 쓰지 않고 다시 수집
+    
+    Args:
+        data: 업로드 파일 내용 (bytes 또는 memoryview)
+        file_ext: 파일 확장자 (예: '.pdf')
+    
+    Returns:
+        문서 키
+    """
+    digest = hashlib.sha256(f"text-v{TEXT_VERSION}\0".encode("ascii"))
+    digest.update(data)
+    return f"{digest.hexdigest()}{file_ext.lower()}"
+
+
+def _map_file(path: str):
+    """파일을 읽기 전용으로 메모리 매핑 (빈 파일은 매핑할 수 없으므로 빈 bytes)"""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _write_atomic(path: str, write: Callable):
+    """임시 파일에 쓴 뒤 교체하여 다른 프로세스가 쓰다 만 파일을 읽지 않도록 함"""
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        write(f)
+    os.replace(tmp_path, path)
+
+
+def _write_json(path: str, value: Any):
+    _write_atomic(path, lambda f: f.write(json.dumps(value, ensure_ascii=False).encode("utf-8")))
+
+
+def _embeddings_file(model_id: str) -> str:
+    return "embeddings-" + re.sub(r"[^\w.-]", "_", model_id) + ".f32"
+
+
+class MappedChunks:
+    """메모리 매핑된 문서 텍스트에서 조각을 필요할 때만 디코딩하는 시퀀스"""
+    
+    def __init__(self, text, offsets: memoryview):
+        self._text = text
+        self._offsets = offsets
+    
+    def __len__(self) -> int:
+        return len(self._offsets) // 2
+    
+    def __getitem__(self, chunk_id: int) -> str:
+        if chunk_id < 0:
+            chunk_id += len(self)
+        return self._text[self._offsets[2 * chunk_id]:self._offsets[2 * chunk_id + 1]].decode("utf-8", TEXT_ERRORS)
+
+
+class MappedPostings:
+    """용어 사전만 메모리에 두고 역색인 목록은 메모리 매핑 파일에서 읽는 매핑"""
+    
+    def __init__(self, terms: Dict[str, List[int]], pairs: memoryview):
+        self._terms = terms
+        self._pairs = pairs
+    
+    def __len__(self) -> int:
+        return len(self._terms)
+    
+    def get(self, term: str, default=None) -> Optional[List[tuple]]:
+        entry = self._terms.get(term)
+        if entry is None:
+            return default
+        start, count = entry
+        view = self._pairs[2 * start:2 * (start + count)]
+        return list(zip(view[0::2], view[1::2]))
+
+
+class StoredDocument:
+    """저장소의 문서 하나 (텍스트는 메모리 매핑으로 읽으며 세션에는 키만 보관)"""
+    
+    def __init__(self, key: str, path: str):
+        """
+        StoredDocument 초기화
+        
+        Args:
+            key: 문서 키
+            path: 문서 디렉터리
+        """
+        with open(os.path.join(path, META_FILE), encoding="utf-8") as f:
+            meta = json.load(f)
+        self.key = key
+        self.path = path
+        self.chars = meta["chars"]
+        self.tokens = meta["tokens"]
+        self.parse_ms = meta["parse_ms"]
+        self._text = _map_file(os.path.join(path, TEXT_FILE))
+    
+    @property
+    def size(self) -> int:
+        """텍스트 크기(UTF-8 바이트)"""
+        return len(self._text)
+    
+    def read(self) -> str:
+        """문서 전체 텍스트 (호출할 때마다 새로 디코딩하므로 작은 문서에만 사용)"""
+        return self._text[:].decode("utf-8", TEXT_ERRORS)
+
+
+class DocumentStore:
+    """파싱된 문서 텍스트와 조각 색인을 내용 해시별로 디스크에 저장하고 메모리 매핑으로 읽는 저장소"""
+    
+    def __init__(self, root: str = STORE_DIR, max_bytes: int = STORE_MAX_BYTES):
+        """
+        DocumentStore 초기화
+        
+        Args:
+            root: 저장 디렉터리 (없으면 생성)
+            max_bytes: 저장소 최대 크기(바이트), 초과 시 가장 오래 사용되지 않은 문서부터 삭제
+        """
+        self.root = root
+        self.max_bytes = max_bytes
+        os.makedirs(root, exist_ok=True)
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self._documents: "OrderedDict[str, StoredDocument]" = OrderedDict()
+        self._indexes: "OrderedDict[Tuple[str, str], DocumentIndex]" = OrderedDict()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "parse_ms": 0.0, "parse_ms_saved": 0.0,
+                       "index_builds": 0, "index_loads": 0, "index_build_ms": 0.0}
+    
+    def _path(self, key: str) -> str:
+        if not KEY_PATTERN.fullmatch(key):
+            raise ValueError(f"잘못된 문서 키입니다: {key}")
+        return os.path.join(self.root, key)
+    
+    def _key_lock(self, name: str) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(name, threading.Lock())
+    
+    def open(self, key: str) -> Optional[StoredDocument]:
+        """
+        저장된 문서 열기 (적중/미스 집계 없음)
+        
+        Args:
+            key: content_key로 만든 문서 키
+        
+        Returns:
+            StoredDocument 또는 None
+        """
+        with self._lock:
+            document = self._documents.get(key)
+            if document is not None:
+                self._documents.move_to_end(key)
+        path = self._path(key)
+        if document is None:
+            try:
+                document = StoredDocument(key, path)
+            except FileNotFoundError:
+                return None
+            with self._lock:
+                document = self._documents.setdefault(key, document)
+                while len(self._documents) > MAX_OPEN_DOCUMENTS:
+                    self._documents.popitem(last=False)
+        try:
+            # 수정 시각을 마지막 사용 시각으로 사용하여 디스크 정리 순서 결정
+            os.utime(os.path.join(path, META_FILE))
+        except FileNotFoundError:
+            # 다른 프로세스가 정리한 문서는 없는 것으로 처리하여 다시 저장
+            with self._lock:
+                self._documents.pop(key, None)
+            return None
+        return document
+    
+    def get(self, key: str) -> Optional[StoredDocument]:
+        """저장된 문서 조회 (없으면 None)"""
+        document = self.open(key)
+        if document is not None:
+            with self._lock:
+                self._stats["hits"] += 1
+                self._stats["parse_ms_saved"] += document.parse_ms
+        return document
+    
+    def put(self, key: str, text: str, parse_ms: float) -> StoredDocument:
+        """
+        파싱 결과 저장 (문서 디렉터리를 임시 이름으로 만든 뒤 이름을 바꿔 한 번에 공개)
+        
+        Args:
+            key: content_key로 만든 문서 키
+            text: 파싱된 텍스트
+            parse_ms: 파싱에 걸린 시간(ms) - 이후 적중 시 절감 시간으로 집계
+        
+        Returns:
+            StoredDocument 인스턴스
+        """
+        path = self._path(key)
+        if not os.path.exists(os.path.join(path, META_FILE)):
+            tmp_path = tempfile.mkdtemp(prefix=f".{key}.", dir=self.root)
+            try:
+                with open(os.path.join(tmp_path, TEXT_FILE), "wb") as f:
+                    f.write(text.encode("utf-8", TEXT_ERRORS))
+                _write_json(os.path.join(tmp_path, META_FILE), {
+                    "chars": len(text),
+                    "tokens": estimate_tokens(text),
+                    "parse_ms": round(parse_ms, 1),
+                    "text_version": TEXT_VERSION,
+                    "created": time.time()
+                })
+                os.rename(tmp_path, path)
+            except OSError:
+                # 다른 프로세스가 먼저 저장한 경우 그 문서 사용
+                if not os.path.exists(os.path.join(path, META_FILE)):
+                    raise
+            finally:
+                shutil.rmtree(tmp_path, ignore_errors=True)
+        self.prune(keep=key)
+        return self.open(key)
+    
+    def get_or_parse(self, key: str, parse: Callable[[], str]) -> Tuple[StoredDocument, bool]:
+        """
+        저장된 문서를 반환하거나, 없으면 파싱 후 저장 (같은 문서를 동시에 올리면 한 번만 파싱)
+        
+        Args:
+            key: content_key로 만든 문서 키
+            parse: 텍스트를 반환하는 파싱 함수
+        
+        Returns:
+            (StoredDocument, 적중 여부)
+        """
+        document = self.get(key)
+        if document is not None:
+            return document, True
+        
+        with self._key_lock(key):
+            # 먼저 들어온 호출이 파싱을 끝냈으면 그 결과 사용
+            document = self.get(key)
+            if document is not None:
+                return document, True
+            
+            start = time.perf_counter()
+            try:
+                text = parse()
+            finally:
+                parse_ms = (time.perf_counter() - start) * 1000
+                with self._lock:
+                    self._stats["misses"] += 1
+                    self._stats["parse_ms"] += parse_ms
+            return self.put(key, text, parse_ms), False
+    
+    def _model_id(self, embed) -> str:
+        # NumPy가 없으면 임베딩을 사용하지 않음 (DocumentIndex와 동일)
+        return getattr(embed, "model_id", "default") if embed is not None and np is not None else ""
+    
+    def index_ready(self, key: str, embed: Optional[Callable[[List[str]], List[List[float]]]] = None) -> bool:
+        """
+        색인을 생성 없이 바로 얻을 수 있는지 확인 (메모리에 열려 있거나 디스크에 저장된 경우)
+        
+        Args:
+            key: 저장된 문서 키
+            embed: 임베딩 함수
+        
+        Returns:
+            준비 여부
+        """
+        model_id = self._model_id(embed)
+        with self._lock:
+            if (key, model_id) in self._indexes:
+                return True
+        path = self._path(key)
+        if not os.path.exists(os.path.join(path, INDEX_FILE)):
+            return False
+        return not model_id or os.path.exists(os.path.join(path, _embeddings_file(model_id)))
+    
+    def get_index(self, key: str, embed: Optional[Callable[[List[str]], List[List[float]]]] = None) -> DocumentIndex:
+        """
+        문서 조각 색인 반환 (디스크에 없으면 한 번만 생성하여 저장하고, 이후에는 메모리 매핑으로 불러옴)
+        
+        Args:
+            key: 저장된 문서 키
+            embed: 임베딩 함수 (model_id 속성이 있으면 모델별로 임베딩 저장)
+        
+        Returns:
+            DocumentIndex 인스턴스
+        """
+        model_id = self._model_id(embed)
+        index_key = (key, model_id)
+        with self._lock:
+            index = self._indexes.get(index_key)
+            if index is not None:
+                self._indexes.move_to_end(index_key)
+                return index
+        
+        with self._key_lock(f"{key}/index"):
+            with self._lock:
+                index = self._indexes.get(index_key)
+            if index is not None:
+                return index
+            
+            document = self.open(key)
+            if document is None:
+                raise KeyError(f"저장소에 없는 문서입니다: {key}")
+            
+            start = time.perf_counter()
+            built = not os.path.exists(os.path.join(document.path, INDEX_FILE))
+            if built:
+                text = document.read()
+                self._save_index(document, text, DocumentIndex(text, embed), model_id)
+            index = self._load_index(document, embed, model_id)
+            elapsed_ms = round((time.perf_counter() - start) * 1000, 1)
+            index.build_ms = elapsed_ms
+            
+            with self._lock:
+                self._stats["index_builds" if built else "index_loads"] += 1
+                self._stats["index_build_ms"] += elapsed_ms
+                self._indexes[index_key] = index
+                while len(self._indexes) > MAX_OPEN_INDEXES:
+                    self._indexes.popitem(last=False)
+        if built:
+            self.prune(keep=key)
+        return index
+    
+    def _save_index(self, document: StoredDocument, text: str, index: DocumentIndex, model_id: str):
+        """메모리에 만든 색인을 조밀한 바이너리 배열로 저장 (조각 텍스트는 저장하지 않고 바이트 위치만 기록)"""
+        # 조각의 문자 위치를 UTF-8 바이트 위치로 변환 (위치 순서대로 앞부분만 이어서 인코딩)
+        byte_positions = {}
+        previous = byte_offset = 0
+        for position in sorted({position for span in index.spans for position in span}):
+            byte_offset += len(text[previous:position].encode("utf-8", TEXT_ERRORS))
+            byte_positions[position] = byte_offset
+            previous = position
+        chunks = array("q", (byte_positions[position] for span in index.spans for position in span))
+        
+        terms = {}
+        pairs = array("i")
+        for term, postings in index._postings.items():
+            terms[term] = [len(pairs) // 2, len(postings)]
+            for chunk_id, freq in postings:
+                pairs.append(chunk_id)
+                pairs.append(freq)
+        
+        path = document.path
+        _write_atomic(os.path.join(path, CHUNKS_FILE), chunks.tofile)
+        _write_atomic(os.path.join(path, CHUNK_TOKENS_FILE), array("i", index.chunk_tokens).tofile)
+        _write_atomic(os.path.join(path, LENGTHS_FILE), array("i", index._lengths).tofile)
+        _write_atomic(os.path.join(path, POSTINGS_FILE), pairs.tofile)
+        _write_json(os.path.join(path, TERMS_FILE), terms)
+        if index._matrix is not None:
+            _write_atomic(os.path.join(path, _embeddings_file(model_id)), index._matrix.tofile)
+        _write_json(os.path.join(path, INDEX_FILE), {
+            "chunks": len(index.chunks),
+            "document_tokens": index.document_tokens,
+            "build_ms": index.build_ms
+        })
+    
+    def _load_index(self, document: StoredDocument, embed, model_id: str) -> DocumentIndex:
+        """저장된 색인을 메모리 매핑으로 불러옴 (임베딩 모델이 바뀌었으면 임베딩만 새로 계산하여 저장)"""
+        path = document.path
+        with open(os.path.join(path, INDEX_FILE), encoding="utf-8") as f:
+            meta = json.load(f)
+        with open(os.path.join(path, TERMS_FILE), encoding="utf-8") as f:
+            terms = json.load(f)
+        
+        chunks = MappedChunks(document._text, memoryview(_map_file(os.path.join(path, CHUNKS_FILE))).cast("q"))
+        chunk_tokens = memoryview(_map_file(os.path.join(path, CHUNK_TOKENS_FILE))).cast("i")
+        lengths = memoryview(_map_file(os.path.join(path, LENGTHS_FILE))).cast("i")
+        postings = MappedPostings(terms, memoryview(_map_file(os.path.join(path, POSTINGS_FILE))).cast("i"))
+        
+        matrix = None
+        if model_id and len(chunks):
+            embeddings_path = os.path.join(path, _embeddings_file(model_id))
+            if not os.path.exists(embeddings_path):
+                vectors = normalize_rows(np.asarray(embed([chunks[i] for i in range(len(chunks))]), dtype=np.float32))
+                _write_atomic(embeddings_path, vectors.tofile)
+            matrix = np.frombuffer(_map_file(embeddings_path), dtype=np.float32).reshape(len(chunks), -1)
+        
+        return DocumentIndex.from_parts(chunks, chunk_tokens, postings, lengths, meta["document_tokens"], matrix, embed)
+    
+    def _disk_usage(self) -> List[Tuple[float, int, str]]:
+        """저장된 문서별 (마지막 사용 시각, 크기, 키) 목록"""
+        usage = []
+        with os.scandir(self.root) as entries:
+            for entry in entries:
+                if entry.name.startswith(".") or not entry.is_dir():
+                    continue
+                try:
+                    used = os.stat(os.path.join(entry.path, META_FILE)).st_mtime
+                    size = sum(item.stat().st_size for item in os.scandir(entry.path) if item.is_file())
+                except FileNotFoundError:
+                    continue
+                usage.append((used, size, entry.name))
+        return usage
+    
+    def prune(self, keep: Optional[str] = None):
+        """
+        저장소 크기가 최대 크기를 넘으면 가장 오래 사용되지 않은 문서부터 삭제
+        
+        Args:
+            keep: 삭제하지 않을 문서 키 (방금 저장한 문서)
+        """
+        usage = self._disk_usage()
+        total = sum(size for _, size, _ in usage)
+        for _, size, key in sorted(usage):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            # 이미 매핑한 프로세스는 삭제 후에도 기존 내용을 계속 읽을 수 있음
+            shutil.rmtree(os.path.join(self.root, key), ignore_errors=True)
+            total -= size
+            with self._lock:
+                self._documents.pop(key, None)
+                for index_key in [index_key for index_key in self._indexes if index_key[0] == key]:
+                    del self._indexes[index_key]
+                self._stats["evictions"] += 1
+    
+    def clear(self):
+        """모든 문서 삭제"""
+        with self._lock:
+            self._documents.clear()
+            self._indexes.clear()
+        for _, _, key in self._disk_usage():
+            shutil.rmtree(os.path.join(self.root, key), ignore_errors=True)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        저장소 지표 반환
+        
+        Returns:
+            저장된 문서 수와 크기, 적중/미스 횟수, 파싱 시간과 적중으로 절감한 시간, 색인 생성/불러오기 횟수
+        """
+        usage = self._disk_usage()
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            index_opens = self._stats["index_builds"] + self._stats["index_loads"]
+            return {
+                "root": self.root,
+                "documents": len(usage),
+                "bytes": sum(size for _, size, _ in usage),
+                "max_bytes": self.max_bytes,
+                "open_documents": len(self._documents),
+                "open_indexes": len(self._indexes),
+                "hits": self._stats["hits"],
+                "misses": self._stats["misses"],
+                "evictions": self._stats["evictions"],
+                "hit_ratio": round(self._stats["hits"] / lookups, 3) if lookups else 0.0,
+                "parse_ms": round(self._stats["parse_ms"], 1),
+                "parse_ms_saved": round(self._stats["parse_ms_saved"], 1),
+                "index_builds": self._stats["index_builds"],
+                "index_loads": self._stats["index_loads"],
+                "avg_index_open_ms": round(self._stats["index_build_ms"] / index_opens, 1) if index_opens else 0.0
+            }
+
+
+# 프로세스 전역 문서 저장소 (Streamlit 재실행, 세션, 프로세스 재시작 간 공유)
+document_store = DocumentStore()
+
+
+def main():
+    """CLI 인터페이스로 문서 저장소 관리"""
+    parser = argparse.ArgumentParser(description="문서 저장소 (디스크 저장, 메모리 매핑 읽기)")
+    parser.add_argument('paths', nargs='*', help='저장할 문서 파일 경로')
+    parser.add_argument('--index', action='store_true', help='문서 조각 색인도 함께 생성')
+    parser.add_argument('--clear', action='store_true', help='저장된 문서 모두 삭제')
+    
+    args = parser.parse_args()
+    
+    if args.clear:
+        document_store.clear()
+    
+    from document_parser import parse_document
+    for path in args.paths:
+        with open(path, "rb") as f:
+            data = f.read()
+        file_ext = os.path.splitext(path)[1]
+        key = content_key(data, file_ext)
+        try:
+            document, hit = document_store.get_or_parse(key, lambda: parse_document(data, file_ext))
+            if args.index:
+                document_store.get_index(key)
+        except Exception as e:
+            print(f"{path}: {str(e)}", file=sys.stderr)
+            continue
+        print(f"{path}: {key} ({document.chars:,}자, 약 {document.tokens:,} 토큰{', 저장소 적중' if hit else ''})")
+    
+    print(json.dumps(document_store.get_stats(), ensure_ascii=False, indent=2))
+
+if __name__ == "__main__":
+    main()
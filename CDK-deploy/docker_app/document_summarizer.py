@@ -0,0 +1,454 @@
+#!/usr/bin/env python
+import os
+import re
+import sys
+import json
+import time
+import hashlib
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from ttl_cache import TTLCache
+from document_index import chunk_spans, estimate_tokens
+from document_store import STORE_DIR, _write_atomic
+
+# 동시에 실행할 조각 요약(map) Bedrock 호출 수 (프로세스 전체, 세션이 여러 개여도 이 수를 넘지 않음)
+SUMMARY_CONCURRENCY = int(os.environ.get("SUMMARY_CONCURRENCY", "4"))
+
+# 요약 조각 크기(문자 수) - 검색용 조각보다 크게 나누어 호출 수를 줄임
+SUMMARY_CHUNK_CHARS = int(os.environ.get("SUMMARY_CHUNK_CHARS", "20000"))
+
+# 조각 요약 최대 출력 토큰과 합치기(reduce) 단계 입력 토큰 예산 (넘으면 요약을 묶어 한 번 더 요약)
+MAP_MAX_TOKENS = 700
+REDUCE_INPUT_TOKENS = 24000
+
+# 조각 요약 캐시 위치 (문서 저장소 디렉터리 아래, 점으로 시작하므로 문서 정리 대상에서 제외)와 최대 파일 수
+SUMMARY_CACHE_DIR = os.environ.get("SUMMARY_CACHE_DIR", os.path.join(STORE_DIR, ".summaries"))
+SUMMARY_CACHE_MAX_FILES = 20000
+PRUNE_EVERY = 64
+
+# 프롬프트를 바꾸면 올려서 이전 프롬프트로 만든 캐시를 쓰지 않도록 함
+PROMPT_VERSION = "1"
+
+MAP_PROMPT = """다음은 긴 문서의 일부입니다. 이 부분의 핵심 내용을 문서와 같은 언어로 요약하세요.
+- 주요 주장, 결론, 수치, 날짜, 고유명사는 빠뜨리지 말고 유지하세요.
+- 머리말 없이 요약만 글머리표로 작성하세요.
+
+<document_part>
+{text}
+</document_part>"""
+
+COLLAPSE_PROMPT = """다음은 긴 문서의 연속된 부분들을 각각 요약한 것입니다. 중복을 없애고 하나의 요약으로 합치세요.
+- 주요 주장, 결론, 수치, 날짜, 고유명사는 빠뜨리지 말고 유지하세요.
+- 머리말 없이 요약만 글머리표로 작성하세요.
+
+{text}"""
+
+REDUCE_PROMPT = """질문: {question}
+
+업로드한 문서가 길어서 문서를 순서대로 나누어 요약했습니다. 아래 부분 요약은 문서 순서를 따릅니다.
+
+{text}
+
+중요 지침:
+1. 부분 요약을 종합하여 질문에 맞게 문서 전체를 요약하세요.
+2. 부분 요약에 없는 내용은 추측하지 마세요.
+3. 수치와 고유명사는 부분 요약에 있는 그대로 사용하세요."""
+
+# 문서 요약 요청 판별 (한국어/영어) - "요약"이라는 단어만으로는 판단하지 않고 요약해 달라는 요청 형태만 인정
+# ("3장의 요약 통계 표 값은?", "what does the summary table say"처럼 요약 표/항목을 묻는 질문은 검색 경로로)
+SUMMARY_REQUEST_PATTERN = re.compile(
+    r"(요약|개요|줄거리|요점)\s*(을|를|이|가|은|는|만)?\s*(해|하여|하면|좀|부탁|바랍|알려|말해|보여|설명|뭐|[?？.!]|$)"
+    r"|(문서|파일|보고서|논문|자료|전체|전반|내용)\S*\s*.{0,10}정리\s*(해|하여|좀|부탁|바랍)"
+    r"|\bsummari[sz]e\s+(it|this|that)\b"
+    r"|\bsummari[sz]e\s+(this|the|that|my|our|your)?\s*(whole\s+|entire\s+|full\s+|attached\s+|uploaded\s+)?"
+    r"(document|doc|file|report|paper|pdf|article|text|book|contents?)s?\b"
+    r"|\b(give|write|provide|make|need|want|get)\b.{0,30}\b(summary|overview|synopsis)(\s+(of|for)\b|\s*[.?!]|\s*$)"
+    r"|\b(summary|overview)\s+of\s+(this|the|that|my|our|your)\s+(whole\s+|entire\s+)?(document|doc|file|report|paper|pdf|article|text|book)"
+    r"|\btl;?dr\b",
+    re.IGNORECASE
+)
+
+
+def is_summary_request(text: str) -> bool:
+    """
+    문서 요약을 요청하는 질문인지 판별
+    
+    Args:
+        text: 사용자 질문
+    
+    Returns:
+        요약 요청 여부
+    """
+    return bool(SUMMARY_REQUEST_PATTERN.search(text))
+
+
+def _response_text(body: Dict[str, Any]) -> str:
+    return "".join(block.get("text", "") for block in body.get("content", []) if block.get("type") == "text").strip()
+
+
+class SummaryCache:
+    """조각 요약을 내용 해시로 보관하는 캐시 (메모리 LRU + 디스크, 재시작과 프로세스 간 공유)"""
+    
+    def __init__(self, root: Optional[str] = SUMMARY_CACHE_DIR, max_entries: int = 4096,
+                 max_files: int = SUMMARY_CACHE_MAX_FILES):
+        """
+        SummaryCache 초기화
+        
+        Args:
+            root: 디스크 캐시 디렉터리 (None이면 메모리만 사용)
+            max_entries: 메모리에 보관할 요약 수
+            max_files: 디스크에 보관할 요약 수, 초과 시 가장 오래 사용되지 않은 요약부터 삭제
+        """
+        self.root = root
+        self.max_files = max_files
+        self._memory = TTLCache(max_entries=max_entries, ttl=None, name="summaries")
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._stats = {"disk_hits": 0, "misses": 0}
+        if root:
+            os.makedirs(root, exist_ok=True)
+    
+    @staticmethod
+    def make_key(model_id: str, prompt: str, text: str) -> str:
+        """모델, 프롬프트 버전과 입력 내용의 SHA-256 (같은 내용이면 다른 문서나 질문에서도 재사용)"""
+        digest = hashlib.sha256(f"{model_id}\n{PROMPT_VERSION}\n{prompt}\n".encode("utf-8"))
+        digest.update(text.encode("utf-8", "surrogatepass"))
+        return digest.hexdigest()
+    
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], key + ".txt")
+    
+    def get(self, key: str) -> Optional[str]:
+        """캐시된 요약 조회 (없으면 None)"""
+        summary = self._memory.get(key, None)
+        if summary is not None or not self.root:
+            if summary is None:
+                with self._lock:
+                    self._stats["misses"] += 1
+            return summary
+        
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                summary = f.read().decode("utf-8")
+            # 마지막 사용 시각 갱신 (디스크 정리 순서)
+            os.utime(path)
+        except FileNotFoundError:
+            with self._lock:
+                self._stats["misses"] += 1
+            return None
+        self._memory.set(key, summary)
+        with self._lock:
+            self._stats["disk_hits"] += 1
+        return summary
+    
+    def set(self, key: str, summary: str):
+        """요약 저장"""
+        self._memory.set(key, summary)
+        if not self.root:
+            return
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        _write_atomic(path, lambda f: f.write(summary.encode("utf-8")))
+        with self._lock:
+            self._writes += 1
+            prune = self._writes % PRUNE_EVERY == 0
+        if prune:
+            self.prune()
+    
+    def _files(self) -> List[tuple]:
+        files = []
+        for root, _, names in os.walk(self.root):
+            for name in names:
+                path = os.path.join(root, name)
+                try:
+                    files.append((os.stat(path).st_mtime, path))
+                except FileNotFoundError:
+                    continue
+        return files
+    
+    def prune(self):
+        """디스크 요약 수가 최대 개수를 넘으면 가장 오래 사용되지 않은 요약부터 삭제"""
+        files = self._files()
+        for _, path in sorted(files)[:max(len(files) - self.max_files, 0)]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+    
+    def clear(self):
+        """모든 요약 삭제"""
+        self._memory.clear()
+        if self.root:
+            for _, path in self._files():
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        캐시 지표 반환
+        
+        Returns:
+            메모리 캐시 지표와 디스크 적중/미스 횟수
+        """
+        memory = self._memory.get_stats()
+        with self._lock:
+            hits = memory["hits"] + self._stats["disk_hits"]
+            lookups = hits + self._stats["misses"]
+            return {
+                "root": self.root,
+                "entries": memory["entries"],
+                "memory_hits": memory["hits"],
+                "disk_hits": self._stats["disk_hits"],
+                "misses": self._stats["misses"],
+                "hit_ratio": round(hits / lookups, 3) if lookups else 0.0
+            }
+
+
+class DocumentSummarizer:
+    """
+    컨텍스트 예산보다 큰 문서의 map-reduce 요약
+    문서를 큰 조각으로 나누어 동시에 요약(map)하고, 조각 요약을 합쳐 질문에 맞는 최종 요약을 스트리밍(reduce)
+    """
+    
+    def __init__(self, concurrency: int = SUMMARY_CONCURRENCY, chunk_chars: int = SUMMARY_CHUNK_CHARS,
+                 cache: Optional[SummaryCache] = None):
+        """
+        DocumentSummarizer 초기화
+        
+        Args:
+            concurrency: 동시에 실행할 조각 요약 호출 수 (이 인스턴스를 쓰는 모든 세션에 적용)
+            chunk_chars: 요약 조각 크기(문자 수)
+            cache: 조각 요약 캐시 (기본값: 디스크 캐시)
+        """
+        self.concurrency = max(concurrency, 1)
+        self.chunk_chars = chunk_chars
+        self.cache = cache if cache is not None else SummaryCache()
+        self._slots = threading.BoundedSemaphore(self.concurrency)
+        self._lock = threading.Lock()
+        self._stats = {"summaries": 0, "reduces": 0, "chunks": 0, "cached_chunks": 0, "map_calls": 0, "collapse_calls": 0,
+                       "input_tokens": 0, "output_tokens": 0, "map_ms": 0.0, "reduce_ms": 0.0}
+    
+    def _record(self, **values):
+        with self._lock:
+            for name, value in values.items():
+                self._stats[name] += value
+    
+    def _invoke(self, client, model_id: str, prompt: str, max_tokens: int) -> str:
+        """요약 호출 한 번 (동시 호출 수 제한, 스로틀링 재시도는 boto3 클라이언트 설정을 따름)"""
+        payload = {
+            "anthropic_version": "bedrock-2023-05-31",
+            "max_tokens": max_tokens,
+            "temperature": 0.0,
+            "messages": [{"role": "user", "content": prompt}]
+        }
+        with self._slots:
+            response = client.invoke_model(modelId=model_id, body=json.dumps(payload))
+            body = json.loads(response["body"].read())
+        usage = body.get("usage", {})
+        self._record(input_tokens=usage.get("input_tokens", 0), output_tokens=usage.get("output_tokens", 0))
+        return _response_text(body)
+    
+    def _summarize_all(self, client, model_id: str, template: str, texts: List[str], call_stat: str,
+                       progress: Optional[Callable[[int, int], None]] = None) -> Dict[str, Any]:
+        """캐시에 없는 텍스트만 동시에 요약하고 입력 순서대로 반환 (같은 내용은 한 번만 호출)"""
+        keys = [self.cache.make_key(model_id, template, text) for text in texts]
+        results: Dict[str, str] = {}
+        pending: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key in results or key in pending:
+                continue
+            summary = self.cache.get(key)
+            if summary is None:
+                pending[key] = text
+            else:
+                results[key] = summary
+        
+        cached = len(results)
+        total = cached + len(pending)
+        if progress:
+            progress(cached, total)
+        if pending:
+            with ThreadPoolExecutor(max_workers=min(self.concurrency, len(pending)), thread_name_prefix="summarize") as executor:
+                futures = {
+                    executor.submit(self._invoke, client, model_id, template.format(text=text), MAP_MAX_TOKENS): key
+                    for key, text in pending.items()
+                }
+                try:
+                    for future in as_completed(futures):
+                        key = futures[future]
+                        results[key] = future.result()
+                        self.cache.set(key, results[key])
+                        self._record(**{call_stat: 1})
+                        if progress:
+                            progress(len(results), total)
+                except BaseException:
+                    # 하나가 실패하거나 진행률 콜백이 중단하면 아직 시작하지 않은 호출은 취소
+                    for future in futures:
+                        future.cancel()
+                    raise
+        return {"summaries": [results[key] for key in keys], "cached": cached, "calls": len(pending)}
+    
+    def map(self, client, model_id: str, text: str,
+            progress: Optional[Callable[[int, int], None]] = None) -> Dict[str, Any]:
+        """
+        문서를 조각으로 나누어 조각마다 요약 (캐시에 있는 조각은 호출하지 않음)
+        
+        Args:
+            client: boto3 bedrock-runtime 클라이언트
+            model_id: 요약 모델 ID
+            text: 문서 텍스트
+            progress: (완료 조각 수, 전체 조각 수) 콜백 - 호출한 스레드에서 실행되므로 Streamlit 요소를 갱신해도 됨
+        
+        Returns:
+            조각 요약 목록(문서 순서), 조각 수, 캐시에서 가져온 조각 수, 소요 시간을 담은 딕셔너리
+        """
+        start = time.perf_counter()
+        chunks = [text[begin:end] for begin, end in chunk_spans(text, self.chunk_chars, 0)]
+        result = self._summarize_all(client, model_id, MAP_PROMPT, chunks, "map_calls", progress)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self._record(summaries=1, chunks=len(chunks), cached_chunks=result["cached"], map_ms=elapsed_ms)
+        return {
+            "summaries": result["summaries"],
+            "chunks": len(chunks),
+            "cached": result["cached"],
+            "document_tokens": estimate_tokens(text),
+            "elapsed_ms": elapsed_ms
+        }
+    
+    def collapse(self, client, model_id: str, summaries: List[str]) -> List[str]:
+        """
+        조각 요약 전체가 합치기 단계 입력 예산을 넘으면 연속된 요약을 묶어 다시 요약 (예산 안에 들어올 때까지 반복)
+        
+        Args:
+            client: boto3 bedrock-runtime 클라이언트
+            model_id: 요약 모델 ID
+            summaries: 문서 순서의 요약 목록
+        
+        Returns:
+            예산 안에 들어오는 요약 목록
+        """
+        while len(summaries) > 1 and sum(estimate_tokens(summary) for summary in summaries) > REDUCE_INPUT_TOKENS:
+            groups: List[List[str]] = [[]]
+            group_tokens = 0
+            for summary in summaries:
+                tokens = estimate_tokens(summary)
+                if groups[-1] and group_tokens + tokens > REDUCE_INPUT_TOKENS:
+                    groups.append([])
+                    group_tokens = 0
+                groups[-1].append(summary)
+                group_tokens += tokens
+            if len(groups) == len(summaries):
+                # 요약 하나가 예산만큼 커서 더 묶을 수 없음
+                break
+            texts = ["\n\n".join(f"[부분 {index + 1}]\n{summary}" for index, summary in enumerate(group)) for group in groups]
+            summaries = self._summarize_all(client, model_id, COLLAPSE_PROMPT, texts, "collapse_calls")["summaries"]
+        return summaries
+    
+    def reduce_stream(self, client, model_id: str, question: str, summaries: List[str], system: str = "",
+                      max_tokens: int = 4096, temperature: float = 0.0) -> Iterator[str]:
+        """
+        조각 요약을 합쳐 질문에 맞는 최종 요약을 스트리밍 (응답마다 한 번이므로 동시 호출 수 제한을 적용하지 않음)
+        
+        Args:
+            client: boto3 bedrock-runtime 클라이언트
+            model_id: 모델 ID
+            question: 사용자 질문
+            summaries: map 단계의 조각 요약 목록
+            system: 시스템 프롬프트
+            max_tokens: 최대 출력 토큰
+            temperature: 온도
+        
+        Yields:
+            응답 텍스트 조각
+        """
+        start = time.perf_counter()
+        summaries = self.collapse(client, model_id, summaries)
+        text = "\n\n".join(f"[부분 {index + 1}/{len(summaries)}]\n{summary}" for index, summary in enumerate(summaries))
+        payload = {
+            "anthropic_version": "bedrock-2023-05-31",
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "messages": [{"role": "user", "content": REDUCE_PROMPT.format(question=question, text=text)}]
+        }
+        if system:
+            payload["system"] = system
+        
+        response = client.invoke_model_with_response_stream(modelId=model_id, body=json.dumps(payload))
+        try:
+            for event in response["body"]:
+                chunk = json.loads(event["chunk"]["bytes"])
+                if chunk.get("type") == "message_start":
+                    self._record(input_tokens=chunk.get("message", {}).get("usage", {}).get("input_tokens", 0))
+                elif chunk.get("type") == "message_delta":
+                    self._record(output_tokens=chunk.get("usage", {}).get("output_tokens", 0))
+                elif chunk.get("type") == "content_block_delta" and chunk["delta"].get("type") == "text_delta":
+                    yield chunk["delta"].get("text", "")
+        finally:
+            self._record(reduces=1, reduce_ms=(time.perf_counter() - start) * 1000)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        요약 지표 반환
+        
+        Returns:
+            요약(map)/합치기(reduce) 횟수, 조각 수와 캐시 재사용 수, 모델 호출 수, 토큰 사용량, 평균 map/reduce 시간, 캐시 지표
+        """
+        with self._lock:
+            stats = dict(self._stats)
+        stats["cache_reuse"] = round(stats["cached_chunks"] / stats["chunks"], 3) if stats["chunks"] else 0.0
+        stats["avg_map_ms"] = round(stats.pop("map_ms") / stats["summaries"], 1) if stats["summaries"] else 0.0
+        stats["avg_reduce_ms"] = round(stats.pop("reduce_ms") / stats["reduces"], 1) if stats["reduces"] else 0.0
+        stats["concurrency"] = self.concurrency
+        stats["cache"] = self.cache.get_stats()
+        return stats
+
+
+# 프로세스 전역 요약기 (동시 호출 수 제한과 캐시를 세션 간 공유)
+document_summarizer = DocumentSummarizer()
+
+
+def main():
+    """CLI 인터페이스로 문서 map-reduce 요약 확인 (Bedrock 호출)"""
+    parser = argparse.ArgumentParser(description="큰 문서 map-reduce 요약 (조각 요약 동시 실행, 최종 요약 스트리밍)")
+    parser.add_argument('path', nargs='?', help='문서 파일 경로')
+    parser.add_argument('--question', default="이 문서를 요약해 주세요.", help='요약 요청 질문')
+    parser.add_argument('--model', default="us.anthropic.claude-3-7-sonnet-20250219-v1:0", help='Bedrock 모델 ID')
+    parser.add_argument('--clear-cache', action='store_true', help='조각 요약 캐시 삭제')
+    
+    args = parser.parse_args()
+    
+    if args.clear_cache:
+        document_summarizer.cache.clear()
+    if not args.path:
+        return
+    
+    import boto3
+    from document_parser import iter_document
+    from text_normalizer import normalize_document
+    file_ext = os.path.splitext(args.path)[1]
+    with open(args.path, "rb") as f:
+        data = f.read()
+    client = boto3.client("bedrock-runtime", region_name=os.getenv("AWS_REGION", "us-west-2"))
+    try:
+        text = normalize_document(iter_document(data, file_ext), file_ext)
+        result = document_summarizer.map(
+            client, args.model, text, lambda done, total: print(f"\r조각 요약 {done}/{total}", end="", file=sys.stderr)
+        )
+        print(file=sys.stderr)
+        for text_chunk in document_summarizer.reduce_stream(client, args.model, args.question, result["summaries"]):
+            print(text_chunk, end="", flush=True)
+        print()
+    except Exception as e:
+        print(str(e), file=sys.stderr)
+        sys.exit(1)
+    
+    print(json.dumps(document_summarizer.get_stats(), ensure_ascii=False, indent=2), file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
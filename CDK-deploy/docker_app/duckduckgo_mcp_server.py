@@ -0,0 +1,262 @@
+#!/usr/bin/env python
+import requests
+import argparse
+import json
+from html.parser import HTMLParser
+from typing import List, Dict, Optional
+
+from keyword_extractor import default_extractor
+
+
+class _ParsingDone(Exception):
+    """필요한 결과 수를 채웠을 때 파싱을 중단하기 위한 예외"""
+
+
+class DuckDuckGoResultParser(HTMLParser):
+    """
+    DuckDuckGo HTML 검색 결과 페이지용 이벤트 기반 파서
+    
+    전체 DOM 트리를 만들지 않고 .result 블록의 제목/스니펫/URL 텍스트만 수집하며,
+    max_results개를 채우면 나머지 문서는 읽지 않습니다.
+    """
+    
+    # 종료 태그가 없는 요소 (중첩 깊이 계산에서 제외)
+    VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+    
+    def __init__(self, max_results: int = 5):
+        super().__init__(convert_charrefs=True)
+        self.max_results = max_results
+        self.results: List[Dict[str, str]] = []
+        self._current = None        # 현재 결과 블록 {"title": [], "content": [], "url": [], "href": ""}
+        self._field = None          # 텍스트를 수집 중인 필드 이름
+        self._field_depth = 0       # 수집 중인 요소 안의 중첩 깊이
+    
+    def handle_starttag(self, tag, attrs):
+        if tag in self.VOID_TAGS:
+            return
+        
+        if self._field is not None:
+            self._field_depth += 1
+            if self._field == "title" and tag == "a" and not self._current["href"]:
+                self._current["href"] = dict(attrs).get("href") or ""
+            return
+        
+        class_attr = None
+        for name, value in attrs:
+            if name == "class":
+                class_attr = value
+                break
+        if not class_attr:
+            return
+        classes = class_attr.split()
+        
+        if "result" in classes:
+            self._flush()
+            self._current = {"title": [], "content": [], "url": [], "href": ""}
+        elif self._current is not None:
+            if "result__title" in classes:
+                self._start_field("title")
+            elif "result__snippet" in classes:
+                self._start_field("content")
+            elif "result__url" in classes:
+                self._start_field("url")
+                if tag == "a" and not self._current["href"]:
+                    self._current["href"] = dict(attrs).get("href") or ""
+    
+    def handle_endtag(self, tag):
+        if self._field is None or tag in self.VOID_TAGS:
+            return
+        self._field_depth -= 1
+        if self._field_depth == 0:
+            finished = self._field
+            self._field = None
+            # 스니펫은 결과 블록의 마지막 요소이므로 바로 확정
+            if finished == "content":
+                self._flush()
+    
+    def handle_data(self, data):
+        if self._field is not None:
+            self._current[self._field].append(data)
+    
+    def _start_field(self, field: str):
+        self._field = field
+        self._field_depth = 1
+    
+    def _flush(self):
+        """현재 결과 블록을 확정하고 필요한 수를 채우면 파싱 중단"""
+        current, self._current = self._current, None
+        self._field = None
+        if current is None:
+            return
+        
+        # 태그 사이 줄바꿈/들여쓰기 공백은 하나로 정리
+        title = " ".join("".join(current["title"]).split())
+        snippet = " ".join("".join(current["content"]).split())
+        if not title or not snippet:
+            return
+        
+        url = "".join(current["url"]).strip()
+        if not url and current["href"]:
+            # DuckDuckGo는 때로 URL을 리디렉션 형태로 제공
+            href = current["href"]
+            if href.startswith("//"):
+                url = "https:" + href
+            elif href.startswith("/"):
+                url = "https://duckduckgo.com" + href
+            else:
+                url = href
+        
+        self.results.append({"title": title, "content": snippet, "url": url})
+        if len(self.results) >= self.max_results:
+            raise _ParsingDone()
+    
+    def parse(self, html: str) -> List[Dict[str, str]]:
+        """
+        HTML 문서에서 검색 결과를 추출합니다.
+        
+        Args:
+            html: DuckDuckGo HTML 검색 결과 페이지
+            
+        Returns:
+            검색 결과 목록 (딕셔너리 리스트)
+        """
+        try:
+            self.feed(html)
+            self.close()
+            self._flush()
+        except _ParsingDone:
+            pass
+        return self.results
+
+
+def parse_results(html: str, max_results: int = 5) -> List[Dict[str, str]]:
+    """DuckDuckGo HTML 검색 결과 페이지에서 최대 max_results개의 결과를 추출"""
+    return DuckDuckGoResultParser(max_results=max_results).parse(html)
+
+
+class DuckDuckGoServer:
+    """DuckDuckGo 검색 기능을 제공하는 서버 클래스"""
+    
+    def __init__(self, max_results: int = 5):
+        """
+        DuckDuckGoServer 초기화
+        
+        Args:
+            max_results: 검색 결과 최대 개수 (기본값: 5)
+        """
+        self.max_results = max_results
+        self.base_url = "https://html.duckduckgo.com/html/"
+        
+        # 검색 요청 헤더 설정
+        self.headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+        }
+    
+    def extract_keywords(self, text: str) -> List[str]:
+        """
+        주어진 텍스트에서 중요 키워드를 추출합니다.
+        
+        Args:
+            text: 키워드를 추출할 텍스트
+            
+        Returns:
+            추출된 키워드 리스트 (최대 5개)
+        """
+        # 내장 불용어/조사 테이블을 사용하는 로컬 추출기 (NLTK 리소스 불필요)
+        return default_extractor.extract(text)[:5]
+    
+    def search(self, query: str, max_results: Optional[int] = None) -> List[Dict[str, str]]:
+        """
+        DuckDuckGo 검색을 수행하여 검색 결과를 반환합니다.
+        
+        Args:
+            query: 검색 쿼리 문자열
+            max_results: 최대 결과 개수 (기본값: 서버 설정값)
+            
+        Returns:
+            검색 결과 목록 (딕셔너리 리스트)
+        """
+        max_results = max_results or self.max_results
+        try:
+            # 검색 요청 실행
+            response = requests.get(
+                self.base_url,
+                params={'q': query},
+                headers=self.headers,
+                timeout=10  # 타임아웃 추가
+            )
+            response.raise_for_status()
+            
+            # 필요한 결과 수만큼만 파싱
+            results = parse_results(response.text, max_results=max_results)
+            
+            # 결과가 없을 경우 로그 출력
+            if not results:
+                print(f"'{query}' 검색 결과가 없습니다. HTML 응답 길이: {len(response.text)} 바이트")
+            
+            return results
+        
+        except requests.exceptions.RequestException as e:
+            error_msg = f"네트워크 요청 오류: {str(e)}"
+            print(error_msg)
+            # 빈 리스트 대신 오류 정보를 포함한 결과 반환
+            return [{
+                "title": "검색 오류",
+                "content": f"DuckDuckGo 검색 중 네트워크 오류가 발생했습니다: {str(e)}",
+                "url": ""
+            }]
+        except Exception as e:
+            error_msg = f"검색 중 오류 발생: {str(e)}"
+            print(error_msg)
+            return [{
+                "title": "검색 처리 오류",
+                "content": f"검색 결과 처리 중 오류가 발생했습니다: {str(e)}",
+                "url": ""
+            }]
+    
+    def format_results(self, results: List[Dict[str, str]]) -> str:
+        """
+        검색 결과를 문자열 형식으로 포맷팅합니다.
+        
+        Args:
+            results: 검색 결과 목록
+            
+        Returns:
+            포맷팅된 검색 결과 문자열
+        """
+        if not results:
+            return "검색 결과가 없습니다."
+            
+        formatted_text = ""
+        for i, result in enumerate(results, 1):
+            title = result.get("title", "제목 없음")
+            content = result.get("content", "내용 없음")
+            url = result.get("url", "")
+            
+            formatted_text += f"[{i}] {title}\n{content}\n"
+            if url:
+                formatted_text += f"출처: {url}\n"
+            formatted_text += "\n"
+        
+        return formatted_text
+
+
+def main():
+    """CLI 인터페이스로 DuckDuckGo 검색 기능 실행"""
+    parser = argparse.ArgumentParser(description="DuckDuckGo 검색 CLI")
+    parser.add_argument('query', help='검색할 쿼리')
+    parser.add_argument('--max-results', type=int, default=5, help='최대 결과 수 (기본값: 5)')
+    parser.add_argument('--json', action='store_true', help='JSON 형식으로 출력')
+    
+    args = parser.parse_args()
+    
+    server = DuckDuckGoServer(max_results=args.max_results)
+    results = server.search(args.query)
+    
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+    else:
+        print(server.format_results(results))
+
+if __name__ == "__main__":
+    main()
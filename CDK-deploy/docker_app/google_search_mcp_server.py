@@ -4,45 +4,79 @@ import os
 import argparse
 import json
 import re
+import datetime
+import threading
+import unicodedata
 import boto3
-from typing import List, Dict, Any, Optional
-import nltk
+from concurrent.futures import ThreadPoolExecutor
+from zoneinfo import ZoneInfo
+from typing import List, Dict, Any, Optional, Tuple
 
-# NLTK 데이터 다운로드 체크
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
-try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('stopwords')
+from keyword_extractor import default_extractor
+from ttl_cache import TTLCache
 
-from nltk.corpus import stopwords
+# Google Custom Search API 페이지 제한
+GOOGLE_PAGE_SIZE = 10        # 요청 1회당 최대 결과 수
+GOOGLE_MAX_RESULTS = 99      # start + num <= 100 제한 - 마지막 페이지는 start=91, num=9
+
+# Custom Search 일일 쿼터는 태평양 시간 자정에 초기화됨
+QUOTA_TIMEZONE = ZoneInfo("America/Los_Angeles")
+
+# 키워드 추출 결과 메모 캐시 (프로세스 전역 - MCP 서버 경로와 클라이언트 경로가 공유)
+keyword_cache = TTLCache(
+    max_entries=int(os.environ.get('KEYWORD_CACHE_SIZE', '2048')),
+    ttl=float(os.environ.get('KEYWORD_CACHE_TTL', '3600')),
+    name="keywords"
+)
+
+
+def quota_today() -> datetime.date:
+    """쿼터 기준 날짜 (태평양 시간)"""
+    return datetime.datetime.now(QUOTA_TIMEZONE).date()
+
+
+def normalize_text(text: str) -> str:
+    """캐시 키용 텍스트 정규화 (유니코드 NFC, 공백 정리, 소문자)"""
+    return " ".join(unicodedata.normalize("NFC", text).split()).lower()
 
 class GoogleSearchServer:
     """Google Custom Search API를 사용하는 검색 기능을 제공하는 서버 클래스"""
     
-    def __init__(self, max_results: int = 5):
+    def __init__(self, max_results: int = 5, max_workers: int = 4, llm_keywords: Optional[bool] = None):
         """
         GoogleSearchServer 초기화
         
         Args:
             max_results: 검색 결과 최대 개수 (기본값: 5)
+            max_workers: 페이지 동시 요청 수 (기본값: 4)
+            llm_keywords: Claude로 키워드를 정제할지 여부 (기본값: KEYWORD_LLM_REFINE 환경 변수, 미설정 시 사용 안 함)
         """
         self.max_results = max_results
+        self.max_workers = max_workers
+        if llm_keywords is None:
+            llm_keywords = os.environ.get('KEYWORD_LLM_REFINE', '').lower() in ('1', 'true', 'yes')
+        self.llm_keywords = llm_keywords
         self.api_key = os.environ.get('GOOGLE_API_KEY')
         self.search_engine_id = os.environ.get('GOOGLE_SEARCH_ENGINE_ID')
         
+        # 일일 쿼리 사용량 집계 (페이지 요청 1회 = 쿼리 1회)
+        self.daily_quota = int(os.environ.get('GOOGLE_SEARCH_DAILY_QUOTA', '100'))
+        self._quota_lock = threading.Lock()
+        self._quota_date = quota_today()
+        self._quota_used = 0
+        self._pages_skipped = 0
+        self._quota_exhausted = False
+        
         # AWS 리전 설정
         self.aws_region = os.environ.get('AWS_REGION', 'us-west-2')
         
-        # boto3 클라이언트 초기화
-        try:
-            self.bedrock_client = boto3.client('bedrock-runtime', region_name=self.aws_region)
-        except Exception as e:
-            print(f"boto3 클라이언트 초기화 오류: {str(e)}")
-            self.bedrock_client = None
+        # boto3 클라이언트 초기화 (LLM 키워드 정제를 사용하는 경우에만)
+        self.bedrock_client = None
+        if self.llm_keywords:
+            try:
+                self.bedrock_client = boto3.client('bedrock-runtime', region_name=self.aws_region)
+            except Exception as e:
+                print(f"boto3 클라이언트 초기화 오류: {str(e)}")
             
         if not self.api_key or not self.search_engine_id:
             print("경고: Google API Key 또는 Search Engine ID가 설정되지 않았습니다. 환경 변수를 확인하세요.")
@@ -52,8 +86,8 @@ class GoogleSearchServer:
     def extract_keywords(self, text: str) -> List[str]:
         """
         주어진 텍스트에서 중요 키워드를 추출합니다.
-        Claude 3.7을 사용하여 검색에 최적화된 키워드를 추출하고,
-        실패할 경우 기존 방식으로 폴백합니다.
+        로컬 추출기(조사 제거, 빈도/위치 점수)를 기본으로 사용하고,
+        llm_keywords가 활성화된 경우에만 Claude 3.7로 키워드를 정제합니다.
         
         Args:
             text: 키워드를 추출할 텍스트
@@ -61,11 +95,38 @@ class GoogleSearchServer:
         Returns:
             추출된 키워드 리스트
         """
-        # Claude를 사용한 키워드 추출 시도
-        if self.bedrock_client:
-            try:
-                # Claude에 전달할 시스템 프롬프트
-                system_prompt = """당신은 검색 쿼리 최적화 전문가입니다.
+        use_llm = bool(self.llm_keywords and self.bedrock_client)
+        cache_key = (use_llm, normalize_text(text))
+        
+        cached = keyword_cache.get(cache_key, None)
+        if cached is not None:
+            return list(cached)
+        
+        keywords = default_extractor.extract(text)
+        
+        # 선택적 LLM 정제 (실패 시 로컬 추출 결과 사용, 실패 결과는 캐시하지 않음)
+        if use_llm:
+            refined = self._extract_keywords_with_llm(text)
+            if not refined:
+                return keywords
+            keywords = refined
+        
+        keyword_cache.set(cache_key, tuple(keywords))
+        return keywords
+    
+    def _extract_keywords_with_llm(self, text: str) -> List[str]:
+        """
+        Claude 3.7을 사용하여 검색에 최적화된 키워드를 추출합니다.
+        
+        Args:
+            text: 키워드를 추출할 텍스트
+            
+        Returns:
+            추출된 키워드 리스트 (실패 시 빈 리스트)
+        """
+        try:
+            # Claude에 전달할 시스템 프롬프트
+            system_prompt = """당신은 검색 쿼리 최적화 전문가입니다.
 사용자 질문을 분석하여 Google 검색에 가장 효과적인 키워드를 추출해주세요.
 
 1. 한글 검색어의 경우 조사나 접미사는 제거하고 핵심 키워드만 추출
@@ -82,113 +143,195 @@ class GoogleSearchServer:
 키워드: "스타워즈 에피소드9 개봉일"
 """
 
-                # Claude API 호출
-                response = self.bedrock_client.invoke_model(
-                    modelId="us.anthropic.claude-3-7-sonnet-20250219-v1:0",
-                    body=json.dumps({
-                        "anthropic_version": "bedrock-2023-05-31",
-                        "max_tokens": 100,
-                        "temperature": 0,
-                        "system": system_prompt,
-                        "messages": [
-                            {"role": "user", "content": f"질문: {text}\n\n검색에 사용할 키워드를 추출해주세요."}
-                        ]
-                    })
-                )
-                
-                # 응답 파싱
-                response_body = json.loads(response['body'].read())
-                extracted_text = response_body.get('content', [{'text': ''}])[0]['text'].strip()
-                
-                # '키워드:', 'Keywords:' 등의 접두어 제거
-                keywords_text = re.sub(r'^(keywords:|키워드:|\s|\")+', '', extracted_text, flags=re.IGNORECASE)
-                keywords_text = re.sub(r'(\"|\s)+$', '', keywords_text)
-                
-                # 결과가 있으면 공백으로 분할된 키워드 리스트 반환
-                if keywords_text:
-                    keywords = keywords_text.split()
-                    print(f"Claude 키워드 추출 성공: {keywords}")
-                    return keywords
-                
-            except Exception as e:
-                print(f"Claude 키워드 추출 중 오류: {str(e)}")
-                # 오류 시 기존 방식으로 폴백
-        
-        # 기존 키워드 추출 로직 (폴백)
-        try:
-            # 한국어와 영어 둘 다 처리할 수 있도록 합니다.
-            stop_words = set(stopwords.words('english'))
-            
-            # 텍스트를 직접 토큰화합니다 (간단한 공백 기반 토큰화)
-            word_tokens = text.lower().split()
+            # Claude API 호출
+            response = self.bedrock_client.invoke_model(
+                modelId="us.anthropic.claude-3-7-sonnet-20250219-v1:0",
+                body=json.dumps({
+                    "anthropic_version": "bedrock-2023-05-31",
+                    "max_tokens": 100,
+                    "temperature": 0,
+                    "system": system_prompt,
+                    "messages": [
+                        {"role": "user", "content": f"질문: {text}\n\n검색에 사용할 키워드를 추출해주세요."}
+                    ]
+                })
+            )
             
-            # 불용어를 제거하고 길이가 1 이상인 단어만 선택합니다. (isalnum 제약 완화)
-            keywords = [word for word in word_tokens if word not in stop_words and len(word) > 1]
+            # 응답 파싱
+            response_body = json.loads(response['body'].read())
+            extracted_text = response_body.get('content', [{'text': ''}])[0]['text'].strip()
             
-            # 중복 제거 및 빈도 기반 정렬
-            keyword_freq = {}
-            for word in keywords:
-                keyword_freq[word] = keyword_freq.get(word, 0) + 1
-            
-            # 빈도수 기준 상위 5개 키워드 반환
-            sorted_keywords = sorted(keyword_freq.items(), key=lambda x: x[1], reverse=True)
-            return [word for word, freq in sorted_keywords[:5]] if sorted_keywords else text.split()
+            # '키워드:', 'Keywords:' 등의 접두어 제거
+            keywords_text = re.sub(r'^(keywords:|키워드:|\s|\")+', '', extracted_text, flags=re.IGNORECASE)
+            keywords_text = re.sub(r'(\"|\s)+$', '', keywords_text)
             
+            # 결과가 있으면 공백으로 분할된 키워드 리스트 반환
+            if keywords_text:
+                keywords = keywords_text.split()
+                print(f"Claude 키워드 추출 성공: {keywords}")
+                return keywords
+                
         except Exception as e:
-            print(f"기존 키워드 추출 중 오류: {str(e)}")
-            # 모든 추출 방식이 실패한 경우 입력 텍스트를 단순 분할
-            return text.split()
+            print(f"Claude 키워드 추출 중 오류: {str(e)}")
+        
+        return []
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        검색 서버 지표 반환
+        
+        Returns:
+            쿼터 사용량과 키워드 캐시 지표를 담은 딕셔너리
+        """
+        return {
+            "quota": self.get_quota_usage(),
+            "keyword_cache": keyword_cache.get_stats()
+        }
+    
+    def _record_query(self, count: int = 1, skipped: int = 0):
+        """쿼리 사용량 기록 (태평양 시간 기준 날짜가 바뀌면 초기화)"""
+        with self._quota_lock:
+            today = quota_today()
+            if today != self._quota_date:
+                self._quota_date = today
+                self._quota_used = 0
+                self._pages_skipped = 0
+                self._quota_exhausted = False
+            self._quota_used += count
+            self._pages_skipped += skipped
+    
+    def get_quota_usage(self) -> Dict[str, Any]:
+        """
+        오늘의 Google Custom Search 쿼리 사용량을 반환합니다.
+        
+        Returns:
+            사용량 정보를 담은 딕셔너리
+        """
+        self._record_query(0)
+        with self._quota_lock:
+            return {
+                "date": self._quota_date.isoformat(),
+                "queries_used": self._quota_used,
+                "daily_quota": self.daily_quota,
+                "remaining": max(self.daily_quota - self._quota_used, 0),
+                "pages_skipped": self._pages_skipped,
+                "exhausted": self._quota_exhausted or self._quota_used >= self.daily_quota
+            }
     
-    def search(self, query: str) -> List[Dict[str, str]]:
+    def _fetch_page(self, query: str, start: int, num: int) -> Tuple[List[Dict[str, str]], int]:
+        """
+        검색 결과 한 페이지를 요청합니다.
+        
+        Args:
+            query: 검색 쿼리 문자열
+            start: 시작 순위 (1부터 시작)
+            num: 요청할 결과 수 (최대 10)
+            
+        Returns:
+            (결과 목록, 전체 결과 수) 튜플
+        """
+        params = {
+            'key': self.api_key,
+            'cx': self.search_engine_id,
+            'q': query,
+            'start': start,
+            'num': num
+        }
+        
+        self._record_query()
+        response = requests.get("https://www.googleapis.com/customsearch/v1", params=params, timeout=10)
+        response.raise_for_status()
+        
+        search_results = response.json()
+        total_results = int(search_results.get('searchInformation', {}).get('totalResults', 0) or 0)
+        
+        results = []
+        for item in search_results.get('items', []):
+            results.append({
+                "title": item.get('title', '제목 없음'),
+                "content": item.get('snippet', '내용 없음'),
+                "url": item.get('link', '')
+            })
+        
+        return results, total_results
+    
+    def search(self, query: str, max_results: Optional[int] = None) -> List[Dict[str, str]]:
         """
         Google Custom Search API를 사용해 검색을 수행하여 결과를 반환합니다.
+        10개를 초과하는 결과가 필요한 경우 여러 페이지(start=1, 11, 21...)를
+        동시에 요청한 뒤 순위 순서대로 병합합니다.
         
         Args:
             query: 검색 쿼리 문자열
+            max_results: 최대 결과 개수 (기본값: 서버 설정값, 최대 99)
             
         Returns:
             검색 결과 목록 (딕셔너리 리스트)
         """
+        return self.search_with_usage(query, max_results)[0]
+    
+    def search_with_usage(self, query: str, max_results: Optional[int] = None) -> Tuple[List[Dict[str, str]], int]:
+        """
+        search()와 같지만 이번 호출이 사용한 쿼리 수를 함께 반환합니다.
+        공유 사용량 카운터의 전후 차이는 동시 호출이 섞이므로 호출별로 직접 집계합니다.
+        
+        Args:
+            query: 검색 쿼리 문자열
+            max_results: 최대 결과 개수 (기본값: 서버 설정값, 최대 99)
+            
+        Returns:
+            (검색 결과 목록, 사용한 쿼리 수) 튜플
+        """
         # API 키와 검색 엔진 ID 확인
         if not self.api_key or not self.search_engine_id:
             return [{
                 "title": "검색 설정 오류",
                 "content": "Google API Key 또는 Search Engine ID가 설정되지 않았습니다. 환경 변수를 확인하세요.",
                 "url": ""
-            }]
+            }], 0
+        
+        max_results = max(1, min(max_results or self.max_results, GOOGLE_MAX_RESULTS))
         
+        # 필요한 페이지 목록 (시작 순위, 요청 수)
+        pages = []
+        for start in range(1, max_results + 1, GOOGLE_PAGE_SIZE):
+            pages.append((start, min(GOOGLE_PAGE_SIZE, max_results - start + 1, GOOGLE_MAX_RESULTS + 1 - start)))
+        
+        futures = []
         try:
-            # Google Custom Search API 요청
-            url = "https://www.googleapis.com/customsearch/v1"
-            params = {
-                'key': self.api_key,
-                'cx': self.search_engine_id,
-                'q': query,
-                'num': min(self.max_results, 10)  # Google API는 최대 10개까지만 허용
-            }
-            
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            
-            search_results = response.json()
             results = []
+            seen_urls = set()
             
-            if 'items' in search_results:
-                for item in search_results['items']:
-                    title = item.get('title', '제목 없음')
-                    snippet = item.get('snippet', '내용 없음')
-                    link = item.get('link', '')
+            with ThreadPoolExecutor(max_workers=max(1, min(len(pages), self.max_workers))) as executor:
+                futures.extend(executor.submit(self._fetch_page, query, start, num) for start, num in pages)
+                
+                for index, future in enumerate(futures):
+                    start, num = pages[index]
+                    try:
+                        page_results, total_results = future.result()
+                    except Exception:
+                        # 첫 페이지 오류는 그대로 전달, 이후 페이지 오류는 부분 결과 반환
+                        if index == 0:
+                            raise
+                        page_results, total_results = [], 0
                     
-                    results.append({
-                        "title": title,
-                        "content": snippet,
-                        "url": link
-                    })
+                    # 페이지 간 중복 결과 제거 (순위 순서 유지)
+                    for result in page_results:
+                        if result["url"] and result["url"] in seen_urls:
+                            continue
+                        seen_urls.add(result["url"])
+                        results.append(result)
                     
-                    # 최대 결과 수에 도달하면 중단
-                    if len(results) >= self.max_results:
+                    # 조기 종료: 결과가 부족하거나 전체 결과 수를 넘어선 경우 남은 페이지 취소
+                    if len(results) >= max_results or len(page_results) < num or start + num > total_results:
+                        remaining = futures[index + 1:]
+                        skipped = sum(1 for pending in remaining if pending.cancel())
+                        if skipped:
+                            self._record_query(0, skipped)
                         break
             
+            results = results[:max_results]
+            
             # 결과가 없을 경우 메시지 반환
             if not results:
                 print(f"'{query}' 검색 결과가 없습니다.")
@@ -196,18 +339,24 @@ class GoogleSearchServer:
                     "title": "검색 결과 없음",
                     "content": f"'{query}'에 대한 검색 결과를 찾을 수 없습니다.",
                     "url": ""
-                }]
+                }], self._queries_sent(futures)
             
-            return results
+            return results, self._queries_sent(futures)
             
         except requests.exceptions.RequestException as e:
             error_msg = f"네트워크 요청 오류: {str(e)}"
             print(error_msg)
+            
+            # 429 응답은 일일 쿼터 소진으로 간주 (다음 날까지 유지)
+            if getattr(getattr(e, 'response', None), 'status_code', None) == 429:
+                with self._quota_lock:
+                    self._quota_exhausted = True
+            
             return [{
                 "title": "검색 오류",
                 "content": f"Google 검색 중 네트워크 오류가 발생했습니다: {str(e)}",
                 "url": ""
-            }]
+            }], self._queries_sent(futures)
         except Exception as e:
             error_msg = f"검색 중 오류 발생: {str(e)}"
             print(error_msg)
@@ -215,9 +364,15 @@ class GoogleSearchServer:
                 "title": "검색 처리 오류",
                 "content": f"검색 결과 처리 중 오류가 발생했습니다: {str(e)}",
                 "url": ""
-            }]
+            }], self._queries_sent(futures)
+    
+    @staticmethod
+    def _queries_sent(futures: List[Any]) -> int:
+        """실행된(취소되지 않은) 페이지 요청 수 = 이번 호출이 사용한 쿼리 수"""
+        return sum(1 for future in futures if not future.cancelled())
     
-    def format_results(self, results: List[Dict[str, str]]) -> str:
+    @staticmethod
+    def format_results(results: List[Dict[str, str]]) -> str:
         """
         검색 결과를 문자열 형식으로 포맷팅합니다.
         
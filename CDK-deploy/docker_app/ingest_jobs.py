@@ -0,0 +1,277 @@
+#!/usr/bin/env python
+import os
+import sys
+import json
+import time
+import uuid
+import argparse
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+# 동시에 처리할 문서 수집 작업 수 (큰 PDF는 document_parser가 프로세스 풀로 다시 나눠 추출)
+INGEST_WORKERS = int(os.environ.get("INGEST_WORKERS", "2"))
+
+# 완료된 작업을 보관할 개수 (같은 문서를 올린 다른 세션/재실행이 결과를 찾을 수 있도록)
+MAX_JOBS = 64
+
+# 작업 상태
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED = (DONE, FAILED, CANCELLED)
+
+
+class IngestCancelled(Exception):
+    """취소된 작업의 진행률 보고 시 발생하여 파싱을 중단"""
+
+
+class IngestJob:
+    """백그라운드 문서 수집 작업 하나 (진행률, 상태, 결과)"""
+    
+    def __init__(self, key: str, name: str):
+        """
+        IngestJob 초기화
+        
+        Args:
+            key: 문서 키 (document_store.content_key)
+            name: 업로드 파일 이름
+        """
+        self.id = uuid.uuid4().hex[:12]
+        self.key = key
+        self.name = name
+        self.status = QUEUED
+        self.stage = "대기 중"
+        self.done = 0
+        self.total = 0
+        self.error: Optional[str] = None
+        self.result: Any = None
+        self.created = time.time()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self._cancel = threading.Event()
+    
+    @property
+    def cancelled(self) -> bool:
+        """취소 요청 여부"""
+        return self._cancel.is_set()
+    
+    @property
+    def is_finished(self) -> bool:
+        """완료/실패/취소 여부"""
+        return self.status in FINISHED
+    
+    @property
+    def progress(self) -> float:
+        """진행률 (0.0 ~ 1.0)"""
+        if self.status == DONE:
+            return 1.0
+        return min(self.done / self.total, 1.0) if self.total else 0.0
+    
+    def report(self, done: int, total: int, stage: Optional[str] = None):
+        """
+        진행률 보고 (document_parser/TableData의 progress 콜백으로 사용)
+        
+        Args:
+            done: 처리한 단위 수
+            total: 전체 단위 수
+            stage: 현재 단계 이름 (생략하면 유지)
+        
+        Raises:
+            IngestCancelled: 취소가 요청된 경우
+        """
+        if self._cancel.is_set():
+            raise IngestCancelled(f"작업이 취소되었습니다: {self.name}")
+        self.done = done
+        self.total = total
+        if stage is not None:
+            self.stage = stage
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """작업 상태를 직렬화 가능한 사전으로 반환"""
+        end = self.finished or time.time()
+        return {
+            "id": self.id,
+            "name": self.name,
+            "status": self.status,
+            "stage": self.stage,
+            "progress": round(self.progress, 3),
+            "done": self.done,
+            "total": self.total,
+            "error": self.error,
+            "wait_ms": round(((self.started or end) - self.created) * 1000, 1),
+            "run_ms": round((end - self.started) * 1000, 1) if self.started else 0.0
+        }
+
+
+class IngestManager:
+    """문서 수집 작업을 스레드 풀에서 실행하고 작업 ID와 문서 키로 조회하는 프로세스 전역 관리자"""
+    
+    def __init__(self, max_workers: int = INGEST_WORKERS, max_jobs: int = MAX_JOBS):
+        """
+        IngestManager 초기화
+        
+        Args:
+            max_workers: 동시에 실행할 작업 수
+            max_jobs: 보관할 작업 수, 초과 시 오래된 완료 작업부터 제거
+        """
+        self.max_jobs = max_jobs
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ingest")
+        self._lock = threading.Lock()
+        self._jobs: "OrderedDict[str, IngestJob]" = OrderedDict()
+        self._by_key: Dict[str, IngestJob] = {}
+        self._futures: Dict[str, Any] = {}
+        self._stats = {"submitted": 0, "reused": 0, "done": 0, "failed": 0, "cancelled": 0, "run_ms": 0.0}
+    
+    def submit(self, key: str, name: str, run: Callable[[IngestJob], Any]) -> IngestJob:
+        """
+        작업 제출 (같은 문서의 작업이 대기/실행 중이거나 완료되었으면 그 작업을 반환)
+        
+        Args:
+            key: 문서 키
+            name: 업로드 파일 이름
+            run: 작업을 받아 결과를 반환하는 함수 (job.report로 진행률 보고)
+        
+        Returns:
+            IngestJob 인스턴스
+        """
+        with self._lock:
+            job = self._by_key.get(key)
+            if job is not None and job.status not in (FAILED, CANCELLED):
+                self._stats["reused"] += 1
+                return job
+            
+            job = IngestJob(key, name)
+            self._jobs[job.id] = job
+            self._by_key[key] = job
+            self._stats["submitted"] += 1
+            self._futures[job.id] = self._executor.submit(self._run, job, run)
+            self._trim()
+            return job
+    
+    def _run(self, job: IngestJob, run: Callable[[IngestJob], Any]):
+        job.started = time.time()
+        try:
+            # 실행 직전에 취소된 작업은 바로 중단
+            job.report(0, 0)
+            job.status = RUNNING
+            job.result = run(job)
+            job.status = DONE
+        except Exception as e:
+            # 파서가 취소 예외를 감싸서 다시 던질 수 있으므로 취소 요청 여부로 판단
+            if job.cancelled:
+                job.status = CANCELLED
+            else:
+                job.status = FAILED
+                job.error = str(e)
+        finally:
+            job.finished = time.time()
+            with self._lock:
+                self._futures.pop(job.id, None)
+                self._stats[job.status] += 1
+                self._stats["run_ms"] += (job.finished - job.started) * 1000
+    
+    def _trim(self):
+        # 오래된 완료 작업부터 제거 (대기/실행 중인 작업은 유지)
+        for job_id in [job_id for job_id, job in self._jobs.items() if job.is_finished]:
+            if len(self._jobs) <= self.max_jobs:
+                break
+            job = self._jobs.pop(job_id)
+            if self._by_key.get(job.key) is job:
+                del self._by_key[job.key]
+    
+    def get(self, job_id: Optional[str]) -> Optional[IngestJob]:
+        """작업 ID로 조회 (없으면 None)"""
+        with self._lock:
+            return self._jobs.get(job_id) if job_id else None
+    
+    def find(self, key: str) -> Optional[IngestJob]:
+        """문서 키의 가장 최근 작업 조회 (없으면 None)"""
+        with self._lock:
+            return self._by_key.get(key)
+    
+    def cancel(self, job_id: str) -> bool:
+        """
+        작업 취소 (대기 중이면 바로 취소, 실행 중이면 다음 진행률 보고 시 중단)
+        
+        Args:
+            job_id: 작업 ID
+        
+        Returns:
+            취소 요청 여부 (이미 끝난 작업이면 False)
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.is_finished:
+                return False
+            job._cancel.set()
+            future = self._futures.get(job_id)
+            if future is not None and future.cancel():
+                # 아직 시작하지 않은 작업
+                self._futures.pop(job_id, None)
+                job.status = CANCELLED
+                job.finished = time.time()
+                self._stats["cancelled"] += 1
+            return True
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        작업 지표 반환
+        
+        Returns:
+            상태별 작업 수, 평균 실행 시간, 대기/실행 중인 작업 목록
+        """
+        with self._lock:
+            finished = self._stats["done"] + self._stats["failed"] + self._stats["cancelled"]
+            return {
+                "submitted": self._stats["submitted"],
+                "reused": self._stats["reused"],
+                "done": self._stats["done"],
+                "failed": self._stats["failed"],
+                "cancelled": self._stats["cancelled"],
+                "avg_run_ms": round(self._stats["run_ms"] / finished, 1) if finished else 0.0,
+                "active": [job.to_dict() for job in self._jobs.values() if not job.is_finished]
+            }
+
+
+# 프로세스 전역 수집 작업 관리자 (세션 간 공유)
+ingest_manager = IngestManager()
+
+
+def main():
+    """CLI 인터페이스로 백그라운드 문서 수집 확인"""
+    parser = argparse.ArgumentParser(description="백그라운드 문서 수집 (진행률 표시, 취소)")
+    parser.add_argument('path', help='문서 파일 경로')
+    parser.add_argument('--cancel-after', type=float, default=0, help='지정한 초가 지나면 취소')
+    
+    args = parser.parse_args()
+    
+    from document_parser import parse_document
+    from document_store import content_key
+    with open(args.path, "rb") as f:
+        data = f.read()
+    file_ext = os.path.splitext(args.path)[1]
+    
+    job = ingest_manager.submit(
+        content_key(data, file_ext),
+        os.path.basename(args.path),
+        lambda job: len(parse_document(data, file_ext, lambda done, total: job.report(done, total, "텍스트 추출")))
+    )
+    start = time.time()
+    while not job.is_finished:
+        if args.cancel_after and time.time() - start > args.cancel_after:
+            ingest_manager.cancel(job.id)
+        print(f"\r{job.stage} {job.progress:.0%} ({job.done}/{job.total})", end="", file=sys.stderr)
+        time.sleep(0.1)
+    print(file=sys.stderr)
+    
+    if job.status == FAILED:
+        print(job.error, file=sys.stderr)
+        sys.exit(1)
+    print(json.dumps({**job.to_dict(), "chars": job.result}, ensure_ascii=False, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+#!/usr/bin/env python
+import re
+import json
+import argparse
+from typing import List, Dict, Tuple
+
+# 영어 불용어 (NLTK english stopwords 목록과 동일)
+ENGLISH_STOPWORDS = frozenset("""
+i me my myself we our ours ourselves you you're you've you'll you'd your yours yourself yourselves
+he him his himself she she's her hers herself it it's its itself they them their theirs themselves
+what which who whom this that that'll these those am is are was were be been being have has had
+having do does did doing a an the and but if or because as until while of at by for with about
+against between into through during before after above below to from up down in out on off over
+under again further then once here there when where why how all any both each few more most other
+some such no nor not only own same so than too very s t can will just don don't should should've
+now d ll m o re ve y ain aren aren't couldn couldn't didn didn't doesn doesn't hadn hadn't hasn
+hasn't haven haven't isn isn't ma mightn mightn't mustn mustn't needn needn't shan shan't shouldn
+shouldn't wasn wasn't weren weren't won won't wouldn wouldn't
+""".split())
+
+# 검색 질의에서 의미가 없는 영어 표현 (질문/요청 표현)
+ENGLISH_QUERY_WORDS = frozenset("""
+please tell show find search explain know let get give want need could would may might
+""".split())
+
+# 한국어 불용어 (의문사, 요청 표현, 대명사, 의존 명사 등)
+KOREAN_STOPWORDS = frozenset("""
+뭐 뭔가 무엇 무엇인가 무슨 어떤 어떻게 어디 어디서 언제 왜 누구 누가 얼마 얼마나 몇
+알려줘 알려주세요 알려줄래 알려 주세요 줘 해줘 해주세요 말해줘 설명해줘 설명해주세요 찾아줘 검색해줘
+어때 어때요 어떤가요 어떨까 있는 있을 궁금해 궁금합니다 궁금해요 있어 있어요 있나요 있습니까 없어 없나요
+되나요 되 돼 해 하나요 할까 할까요 이거 그거 저거 이것 그것 저것 여기 거기 저기 이번 그냥 좀 정말 진짜 혹시
+그리고 그런데 하지만 나 내 저 제 우리 너 당신 대한 대해 대해서 관련 관련된 위한 위해 통해 같은 등 및 또는
+입니까 인가요 인가 인지 일까 일까요 이야 이에요 예요 입니다 이다 요 수 것 거 게 걸 건 데 때 더 잘 못 안 중 또
+""".split())
+
+# 한국어 조사 및 어미 - (형태, 앞 글자 받침 조건)
+# 받침 조건: True=받침 있음, False=받침 없음, None=무관
+# 예) "출시일이" → "출시일" (일: 받침 있음), "고양이"는 "양"에 받침이 있지만 "고양"이 되지 않도록 사전 예외로 처리
+_KOREAN_SUFFIX_RULES = [
+    # 받침 뒤에만 오는 조사
+    ("이", True), ("은", True), ("을", True), ("과", True), ("이나", True), ("이랑", True),
+    ("이라고", True), ("이라는", True), ("이란", True), ("으로", True), ("으로는", True),
+    ("으로서", True), ("으로써", True), ("으로부터", True), ("이야", True), ("이에요", True),
+    ("이요", True), ("은요", True), ("과는", True),
+    # 받침 없는 글자 뒤에만 오는 조사
+    ("가", False), ("는", False), ("를", False), ("와", False), ("나", False), ("랑", False),
+    ("라고", False), ("라는", False), ("란", False), ("야", False), ("예요", False),
+    ("는요", False), ("와는", False),
+    # 받침과 무관한 조사/어미
+    ("로", None), ("로는", None), ("로서", None), ("로써", None), ("로부터", None),
+    ("의", None), ("에", None), ("에는", None), ("에도", None), ("에선", None), ("에서", None),
+    ("에서는", None), ("에서도", None), ("에게", None), ("에게서", None), ("한테", None), ("한테서", None),
+    ("께서", None), ("만", None), ("까지", None), ("부터", None), ("마저", None), ("조차", None),
+    ("밖에", None), ("처럼", None), ("보다", None), ("만큼", None), ("하고", None),
+    ("인가요", None), ("인가", None), ("인지", None), ("인데", None), ("입니다", None), ("이다", None),
+    ("이고", None), ("이며", None),
+    # 동사화 어미 ("추천해줘" → "추천", "좋아하는" → "좋아")
+    ("하는데", None), ("하는", None), ("했던", None), ("하던", None), ("하면", None), ("해서", None),
+    ("했어", None), ("했나요", None), ("합니까", None), ("할", None), ("해줘", None), ("해주세요", None),
+    ("해봐", None),
+]
+KOREAN_SUFFIXES = tuple(sorted(_KOREAN_SUFFIX_RULES, key=lambda rule: len(rule[0]), reverse=True))
+KOREAN_PARTICLES = frozenset(suffix for suffix, _ in _KOREAN_SUFFIX_RULES)
+
+# 조사처럼 보이는 글자로 끝나지만 하나의 명사인 단어
+KOREAN_NOUN_EXCEPTIONS = frozenset("""
+고양이 원숭이 호랑이 오징어 아이 어린이 나이 사이 길이 높이 넓이 깊이 거리 자리 머리 다리 소리 우리
+하루 이야기 주가 물가 평가 작가 국가 가수 휴가 대가 정가 원가 시가 단가 특가 유가 장르 바나나
+""".split())
+
+# 조사 "의"/"로"와 같은 글자로 끝나는 명사 어미 - 이 어미로 끝나는 토큰에서는 "의"/"로"를 떼지 않음
+# 예) "민주주의" → "민주주", "마이크로" → "마이크"가 되지 않도록 처리 ("회의로" → "회의"는 그대로 제거)
+KOREAN_NOUN_ENDINGS = {
+    "의": tuple("""
+주의 회의 정의 동의 강의 논의 합의 협의 건의 토의 예의 결의 심의 문의 편의 창의 모의 이의 고의 성의 민의
+""".split()),
+    "로": tuple("""
+마이크로 매크로 프로 메트로 인트로 고속도로 경로 진로 통로 회로 항로 선로 수로 미로 활주로 산책로 교차로
+""".split()),
+}
+
+# 조사 제거 후 남아야 하는 최소 어간 길이
+MIN_STEM_LENGTH = 2
+
+TOKEN_PATTERN = re.compile(r"[0-9]*[가-힣]+[0-9]*|[A-Za-z0-9][A-Za-z0-9+#.\-']*[A-Za-z0-9+#]|[A-Za-z0-9]")
+
+
+def _has_batchim(char: str) -> bool:
+    """한글 음절의 받침 여부"""
+    return "가" <= char <= "힣" and (ord(char) - 0xAC00) % 28 != 0
+
+
+class KeywordExtractor:
+    """LLM 호출 없이 한국어/영어 질의에서 검색 키워드를 추출하는 클래스"""
+    
+    def __init__(self, max_keywords: int = 6):
+        """
+        KeywordExtractor 초기화
+        
+        Args:
+            max_keywords: 반환할 최대 키워드 수 (기본값: 6)
+        """
+        self.max_keywords = max_keywords
+    
+    def strip_korean_suffix(self, token: str) -> str:
+        """
+        한국어 토큰에서 조사/어미를 제거합니다.
+        
+        Args:
+            token: 한글 토큰
+        
+        Returns:
+            조사가 제거된 어간 (어간이 너무 짧아지면 원래 토큰)
+        """
+        if token in KOREAN_NOUN_EXCEPTIONS:
+            return token
+        
+        for suffix, needs_batchim in KOREAN_SUFFIXES:
+            if not token.endswith(suffix) or len(token) - len(suffix) < MIN_STEM_LENGTH:
+                continue
+            if token.endswith(KOREAN_NOUN_ENDINGS.get(suffix, ())):
+                continue
+            stem = token[:-len(suffix)]
+            if needs_batchim is not None and _has_batchim(stem[-1]) != needs_batchim:
+                continue
+            return stem
+        return token
+    
+    def tokenize(self, text: str) -> List[str]:
+        """
+        텍스트를 정규화된 토큰 목록으로 변환합니다 (불용어 제거 전).
+        
+        Args:
+            text: 입력 텍스트
+        
+        Returns:
+            토큰 리스트
+        """
+        tokens = []
+        for match in TOKEN_PATTERN.finditer(text):
+            token = match.group()
+            if "가" <= token[-1] <= "힣":
+                token = self.strip_korean_suffix(token)
+            else:
+                token = token.lower()
+            tokens.append(token)
+        return tokens
+    
+    def _is_stopword(self, token: str) -> bool:
+        if token in KOREAN_STOPWORDS or token in KOREAN_PARTICLES:
+            return True
+        if token in ENGLISH_STOPWORDS or token in ENGLISH_QUERY_WORDS:
+            return True
+        # 한 글자 영문 토큰은 검색에 도움이 되지 않음 (한글 한 글자 명사와 숫자는 유지)
+        return len(token) < 2 and token.isascii() and not token.isdigit()
+    
+    def terms(self, text: str) -> List[str]:
+        """
+        불용어를 제외한 색인/검색용 토큰 목록 (등장 순서, 중복 포함)
+        
+        Args:
+            text: 입력 텍스트
+        
+        Returns:
+            토큰 리스트
+        """
+        return [token for token in self.tokenize(text) if not self._is_stopword(token)]
+    
+    def score(self, text: str) -> List[Tuple[str, float, int]]:
+        """
+        키워드 후보별 점수를 계산합니다.
+        점수 = 빈도 + 위치 가중치(앞쪽일수록 높음) + 길이 가중치
+        
+        Args:
+            text: 입력 텍스트
+        
+        Returns:
+            (키워드, 점수, 첫 등장 위치) 튜플 리스트
+        """
+        tokens = self.tokenize(text)
+        total = max(len(tokens), 1)
+        
+        candidates: Dict[str, List[float]] = {}
+        for position, token in enumerate(tokens):
+            if self._is_stopword(token):
+                continue
+            if token not in candidates:
+                candidates[token] = [0.0, float(position)]
+            candidates[token][0] += 1.0
+        
+        scored = []
+        for token, (freq, first_position) in candidates.items():
+            position_weight = 0.5 * (1.0 - first_position / total)
+            length_weight = min(len(token), 6) * 0.05
+            scored.append((token, freq + position_weight + length_weight, int(first_position)))
+        return scored
+    
+    def extract(self, text: str) -> List[str]:
+        """
+        주어진 텍스트에서 검색 키워드를 추출합니다.
+        상위 점수 키워드를 원문 등장 순서대로 반환하여 검색어 어순을 유지합니다.
+        
+        Args:
+            text: 키워드를 추출할 텍스트
+        
+        Returns:
+            추출된 키워드 리스트
+        """
+        scored = self.score(text)
+        if not scored:
+            return text.split()
+        
+        top = sorted(scored, key=lambda item: item[1], reverse=True)[:self.max_keywords]
+        return [token for token, _, _ in sorted(top, key=lambda item: item[2])]
+
+
+# 프로세스 시작 시 한 번만 생성되는 기본 추출기
+default_extractor = KeywordExtractor()
+
+
+def extract_keywords(text: str) -> List[str]:
+    """기본 추출기로 키워드 추출"""
+    return default_extractor.extract(text)
+
+
+def main():
+    """CLI 인터페이스로 키워드 추출"""
+    parser = argparse.ArgumentParser(description="로컬 키워드 추출 CLI")
+    parser.add_argument('text', help='키워드를 추출할 텍스트')
+    parser.add_argument('--scores', action='store_true', help='후보별 점수를 JSON으로 출력')
+    
+    args = parser.parse_args()
+    
+    if args.scores:
+        scored = default_extractor.score(args.text)
+        print(json.dumps([{"keyword": k, "score": round(s, 3)} for k, s, _ in scored], ensure_ascii=False, indent=2))
+    else:
+        print(" ".join(extract_keywords(args.text)))
+
+if __name__ == "__main__":
+    main()
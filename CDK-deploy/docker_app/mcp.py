@@ -2,9 +2,17 @@
 import os
 import json
 import sys
+import time
+import asyncio
+import functools
+import argparse
 import importlib
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, List, Optional
 
+from tool_cache import ToolResultCache
+from tool_schemas import SERVICE_TOOLS, STATS_TOOL, BATCH_TOOL, get_tool_names
+
 # MCP SDK 임포트
 try:
     from modelcontextprotocol.sdk.server import Server
@@ -19,6 +27,16 @@ except ImportError:
     print("MCP SDK가 설치되어 있지 않습니다. pip install modelcontextprotocol을 실행하세요.", file=sys.stderr)
     sys.exit(1)
 
+# 블로킹 도구의 기본 실행 제한 - 도구 이름: {동시 실행 수, 시간 초과(초)}
+# 여기에 없는 도구(날짜/시간 등)는 이벤트 루프에서 바로 실행
+DEFAULT_TOOL_LIMITS = {
+    "search": {"concurrency": 4, "timeout": 20},
+    "extract_keywords": {"concurrency": 8, "timeout": 15}
+}
+
+# batch 도구 한 번에 허용하는 최대 호출 수
+MAX_BATCH_CALLS = 16
+
 class MCPServer:
     """통합 MCP 서버 클래스"""
     
@@ -26,18 +44,29 @@ class MCPServer:
         # 기본 설정
         self.config = config or {}
         
-        # MCP 서버 설정
-        self.server = Server(
-            {
-                "name": "unified-mcp-server",
-                "version": "1.0.0",
-            },
-            {
-                "capabilities": {
-                    "tools": {},
-                },
-            }
+        # 블로킹 도구 실행기 - 설정 파일의 tool_limits로 도구별 제한을 덮어쓸 수 있음
+        self.tool_limits = {name: dict(limit) for name, limit in DEFAULT_TOOL_LIMITS.items()}
+        for tool_name, limit in self.config.get("tool_limits", {}).items():
+            self.tool_limits[tool_name] = {**self.tool_limits.get(tool_name, {"concurrency": 4, "timeout": 30}), **limit}
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.config.get("max_workers", 8),
+            thread_name_prefix="mcp-tool"
         )
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._tool_stats: Dict[str, Dict[str, Any]] = {}
+        
+        # 도구 결과 캐시 - 설정 파일의 tool_cache에 정책이 선언된 도구만 캐시
+        self.tool_cache = ToolResultCache(self.config.get("tool_cache", {}))
+        
+        # MCP 서버 설정 (HTTP 전송의 initialize 응답에도 같은 정보 사용)
+        self.server_info = {
+            "name": "unified-mcp-server",
+            "version": "1.0.0",
+        }
+        self.capabilities = {
+            "tools": {},
+        }
+        self.server = Server(self.server_info, {"capabilities": self.capabilities})
         
         # 서비스 컨테이너 - 각 서비스의 인스턴스를 저장
         self.services = {}
@@ -61,6 +90,7 @@ class MCPServer:
     def _handle_sigint(self, sig, frame):
         """Ctrl+C 처리"""
         print("\n서버를 종료합니다...", file=sys.stderr)
+        self._executor.shutdown(wait=False)
         self.server.close()
         sys.exit(0)
     
@@ -76,8 +106,8 @@ class MCPServer:
             },
             {
                 "name": "search",
-                "module": "google_search_mcp_server", 
-                "class": "GoogleSearchServer",
+                "module": "search_dispatcher", 
+                "class": "SearchDispatcher",
                 "params": {"max_results": 5}
             }
         ])
@@ -109,15 +139,8 @@ class MCPServer:
                 print(f"서비스 '{service_config.get('name', '알 수 없음')}' 로드 실패: {str(e)}", file=sys.stderr)
     
     def _get_service_tools(self, service_name: str, service_instance: Any) -> List[str]:
-        """서비스가 제공하는 도구 이름 목록 반환"""
-        # 날짜/시간 서비스 도구
-        if service_name == "datetime":
-            return ["get_current_time", "get_current_date", "get_datetime_info"]
-        # 검색 서비스 도구
-        elif service_name == "search":
-            return ["search", "extract_keywords"]
-        # 기타 서비스는 빈 목록 반환 (확장 가능)
-        return []
+        """서비스가 제공하는 도구 이름 목록 반환 (tool_schemas.py에 정의되지 않은 서비스는 빈 목록)"""
+        return get_tool_names(service_name)
     
     def setup_tool_handlers(self):
         """MCP 도구 핸들러 설정"""
@@ -132,84 +155,28 @@ class MCPServer:
         """사용 가능한 모든 도구 목록 반환"""
         tools = []
         
-        # 날짜/시간 서비스 도구
-        if "datetime" in self.services:
-            tools.extend([
-                {
-                    "name": "get_current_time",
-                    "description": "현재 시간 정보를 반환합니다",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {},
-                        "required": []
-                    }
-                },
-                {
-                    "name": "get_current_date",
-                    "description": "현재 날짜 정보를 반환합니다",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {},
-                        "required": []
-                    }
-                },
-                {
-                    "name": "get_datetime_info",
-                    "description": "현재 날짜와 시간의 종합 정보를 반환합니다",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {},
-                        "required": []
-                    }
-                }
-            ])
-        
-        # 검색 서비스 도구
-        if "search" in self.services:
-            tools.extend([
-                {
-                    "name": "search",
-                    "description": "웹 검색을 수행합니다",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {
-                            "query": {
-                                "type": "string",
-                                "description": "검색 쿼리"
-                            },
-                            "max_results": {
-                                "type": "integer",
-                                "description": "최대 결과 수 (기본값: 5)",
-                                "default": 5
-                            }
-                        },
-                        "required": ["query"]
-                    }
-                },
-                {
-                    "name": "extract_keywords",
-                    "description": "텍스트에서 중요 키워드를 추출합니다",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {
-                            "text": {
-                                "type": "string",
-                                "description": "키워드를 추출할 텍스트"
-                            }
-                        },
-                        "required": ["text"]
-                    }
-                }
-            ])
-        
-        # 여기에 추가 서비스의 도구 정의를 추가할 수 있습니다
+        # 로드된 서비스의 도구 (스키마는 tool_schemas.py에 정의)
+        for service_name in self.services:
+            tools.extend(SERVICE_TOOLS.get(service_name, []))
+        
+        # 서버 도구 (서비스와 무관하게 항상 제공)
+        tools.append(STATS_TOOL)
+        tools.append(BATCH_TOOL)
         
         return {"tools": tools}
     
     async def _handle_call_tool(self, request):
-        """도구 호출 처리 - 적절한 서비스로 라우팅"""
-        tool_name = request.params.name
-        args = request.params.arguments
+        """도구 호출 처리 - 적절한 서비스로 라우팅 (블로킹 도구는 실행기에서 실행)"""
+        return await self._call_tool(request.params.name, request.params.arguments)
+    
+    async def _call_tool(self, tool_name: str, args: Dict[str, Any]) -> Dict[str, Any]:
+        """도구 하나 실행 (tools/call과 batch 항목이 공유)"""
+        if tool_name == "batch":
+            return await self._handle_batch(args)
+        
+        if tool_name == "get_mcp_stats":
+            stats = {"tools": self.get_stats(), "cache": self.tool_cache.get_stats()}
+            return self._tool_result(json.dumps(stats, ensure_ascii=False, indent=2), stats)
         
         # 도구 이름으로 서비스 찾기
         service_name = self.tool_mapping.get(tool_name)
@@ -219,6 +186,167 @@ class MCPServer:
                 f"알 수 없는 도구: {tool_name}"
             )
         
+        # 캐시 정책이 있는 도구는 캐시를 먼저 확인하고, 미스일 때만 실행
+        return await self.tool_cache.call(
+            tool_name, args,
+            lambda: self._run_tool(tool_name, self._execute_tool, service_name, tool_name, args)
+        )
+    
+    async def _handle_batch(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        여러 도구 호출을 동시에 실행하고 한 번의 응답으로 반환 (항목별 결과/오류/소요 시간 포함)
+        
+        Args:
+            args: {"calls": [{"tool": 도구 이름, "arguments": 인자}, ...]}
+            
+        Returns:
+            MCP 도구 응답 (structuredContent.results는 요청 순서와 같음)
+        """
+        calls = args.get("calls") if isinstance(args, dict) else None
+        if not isinstance(calls, list) or not calls:
+            raise McpError(
+                ErrorCode.InvalidParams,
+                "호출 목록이 제공되지 않았습니다"
+            )
+        if len(calls) > MAX_BATCH_CALLS:
+            raise McpError(
+                ErrorCode.InvalidParams,
+                f"한 번에 최대 {MAX_BATCH_CALLS}개까지 호출할 수 있습니다"
+            )
+        
+        async def run_item(call: Dict[str, Any]) -> Dict[str, Any]:
+            start = time.perf_counter()
+            tool_name = call.get("tool") if isinstance(call, dict) else None
+            item = {"tool": tool_name}
+            try:
+                if not tool_name or tool_name == "batch":
+                    raise McpError(
+                        ErrorCode.InvalidParams,
+                        f"batch에서 호출할 수 없는 도구: {tool_name}"
+                    )
+                result = await self._call_tool(tool_name, call.get("arguments") or {})
+                item.update({
+                    "ok": True,
+                    "text": "\n".join(content.get("text", "") for content in result.get("content", [])),
+                    "data": result.get("structuredContent")
+                })
+            except Exception as e:
+                item.update({"ok": False, "error": {"code": getattr(e, "code", ErrorCode.InternalError), "message": str(e)}})
+            item["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 1)
+            return item
+        
+        start = time.perf_counter()
+        results = await asyncio.gather(*[run_item(call) for call in calls])
+        summary = {
+            "results": results,
+            "failed": sum(not item["ok"] for item in results),
+            "elapsed_ms": round((time.perf_counter() - start) * 1000, 1)
+        }
+        text = "\n\n".join(
+            f"[{index}] {item['tool']} ({item['elapsed_ms']:.0f} ms)\n" + (item["text"] if item["ok"] else f"오류: {item['error']['message']}")
+            for index, item in enumerate(results, 1)
+        )
+        return self._tool_result(text, summary)
+    
+    def _get_semaphore(self, tool_name: str) -> asyncio.Semaphore:
+        """도구별 동시 실행 제한 세마포어 (실행 중인 이벤트 루프에서 지연 생성)"""
+        semaphore = self._semaphores.get(tool_name)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.tool_limits[tool_name]["concurrency"])
+            self._semaphores[tool_name] = semaphore
+        return semaphore
+    
+    async def _run_tool(self, tool_name: str, fn, *args) -> Any:
+        """
+        도구 함수 실행
+        실행 제한이 설정된 도구는 제한된 스레드 풀에서 실행하여 이벤트 루프를 막지 않고,
+        설정이 없는 도구(날짜/시간 등 즉시 끝나는 도구)는 바로 실행합니다.
+        
+        Args:
+            tool_name: 도구 이름
+            fn: 실행할 동기 함수
+            
+        Returns:
+            함수 실행 결과
+        """
+        limit = self.tool_limits.get(tool_name)
+        stats = self._tool_stats.setdefault(tool_name, {
+            "calls": 0, "in_flight": 0, "max_in_flight": 0, "queued": 0, "timeouts": 0, "errors": 0, "total_ms": 0.0
+        })
+        stats["calls"] += 1
+        
+        if limit is None:
+            try:
+                return fn(*args)
+            except Exception:
+                stats["errors"] += 1
+                raise
+        
+        semaphore = self._get_semaphore(tool_name)
+        if semaphore.locked():
+            stats["queued"] += 1
+        await semaphore.acquire()
+        
+        stats["in_flight"] += 1
+        stats["max_in_flight"] = max(stats["max_in_flight"], stats["in_flight"])
+        start = time.perf_counter()
+        
+        def release(_):
+            # 시간 초과 후에도 스레드가 끝날 때까지 슬롯을 점유하여 동시 실행 수 제한 유지
+            stats["in_flight"] -= 1
+            stats["total_ms"] += (time.perf_counter() - start) * 1000
+            semaphore.release()
+        
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._executor, functools.partial(fn, *args))
+        future.add_done_callback(release)
+        
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout=limit["timeout"])
+        except asyncio.TimeoutError:
+            stats["timeouts"] += 1
+            raise McpError(
+                ErrorCode.InternalError,
+                f"도구 '{tool_name}' 실행 시간 초과 ({limit['timeout']}초)"
+            )
+        except Exception:
+            # _execute_tool이 도구 오류를 McpError로 감싸므로 McpError도 오류로 집계 (시간 초과는 위에서 따로 집계)
+            stats["errors"] += 1
+            raise
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        도구별 실행 통계 반환
+        
+        Returns:
+            도구 이름별 호출 수, 최대 동시 실행 수, 대기/시간 초과 횟수, 평균 실행 시간
+        """
+        stats = {}
+        for tool_name, tool_stats in self._tool_stats.items():
+            completed = tool_stats["calls"] - tool_stats["in_flight"]
+            stats[tool_name] = {
+                **{key: value for key, value in tool_stats.items() if key != "total_ms"},
+                "avg_ms": round(tool_stats["total_ms"] / completed, 1) if completed and tool_name in self.tool_limits else None,
+                "limit": self.tool_limits.get(tool_name)
+            }
+        return stats
+    
+    @staticmethod
+    def _tool_result(text: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        도구 응답 생성 - 사람이 읽는 텍스트와 함께 클라이언트가 그대로 쓸 수 있는 구조화된 결과 포함
+        
+        Args:
+            text: 포맷팅된 결과 텍스트
+            data: 구조화된 결과 (JSON 직렬화 가능)
+            
+        Returns:
+            MCP 도구 응답 딕셔너리
+        """
+        return {"content": [{"type": "text", "text": text}], "structuredContent": data}
+    
+    def _execute_tool(self, service_name: str, tool_name: str, args: Dict[str, Any]) -> Dict[str, Any]:
+        """도구 실행 (동기) - 서비스별 도구 처리 후 MCP 응답 형식으로 반환"""
         # 적절한 서비스 인스턴스 가져오기
         service = self.services[service_name]
         
@@ -228,17 +356,53 @@ class MCPServer:
                 if tool_name == "get_current_time":
                     result = service.get_current_time()
                     formatted_result = service.format_time(result)
-                    return {"content": [{"type": "text", "text": formatted_result}]}
+                    return self._tool_result(formatted_result, result)
                 
                 elif tool_name == "get_current_date":
                     result = service.get_current_date()
                     formatted_result = service.format_date(result)
-                    return {"content": [{"type": "text", "text": formatted_result}]}
+                    return self._tool_result(formatted_result, result)
                 
                 elif tool_name == "get_datetime_info":
                     result = service.get_datetime_info()
                     formatted_result = service.format_datetime_info(result)
-                    return {"content": [{"type": "text", "text": formatted_result}]}
+                    return self._tool_result(formatted_result, result)
+                
+                elif tool_name == "get_datetime_info_many":
+                    if not isinstance(args, dict) or not isinstance(args.get("timezones"), list) or not args["timezones"]:
+                        raise McpError(
+                            ErrorCode.InvalidParams,
+                            "시간대 목록이 제공되지 않았습니다"
+                        )
+                    
+                    result = service.get_datetime_info_many(args["timezones"])
+                    formatted_result = service.format_datetime_info_many(result)
+                    return self._tool_result(formatted_result, result)
+                
+                elif tool_name == "calculate_time_difference":
+                    if not isinstance(args, dict) or "from_date" not in args:
+                        raise McpError(
+                            ErrorCode.InvalidParams,
+                            "시작 날짜가 제공되지 않았습니다"
+                        )
+                    
+                    result = service.calculate_time_difference(args["from_date"], args.get("to_date"))
+                    formatted_result = service.format_time_difference(result)
+                    return self._tool_result(formatted_result, result)
+                
+                elif tool_name == "resolve_datetime_expression":
+                    if not isinstance(args, dict) or "text" not in args:
+                        raise McpError(
+                            ErrorCode.InvalidParams,
+                            "해석할 텍스트가 제공되지 않았습니다"
+                        )
+                    
+                    resolution = service.resolve_expression(args["text"])
+                    if resolution is None:
+                        formatted_result = "날짜/시간 표현을 찾을 수 없습니다."
+                    else:
+                        formatted_result = service.format_resolution(resolution)
+                    return self._tool_result(formatted_result, {"resolution": resolution})
             
             # 검색 서비스 도구 처리
             elif service_name == "search":
@@ -252,10 +416,12 @@ class MCPServer:
                     query = args["query"]
                     max_results = args.get("max_results", 5)
                     
-                    results = service.search(query)
+                    results = service.search(query, max_results=max_results)
                     formatted_results = service.format_results(results)
                     
-                    return {"content": [{"type": "text", "text": formatted_results}]}
+                    # 검색 오류는 일반 결과 형식으로 반환되므로 표시하여 캐시가 짧은 부정 TTL로 저장하도록 함
+                    from search_dispatcher import is_error_results
+                    return self._tool_result(formatted_results, {"results": results, "error": is_error_results(results)})
                 
                 elif tool_name == "extract_keywords":
                     if not isinstance(args, dict) or "text" not in args:
@@ -267,11 +433,7 @@ class MCPServer:
                     text = args["text"]
                     keywords = service.extract_keywords(text)
                     
-                    return {
-                        "content": [
-                            {"type": "text", "text": f"추출된 키워드: {', '.join(keywords)}"}
-                        ]
-                    }
+                    return self._tool_result(f"추출된 키워드: {', '.join(keywords)}", {"keywords": keywords})
             
             # 여기에 추가 서비스의 도구 처리 로직을 추가할 수 있습니다
             
@@ -288,8 +450,20 @@ class MCPServer:
                 f"도구 실행 중 오류 발생: {str(e)}"
             )
     
-    async def run(self):
-        """MCP 서버 실행"""
+    async def run(self, transport: str = "stdio", host: str = "127.0.0.1", port: int = 8765):
+        """
+        MCP 서버 실행
+        
+        Args:
+            transport: 전송 방식 ("stdio" 또는 "http")
+            host: HTTP 바인딩 주소
+            port: HTTP 포트
+        """
+        if transport == "http":
+            from mcp_http import MCPHttpTransport
+            await MCPHttpTransport(self, host=host, port=port).serve()
+            return
+        
         transport = StdioServerTransport()
         await self.server.connect(transport)
         print("통합 MCP 서버가 stdio에서 실행 중입니다.", file=sys.stderr)
@@ -297,7 +471,13 @@ class MCPServer:
 
 def main():
     """메인 함수"""
-    import asyncio
+    parser = argparse.ArgumentParser(description="통합 MCP 서버")
+    parser.add_argument('--transport', choices=['stdio', 'http'], default=os.environ.get("MCP_TRANSPORT", "stdio"),
+                        help='전송 방식 (기본값: stdio, MCP_TRANSPORT 환경 변수)')
+    parser.add_argument('--host', default=os.environ.get("MCP_HOST", "127.0.0.1"), help='HTTP 바인딩 주소 (기본값: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=int(os.environ.get("MCP_PORT", "8765")), help='HTTP 포트 (기본값: 8765)')
+    
+    args = parser.parse_args()
     
     # 설정 파일 로드 (있는 경우)
     config = {}
@@ -312,7 +492,7 @@ def main():
     server = MCPServer(config)
     
     try:
-        asyncio.run(server.run())
+        asyncio.run(server.run(args.transport, args.host, args.port))
     except KeyboardInterrupt:
         print("\n서버를 종료합니다...", file=sys.stderr)
         sys.exit(0)
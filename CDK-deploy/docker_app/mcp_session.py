@@ -0,0 +1,490 @@
+#!/usr/bin/env python
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+import subprocess
+from abc import ABC, abstractmethod
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Dict, Any, List, Optional, Tuple
+
+# 클라이언트가 요청하는 MCP 프로토콜 버전
+PROTOCOL_VERSION = "2024-11-05"
+
+
+class MCPRemoteError(Exception):
+    """MCP 서버가 반환한 JSON-RPC 오류 또는 도구 실행 오류"""
+    
+    def __init__(self, code: int, message: str, data: Any = None):
+        super().__init__(f"[{code}] {message}")
+        self.code = code
+        self.message = message
+        self.data = data
+
+
+class MCPSessionBase(ABC):
+    """MCP 세션 공통 도구 호출 인터페이스 - 하위 클래스는 request()로 Future를 반환"""
+    
+    request_timeout: float = 60.0
+    
+    @abstractmethod
+    def request(self, method: str, params: Optional[Dict[str, Any]] = None) -> Future:
+        """요청을 보내고 응답 result를 담을 Future 반환 (전송 방식별로 구현)"""
+    
+    def call_tool_async(self, name: str, arguments: Optional[Dict[str, Any]] = None) -> Future:
+        """
+        도구 호출을 보내고 Future를 반환합니다.
+        
+        Args:
+            name: 도구 이름
+            arguments: 도구 인자
+        
+        Returns:
+            도구 결과(result)를 담을 Future
+        """
+        return self.request("tools/call", {"name": name, "arguments": arguments or {}})
+    
+    def call_tool(self, name: str, arguments: Optional[Dict[str, Any]] = None,
+                  timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        도구를 호출하고 결과를 기다립니다.
+        
+        Args:
+            name: 도구 이름
+            arguments: 도구 인자
+            timeout: 응답 대기 시간(초) (기본값: request_timeout)
+        
+        Returns:
+            도구 결과 (content, structuredContent 등)
+        """
+        return self._result(self.call_tool_async(name, arguments), timeout)
+    
+    def call_many(self, calls: List[Tuple[str, Dict[str, Any]]], timeout: Optional[float] = None) -> List[Any]:
+        """
+        여러 도구 호출을 한 번에 보내고 (파이프라이닝) 요청 순서대로 결과를 반환합니다.
+        
+        Args:
+            calls: (도구 이름, 인자) 리스트
+            timeout: 전체 응답 대기 시간(초) (기본값: request_timeout)
+        
+        Returns:
+            결과 리스트 (실패한 호출은 해당 위치에 예외 객체)
+        """
+        futures = [self.call_tool_async(name, arguments) for name, arguments in calls]
+        deadline = time.monotonic() + (timeout or self.request_timeout)
+        results = []
+        for future in futures:
+            try:
+                results.append(self._result(future, max(deadline - time.monotonic(), 0)))
+            except Exception as e:
+                results.append(e)
+        return results
+    
+    def _result(self, future: Future, timeout: Optional[float]) -> Dict[str, Any]:
+        """Future 결과 대기 - 도구가 isError 결과를 반환하면 예외로 변환"""
+        try:
+            result = future.result(timeout=timeout if timeout is not None else self.request_timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise TimeoutError("MCP 서버 응답 시간 초과")
+        if isinstance(result, dict) and result.get("isError"):
+            text = " ".join(item.get("text", "") for item in result.get("content", []))
+            raise MCPRemoteError(-32603, text or "도구 실행 오류")
+        return result
+    
+    def list_tools(self, timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """서버가 제공하는 도구 목록"""
+        return self._result(self.request("tools/list", {}), timeout).get("tools", [])
+
+
+class MCPStdioSession(MCPSessionBase):
+    """MCP 서버 프로세스와 stdio로 연결된 영속 JSON-RPC 세션 (요청 ID로 다중화, 파이프라이닝 지원)"""
+    
+    def __init__(self, command: List[str], env: Optional[Dict[str, str]] = None,
+                 cwd: Optional[str] = None, request_timeout: float = 60.0):
+        """
+        MCPStdioSession 초기화
+        
+        Args:
+            command: 서버 실행 명령 (예: [sys.executable, "mcp.py"])
+            env: 서버 프로세스 환경 변수
+            cwd: 서버 프로세스 작업 디렉터리
+            request_timeout: 요청별 기본 응답 대기 시간(초)
+        """
+        self.command = command
+        self.env = env
+        self.cwd = cwd
+        self.request_timeout = request_timeout
+        self.server_info: Dict[str, Any] = {}
+        
+        self._process: Optional[subprocess.Popen] = None
+        self._write_lock = threading.Lock()
+        self._pending_lock = threading.Lock()
+        self._pending: Dict[int, Tuple[Future, float]] = {}
+        self._next_id = 0
+        self._closed = False
+        self._stats = {"requests": 0, "responses": 0, "errors": 0, "max_in_flight": 0, "total_ms": 0.0}
+    
+    @property
+    def alive(self) -> bool:
+        """서버 프로세스가 실행 중이고 세션이 열려 있는지 여부"""
+        return not self._closed and self._process is not None and self._process.poll() is None
+    
+    def start(self, timeout: float = 15.0) -> Dict[str, Any]:
+        """
+        서버 프로세스를 시작하고 initialize 핸드셰이크를 수행합니다.
+        고정 대기 대신 서버가 initialize에 응답하는 시점을 준비 완료로 봅니다.
+        
+        Args:
+            timeout: 핸드셰이크 대기 시간(초)
+        
+        Returns:
+            서버의 initialize 응답 (serverInfo, capabilities 등)
+        """
+        self._process = subprocess.Popen(
+            self.command,
+            env=self.env,
+            cwd=self.cwd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=None,  # 서버 로그는 부모 프로세스의 stderr로 그대로 출력
+            universal_newlines=True,
+            encoding="utf-8",
+            bufsize=1
+        )
+        threading.Thread(target=self._read_loop, name="mcp-session-reader", daemon=True).start()
+        
+        try:
+            self.server_info = self.request("initialize", {
+                "protocolVersion": PROTOCOL_VERSION,
+                "capabilities": {},
+                "clientInfo": {"name": "unified-mcp-client", "version": "1.0.0"}
+            }).result(timeout=timeout)
+        except Exception:
+            self.close()
+            raise
+        
+        self.notify("notifications/initialized", {})
+        return self.server_info
+    
+    def _send(self, message: Dict[str, Any]):
+        """JSON-RPC 메시지 한 줄 전송"""
+        if not self.alive:
+            raise ConnectionError("MCP 서버 세션이 종료되었습니다.")
+        line = json.dumps(message, ensure_ascii=False) + "\n"
+        with self._write_lock:
+            self._process.stdin.write(line)
+            self._process.stdin.flush()
+    
+    def request(self, method: str, params: Optional[Dict[str, Any]] = None) -> Future:
+        """
+        요청을 보내고 응답을 기다리지 않고 Future를 반환합니다 (파이프라이닝).
+        
+        Args:
+            method: JSON-RPC 메서드 이름
+            params: 요청 파라미터
+        
+        Returns:
+            응답 result를 담을 Future (오류 응답이면 MCPRemoteError)
+        """
+        future: Future = Future()
+        with self._pending_lock:
+            self._next_id += 1
+            request_id = self._next_id
+            self._pending[request_id] = (future, time.perf_counter())
+            self._stats["requests"] += 1
+            self._stats["max_in_flight"] = max(self._stats["max_in_flight"], len(self._pending))
+        # 응답, 전송 실패, 시간 초과 취소 중 어느 쪽으로 끝나도 대기 목록에서 제거
+        future.add_done_callback(lambda _, request_id=request_id: self._forget(request_id))
+        
+        try:
+            self._send({"jsonrpc": "2.0", "id": request_id, "method": method, "params": params or {}})
+        except Exception as e:
+            future.set_exception(e)
+        return future
+    
+    def _forget(self, request_id: int):
+        """완료된 요청을 대기 목록에서 제거 (늦게 도착한 응답은 읽기 루프에서 무시)"""
+        with self._pending_lock:
+            self._pending.pop(request_id, None)
+    
+    def notify(self, method: str, params: Optional[Dict[str, Any]] = None):
+        """응답이 없는 알림 전송"""
+        self._send({"jsonrpc": "2.0", "method": method, "params": params or {}})
+    
+    def _read_loop(self):
+        """서버 출력을 읽어 요청 ID별 Future에 결과 전달"""
+        try:
+            for line in self._process.stdout:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    print(f"MCP 서버 출력 파싱 실패: {line[:200]}", file=sys.stderr)
+                    continue
+                
+                if "method" in message:
+                    # 서버 → 클라이언트 요청(ping 등)에는 빈 결과로 응답, 알림은 무시
+                    if "id" in message:
+                        self._send({"jsonrpc": "2.0", "id": message["id"], "result": {}})
+                    continue
+                
+                with self._pending_lock:
+                    entry = self._pending.pop(message.get("id"), None)
+                if entry is None:
+                    continue
+                
+                future, sent_at = entry
+                if future.done():
+                    # 응답 대기 시간 초과로 이미 취소된 요청
+                    continue
+                with self._pending_lock:
+                    self._stats["responses"] += 1
+                    self._stats["total_ms"] += (time.perf_counter() - sent_at) * 1000
+                
+                if "error" in message:
+                    error = message["error"]
+                    with self._pending_lock:
+                        self._stats["errors"] += 1
+                    future.set_exception(MCPRemoteError(error.get("code", -32603), error.get("message", ""), error.get("data")))
+                else:
+                    future.set_result(message.get("result"))
+        except Exception as e:
+            print(f"MCP 세션 읽기 오류: {str(e)}", file=sys.stderr)
+        finally:
+            self._fail_pending(ConnectionError("MCP 서버 연결이 끊어졌습니다."))
+    
+    def _fail_pending(self, error: Exception):
+        """응답을 기다리는 모든 요청을 실패 처리"""
+        with self._pending_lock:
+            pending, self._pending = self._pending, {}
+        for future, _ in pending.values():
+            if not future.done():
+                future.set_exception(error)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """세션 통계 반환"""
+        with self._pending_lock:
+            stats = dict(self._stats)
+            stats["in_flight"] = len(self._pending)
+        stats["avg_ms"] = round(stats.pop("total_ms") / stats["responses"], 1) if stats["responses"] else 0.0
+        stats["alive"] = self.alive
+        return stats
+    
+    def close(self, timeout: float = 5.0):
+        """세션 종료 - stdin을 닫아 서버가 정상 종료하도록 하고, 응답이 없으면 강제 종료"""
+        if self._closed:
+            return
+        self._closed = True
+        process = self._process
+        if process is None:
+            return
+        
+        try:
+            process.stdin.close()
+        except Exception:
+            pass
+        try:
+            process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            process.terminate()
+            try:
+                process.wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        self._fail_pending(ConnectionError("MCP 서버 세션이 종료되었습니다."))
+
+
+class MCPHttpSession(MCPSessionBase):
+    """HTTP로 원격 MCP 도구 서버(mcp.py --transport http)에 연결하는 세션 (연결 재사용, 동시 요청 지원)"""
+    
+    def __init__(self, url: str, request_timeout: float = 60.0, max_workers: int = 8):
+        """
+        MCPHttpSession 초기화
+        
+        Args:
+            url: JSON-RPC 엔드포인트 URL (예: http://localhost:8765/mcp)
+            request_timeout: 요청별 기본 응답 대기 시간(초)
+            max_workers: 동시에 보낼 수 있는 요청 수
+        """
+        self.url = url
+        self.request_timeout = request_timeout
+        self.server_info: Dict[str, Any] = {}
+        self.session_id: Optional[str] = None
+        
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="mcp-http")
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._next_id = 0
+        self._in_flight = 0
+        self._closed = False
+        self._connected = False
+        self._stats = {"requests": 0, "responses": 0, "errors": 0, "max_in_flight": 0, "total_ms": 0.0}
+    
+    @property
+    def alive(self) -> bool:
+        """initialize가 끝났고 세션이 열려 있는지 여부 (서버 상태는 요청 시 확인)"""
+        return self._connected and not self._closed
+    
+    def _http(self):
+        """스레드별 requests 세션 (keep-alive 연결 재사용)"""
+        http = getattr(self._local, "http", None)
+        if http is None:
+            import requests
+            http = requests.Session()
+            self._local.http = http
+        return http
+    
+    def _post(self, message: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """JSON-RPC 메시지 하나를 POST하고 응답 반환 (알림이면 None)"""
+        headers = {"Accept": "application/json"}
+        if self.session_id:
+            headers["Mcp-Session-Id"] = self.session_id
+        response = self._http().post(self.url, json=message, headers=headers, timeout=self.request_timeout)
+        if "Mcp-Session-Id" in response.headers and self.session_id is None:
+            self.session_id = response.headers["Mcp-Session-Id"]
+        if response.status_code == 202 or not response.content:
+            return None
+        try:
+            return response.json()
+        except ValueError:
+            response.raise_for_status()
+            raise
+    
+    def _call(self, method: str, params: Dict[str, Any], request_id: int) -> Any:
+        """요청 스레드에서 실행 - 응답의 error는 MCPRemoteError로 변환"""
+        start = time.perf_counter()
+        try:
+            message = self._post({"jsonrpc": "2.0", "id": request_id, "method": method, "params": params})
+            if message is None:
+                raise MCPRemoteError(-32603, "MCP 서버 응답이 비어 있습니다.")
+            if "error" in message:
+                error = message["error"]
+                raise MCPRemoteError(error.get("code", -32603), error.get("message", ""), error.get("data"))
+            with self._lock:
+                self._stats["responses"] += 1
+                self._stats["total_ms"] += (time.perf_counter() - start) * 1000
+            return message.get("result")
+        except Exception:
+            with self._lock:
+                self._stats["errors"] += 1
+            raise
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+    
+    def request(self, method: str, params: Optional[Dict[str, Any]] = None) -> Future:
+        """
+        요청을 실행기에 넘기고 Future를 반환합니다 (여러 요청을 동시에 보낼 수 있음).
+        
+        Args:
+            method: JSON-RPC 메서드 이름
+            params: 요청 파라미터
+        
+        Returns:
+            응답 result를 담을 Future (오류 응답이면 MCPRemoteError)
+        """
+        with self._lock:
+            self._next_id += 1
+            request_id = self._next_id
+            self._in_flight += 1
+            self._stats["requests"] += 1
+            self._stats["max_in_flight"] = max(self._stats["max_in_flight"], self._in_flight)
+        
+        if self._closed:
+            with self._lock:
+                self._in_flight -= 1
+            future: Future = Future()
+            future.set_exception(ConnectionError("MCP 서버 세션이 종료되었습니다."))
+            return future
+        return self._executor.submit(self._call, method, params or {}, request_id)
+    
+    def notify(self, method: str, params: Optional[Dict[str, Any]] = None):
+        """응답이 없는 알림 전송"""
+        self._post({"jsonrpc": "2.0", "method": method, "params": params or {}})
+    
+    def start(self, timeout: float = 15.0) -> Dict[str, Any]:
+        """
+        initialize 핸드셰이크로 서버 준비 상태를 확인하고 세션 ID를 받습니다.
+        
+        Args:
+            timeout: 핸드셰이크 대기 시간(초)
+        
+        Returns:
+            서버의 initialize 응답 (serverInfo, capabilities 등)
+        """
+        self.server_info = self._result(self.request("initialize", {
+            "protocolVersion": PROTOCOL_VERSION,
+            "capabilities": {},
+            "clientInfo": {"name": "unified-mcp-client", "version": "1.0.0"}
+        }), timeout)
+        self.notify("notifications/initialized", {})
+        self._connected = True
+        return self.server_info
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """세션 통계 반환"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["in_flight"] = self._in_flight
+        stats["avg_ms"] = round(stats.pop("total_ms") / stats["responses"], 1) if stats["responses"] else 0.0
+        stats["alive"] = self.alive
+        stats["url"] = self.url
+        return stats
+    
+    def close(self, timeout: float = 5.0):
+        """세션 종료 - 서버에 세션 종료를 알리고 실행기 정리"""
+        if self._closed:
+            return
+        self._closed = True
+        if self.session_id:
+            try:
+                self._http().delete(self.url, headers={"Mcp-Session-Id": self.session_id}, timeout=timeout)
+            except Exception:
+                pass
+        self._executor.shutdown(wait=False)
+
+
+def main():
+    """CLI 인터페이스로 MCP 서버 도구 호출"""
+    parser = argparse.ArgumentParser(description="MCP stdio 세션 CLI")
+    parser.add_argument('tool', nargs='?', help='호출할 도구 이름 (생략하면 도구 목록 출력)')
+    parser.add_argument('--args', default='{}', help='도구 인자 (JSON)')
+    parser.add_argument('--repeat', type=int, default=1, help='같은 호출을 파이프라이닝으로 반복할 횟수')
+    parser.add_argument('--url', default=os.environ.get("MCP_SERVER_URL"),
+                        help='HTTP 도구 서버 URL (예: http://localhost:8765/mcp, 생략하면 mcp.py를 stdio로 실행)')
+    
+    args = parser.parse_args()
+    
+    if args.url:
+        session = MCPHttpSession(args.url)
+    else:
+        script_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "mcp.py")
+        session = MCPStdioSession([sys.executable, script_path])
+    
+    try:
+        start = time.perf_counter()
+        info = session.start()
+        print(f"연결됨: {info.get('serverInfo', {})} ({(time.perf_counter() - start) * 1000:.0f} ms)", file=sys.stderr)
+        
+        if not args.tool:
+            for tool in session.list_tools():
+                print(f"- {tool['name']}: {tool.get('description', '')}")
+            return
+        
+        calls = [(args.tool, json.loads(args.args))] * args.repeat
+        for result in session.call_many(calls):
+            if isinstance(result, Exception):
+                print(f"오류: {str(result)}")
+            else:
+                print("\n".join(item.get("text", "") for item in result.get("content", [])))
+        print(json.dumps(session.get_stats(), ensure_ascii=False), file=sys.stderr)
+    finally:
+        session.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+#!/usr/bin/env python
+import sys
+import time
+import json
+import random
+import datetime
+import argparse
+import threading
+from collections import deque
+from typing import List, Dict, Any, Optional, Tuple
+
+from google_search_mcp_server import GoogleSearchServer, QUOTA_TIMEZONE
+from ttl_cache import TTLCache
+
+# 디스패처 동작 단계
+LEVEL_NORMAL = "normal"          # Google 검색 사용
+LEVEL_CONSERVE = "conserve"      # 예상 소진 시점이 리셋 이전 - 일부 트래픽을 캐시/대체 백엔드로 전환
+LEVEL_EXHAUSTED = "exhausted"    # 쿼터 소진(또는 예비분 도달) - Google 사용 중지
+
+# 오류를 나타내는 검색 결과 제목 (캐시하지 않음)
+ERROR_RESULT_TITLES = {"검색 설정 오류", "검색 오류", "검색 처리 오류", "검색 결과 없음"}
+
+
+def is_error_results(results: List[Dict[str, str]]) -> bool:
+    """검색 서버가 오류/결과 없음을 일반 결과 형식으로 반환했는지 확인 (빈 목록 포함)"""
+    return not results or any(result.get("title") in ERROR_RESULT_TITLES and not result.get("url") for result in results)
+
+
+class SearchDispatcher:
+    """Google 검색 쿼터를 추적하여 캐시/DuckDuckGo로 점진적으로 전환하는 검색 디스패처"""
+    
+    def __init__(self, max_results: int = 5, reserve_queries: int = 5, rate_window: int = 3600,
+                 cache_ttl: int = 6 * 3600, cache_size: int = 512, llm_keywords: Optional[bool] = None,
+                 reserve_fallback: bool = True):
+        """
+        SearchDispatcher 초기화
+        
+        Args:
+            max_results: 검색 결과 최대 개수 (기본값: 5)
+            reserve_queries: 소진으로 간주하기 전 남겨둘 예비 쿼리 수 (기본값: 5)
+            rate_window: 소비 속도 계산에 사용할 구간(초) (기본값: 3600)
+            cache_ttl: 저하 모드에서 재사용할 검색 결과의 유효 시간(초) (기본값: 6시간)
+            cache_size: 보관할 검색 결과 최대 개수 (기본값: 512)
+            llm_keywords: Claude로 키워드를 정제할지 여부 (기본값: KEYWORD_LLM_REFINE 환경 변수)
+            reserve_fallback: 예비분 도달 후 캐시/DuckDuckGo가 모두 실패하면 예비 쿼리로 Google을 사용할지 여부
+                (기본값: True, 쿼터가 실제로 소진된 경우에는 항상 사용하지 않음)
+        """
+        self.max_results = max_results
+        self.reserve_queries = reserve_queries
+        self.reserve_fallback = reserve_fallback
+        self.rate_window = rate_window
+        
+        self.google = GoogleSearchServer(max_results=max_results, llm_keywords=llm_keywords)
+        
+        # 대체 백엔드는 선택 사항 (표준 라이브러리 html.parser만 사용, 로드에 실패하면 캐시만 사용)
+        try:
+            from duckduckgo_mcp_server import DuckDuckGoServer
+            self.fallback = DuckDuckGoServer(max_results=max_results)
+        except Exception as e:
+            print(f"DuckDuckGo 백엔드 로드 실패: {str(e)}", file=sys.stderr)
+            self.fallback = None
+        
+        self._lock = threading.Lock()
+        self._query_times = deque()  # (시각, 사용 쿼리 수)
+        self._cache = TTLCache(max_entries=cache_size, ttl=cache_ttl, name="search_results")
+        self._routed = {"google": 0, "cache": 0, "duckduckgo": 0, "unavailable": 0}
+        self._cache_hits = {"google": 0, "duckduckgo": 0}  # 캐시 적중 - 결과를 가져온 백엔드별
+    
+    # === 쿼터 예측 ===
+    def _seconds_until_reset(self) -> float:
+        """쿼터 리셋(태평양 시간 자정)까지 남은 시간(초)"""
+        now = datetime.datetime.now(QUOTA_TIMEZONE)
+        midnight = datetime.datetime.combine(now.date() + datetime.timedelta(days=1), datetime.time(), tzinfo=QUOTA_TIMEZONE)
+        # 같은 tzinfo끼리의 뺄셈은 서머타임 변경을 무시하므로 타임스탬프로 계산
+        return midnight.timestamp() - now.timestamp()
+    
+    def _current_rate(self, now: float) -> float:
+        """최근 구간의 Google 쿼리 소비 속도(쿼리/초)"""
+        while self._query_times and now - self._query_times[0][0] > self.rate_window:
+            self._query_times.popleft()
+        if not self._query_times:
+            return 0.0
+        used = sum(count for _, count in self._query_times)
+        elapsed = max(now - self._query_times[0][0], 60.0)
+        return used / elapsed
+    
+    def get_forecast(self) -> Dict[str, Any]:
+        """
+        현재 소비 속도로 예측한 쿼터 상황을 반환합니다.
+        
+        Returns:
+            쿼터 사용량, 소비 속도, 예상 소진 시간, 동작 단계를 담은 딕셔너리
+        """
+        usage = self.google.get_quota_usage()
+        with self._lock:
+            rate = self._current_rate(time.time())
+        
+        seconds_left = self._seconds_until_reset()
+        available = usage["remaining"] - self.reserve_queries
+        projected_demand = rate * seconds_left
+        
+        if usage["exhausted"] or available <= 0:
+            level = LEVEL_EXHAUSTED
+            google_share = 0.0
+        elif projected_demand > available:
+            level = LEVEL_CONSERVE
+            google_share = available / projected_demand
+        else:
+            level = LEVEL_NORMAL
+            google_share = 1.0
+        
+        return {
+            **usage,
+            "rate_per_hour": round(rate * 3600, 2),
+            "projected_demand_until_reset": int(projected_demand),
+            "seconds_until_exhaustion": int(available / rate) if rate > 0 and available > 0 else None,
+            "seconds_until_reset": int(seconds_left),
+            "google_share": round(google_share, 3),
+            "level": level
+        }
+    
+    # === 결과 캐시 ===
+    def _cache_key(self, query: str, max_results: int) -> str:
+        return f"{max_results}:{' '.join(query.lower().split())}"
+    
+    def _cache_get(self, key: str) -> Optional[Tuple[str, List[Dict[str, str]]]]:
+        entry = self._cache.get(key, None)
+        if entry is None:
+            return None
+        source, results = entry
+        return source, [dict(result) for result in results]
+    
+    def _cache_put(self, key: str, source: str, results: List[Dict[str, str]]):
+        if is_error_results(results):
+            return
+        self._cache.set(key, (source, results))
+    
+    # === 검색 ===
+    def search(self, query: str, max_results: Optional[int] = None) -> List[Dict[str, str]]:
+        """
+        쿼터 상황에 따라 Google, 캐시, DuckDuckGo 중 하나로 검색을 수행합니다.
+        
+        Args:
+            query: 검색 쿼리 문자열
+            max_results: 최대 결과 개수 (기본값: 디스패처 설정값)
+        
+        Returns:
+            검색 결과 목록 (딕셔너리 리스트)
+        """
+        max_results = max_results or self.max_results
+        key = self._cache_key(query, max_results)
+        forecast = self.get_forecast()
+        use_google = forecast["level"] == LEVEL_NORMAL or random.random() < forecast["google_share"]
+        
+        if not use_google:
+            cached = self._cache_get(key)
+            if cached is not None:
+                source, results = cached
+                with self._lock:
+                    self._routed["cache"] += 1
+                    self._cache_hits[source] += 1
+                return results
+            
+            results = None
+            if self.fallback is not None:
+                results = self.fallback.search(query, max_results=max_results)
+                if not is_error_results(results):
+                    self._count_route("duckduckgo")
+                    self._cache_put(key, "duckduckgo", results)
+                    return results
+            
+            # 대체 수단이 없거나 오류/결과 없음 - 쿼터가 소진되었거나 예비 쿼리 사용이 허용되지 않으면 Google을 호출하지 않음
+            if forecast["exhausted"] or (forecast["level"] == LEVEL_EXHAUSTED and not self.reserve_fallback):
+                self._count_route("unavailable")
+                return results or [{
+                    "title": "검색 오류",
+                    "content": "Google 검색 일일 쿼터가 소진(또는 예비분에 도달)되었고 대체 검색 백엔드를 사용할 수 없습니다. 잠시 후 다시 시도하세요.",
+                    "url": ""
+                }]
+            # 남은 쿼터(보존 단계) 또는 예비 쿼리로 Google 사용
+        
+        results, used = self.google.search_with_usage(query, max_results=max_results)
+        
+        with self._lock:
+            if used > 0:
+                self._query_times.append((time.time(), used))
+            self._routed["google"] += 1
+        
+        self._cache_put(key, "google", results)
+        return results
+    
+    def _count_route(self, backend: str):
+        with self._lock:
+            self._routed[backend] += 1
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        디스패처 상태 반환 (지표 표시용)
+        
+        Returns:
+            쿼터 예측, 백엔드별 처리 건수, 캐시 크기를 담은 딕셔너리
+        """
+        forecast = self.get_forecast()
+        with self._lock:
+            return {
+                **forecast,
+                "routed": dict(self._routed),
+                "cache_hits_by_source": dict(self._cache_hits),
+                "cache": self._cache.get_stats(),
+                "keyword_cache": self.google.get_stats()["keyword_cache"],
+                "fallback_available": self.fallback is not None
+            }
+    
+    # === GoogleSearchServer 호환 메서드 ===
+    def extract_keywords(self, text: str) -> List[str]:
+        """텍스트에서 중요 키워드 추출 (Google 검색 서버에 위임)"""
+        return self.google.extract_keywords(text)
+    
+    def format_results(self, results: List[Dict[str, str]]) -> str:
+        """검색 결과 포맷팅 (Google 검색 서버에 위임)"""
+        return self.google.format_results(results)
+    
+    def get_quota_usage(self) -> Dict[str, Any]:
+        """Google 쿼터 사용량 반환"""
+        return self.google.get_quota_usage()
+
+
+def main():
+    """CLI 인터페이스로 검색 디스패처 실행"""
+    parser = argparse.ArgumentParser(description="쿼터 인식 검색 디스패처 CLI")
+    parser.add_argument('query', help='검색할 쿼리')
+    parser.add_argument('--max-results', type=int, default=5, help='최대 결과 수 (기본값: 5)')
+    parser.add_argument('--stats', action='store_true', help='디스패처 상태를 JSON으로 출력')
+    
+    args = parser.parse_args()
+    
+    dispatcher = SearchDispatcher(max_results=args.max_results)
+    results = dispatcher.search(args.query)
+    print(dispatcher.format_results(results))
+    
+    if args.stats:
+        print(json.dumps(dispatcher.get_stats(), ensure_ascii=False, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+#!/usr/bin/env python
+import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Callable
+
+from tool_schemas import to_bedrock_tools
+
+# 모델에 공개하는 도구 - 검색어는 모델이 직접 만들 수 있으므로 키워드 추출 도구는 제외
+AGENT_TOOLS = [
+    "get_current_time", "get_current_date", "get_datetime_info", "get_datetime_info_many",
+    "calculate_time_difference", "resolve_datetime_expression", "search"
+]
+
+# 도구 결과 하나가 프롬프트에 들어갈 최대 길이
+MAX_TOOL_RESULT_CHARS = 12000
+
+# 도구 실행기 (프로세스 전역 - 한 라운드의 도구 호출을 동시에 실행)
+_tool_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="agent-tool")
+
+
+class ToolUsageStats:
+    """응답 방식(prefetch: 미리 도구 실행 후 프롬프트 주입, agent: 모델이 필요한 도구만 호출)별 사용량 집계"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._modes: Dict[str, Dict[str, float]] = {}
+    
+    def record(self, mode: str, tool_calls: int, model_calls: int, context_chars: int,
+               input_tokens: Optional[int] = None, estimated_prefetch_tool_calls: Optional[int] = None):
+        """
+        응답 한 번의 사용량 기록
+        
+        Args:
+            mode: "prefetch" 또는 "agent"
+            tool_calls: 실행한 도구 호출 수
+            model_calls: Bedrock 모델 호출 수 (의도 분석 포함)
+            context_chars: 도구 결과로 프롬프트에 추가된 문자 수
+            input_tokens: 모델 입력 토큰 수 (스트림의 usage에서 확인된 경우)
+            estimated_prefetch_tool_calls: agent 모드에서 같은 질의를 prefetch 방식으로 처리했다면 실행했을 도구 호출 수 추정치
+        """
+        with self._lock:
+            stats = self._modes.setdefault(mode, {
+                "turns": 0, "tool_calls": 0, "model_calls": 0, "context_chars": 0,
+                "input_tokens": 0, "token_turns": 0, "estimated_prefetch_tool_calls": 0
+            })
+            stats["turns"] += 1
+            stats["tool_calls"] += tool_calls
+            stats["model_calls"] += model_calls
+            stats["context_chars"] += context_chars
+            if input_tokens is not None:
+                stats["input_tokens"] += input_tokens
+                stats["token_turns"] += 1
+            if estimated_prefetch_tool_calls is not None:
+                stats["estimated_prefetch_tool_calls"] += estimated_prefetch_tool_calls
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        방식별 응답당 평균과 prefetch 대비 절감량 반환
+        
+        Returns:
+            방식 이름별 평균 지표와 savings 딕셔너리
+        """
+        with self._lock:
+            modes = {mode: dict(stats) for mode, stats in self._modes.items()}
+        
+        result = {}
+        for mode, stats in modes.items():
+            turns = stats["turns"]
+            result[mode] = {
+                "turns": turns,
+                "avg_tool_calls": round(stats["tool_calls"] / turns, 2),
+                "avg_model_calls": round(stats["model_calls"] / turns, 2),
+                "avg_context_chars": round(stats["context_chars"] / turns),
+                "avg_input_tokens": round(stats["input_tokens"] / stats["token_turns"]) if stats["token_turns"] else None
+            }
+        
+        agent = modes.get("agent")
+        if agent:
+            savings = {
+                # 같은 질의를 prefetch 방식으로 처리했을 때와 비교한 도구 호출 절감 (질의별 추정)
+                "tool_calls_avoided": int(agent["estimated_prefetch_tool_calls"] - agent["tool_calls"])
+            }
+            prefetch = result.get("prefetch")
+            if prefetch:
+                # 두 방식의 실측 평균 비교
+                savings["context_chars_per_turn"] = prefetch["avg_context_chars"] - result["agent"]["avg_context_chars"]
+                savings["model_calls_per_turn"] = round(prefetch["avg_model_calls"] - result["agent"]["avg_model_calls"], 2)
+                if prefetch["avg_input_tokens"] and result["agent"]["avg_input_tokens"]:
+                    savings["input_tokens_per_turn"] = prefetch["avg_input_tokens"] - result["agent"]["avg_input_tokens"]
+            result["savings"] = savings
+        return result
+
+
+# 프로세스 전역 사용량 집계
+usage_stats = ToolUsageStats()
+
+
+class BedrockToolAgent:
+    """Bedrock Messages API의 tool use로 모델이 요청한 도구만 실행하고 결과를 이어서 스트리밍하는 에이전트"""
+    
+    def __init__(self, bedrock_client, model_id: str, tool_executor: Callable[[str, Dict[str, Any]], Dict[str, Any]],
+                 tools: Optional[List[str]] = None, max_rounds: int = 4):
+        """
+        BedrockToolAgent 초기화
+        
+        Args:
+            bedrock_client: boto3 bedrock-runtime 클라이언트
+            model_id: 모델 ID
+            tool_executor: (도구 이름, 인자) -> {"text", "data"}를 반환하는 함수 (예: UnifiedMCPClient.call_tool)
+            tools: 공개할 도구 이름 (기본값: AGENT_TOOLS)
+            max_rounds: 모델 호출 최대 횟수 (마지막 호출은 도구 없이 텍스트로 답변)
+        """
+        self.client = bedrock_client
+        self.model_id = model_id
+        self.tool_executor = tool_executor
+        self.tools = to_bedrock_tools(tools or AGENT_TOOLS)
+        self.max_rounds = max_rounds
+    
+    def _stream(self, payload: Dict[str, Any], on_text: Optional[Callable[[str], None]]) -> Dict[str, Any]:
+        """
+        모델 호출 한 번을 스트리밍으로 처리
+        
+        Returns:
+            {"content": 어시스턴트 콘텐츠 블록 리스트, "stop_reason", "input_tokens", "output_tokens"}
+        """
+        response = self.client.invoke_model_with_response_stream(
+            modelId=self.model_id,
+            body=json.dumps(payload)
+        )
+        
+        blocks: Dict[int, Dict[str, Any]] = {}
+        partial_json: Dict[int, str] = {}
+        stop_reason = None
+        input_tokens = None
+        output_tokens = None
+        
+        for event in response["body"]:
+            if "chunk" not in event:
+                # 스트림 중간 오류 (throttlingException 등)
+                raise RuntimeError(f"스트리밍 오류: {json.dumps(event, default=str)[:500]}")
+            chunk = json.loads(event["chunk"]["bytes"])
+            chunk_type = chunk.get("type")
+            
+            if chunk_type == "message_start":
+                input_tokens = chunk.get("message", {}).get("usage", {}).get("input_tokens")
+            
+            elif chunk_type == "content_block_start":
+                block = chunk["content_block"]
+                if block["type"] == "tool_use":
+                    blocks[chunk["index"]] = {"type": "tool_use", "id": block["id"], "name": block["name"], "input": {}}
+                    partial_json[chunk["index"]] = ""
+                elif block["type"] == "text":
+                    blocks[chunk["index"]] = {"type": "text", "text": block.get("text", "")}
+            
+            elif chunk_type == "content_block_delta":
+                delta = chunk["delta"]
+                if delta.get("type") == "text_delta":
+                    blocks[chunk["index"]]["text"] += delta.get("text", "")
+                    if on_text:
+                        on_text(delta.get("text", ""))
+                elif delta.get("type") == "input_json_delta":
+                    partial_json[chunk["index"]] += delta.get("partial_json", "")
+            
+            elif chunk_type == "content_block_stop":
+                if chunk["index"] in partial_json:
+                    raw = partial_json.pop(chunk["index"])
+                    blocks[chunk["index"]]["input"] = json.loads(raw) if raw else {}
+            
+            elif chunk_type == "message_delta":
+                stop_reason = chunk.get("delta", {}).get("stop_reason", stop_reason)
+                output_tokens = chunk.get("usage", {}).get("output_tokens", output_tokens)
+        
+        # 빈 텍스트 블록은 다음 요청에서 거부되므로 제외
+        content = [blocks[index] for index in sorted(blocks) if blocks[index]["type"] != "text" or blocks[index]["text"]]
+        return {"content": content, "stop_reason": stop_reason, "input_tokens": input_tokens, "output_tokens": output_tokens}
+    
+    def _run_tool(self, tool_use: Dict[str, Any]) -> Dict[str, Any]:
+        """도구 하나 실행 (실행기 스레드) - 오류는 결과로 변환하여 모델에 전달"""
+        start = time.perf_counter()
+        try:
+            text = self.tool_executor(tool_use["name"], tool_use["input"])["text"]
+            error = None
+        except Exception as e:
+            text = f"도구 실행 오류: {str(e)}"
+            error = str(e)
+        return {
+            "id": tool_use["id"],
+            "name": tool_use["name"],
+            "input": tool_use["input"],
+            "text": text[:MAX_TOOL_RESULT_CHARS],
+            "error": error,
+            "elapsed_ms": round((time.perf_counter() - start) * 1000, 1)
+        }
+    
+    def run(self, payload: Dict[str, Any], on_text: Optional[Callable[[str], None]] = None,
+            on_tools: Optional[Callable[[List[Dict[str, Any]]], None]] = None) -> Dict[str, Any]:
+        """
+        도구 사용 루프 실행 - 모델이 tool_use로 멈추면 도구를 동시에 실행하고 tool_result로 이어서 호출
+        
+        Args:
+            payload: Bedrock 요청 본문 (anthropic_version, max_tokens, messages, system 등)
+            on_text: 텍스트 조각이 도착할 때마다 호출
+            on_tools: 한 라운드의 도구 실행이 끝나면 실행 기록 리스트로 호출 (호출 스레드에서 실행)
+        
+        Returns:
+            {"text": 최종 응답, "rounds": 모델 호출 수, "tool_calls": 실행 기록, "context_chars", "input_tokens", "output_tokens"}
+        """
+        payload = {**payload, "messages": list(payload["messages"]), "tools": self.tools}
+        text_parts: List[str] = []
+        tool_calls: List[Dict[str, Any]] = []
+        input_tokens = 0
+        output_tokens = 0
+        rounds = 0
+        
+        while True:
+            rounds += 1
+            if rounds >= self.max_rounds:
+                # 마지막 호출 - 도구 호출을 막고 텍스트 답변을 강제
+                payload["tool_choice"] = {"type": "none"}
+            turn = self._stream(payload, on_text)
+            input_tokens += turn["input_tokens"] or 0
+            output_tokens += turn["output_tokens"] or 0
+            text_parts.extend(block["text"] for block in turn["content"] if block["type"] == "text")
+            
+            tool_uses = [block for block in turn["content"] if block["type"] == "tool_use"]
+            if turn["stop_reason"] != "tool_use" or not tool_uses or rounds >= self.max_rounds:
+                break
+            
+            # 한 라운드에서 요청된 도구를 동시에 실행
+            results = list(_tool_executor.map(self._run_tool, tool_uses))
+            tool_calls.extend(results)
+            if on_tools:
+                on_tools(results)
+            
+            tool_results = [{
+                "type": "tool_result",
+                "tool_use_id": result["id"],
+                "content": [{"type": "text", "text": result["text"]}],
+                "is_error": result["error"] is not None
+            } for result in results]
+            if rounds + 1 == self.max_rounds:
+                # 다음이 마지막 호출 - 추가 도구 호출 없이 답변하도록 안내
+                tool_results.append({"type": "text", "text": "도구 호출 한도에 도달했습니다. 지금까지의 정보로 답변해 주세요."})
+            
+            payload["messages"].append({"role": "assistant", "content": turn["content"]})
+            payload["messages"].append({"role": "user", "content": tool_results})
+        
+        return {
+            "text": "".join(text_parts),
+            "rounds": rounds,
+            "tool_calls": tool_calls,
+            "context_chars": sum(len(call["text"]) for call in tool_calls),
+            "input_tokens": input_tokens or None,
+            "output_tokens": output_tokens or None
+        }
@@ -0,0 +1,168 @@
+#!/usr/bin/env python
+import json
+import asyncio
+import unicodedata
+from typing import Dict, Any, Optional, Callable, Awaitable
+
+from ttl_cache import TTLCache, MISSING
+
+# 정책 항목의 기본값
+DEFAULT_POLICY = {
+    "ttl": 3600,            # 정상 결과 유효 시간(초)
+    "max_entries": 512,     # 도구별 최대 항목 수
+    "key_fields": None,     # 캐시 키에 사용할 인자 이름 (None이면 모든 인자)
+    "defaults": {},         # 인자가 생략됐을 때 키에 사용할 기본값 (생략과 기본값 지정을 같은 키로 취급)
+    "negative_ttl": 0,      # 빈 결과/오류 결과/실행 오류 유효 시간(초), 0이면 저장하지 않음
+    "normalize": True       # 문자열 인자의 유니코드/공백/대소문자 정규화 여부
+}
+
+
+class _CachedError:
+    """부정 캐시에 저장된 도구 실행 오류"""
+    
+    def __init__(self, error: Exception):
+        self.error = error
+
+
+class ToolResultCache:
+    """mcp_config.json의 tool_cache 정책에 따라 도구 결과를 캐시하는 미들웨어"""
+    
+    def __init__(self, policies: Optional[Dict[str, Dict[str, Any]]] = None):
+        """
+        ToolResultCache 초기화
+        
+        Args:
+            policies: 도구 이름별 캐시 정책 (ttl, max_entries, key_fields, defaults, negative_ttl, normalize)
+                      정책이 없는 도구는 캐시하지 않음
+        """
+        self.policies: Dict[str, Dict[str, Any]] = {}
+        self._caches: Dict[str, TTLCache] = {}
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+        
+        for tool_name, policy in (policies or {}).items():
+            policy = {**DEFAULT_POLICY, **policy}
+            self.policies[tool_name] = policy
+            self._caches[tool_name] = TTLCache(max_entries=policy["max_entries"], ttl=policy["ttl"], name=f"tool:{tool_name}")
+            self._stats[tool_name] = {"negative_hits": 0, "negative_stored": 0, "coalesced": 0}
+    
+    def make_key(self, tool_name: str, args: Optional[Dict[str, Any]]) -> str:
+        """
+        정책의 key_fields와 defaults로 캐시 키 생성
+        
+        Args:
+            tool_name: 도구 이름
+            args: 도구 인자
+        
+        Returns:
+            정규화된 캐시 키
+        """
+        policy = self.policies[tool_name]
+        args = {**policy["defaults"], **(args or {})}
+        fields = policy["key_fields"] if policy["key_fields"] is not None else sorted(args)
+        
+        key_args = {}
+        for field in fields:
+            value = args.get(field)
+            if policy["normalize"] and isinstance(value, str):
+                value = " ".join(unicodedata.normalize("NFC", value).split()).lower()
+            key_args[field] = value
+        return json.dumps(key_args, sort_keys=True, ensure_ascii=False, default=str)
+    
+    @staticmethod
+    def is_negative(result: Any) -> bool:
+        """
+        구조화된 결과의 값이 모두 비어 있거나 error 표시가 있으면 부정 결과로 판단
+        (검색처럼 오류를 일반 결과 형식으로 반환하는 도구는 structuredContent에 "error": true를 넣음)
+        """
+        if not isinstance(result, dict):
+            return False
+        data = result.get("structuredContent")
+        if not isinstance(data, dict) or not data:
+            return False
+        return data.get("error") is True or not any(data.values())
+    
+    async def call(self, tool_name: str, args: Optional[Dict[str, Any]],
+                   execute: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        캐시를 거쳐 도구 실행 - 적중하면 저장된 결과를 반환하고, 같은 키의 실행이 진행 중이면 그 결과를 기다림
+        
+        Args:
+            tool_name: 도구 이름
+            args: 도구 인자
+            execute: 캐시 미스 시 도구를 실행하는 코루틴 함수
+        
+        Returns:
+            도구 결과 (부정 캐시된 오류는 다시 발생)
+        """
+        if tool_name not in self.policies:
+            return await execute()
+        
+        policy = self.policies[tool_name]
+        cache = self._caches[tool_name]
+        stats = self._stats[tool_name]
+        key = self.make_key(tool_name, args)
+        
+        cached = cache.get(key)
+        if cached is not MISSING:
+            if isinstance(cached, _CachedError):
+                stats["negative_hits"] += 1
+                raise cached.error
+            return cached
+        
+        in_flight_key = f"{tool_name}:{key}"
+        pending = self._in_flight.get(in_flight_key)
+        if pending is not None:
+            stats["coalesced"] += 1
+            return await asyncio.shield(pending)
+        
+        pending = asyncio.get_running_loop().create_future()
+        self._in_flight[in_flight_key] = pending
+        try:
+            result = await execute()
+        except Exception as e:
+            if policy["negative_ttl"] > 0:
+                cache.set(key, _CachedError(e), ttl=policy["negative_ttl"])
+                stats["negative_stored"] += 1
+            pending.set_exception(e)
+            raise
+        else:
+            if not self.is_negative(result):
+                cache.set(key, result)
+            elif policy["negative_ttl"] > 0:
+                cache.set(key, result, ttl=policy["negative_ttl"])
+                stats["negative_stored"] += 1
+            pending.set_result(result)
+            return result
+        finally:
+            del self._in_flight[in_flight_key]
+            if not pending.done():
+                # 실행이 취소된 경우 기다리는 호출자도 취소
+                pending.cancel()
+            elif not pending.cancelled():
+                # 기다리는 호출자가 없을 때 '조회되지 않은 예외' 경고 방지
+                pending.exception()
+    
+    def clear(self, tool_name: Optional[str] = None):
+        """캐시 비우기 (tool_name이 없으면 전체)"""
+        for name, cache in self._caches.items():
+            if tool_name is None or name == tool_name:
+                cache.clear()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        도구별 캐시 지표 반환
+        
+        Returns:
+            도구 이름별 적중률, 항목 수, 부정 캐시/병합 횟수, 정책
+        """
+        stats = {}
+        for tool_name, cache in self._caches.items():
+            policy = self.policies[tool_name]
+            stats[tool_name] = {
+                **cache.get_stats(),
+                **self._stats[tool_name],
+                "ttl": policy["ttl"],
+                "negative_ttl": policy["negative_ttl"]
+            }
+        return stats
@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+# 캐시 미스를 나타내는 기본 반환값
+MISSING = object()
+
+
+class TTLCache:
+    """유효 시간(TTL)과 최대 항목 수를 가진 스레드 안전 LRU 캐시"""
+    
+    def __init__(self, max_entries: int = 1024, ttl: Optional[float] = 3600, name: str = "cache"):
+        """
+        TTLCache 초기화
+        
+        Args:
+            max_entries: 최대 항목 수 (초과 시 가장 오래 사용되지 않은 항목 제거)
+            ttl: 기본 유효 시간(초), None이면 만료 없음
+            name: 지표 표시용 캐시 이름
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.name = name
+        self._lock = threading.Lock()
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()  # key -> (만료 시각, 값)
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+    
+    def get(self, key: Hashable, default: Any = MISSING, max_age: Optional[float] = None) -> Any:
+        """
+        캐시에서 값 조회
+        
+        Args:
+            key: 캐시 키
+            default: 미스 시 반환할 값 (기본값: MISSING)
+            max_age: 저장 시점 기준 허용할 최대 경과 시간(초) (선택적)
+        
+        Returns:
+            저장된 값 또는 default
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                expires_at, stored_at, value = entry
+                if expires_at is not None and now >= expires_at:
+                    del self._data[key]
+                    entry = None
+                elif max_age is not None and now - stored_at > max_age:
+                    entry = None
+            
+            if entry is None:
+                self._misses += 1
+                return default
+            
+            self._data.move_to_end(key)
+            self._hits += 1
+            return value
+    
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = MISSING):
+        """
+        캐시에 값 저장
+        
+        Args:
+            key: 캐시 키
+            value: 저장할 값
+            ttl: 이 항목의 유효 시간(초) (기본값: 캐시 설정값, None이면 만료 없음)
+        """
+        ttl = self.ttl if ttl is MISSING else ttl
+        now = time.time()
+        expires_at = now + ttl if ttl is not None else None
+        with self._lock:
+            self._data[key] = (expires_at, now, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self._evictions += 1
+    
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """항목 제거 후 값 반환"""
+        with self._lock:
+            entry = self._data.pop(key, None)
+        return entry[2] if entry is not None else default
+    
+    def clear(self):
+        """모든 항목 제거"""
+        with self._lock:
+            self._data.clear()
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        캐시 지표 반환
+        
+        Returns:
+            항목 수, 적중/미스 횟수, 적중률을 담은 딕셔너리
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "name": self.name,
+                "entries": len(self._data),
+                "max_entries": self.max_entries,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "hit_ratio": round(self._hits / lookups, 3) if lookups else 0.0
+            }
@@ -1,10 +1,8 @@
 import random
 import json
-from typing import List, Tuple, Union, Dict
+from typing import List, Tuple, Union, Dict, Optional
 import os
-import tempfile
 import csv
-import pandas as pd
 import warnings
 
 # Pydantic 경고 무시
@@ -21,10 +19,18 @@ import boto3
 # MCP 기능 임포트
 import re
 import json
-from mcp_client import UnifiedMCPClient
-
-# 통합 MCP 클라이언트 초기화
-mcp_client = UnifiedMCPClient()
+from mcp_client import get_client
+from tool_agent import BedrockToolAgent, usage_stats, AGENT_TOOLS
+from document_store import document_store, content_key, StoredDocument
+from document_parser import iter_document
+from text_normalizer import normalize_document, default_normalizer
+from document_index import bedrock_embedder, CONTEXT_TOKEN_BUDGET, EMBEDDING_MODEL
+from document_summarizer import document_summarizer, is_summary_request
+from table_data import TableData, get_table, TABLE_EXTENSIONS
+from ingest_jobs import ingest_manager, IngestJob, DONE, FAILED, CANCELLED
+
+# 통합 MCP 클라이언트 (프로세스 전역 - 서비스는 처음 사용할 때 생성)
+mcp_client = get_client()
 extract_keywords = mcp_client.extract_keywords
 
 # 질의 의도 타입
@@ -91,6 +97,9 @@ REGION = os.getenv("AWS_REGION", "us-west-2")
 if not REGION:
     raise ValueError("AWS_REGION 환경 변수가 설정되지 않았습니다.")
 
+# 문서 조각 임베딩 함수 (DOCUMENT_EMBEDDING_MODEL이 설정된 경우에만, 없으면 BM25만 사용)
+document_embedder = bedrock_embedder(boto3.client("bedrock-runtime", region_name=REGION)) if EMBEDDING_MODEL else None
+
 MODELS = {
     "Claude 3.7 Sonnet": {
         "id": "us.anthropic.claude-3-7-sonnet-20250219-v1:0",
@@ -116,10 +125,16 @@ def initialize_session_state():
         st.session_state.messages = []
     if "chat_history" not in st.session_state:
         st.session_state.chat_history = StreamlitChatMessageHistory(key="chat_history")
-    if "context" not in st.session_state:
-        st.session_state.context = None
+    if "document_key" not in st.session_state:
+        st.session_state.document_key = None
     if "initial_system_message" not in st.session_state:
         st.session_state.initial_system_message = None
+    if "document_table" not in st.session_state:
+        st.session_state.document_table = None
+    if "ingest_job_id" not in st.session_state:
+        st.session_state.ingest_job_id = None
+    if "ingest_cancelled_key" not in st.session_state:
+        st.session_state.ingest_cancelled_key = None
 
 class StreamHandler(BaseCallbackHandler):
     def __init__(self, container: st.container) -> None:
@@ -134,7 +149,7 @@ def set_page_config() -> None:
     st.set_page_config(page_title="Bedrock Chatbot", layout="wide")
     st.title("Bedrock Chatbot with Document Q&A")
 
-def get_sidebar_params() -> Tuple[float, float, int, int, int, str, object, str, bool, bool, bool]:
+def get_sidebar_params() -> Tuple[float, float, int, int, int, str, object, str, bool, bool, bool, bool]:
     with st.sidebar:
         st.markdown("## 모델 정보")
         # 모델 선택 대신 고정 텍스트로 표시
@@ -156,6 +171,7 @@ def get_sidebar_params() -> Tuple[float, float, int, int, int, str, object, str,
         extended_thinking = False
         show_reasoning = False
         mcp_enable = False
+        agent_mode = False
         
         if mode == "Reasoning 모드":
             extended_thinking = True
@@ -172,6 +188,13 @@ def get_sidebar_params() -> Tuple[float, float, int, int, int, str, object, str,
         elif mode == "MCP 모드":
             mcp_enable = True
             st.info("MCP 모드에서는 웹 검색 및 시간/날짜 정보를 자동으로 제공합니다.")
+            
+            agent_mode = st.checkbox(
+                "도구 호출 에이전트 모드",
+                value=os.getenv("MCP_AGENT_MODE", "").lower() in ("1", "true", "yes"),
+                help="질의 분석 후 도구를 미리 실행하는 대신, Claude가 필요한 도구만 직접 호출합니다 (Bedrock tool use).",
+                key=f"{st.session_state['widget_key']}_Agent_Mode"
+            )
         
         st.markdown("## Document Upload")
         uploaded_file = st.file_uploader(
@@ -240,59 +263,77 @@ def get_sidebar_params() -> Tuple[float, float, int, int, int, str, object, str,
                     key=f"{st.session_state['widget_key']}_Memory_Window",
                 )
 
-    return temperature, top_p, top_k, max_tokens, memory_window, system_prompt, uploaded_file, model_name, extended_thinking, show_reasoning, mcp_enable
-
-def process_uploaded_file(file_path: str) -> str:
-    """문서 파일을 처리하여 텍스트로 변환"""
-    file_ext = os.path.splitext(file_path)[1].lower()
-    
-    try:
-        if file_ext == '.pdf':
-            from PyPDF2 import PdfReader
-            reader = PdfReader(file_path)
-            # PDF 파일이 암호화되어 있는 경우 처리되지 않음
-            if reader.is_encrypted:
-                raise ValueError("암호화된 PDF 파일은 처리할 수 없습니다.")
-            text = ""
-            for page in reader.pages:
-                text += page.extract_text() + "\n"
-            return text
-        
-        elif file_ext in ['.doc', '.docx']:
-            from docx import Document
-            doc = Document(file_path)
-            text = ""
-            for para in doc.paragraphs:
-                text += para.text + "\n"
-            return text
+    return temperature, top_p, top_k, max_tokens, memory_window, system_prompt, uploaded_file, model_name, extended_thinking, show_reasoning, mcp_enable, agent_mode
+
+def show_metrics_sidebar(mcp_enable: bool = True, document_index=None, document_table=None) -> None:
+    """사이드바에 MCP 및 문서 저장소/검색 성능 지표 표시"""
+    with st.sidebar.expander("📊 성능 지표", expanded=False):
+        doc_stats = document_store.get_stats()
+        if doc_stats["hits"] or doc_stats["misses"]:
+            st.markdown(f"**문서 저장소:** 적중 {doc_stats['hits']} / {doc_stats['hits'] + doc_stats['misses']}, "
+                        f"파싱 절감 {doc_stats['parse_ms_saved'] / 1000:.1f}초 (디스크 문서 {doc_stats['documents']}개, "
+                        f"{doc_stats['bytes'] / 1024 / 1024:.1f} MB, 색인 불러오기 {doc_stats['index_loads']}회)")
+        normalize_stats = default_normalizer.get_stats()
+        if normalize_stats["documents"]:
+            st.markdown(f"**문서 정리:** 토큰 {normalize_stats['tokens_before']:,} → {normalize_stats['tokens_after']:,} "
+                        f"({normalize_stats['token_reduction']:.0%} 절감, 문서 {normalize_stats['documents']}개)")
+        document_stats = {"document_store": doc_stats, "normalizer": normalize_stats, "ingest": ingest_manager.get_stats()}
+        summary_stats = document_summarizer.get_stats()
+        if summary_stats["summaries"]:
+            document_stats["summarizer"] = summary_stats
+            st.markdown(f"**문서 요약:** {summary_stats['summaries']}회, 조각 요약 재사용 {summary_stats['cache_reuse']:.0%} "
+                        f"(조각 {summary_stats['chunks']}개 중 {summary_stats['cached_chunks']}개), "
+                        f"평균 조각 요약 {summary_stats['avg_map_ms'] / 1000:.1f}초 (동시 호출 {summary_stats['concurrency']}개)")
+        if document_index is not None:
+            index_stats = document_index.get_stats()
+            document_stats["document_index"] = index_stats
+            if index_stats["queries"]:
+                st.markdown(f"**문서 검색:** 평균 {index_stats['avg_retrieval_ms']:.1f} ms, "
+                            f"질문당 약 {index_stats['avg_tokens_saved']:,} 토큰 절감 "
+                            f"(조각 {index_stats['chunks']}개 중 약 {index_stats['avg_context_tokens']:,} 토큰 사용)")
+        if document_table is not None:
+            table_stats = document_table.get_stats()
+            document_stats["document_table"] = table_stats
+            st.markdown(f"**표 데이터:** {table_stats['rows']:,}행 × {table_stats['columns']}열, 프로필 {table_stats['profile_chars']:,}자 "
+                        f"(조회 {table_stats['queries']}회, 평균 {table_stats['avg_query_ms']:.1f} ms)")
+        if not mcp_enable:
+            st.json(document_stats, expanded=False)
+            return
         
-        elif file_ext in ['.txt', '.md', '.html']:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                return file.read()
-        
-        elif file_ext in ['.csv']:
-            df = pd.read_csv(file_path)
-            return df.to_string()
-        
-        elif file_ext in ['.xls', '.xlsx']:
-            df = pd.read_excel(file_path)
-            return df.to_string()
-        
-        elif file_ext in ['.ppt', '.pptx']:
-            from pptx import Presentation
-            text = []
-            prs = Presentation(file_path)
-            for slide in prs.slides:
-                for shape in slide.shapes:
-                    if hasattr(shape, "text"):
-                        text.append(shape.text)
-            return "\n\n".join(text)
+        try:
+            stats = mcp_client.get_stats()
+        except Exception as e:
+            st.warning(f"지표를 가져올 수 없습니다: {str(e)}")
+            return
         
-        else:
-            raise ValueError(f"지원하지 않는 파일 형식입니다: {file_ext}")
-            
-    except Exception as e:
-        raise Exception(f"파일 처리 중 오류가 발생했습니다 ({file_ext}): {str(e)}")
+        search_stats = stats.get("search", {})
+        if search_stats:
+            st.markdown(f"**검색 쿼터:** {search_stats.get('queries_used', 0)} / {search_stats.get('daily_quota', 0)} "
+                        f"(단계: {search_stats.get('level', 'normal')})")
+            keyword_cache = search_stats.get("keyword_cache", {})
+            st.markdown(f"**키워드 캐시 적중률:** {keyword_cache.get('hit_ratio', 0.0):.0%} "
+                        f"({keyword_cache.get('hits', 0)} / {keyword_cache.get('hits', 0) + keyword_cache.get('misses', 0)})")
+        service_stats = stats.get("services", {})
+        if service_stats:
+            st.markdown("**서비스 초기화:** " + ", ".join(
+                f"{name} {info['init_ms']:.0f} ms" if info.get("warm") else f"{name} (대기)"
+                for name, info in service_stats.items()
+            ))
+        resolver_stats = stats.get("datetime", {}).get("resolver", {})
+        if resolver_stats:
+            st.markdown(f"**날짜 질의 즉시 응답:** {resolver_stats.get('short_circuit', 0)} / {resolver_stats.get('resolved', 0)} "
+                        f"(평균 {resolver_stats.get('avg_ms', 0.0):.2f} ms)")
+        agent_stats = usage_stats.get_stats()
+        savings = agent_stats.get("savings")
+        if savings:
+            line = f"**에이전트 모드 절감:** 도구 호출 {savings['tool_calls_avoided']}회"
+            if "context_chars_per_turn" in savings:
+                line += f", 응답당 프롬프트 {savings['context_chars_per_turn']:,}자"
+            st.markdown(line)
+        if agent_stats:
+            stats["tool_usage"] = agent_stats
+        stats.update(document_stats)
+        st.json(stats, expanded=False)
 
 def init_conversation_chain(
     temperature: float,
@@ -377,7 +418,9 @@ def generate_response(
     input_text: str,
     chat_history: StreamlitChatMessageHistory,
     show_reasoning: bool = False,
-    mcp_enable: bool = False
+    mcp_enable: bool = False,
+    agent_mode: bool = False,
+    table: TableData = None
 ) -> str:
     # 입력 텍스트 길이 제한 체크
     if len(input_text) > 32000:  # Claude 3의 최대 입력 토큰 제한
@@ -396,8 +439,33 @@ def generate_response(
         datetime_info_text = ""
         search_results_text = ""
         
+        # 표 데이터는 원본 행 대신 프로필만 프롬프트에 있으므로 모델이 표 조회 도구를 호출하도록 함
+        if table is not None and not mcp_enable:
+            return generate_agent_response(client, model_params, input_text, chat_history, None, message_placeholder,
+                                           ["query_table"], table)
+        
         # MCP 활성화 상태에서 처리
         if mcp_enable:
+            # 0. 로컬 날짜 표현 해석 - 확실한 날짜/시간 질의는 모델 호출 없이 바로 응답
+            resolution = None
+            try:
+                resolution = mcp_client.resolve_datetime(input_text)
+            except Exception as e:
+                print(f"날짜 표현 해석 중 오류: {str(e)}")
+            
+            if resolution and resolution["confident"]:
+                full_response = resolution["answer"]
+                message_placeholder.markdown(full_response)
+                st.caption(f"⚡ 로컬 날짜 계산으로 응답 ({resolution['elapsed_ms']:.1f} ms)")
+                return full_response
+            
+            # 에이전트 모드 - 도구를 미리 실행하지 않고 모델이 필요한 도구만 호출 (표 데이터가 있으면 표 조회 도구 포함)
+            if agent_mode or table is not None:
+                tools = AGENT_TOOLS + ["query_table"] if table is not None else None
+                return generate_agent_response(client, model_params, input_text, chat_history, resolution, message_placeholder,
+                                               tools, table)
+            
+            prefetch_tool_calls = 0
             # 질의 분석 및 서비스 실행
             try:
                 # 이전 메시지가 있으면 대화 컨텍스트 생성
@@ -439,32 +507,53 @@ def generate_response(
                     """)
                 
                 # 2. 분석 결과에 따른 MCP 서비스 실행
+                # 날짜/시간 조회와 키워드 추출은 서로 독립적이므로 한 번에 요청 (MCP 서버 사용 시 한 번의 왕복)
+                batch_calls = []
+                if datetime_needed:
+                    st.info("⏰ 날짜/시간 정보를 조회합니다")
+                    batch_calls.append(("get_datetime_info", {}))
+                if search_needed:
+                    batch_calls.append(("extract_keywords", {"text": input_text}))
+                batch_results = {item["tool"]: item for item in mcp_client.call_batch(batch_calls)} if batch_calls else {}
+                prefetch_tool_calls += len(batch_calls)
+                
                 # 날짜/시간 정보가 필요한 경우
                 if datetime_needed:
-                    try:
-                        st.info("⏰ 날짜/시간 정보를 조회합니다")
-                        dt_info = mcp_client.get_datetime_info()
-                        datetime_info_text = mcp_client.format_datetime_info(dt_info)
+                    dt_item = batch_results["get_datetime_info"]
+                    if dt_item["ok"]:
+                        datetime_info_text = dt_item["text"]
                         st.success("현재 날짜/시간 정보 조회 완료")
                         
                         # 결과 표시
                         with st.expander("📅 날짜/시간 정보"):
                             st.markdown(datetime_info_text)
-                    except Exception as e:
-                        st.error(f"날짜/시간 정보 조회 중 오류 발생: {str(e)}")
+                    else:
+                        st.error(f"날짜/시간 정보 조회 중 오류 발생: {dt_item['error']}")
+                
+                # 로컬에서 계산한 날짜 표현 결과는 모델에 함께 전달
+                if resolution:
+                    resolution_text = mcp_client.format_datetime_resolution(resolution)
+                    datetime_info_text = f"{resolution_text}\n{datetime_info_text}" if datetime_info_text else resolution_text
+                    with st.expander("🧮 날짜 계산 결과"):
+                        st.markdown(resolution_text)
                 
                 # 검색 정보가 필요한 경우
                 if search_needed:
-                    # 검색 키워드 추출
-                    keywords = extract_keywords(input_text)
-                    search_query = " ".join(keywords)
+                    # 검색 키워드 (위에서 함께 추출)
+                    keywords_item = batch_results["extract_keywords"]
+                    if not keywords_item["ok"]:
+                        raise ValueError(keywords_item["error"])
+                    search_query = " ".join(keywords_item["data"]["keywords"])
                     
                     if search_query:
                         st.info(f"🔍 Google에서 '{search_query}'에 대한 정보 검색 중")
-                        search_results = mcp_client.search(search_query)
+                        # 검색과 결과 포맷팅을 한 번의 도구 호출로 처리
+                        search_item = mcp_client.call_tool("search", {"query": search_query})
+                        search_results = search_item["data"]["results"]
+                        prefetch_tool_calls += 1
                         
                         if search_results:
-                            search_results_text = mcp_client.format_results(search_results)
+                            search_results_text = search_item["text"]
                             st.success(f"'{search_query}' 검색 결과 {len(search_results)}건 발견")
                             
                             # 검색 결과 표시
@@ -624,13 +713,18 @@ def generate_response(
                 # reasoning_placeholder는 reasoning 모드가 활성화된 경우에만 사용
                 reasoning_placeholder = st.empty() if has_thinking and show_reasoning else None
                 reasoning_text = ""
+                input_tokens = None
                 
                 for event in response["body"]:
                     try:
                         chunk = json.loads(event["chunk"]["bytes"])
                         
+                        # 입력 토큰 수 (사용량 지표)
+                        if chunk.get("type") == "message_start":
+                            input_tokens = chunk.get("message", {}).get("usage", {}).get("input_tokens")
+                        
                         # thinking 타입 처리 (reasoning 과정)
-                        if has_thinking and chunk.get("type") == "thinking":
+                        elif has_thinking and chunk.get("type") == "thinking":
                             if show_reasoning:
                                 thinking_content = chunk.get("thinking", "")
                                 reasoning_text += thinking_content
@@ -680,6 +774,11 @@ def generate_response(
                         print(f"청크 처리 오류: {str(chunk_error)}")
                 
                 message_placeholder.markdown(full_response)
+                
+                if mcp_enable:
+                    # 의도 분석 호출 + 답변 호출, 프롬프트에 추가된 도구 결과 길이
+                    usage_stats.record("prefetch", prefetch_tool_calls, 2,
+                                       len(anthropic_messages[-1]["content"]) - len(input_text), input_tokens)
                 return full_response
                 
             except Exception as e:
@@ -713,6 +812,177 @@ def generate_response(
             message_placeholder.markdown(error_message)
             return error_message
 
+def generate_agent_response(
+    client,
+    model_params: dict,
+    input_text: str,
+    chat_history: StreamlitChatMessageHistory,
+    resolution: Dict = None,
+    message_placeholder=None,
+    tools: List[str] = None,
+    table: TableData = None
+) -> str:
+    """
+    Bedrock tool use로 응답 생성 - 모델이 요청한 도구만 동시에 실행하고 결과를 이어서 스트리밍
+    
+    Args:
+        client: boto3 bedrock-runtime 클라이언트
+        model_params: 모델 파라미터
+        input_text: 사용자 입력
+        chat_history: 대화 기록
+        resolution: 로컬 날짜 표현 해석 결과 (있으면 질문과 함께 전달)
+        message_placeholder: 응답을 표시할 Streamlit placeholder
+        tools: 모델에 공개할 도구 이름 (기본값: AGENT_TOOLS)
+        table: 업로드한 표 데이터 (query_table 도구를 앱에서 직접 실행)
+        
+    Returns:
+        응답 텍스트
+    """
+    messages, system_content = convert_langchain_messages_to_anthropic(
+        [SystemMessage(content=model_params.get("system", ""))] + list(chat_history.messages)
+    )
+    # 대화 기록에 이미 추가된 현재 질문은 아래에서 다시 추가
+    if messages and messages[-1] == {"role": "user", "content": input_text}:
+        messages.pop()
+    user_text = input_text
+    if resolution:
+        # 이미 로컬에서 계산한 날짜는 도구 호출 없이 바로 사용하도록 함께 전달
+        user_text = f"{input_text}\n\n(참고 - 로컬 날짜 계산 결과)\n{mcp_client.format_datetime_resolution(resolution)}"
+    messages.append({"role": "user", "content": user_text})
+    
+    request_payload = {
+        "anthropic_version": model_params.get("anthropic_version", "bedrock-2023-05-31"),
+        "max_tokens": model_params.get("max_tokens", 8192),
+        "temperature": model_params.get("temperature", 0.0),
+        "messages": messages,
+        "system": system_content
+    }
+    if "top_p" in model_params:
+        request_payload["top_p"] = model_params["top_p"]
+    if "top_k" in model_params:
+        request_payload["top_k"] = model_params["top_k"]
+    
+    streamed = {"text": ""}
+    
+    def on_text(text_chunk: str):
+        streamed["text"] += text_chunk
+        if len(text_chunk) > 10 or text_chunk.endswith(('.', '!', '?', '\n')):
+            message_placeholder.markdown(streamed["text"] + "▌")
+    
+    def on_tools(calls: List[Dict]):
+        # 도구 실행 결과 표시 후 다음 라운드 텍스트와 구분
+        for call in calls:
+            label = "⚠️" if call["error"] else "🛠️"
+            with st.expander(f"{label} {call['name']} ({call['elapsed_ms']:.0f} ms)"):
+                st.markdown(f"`{json.dumps(call['input'], ensure_ascii=False)}`\n\n{call['text']}")
+        if streamed["text"] and not streamed["text"].endswith("\n"):
+            streamed["text"] += "\n\n"
+    
+    def execute_tool(name: str, arguments: Dict) -> Dict:
+        # 표 조회는 앱 프로세스의 데이터로 실행, 나머지는 MCP 도구
+        if name == "query_table" and table is not None:
+            return table.query(arguments)
+        return mcp_client.call_tool(name, arguments)
+    
+    agent = BedrockToolAgent(client, model_params["model_id"], execute_tool, tools)
+    try:
+        result = agent.run(request_payload, on_text=on_text, on_tools=on_tools)
+    except Exception as e:
+        error_detail = str(e)
+        print(f"상세 오류: {error_detail}")
+        if "ThrottlingException" in error_detail:
+            error_message = "요청을 처리하지 못했습니다. 잠시 후 다시 말씀해 주세요. 🙏"
+        else:
+            error_message = f"죄송합니다. 오류가 발생했습니다: {error_detail}"
+        message_placeholder.markdown(error_message)
+        return error_message
+    
+    full_response = streamed["text"] or result["text"]
+    message_placeholder.markdown(full_response)
+    st.caption(f"🛠️ 도구 호출 {len(result['tool_calls'])}회, 모델 호출 {result['rounds']}회")
+    
+    if table is None:
+        usage_stats.record("agent", len(result["tool_calls"]), result["rounds"], result["context_chars"],
+                           result["input_tokens"], estimate_prefetch_tool_calls(input_text))
+    else:
+        # 표 조회 응답은 prefetch 방식과 비교할 수 없으므로 따로 집계
+        usage_stats.record("table", len(result["tool_calls"]), result["rounds"], result["context_chars"], result["input_tokens"])
+    return full_response
+
+def generate_summary_response(
+    conversation_data: Tuple[boto3.client, dict],
+    input_text: str,
+    document: StoredDocument
+) -> str:
+    """
+    컨텍스트 예산보다 큰 문서의 요약 요청 - 조각 요약(map)을 동시에 실행한 뒤 합치기(reduce) 단계를 스트리밍
+    (조각 요약은 내용 해시로 캐시되므로 같은 문서에 다시 요약을 요청하면 합치기 단계만 호출)
+    
+    Args:
+        conversation_data: (boto3 클라이언트, 모델 파라미터)
+        input_text: 사용자 질문
+        document: 요약할 문서
+    
+    Returns:
+        응답 텍스트
+    """
+    client, model_params = conversation_data
+    model_id = model_params["model_id"]
+    
+    with st.chat_message("assistant"):
+        progress_bar = st.progress(0.0, text="📝 문서 조각 요약 준비 중...")
+        message_placeholder = st.empty()
+        full_response = ""
+        try:
+            mapped = document_summarizer.map(
+                client, model_id, document.read(),
+                lambda done, total: progress_bar.progress(done / total if total else 1.0,
+                                                          text=f"📝 문서 조각 요약 중... ({done}/{total})")
+            )
+            progress_bar.progress(1.0, text=f"📝 조각 요약 {mapped['chunks']}개를 합치는 중...")
+            
+            for text_chunk in document_summarizer.reduce_stream(
+                client, model_id, input_text, mapped["summaries"], model_params.get("system", ""),
+                model_params.get("max_tokens", 8192), model_params.get("temperature", 0.0)
+            ):
+                full_response += text_chunk
+                if len(text_chunk) > 10 or text_chunk.endswith(('.', '!', '?', '\n')):
+                    message_placeholder.markdown(full_response + "▌")
+        except Exception as e:
+            error_detail = str(e)
+            print(f"상세 오류: {error_detail}")
+            if "ThrottlingException" in error_detail:
+                error_message = "요청을 처리하지 못했습니다. 잠시 후 다시 말씀해 주세요. 🙏"
+            else:
+                error_message = f"죄송합니다. 오류가 발생했습니다: {error_detail}"
+            progress_bar.empty()
+            message_placeholder.markdown(error_message)
+            return error_message
+        
+        progress_bar.empty()
+        message_placeholder.markdown(full_response)
+        st.caption(f"📝 문서 조각 {mapped['chunks']}개 요약 후 합침 (캐시 재사용 {mapped['cached']}개, "
+                   f"조각 요약 {mapped['elapsed_ms'] / 1000:.1f}초, 문서 약 {mapped['document_tokens']:,} 토큰)")
+    return full_response
+
+def estimate_prefetch_tool_calls(query: str) -> int:
+    """
+    같은 질의를 prefetch 방식으로 처리했다면 실행했을 도구 호출 수 추정 (규칙 기반 의도 분석 사용)
+    LLM 의도 분석은 검색 필요 여부의 기본값이 True이므로 날짜/시간 전용 질의가 아니면 검색(키워드 추출 + 검색)을 포함합니다.
+    
+    Args:
+        query: 사용자 질의
+        
+    Returns:
+        추정 도구 호출 수
+    """
+    intent, _ = analyze_query_intent(query)
+    if intent == QueryIntent.DATETIME:
+        return 1
+    if intent == QueryIntent.MIXED:
+        return 3
+    return 2
+
 def analyze_query_intent_with_llm(query: str, client, chat_history=None) -> Dict:
     """
     Claude 3.7 모델을 사용하여 질의 의도를 분석합니다.
@@ -999,26 +1269,105 @@ def new_chat() -> None:
     st.session_state["widget_key"] = str(random.randint(1, 1000000))
     st.session_state.messages = []
     st.session_state.chat_history.clear()
-    st.session_state.context = None
+    st.session_state.document_key = None
     st.session_state.initial_system_message = None
+    st.session_state.document_table = None
+    st.session_state.ingest_job_id = None
+    st.session_state.ingest_cancelled_key = None
 
-def handle_file_upload(uploaded_file) -> str:
-    """파일 업로드 처리"""
-    if uploaded_file:
-        with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(uploaded_file.name)[1]) as tmp_file:
-            tmp_file.write(uploaded_file.getvalue())
-            tmp_file_path = tmp_file.name
-
-        try:
-            document_text = process_uploaded_file(tmp_file_path)
-            st.session_state.context = document_text  # 대용량 문서의 경우 메모리 부족 발생 가능
-            os.unlink(tmp_file_path)
-            return document_text
-        except Exception as e:
-            os.unlink(tmp_file_path)  # 에러 발생 시에도 임시 파일 삭제 필요
-            st.error(f"문서 처리 중 오류가 발생했습니다: {str(e)}")
-            return None
-    return None
+def ingest_upload(job: IngestJob, uploaded_file, key: str, file_ext: str) -> StoredDocument:
+    """
+    백그라운드 수집 작업 - 업로드 파일을 파싱하여 문서 저장소에 저장하고 큰 문서는 조각 색인까지 생성
+    (작업 스레드에서 실행되므로 Streamlit API를 호출하지 않음)
+    
+    Args:
+        job: 진행률 보고와 취소 확인에 사용할 작업
+        uploaded_file: Streamlit UploadedFile
+        key: 문서 키
+        file_ext: 파일 확장자
+    
+    Returns:
+        저장된 문서
+    """
+    with uploaded_file.getbuffer() as buffer:
+        if file_ext.lower() in TABLE_EXTENSIONS:
+            # 표 데이터는 청크 단위로 읽고 프롬프트에는 프로필만 사용
+            table = get_table(key, lambda: TableData.load(
+                buffer, file_ext, uploaded_file.name, lambda done, total: job.report(done, total, "표 데이터 읽기")
+            ))
+            return document_store.get(key) or document_store.put(key, table.profile, table.load_ms)
+        
+        # 추출한 페이지/섹션을 정리(마크업, 머리글/바닥글, 공백, 중복 줄 제거)한 뒤 저장
+        document, _ = document_store.get_or_parse(
+            key,
+            lambda: normalize_document(
+                iter_document(buffer, file_ext, lambda done, total: job.report(done, total, "텍스트 추출")), file_ext
+            )
+        )
+    if document.tokens > CONTEXT_TOKEN_BUDGET:
+        # 첫 질문이 색인 생성을 기다리지 않도록 미리 생성
+        job.report(0, 1, "색인 생성")
+        document_store.get_index(key, document_embedder)
+        job.report(1, 1)
+    return document
+
+def handle_file_upload(uploaded_file) -> Optional[StoredDocument]:
+    """
+    파일 업로드 처리 - 저장소에 준비된 문서는 바로 반환하고, 아니면 백그라운드 수집 작업을 제출
+    (작업이 끝나기 전에는 None을 반환하며, 완료되면 진행률 표시가 앱을 다시 실행하여 문서를 연결)
+    """
+    if not uploaded_file:
+        st.session_state.ingest_cancelled_key = None
+        return None
+    
+    file_ext = os.path.splitext(uploaded_file.name)[1]
+    table_mode = file_ext.lower() in TABLE_EXTENSIONS
+    st.session_state.document_table = None
+    # 업로드 버퍼를 복사하지 않고 바로 해시
+    with uploaded_file.getbuffer() as buffer:
+        key = content_key(buffer, file_ext)
+    if key == st.session_state.ingest_cancelled_key:
+        return None
+    st.session_state.ingest_cancelled_key = None
+    
+    job = ingest_manager.find(key)
+    if job is None or job.status == CANCELLED or (job.status == FAILED and job.id != st.session_state.ingest_job_id):
+        document = None if table_mode else document_store.open(key)
+        if document is not None and (document.tokens <= CONTEXT_TOKEN_BUDGET or document_store.index_ready(key, document_embedder)):
+            # 재시작 전이나 다른 세션에서 이미 처리한 문서는 작업 없이 바로 연결
+            st.session_state.document_key = key
+            return document_store.get(key)
+        job = ingest_manager.submit(key, uploaded_file.name, lambda job: ingest_upload(job, uploaded_file, key, file_ext))
+    st.session_state.ingest_job_id = job.id
+    
+    if job.status == FAILED:
+        st.error(f"문서 처리 중 오류가 발생했습니다: {job.error}")
+        return None
+    if job.status != DONE:
+        return None
+    
+    if table_mode:
+        with uploaded_file.getbuffer() as buffer:
+            st.session_state.document_table = get_table(key, lambda: TableData.load(buffer, file_ext, uploaded_file.name))
+    # 세션에는 문서 키만 보관하고 텍스트와 색인은 문서 저장소의 메모리 매핑으로 공유
+    st.session_state.document_key = key
+    return job.result
+
+@st.fragment(run_every=1.0)
+def show_ingest_progress(job_id: str) -> None:
+    """수집 작업 진행률과 취소 버튼 표시 (1초마다 이 부분만 갱신하고, 작업이 끝나면 앱 전체를 다시 실행)"""
+    job = ingest_manager.get(job_id)
+    if job is None:
+        return
+    if job.is_finished:
+        st.rerun()
+    
+    st.progress(job.progress, text=f"📄 {job.name}: {job.stage}" + (f" ({job.done}/{job.total})" if job.total > 1 else ""))
+    st.caption("문서를 처리하는 동안에도 대화할 수 있으며, 완료되면 문서가 자동으로 연결됩니다.")
+    if st.button("처리 취소", key=f"cancel_ingest_{job.id}"):
+        ingest_manager.cancel(job.id)
+        st.session_state.ingest_cancelled_key = job.key
+        st.rerun()
 
 def main() -> None:
     set_page_config()
@@ -1026,17 +1375,37 @@ def main() -> None:
 
     st.sidebar.button("New Chat", on_click=new_chat, type="primary")
 
-    temperature, top_p, top_k, max_tokens, memory_window, system_prompt, uploaded_file, model_name, extended_thinking, show_reasoning, mcp_enable = get_sidebar_params()
+    temperature, top_p, top_k, max_tokens, memory_window, system_prompt, uploaded_file, model_name, extended_thinking, show_reasoning, mcp_enable, agent_mode = get_sidebar_params()
 
     # 문서가 업로드되면 시스템 메시지 초기화
+    document = None
+    document_index = None
+    document_table = None
     if uploaded_file:
-        document_context = handle_file_upload(uploaded_file)
-        if document_context:
+        document = handle_file_upload(uploaded_file)
+        document_table = st.session_state.get("document_table")
+        job = ingest_manager.get(st.session_state.ingest_job_id)
+        if document is None and st.session_state.ingest_cancelled_key:
+            st.sidebar.info("문서 처리가 취소되었습니다. 다른 파일을 올리거나 파일을 다시 선택하세요.")
+        elif document is None and job is not None and not job.is_finished:
+            with st.sidebar:
+                show_ingest_progress(job.id)
+        if document is not None:
             st.sidebar.success(f"문서가 성공적으로 업로드되었습니다: {uploaded_file.name}")
-            # 문서 컨텍스트를 포함한 시스템 메시지 생성
-            full_system_prompt = f"{system_prompt}\n\n참고할 문서 내용:\n\n{document_context}"
+            if document.tokens <= CONTEXT_TOKEN_BUDGET:
+                # 작은 문서는 전체를 시스템 메시지에 포함
+                full_system_prompt = f"{system_prompt}\n\n참고할 문서 내용:\n\n{document.read()}"
+            else:
+                # 큰 문서는 조각 색인(없으면 생성하여 저장)을 불러와 질문마다 관련 조각만 포함
+                with st.spinner("문서 색인 준비 중..."):
+                    document_index = document_store.get_index(document.key, document_embedder)
+                full_system_prompt = system_prompt
             st.session_state.initial_system_message = full_system_prompt
 
+    # 업로드 처리 후 표시하여 이번 재실행의 문서 저장소 결과까지 반영
+    if mcp_enable or uploaded_file:
+        show_metrics_sidebar(mcp_enable, document_index, document_table)
+
     # 시스템 프롬프트 설정
     if st.session_state.initial_system_message:
         system_prompt = st.session_state.initial_system_message
@@ -1058,8 +1427,24 @@ def main() -> None:
         with st.chat_message("user"):
             st.markdown(prompt)
 
-        # 응답 생성 및 세션 저장 (UI 표시는 generate_response에서 이미 처리됨)
-        response = generate_response(conv_chain, prompt, st.session_state.chat_history, show_reasoning, mcp_enable)
+        if document_index is not None and is_summary_request(prompt):
+            # 큰 문서 요약은 관련 조각 몇 개로는 부족하므로 문서 전체를 조각별로 요약한 뒤 합침
+            response = generate_summary_response(conv_chain, prompt, document)
+        else:
+            if document_index is not None:
+                # 질문과 관련된 문서 조각만 토큰 예산 안에서 시스템 메시지에 포함
+                retrieval = document_index.retrieve(prompt)
+                client, model_params = conv_chain
+                conv_chain = (client, {
+                    **model_params,
+                    "system": f"{system_prompt}\n\n참고할 문서 내용 (질문과 관련된 부분):\n\n{retrieval['text']}"
+                })
+                st.caption(f"📄 문서 조각 {len(retrieval['chunks'])}/{len(document_index.chunks)}개 사용 "
+                           f"({retrieval['elapsed_ms']:.1f} ms, 약 {retrieval['tokens_saved']:,} 토큰 절감)")
+
+            # 응답 생성 및 세션 저장 (UI 표시는 generate_response에서 이미 처리됨)
+            response = generate_response(conv_chain, prompt, st.session_state.chat_history, show_reasoning, mcp_enable, agent_mode,
+                                         document_table)
         
         # 세션 상태 업데이트만 수행 (UI 표시는 하지 않음)
         st.session_state.messages.append({"role": "assistant", "content": response})
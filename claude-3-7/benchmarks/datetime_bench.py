@@ -0,0 +1,207 @@
+#!/usr/bin/env python
+"""
+날짜/시간 서비스 벤치마크
+
+기존 방식(pytz 시간대를 호출마다 3번 조회하고 날짜/시간/부가 정보를 각각 다른 시점에서 계산)과
+단일 시점 캡처 + 시간대 캐시 방식(DatetimeMCPServer.get_datetime_info)의
+처리량(calls/sec)과 결과 일관성을 비교합니다.
+
+일관성 검사는 호출마다 시계를 --clock-step 초씩 진행시키는 가짜 시계로 자정 직전부터 실행하여
+한 결과 안의 날짜(day), 시각(hour/minute/second), ISO 문자열이 서로 다른 시점을 가리키는 비율을 셉니다.
+기존 방식 재현에는 pytz가 필요합니다 (pip install pytz).
+
+마지막으로 로컬 날짜 해석(datetime_resolver)의 즉시 응답 여부를 검사합니다. 날짜/시간만 묻는 질의는 모델 호출 없이
+답하고(confident=True), 날짜 표현에 다른 내용어가 붙은 질의("어제 주가", "내일 날씨 어때?")는 모델에 넘겨야 합니다.
+
+사용법:
+    python benchmarks/datetime_bench.py --repeat 20000
+    python benchmarks/datetime_bench.py --resolver-only
+    python benchmarks/datetime_bench.py --timezones Asia/Seoul America/New_York Europe/London
+"""
+import os
+import sys
+import time
+import types
+import argparse
+import datetime
+from typing import Callable, Dict, Any
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import datetime_mcp_server
+from datetime_mcp_server import DatetimeMCPServer
+
+# 모델 호출 없이 바로 답해야 하는 질의
+SHORT_CIRCUIT_QUERIES = [
+    "지금 몇 시야?", "지금 몇 시 몇 분이야?", "오늘 며칠이야?", "오늘 무슨 요일이야?", "내일은 무슨 요일이야",
+    "어제는 며칠이었어?", "모레는 며칠이에요?", "3일 후는 며칠이야?", "2주 뒤는 무슨 요일이야?", "다음 주 금요일은 며칠이야?",
+    "광복절은 무슨 요일이야?", "크리스마스까지 며칠 남았어?", "크리스마스까지 몇 주 남았어?", "2020년 3월 1일부터 며칠 지났어?",
+    "오늘 날짜 알려줘", "what time is it", "what day is it today", "how many days until christmas",
+]
+
+# 날짜 표현 외에 내용어가 있어 모델(검색)에 넘겨야 하는 질의 (한 글자 내용어 포함)
+HANDOFF_QUERIES = [
+    "어제 주가", "1년 후 주가는?", "어제 분", "내일 가", "어제 일", "내일 날씨 어때?", "내일 주식", "어제 회의",
+]
+
+
+def legacy_datetime_info(timezone: str = "Asia/Seoul", clock=datetime) -> Dict[str, Any]:
+    """기존 방식: 날짜, 시간, 부가 정보를 각각 pytz.timezone 조회 후 별도 시점에서 계산"""
+    import pytz
+    
+    def current_date():
+        now = clock.datetime.now(pytz.timezone(timezone))
+        weekday_kr = ["월요일", "화요일", "수요일", "목요일", "금요일", "토요일", "일요일"]
+        weekday_en = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+        month_kr = ["1월", "2월", "3월", "4월", "5월", "6월", "7월", "8월", "9월", "10월", "11월", "12월"]
+        return {
+            "year": now.year, "month": now.month, "day": now.day, "weekday": now.weekday(),
+            "weekday_kr": weekday_kr[now.weekday()], "weekday_en": weekday_en[now.weekday()],
+            "month_name_kr": month_kr[now.month - 1], "month_name_en": now.strftime("%B"),
+            "day_of_year": now.timetuple().tm_yday, "week_of_year": int(now.strftime("%V")),
+        }
+    
+    def current_time():
+        # 기존 코드 그대로: 시간대가 지정된 datetime을 pytz의 tzname/utcoffset에 넘기면 ValueError가 발생하여
+        # 항상 UTC+9 고정 시간대 예외 경로로 처리됨
+        try:
+            tz = pytz.timezone(timezone)
+            now = clock.datetime.now(tz)
+            return {
+                "hour": now.hour, "minute": now.minute, "second": now.second,
+                "ampm": "오전" if now.hour < 12 else "오후",
+                "hour_12": now.hour % 12 if now.hour % 12 != 0 else 12,
+                "timezone": timezone, "timezone_name": tz.tzname(now),
+                "timezone_offset": int(tz.utcoffset(now).total_seconds() / 3600), "timestamp": now.timestamp(),
+            }
+        except Exception as e:
+            now = clock.datetime.now(datetime.timezone(datetime.timedelta(hours=9)))
+            return {
+                "hour": now.hour, "minute": now.minute, "second": now.second,
+                "ampm": "오전" if now.hour < 12 else "오후",
+                "hour_12": now.hour % 12 if now.hour % 12 != 0 else 12,
+                "timezone": "Asia/Seoul", "timezone_name": "KST", "timezone_offset": 9,
+                "timestamp": now.timestamp(), "error": str(e),
+            }
+    
+    date_info = current_date()
+    time_info = current_time()
+    tz = pytz.timezone(timezone)
+    now = clock.datetime.now(tz)
+    start_of_day = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    start_of_year = tz.localize(datetime.datetime(now.year, 1, 1))
+    end_of_year = tz.localize(datetime.datetime(now.year + 1, 1, 1))
+    additional_info = {
+        "iso_format": now.isoformat(),
+        "elapsed_seconds_today": int((now - start_of_day).total_seconds()),
+        "remaining_seconds_today": int((start_of_day + datetime.timedelta(days=1) - now).total_seconds()),
+        "elapsed_days_this_year": (now - start_of_year).days,
+        "remaining_days_this_year": (end_of_year - now).days,
+    }
+    return {**date_info, **time_info, **additional_info}
+
+
+def make_stepping_clock(start: datetime.datetime, step: float):
+    """now()가 호출될 때마다 step초씩 진행하는 가짜 datetime 모듈"""
+    state = {"current": start}
+    
+    class SteppingDatetime(datetime.datetime):
+        @classmethod
+        def now(cls, tz=None):
+            current = state["current"]
+            state["current"] = current + datetime.timedelta(seconds=step)
+            return current.astimezone(tz) if tz is not None else current
+    
+    clock = types.SimpleNamespace(**{name: getattr(datetime, name) for name in dir(datetime) if not name.startswith("__")})
+    clock.datetime = SteppingDatetime
+    return clock
+
+
+def is_consistent(info: Dict[str, Any]) -> bool:
+    """결과의 날짜/시각/ISO 문자열이 같은 시점을 가리키는지 확인"""
+    iso = datetime.datetime.fromisoformat(info["iso_format"])
+    return (iso.day, iso.hour, iso.minute, iso.second) == (info["day"], info["hour"], info["minute"], info["second"])
+
+
+def throughput(fn: Callable, repeat: int) -> float:
+    """초당 호출 수"""
+    fn()  # 워밍업
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return repeat / (time.perf_counter() - start)
+
+
+def check_resolver() -> int:
+    """즉시 응답 여부가 기대와 다른 질의 수"""
+    server = DatetimeMCPServer(timezone="Asia/Seoul")
+    failures = 0
+    for expected, queries in ((True, SHORT_CIRCUIT_QUERIES), (False, HANDOFF_QUERIES)):
+        for query in queries:
+            resolution = server.resolve_expression(query)
+            confident = bool(resolution and resolution["confident"])
+            if confident != expected:
+                failures += 1
+                leftover = resolution["leftover"] if resolution else None
+                print(f"  실패: {query!r} confident={confident} (기대 {expected}, 남은 단어 {leftover})")
+    total = len(SHORT_CIRCUIT_QUERIES) + len(HANDOFF_QUERIES)
+    print(f"  즉시 응답 {len(SHORT_CIRCUIT_QUERIES)}개, 모델 전달 {len(HANDOFF_QUERIES)}개 중 통과 {total - failures}/{total}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="날짜/시간 서비스 벤치마크")
+    parser.add_argument('--repeat', type=int, default=20000, help='처리량 측정 반복 횟수 (기본값: 20000)')
+    parser.add_argument('--timezones', nargs='+', default=["Asia/Seoul", "America/New_York", "Europe/London", "Asia/Kolkata"],
+                        help='다중 시간대 비교에 사용할 시간대')
+    parser.add_argument('--clock-step', type=float, default=0.4, help='일관성 검사 시 now() 호출마다 진행할 초 (기본값: 0.4)')
+    parser.add_argument('--samples', type=int, default=1000, help='일관성 검사 횟수 (기본값: 1000)')
+    parser.add_argument('--resolver-only', action='store_true', help='날짜 질의 즉시 응답 검사만 실행 (pytz 불필요)')
+    args = parser.parse_args()
+    
+    if args.resolver_only:
+        print("날짜 질의 즉시 응답 검사")
+        sys.exit(1 if check_resolver() else 0)
+    
+    server = DatetimeMCPServer(timezone=args.timezones[0])
+    
+    print(f"처리량 ({args.repeat}회)")
+    legacy_rate = throughput(lambda: legacy_datetime_info(args.timezones[0]), args.repeat)
+    snapshot_rate = throughput(server.get_datetime_info, args.repeat)
+    print(f"  기존 방식 get_datetime_info      {legacy_rate:>10,.0f} calls/sec")
+    print(f"  단일 시점 get_datetime_info      {snapshot_rate:>10,.0f} calls/sec  (x{snapshot_rate / legacy_rate:.1f})")
+    
+    zones = args.timezones
+    loop_rate = throughput(lambda: [legacy_datetime_info(zone) for zone in zones], max(args.repeat // len(zones), 1))
+    many_rate = throughput(lambda: server.get_datetime_info_many(zones), max(args.repeat // len(zones), 1))
+    print(f"  기존 방식 시간대 {len(zones)}개 반복         {loop_rate:>10,.0f} batches/sec")
+    print(f"  get_datetime_info_many ({len(zones)}개)     {many_rate:>10,.0f} batches/sec  (x{many_rate / loop_rate:.1f})")
+    
+    # 자정 10초 전부터 가짜 시계로 일관성 검사
+    start = datetime.datetime(2025, 12, 31, 14, 59, 50, tzinfo=datetime.timezone.utc)  # 서울 기준 자정 10초 전
+    print(f"\n일관성 (now() 호출마다 {args.clock_step}초 진행, {args.samples}회)")
+    
+    legacy_clock = make_stepping_clock(start, args.clock_step)
+    legacy_bad = sum(not is_consistent(legacy_datetime_info("Asia/Seoul", legacy_clock)) for _ in range(args.samples))
+    
+    original = datetime_mcp_server.datetime
+    datetime_mcp_server.datetime = make_stepping_clock(start, args.clock_step)
+    try:
+        snapshot_server = DatetimeMCPServer(timezone="Asia/Seoul")
+        snapshot_bad = sum(not is_consistent(snapshot_server.get_datetime_info()) for _ in range(args.samples))
+        many = snapshot_server.get_datetime_info_many(zones)
+        instants = {datetime.datetime.fromisoformat(info["iso_format"]).astimezone(datetime.timezone.utc) for info in many.values()}
+    finally:
+        datetime_mcp_server.datetime = original
+    
+    print(f"  기존 방식: 불일치 {legacy_bad}/{args.samples} ({legacy_bad / args.samples:.1%})")
+    print(f"  단일 시점: 불일치 {snapshot_bad}/{args.samples} ({snapshot_bad / args.samples:.1%})")
+    print(f"  get_datetime_info_many: 시간대 {len(zones)}개가 가리키는 시점 {len(instants)}개")
+    
+    print("\n날짜 질의 즉시 응답 검사")
+    if check_resolver():
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
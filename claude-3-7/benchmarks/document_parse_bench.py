@@ -0,0 +1,243 @@
+#!/usr/bin/env python
+"""
+문서 파싱 벤치마크
+
+기존 방식(UploadedFile.getvalue()로 복사한 내용을 임시 파일에 쓰고 경로로 다시 열어 파싱)과
+document_parser.parse_document(업로드 버퍼의 memoryview를 임시 파일 없이 바로 파싱)의
+처리 시간과 최대 메모리 사용량(peak RSS)을 비교합니다.
+
+측정은 방식마다 새 인터프리터에서 실행합니다. 파서 라이브러리 임포트와 업로드 버퍼(BytesIO) 준비가 끝난
+시점의 최대 RSS를 기준으로, 파싱 중 늘어난 최대 RSS를 보고합니다.
+PDF와 XLSX 입력 파일은 --size-mb 크기로 생성하여 --workdir에 보관합니다 (다시 실행하면 재사용).
+
+사용법:
+    python benchmarks/document_parse_bench.py
+    python benchmarks/document_parse_bench.py --size-mb 5 --formats pdf --repeat 3
+"""
+import io
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import tempfile
+import subprocess
+from typing import Dict, Any, List, Callable, Optional
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+MODES = ["tempfile", "buffer"]
+
+
+def legacy_process_uploaded_file(file_path: str) -> str:
+    """기존 방식: 임시 파일 경로로 파싱 (app.py의 이전 process_uploaded_file과 동일한 처리)"""
+    import pandas as pd
+    file_ext = os.path.splitext(file_path)[1].lower()
+    
+    if file_ext == '.pdf':
+        from PyPDF2 import PdfReader
+        reader = PdfReader(file_path)
+        text = ""
+        for page in reader.pages:
+            text += page.extract_text() + "\n"
+        return text
+    elif file_ext in ['.doc', '.docx']:
+        from docx import Document
+        doc = Document(file_path)
+        text = ""
+        for para in doc.paragraphs:
+            text += para.text + "\n"
+        return text
+    elif file_ext in ['.xls', '.xlsx']:
+        return pd.read_excel(file_path).to_string()
+    elif file_ext in ['.ppt', '.pptx']:
+        from pptx import Presentation
+        text = []
+        prs = Presentation(file_path)
+        for slide in prs.slides:
+            for shape in slide.shapes:
+                if hasattr(shape, "text"):
+                    text.append(shape.text)
+        return "\n\n".join(text)
+    raise ValueError(f"벤치마크에서 지원하지 않는 형식입니다: {file_ext}")
+
+
+def legacy_handle_upload(uploaded_file, file_ext: str) -> str:
+    """기존 방식: getvalue() 복사 → 임시 파일 쓰기 → 경로로 파싱 → 삭제"""
+    with tempfile.NamedTemporaryFile(delete=False, suffix=file_ext) as tmp_file:
+        tmp_file.write(uploaded_file.getvalue())
+        tmp_file_path = tmp_file.name
+    try:
+        return legacy_process_uploaded_file(tmp_file_path)
+    finally:
+        os.unlink(tmp_file_path)
+
+
+def buffer_handle_upload(uploaded_file, file_ext: str) -> str:
+    """개선 방식: 업로드 버퍼를 임시 파일 없이 바로 파싱"""
+    from document_parser import parse_document
+    with uploaded_file.getbuffer() as buffer:
+        return parse_document(buffer, file_ext)
+
+
+def _pdf_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_pdf(path: str, size_mb: float = 0, pages: int = 0, page_lines: Optional[Callable[[int], List[str]]] = None):
+    """
+    지정한 크기(또는 페이지 수)의 텍스트 PDF 생성 (페이지마다 압축되지 않은 내용 스트림)
+    
+    Args:
+        path: 저장 경로
+        size_mb: 목표 크기(MB), pages가 0일 때 사용
+        pages: 페이지 수
+        page_lines: 페이지 번호(1부터)를 받아 그 페이지의 줄 목록을 반환하는 함수 (없으면 기본 보고서 문장)
+    """
+    target = int(size_mb * 1024 * 1024)
+    objects: List[bytes] = [b"", b""]  # 1: Catalog, 2: Pages (마지막에 채움)
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")  # 3: 글꼴
+    page_ids = []
+    written = 0
+    page = 0
+    
+    while (page < pages) if pages else (written < target):
+        page += 1
+        if page_lines:
+            lines = page_lines(page)
+        else:
+            lines = [f"Page {page} line {line}: quarterly revenue report section {page * 100 + line} "
+                     f"with figures {page * line % 9973} and notes" for line in range(60)]
+        content = "BT /F1 9 Tf 12 TL 36 800 Td " + " ".join(f"({_pdf_escape(line)}) Tj T*" for line in lines) + " ET"
+        stream = content.encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        content_id = len(objects)
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] /Resources << /Font << /F1 3 0 R >> >> "
+                       b"/Contents %d 0 R >>" % content_id)
+        page_ids.append(len(objects))
+        written += len(stream) + 200
+    
+    objects[0] = b"<< /Type /Catalog /Pages 2 0 R >>"
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % page_id for page_id in page_ids), len(page_ids)
+    )
+    
+    with open(path, "wb") as f:
+        f.write(b"%PDF-1.4\n")
+        offsets = []
+        for number, body in enumerate(objects, start=1):
+            offsets.append(f.tell())
+            f.write(b"%d 0 obj\n%s\nendobj\n" % (number, body))
+        xref = f.tell()
+        f.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+        for offset in offsets:
+            f.write(b"%010d 00000 n \n" % offset)
+        f.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+
+
+def make_xlsx(path: str, size_mb: float):
+    """지정한 크기 이상의 XLSX 생성 (행 단위로 쓰면서 파일 크기 확인)"""
+    from openpyxl import Workbook
+    target = int(size_mb * 1024 * 1024)
+    rows = 20000
+    
+    while True:
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet("data")
+        sheet.append(["id", "region", "product", "quantity", "price", "memo"])
+        for row in range(rows):
+            sheet.append([row, f"region-{row % 17}", f"product-{row % 311}", row % 97, round(row * 0.37, 2),
+                          f"order note {row} shipped via carrier {row % 7}"])
+        workbook.save(path)
+        size = os.path.getsize(path)
+        if size >= target:
+            return
+        # 압축률을 반영하여 행 수를 다시 추정
+        rows = int(rows * target / size * 1.02) + 1
+
+
+def ensure_fixture(workdir: str, file_format: str, size_mb: float) -> str:
+    """입력 파일이 없으면 생성"""
+    path = os.path.join(workdir, f"bench_{size_mb:g}mb.{file_format}")
+    if not os.path.exists(path):
+        print(f"{path} 생성 중...", file=sys.stderr)
+        (make_pdf if file_format == "pdf" else make_xlsx)(path, size_mb)
+    return path
+
+
+def _max_rss_mb() -> float:
+    # Linux의 ru_maxrss는 KB 단위
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_worker(mode: str, path: str):
+    """새 인터프리터에서 한 방식을 실행하고 결과를 JSON으로 출력"""
+    import pandas  # noqa: F401 - 파서 라이브러리 임포트 비용을 기준선에 포함
+    import PyPDF2  # noqa: F401
+    import openpyxl  # noqa: F401
+    
+    file_ext = os.path.splitext(path)[1]
+    with open(path, "rb") as f:
+        uploaded_file = io.BytesIO(f.read())  # Streamlit UploadedFile은 BytesIO 하위 클래스
+    baseline = _max_rss_mb()
+    
+    handle = legacy_handle_upload if mode == "tempfile" else buffer_handle_upload
+    start = time.perf_counter()
+    text = handle(uploaded_file, file_ext)
+    elapsed = time.perf_counter() - start
+    
+    print(json.dumps({
+        "seconds": elapsed,
+        "peak_rss_mb": _max_rss_mb(),
+        "rss_growth_mb": _max_rss_mb() - baseline,
+        "chars": len(text)
+    }))
+
+
+def measure(mode: str, path: str) -> Dict[str, Any]:
+    """방식 하나를 별도 프로세스에서 측정"""
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--worker", mode, path],
+        capture_output=True, text=True, check=True
+    )
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="문서 파싱 벤치마크 (임시 파일 vs 메모리 버퍼)")
+    parser.add_argument('--formats', nargs='+', default=["pdf", "xlsx"], choices=["pdf", "xlsx"], help='측정할 형식')
+    parser.add_argument('--size-mb', type=float, default=50, help='입력 파일 크기(MB)')
+    parser.add_argument('--repeat', type=int, default=1, help='방식별 반복 횟수 (최솟값 보고)')
+    parser.add_argument('--workdir', default=tempfile.gettempdir(), help='입력 파일 보관 디렉터리')
+    parser.add_argument('--worker', nargs=2, metavar=('MODE', 'PATH'), help=argparse.SUPPRESS)
+    
+    args = parser.parse_args()
+    
+    if args.worker:
+        run_worker(*args.worker)
+        return
+    
+    print(f"{'형식':<6} {'방식':<10} {'시간(s)':>9} {'peak RSS(MB)':>13} {'RSS 증가(MB)':>13} {'문자 수':>12}")
+    for file_format in args.formats:
+        path = ensure_fixture(args.workdir, file_format, args.size_mb)
+        results = {}
+        for mode in MODES:
+            runs = [measure(mode, path) for _ in range(args.repeat)]
+            best = min(runs, key=lambda run: run["seconds"])
+            best["rss_growth_mb"] = min(run["rss_growth_mb"] for run in runs)
+            results[mode] = best
+            print(f"{file_format:<6} {mode:<10} {best['seconds']:>9.2f} {best['peak_rss_mb']:>13.1f} "
+                  f"{best['rss_growth_mb']:>13.1f} {best['chars']:>12,}")
+        
+        legacy, buffered = results["tempfile"], results["buffer"]
+        if legacy["chars"] != buffered["chars"]:
+            print(f"경고: {file_format} 추출 결과 길이가 다릅니다.", file=sys.stderr)
+        print(f"{file_format:<6} {'개선':<10} {legacy['seconds'] / buffered['seconds']:>8.2f}x "
+              f"{legacy['peak_rss_mb'] - buffered['peak_rss_mb']:>+13.1f} "
+              f"{legacy['rss_growth_mb'] - buffered['rss_growth_mb']:>+13.1f}")
+        print(f"       입력 크기 {os.path.getsize(path) / 1024 / 1024:.1f} MB")
+
+if __name__ == "__main__":
+    main()
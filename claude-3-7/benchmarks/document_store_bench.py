@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+"""
+문서 저장소 벤치마크
+
+기존 방식(파싱한 텍스트와 조각 색인을 프로세스 메모리에 보관)과 document_store(텍스트와 색인을 디스크에 저장하고
+메모리 매핑으로 읽음)의 준비 시간과 메모리를 비교합니다.
+
+방식마다 새 인터프리터에서 문서를 준비한 뒤 여러 세션이 같은 문서에 질문하는 상황을 흉내 내고,
+프로세스 힙 메모리(RssAnon)와 매핑된 파일 페이지(RssFile, 페이지 캐시라서 프로세스 간 공유되고 회수 가능)를 보고합니다.
+- memory: 재시작할 때마다 다시 파싱하고 색인 생성 (기존 방식)
+- store-cold: 저장소가 비어 있는 첫 업로드 (파싱, 색인 생성 후 저장)
+- store-warm: 재시작 후 같은 문서 (디스크에서 불러오기만 함)
+
+사용법:
+    python benchmarks/document_store_bench.py
+    python benchmarks/document_store_bench.py --pages 1000 --sessions 50
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+from typing import Dict, Any
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+from document_parse_bench import make_pdf
+
+MODES = ["memory", "store-cold", "store-warm"]
+
+QUESTIONS = ["quarterly revenue section 4242", "figures and notes for page 120", "report section 31337",
+             "page 7 line 12", "notes 9001"]
+
+
+def _memory_mb() -> Dict[str, float]:
+    """/proc/self/status의 힙(RssAnon)과 파일 매핑(RssFile) 메모리 (MB)"""
+    values = {}
+    with open("/proc/self/status") as f:
+        for line in f:
+            name, _, value = line.partition(":")
+            if name in ("RssAnon", "RssFile"):
+                values[name] = int(value.split()[0]) / 1024
+    return values
+
+
+def run_worker(mode: str, path: str, store_dir: str, sessions: int):
+    """새 인터프리터에서 한 방식을 실행하고 결과를 JSON으로 출력"""
+    import gc
+    import PyPDF2  # noqa: F401 - 파서 라이브러리 임포트 비용을 기준선에 포함
+    from document_parser import parse_document
+    from document_index import DocumentIndex
+    from document_store import DocumentStore, content_key
+    
+    with open(path, "rb") as f:
+        data = f.read()
+    gc.collect()
+    baseline = _memory_mb()
+    
+    start = time.perf_counter()
+    if mode == "memory":
+        text = parse_document(data, ".pdf")
+        index = DocumentIndex(text)
+        # 세션마다 같은 텍스트를 참조 (session_state.context)
+        session_contexts = [text for _ in range(sessions)]
+    else:
+        store = DocumentStore(store_dir)
+        key = content_key(data, ".pdf")
+        document, _ = store.get_or_parse(key, lambda payload=data: parse_document(payload, ".pdf"))
+        index = store.get_index(key)
+        # 세션에는 문서 키만 보관
+        session_contexts = [document.key for _ in range(sessions)]
+    ready = time.perf_counter() - start
+    del data
+    gc.collect()
+    loaded = _memory_mb()
+    
+    start = time.perf_counter()
+    for session in range(sessions):
+        for question in QUESTIONS:
+            index.retrieve(f"{question} {session}")
+    query_ms = (time.perf_counter() - start) * 1000 / (sessions * len(QUESTIONS))
+    gc.collect()
+    after = _memory_mb()
+    
+    print(json.dumps({
+        "ready_seconds": ready,
+        "query_ms": query_ms,
+        "anon_mb": loaded["RssAnon"] - baseline["RssAnon"],
+        "anon_after_sessions_mb": after["RssAnon"] - baseline["RssAnon"],
+        "file_mb": after["RssFile"] - baseline["RssFile"],
+        "sessions": len(session_contexts)
+    }))
+
+
+def measure(mode: str, path: str, store_dir: str, sessions: int) -> Dict[str, Any]:
+    """방식 하나를 별도 프로세스에서 측정"""
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--worker", mode, path, store_dir, str(sessions)],
+        capture_output=True, text=True, check=True
+    )
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="문서 저장소 벤치마크 (프로세스 메모리 vs 디스크 + 메모리 매핑)")
+    parser.add_argument('--pages', type=int, default=500, help='PDF 페이지 수')
+    parser.add_argument('--sessions', type=int, default=20, help='같은 문서에 질문하는 세션 수')
+    parser.add_argument('--workdir', default=tempfile.gettempdir(), help='입력 파일 보관 디렉터리')
+    parser.add_argument('--worker', nargs=4, metavar=('MODE', 'PATH', 'STORE', 'SESSIONS'), help=argparse.SUPPRESS)
+    
+    args = parser.parse_args()
+    
+    if args.worker:
+        mode, path, store_dir, sessions = args.worker
+        run_worker(mode, path, store_dir, int(sessions))
+        return
+    
+    path = os.path.join(args.workdir, f"ingest_{args.pages}p.pdf")
+    if not os.path.exists(path):
+        make_pdf(path, pages=args.pages)
+    store_dir = tempfile.mkdtemp(prefix="document_store_bench_")
+    
+    try:
+        print(f"입력: {args.pages}페이지 PDF ({os.path.getsize(path) / 1024 / 1024:.1f} MB), 세션 {args.sessions}개")
+        print(f"{'방식':<11} {'준비(ms)':>10} {'질의(ms)':>9} {'힙(MB)':>8} {'세션 후 힙(MB)':>15} {'파일 매핑(MB)':>14}")
+        for mode in MODES:
+            result = measure(mode, path, store_dir, args.sessions)
+            print(f"{mode:<11} {result['ready_seconds'] * 1000:>10.1f} {result['query_ms']:>9.2f} {result['anon_mb']:>8.1f} "
+                  f"{result['anon_after_sessions_mb']:>15.1f} {result['file_mb']:>14.1f}")
+        
+        usage = sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(store_dir) for name in names)
+        print(f"저장소 디스크 사용량: {usage / 1024 / 1024:.1f} MB")
+    finally:
+        shutil.rmtree(store_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
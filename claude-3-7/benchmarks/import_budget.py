@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+"""
+모듈 임포트 시간 예산 검사
+
+각 모듈을 새 인터프리터에서 네트워크 연결을 차단한 상태로 임포트하여
+임포트 시간이 예산 이내인지, 임포트 중 네트워크 접근 시도가 없는지 확인합니다.
+(NLTK 리소스 다운로드처럼 임포트 시점에 네트워크를 사용하는 코드를 막기 위한 검사)
+
+사용법:
+    python benchmarks/import_budget.py
+    python benchmarks/import_budget.py --budget-ms 300 --path ../claude-v3/aws-search-bot nltk_loader
+"""
+import os
+import sys
+import json
+import argparse
+import subprocess
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_MODULES = [
+    "keyword_extractor",
+    "ttl_cache",
+    "duckduckgo_mcp_server",
+    "google_search_mcp_server",
+    "search_dispatcher",
+    "datetime_mcp_server",
+    "datetime_resolver",
+    "mcp_client",
+]
+
+# 자식 프로세스에서 실행되는 코드: 소켓 연결을 차단하고 임포트 시간 측정
+PROBE = r"""
+import json, socket, sys, time
+attempts = []
+def _blocked(self, address, *args, **kwargs):
+    attempts.append(str(address))
+    raise OSError("network disabled by import budget check")
+socket.socket.connect = _blocked
+socket.socket.connect_ex = _blocked
+socket.create_connection = lambda address, *a, **k: _blocked(None, address)
+start = time.perf_counter()
+error = None
+try:
+    __import__(sys.argv[1])
+except Exception as e:
+    error = f"{type(e).__name__}: {e}"
+elapsed_ms = (time.perf_counter() - start) * 1000
+print(json.dumps({"elapsed_ms": elapsed_ms, "network_attempts": attempts, "error": error}))
+"""
+
+
+def check(module: str, path: str) -> dict:
+    env = os.environ.copy()
+    env["PYTHONPATH"] = path + os.pathsep + env.get("PYTHONPATH", "")
+    proc = subprocess.run(
+        [sys.executable, "-c", PROBE, module],
+        cwd=path, env=env, capture_output=True, text=True, timeout=120
+    )
+    lines = [line for line in proc.stdout.splitlines() if line.startswith("{")]
+    if not lines:
+        return {"elapsed_ms": None, "network_attempts": [], "error": proc.stderr.strip()[-300:]}
+    return json.loads(lines[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="모듈 임포트 시간 예산 검사")
+    parser.add_argument('modules', nargs='*', help='검사할 모듈 (기본값: claude-3-7 MCP 모듈)')
+    parser.add_argument('--path', default=APP_DIR, help='모듈 경로 (기본값: claude-3-7)')
+    parser.add_argument('--budget-ms', type=float, default=1500, help='모듈별 임포트 시간 예산(ms) (기본값: 1500)')
+    args = parser.parse_args()
+    
+    modules = args.modules or DEFAULT_MODULES
+    failed = False
+    
+    print(f"{'module':<28} {'import ms':>10}  result")
+    for module in modules:
+        result = check(module, os.path.abspath(args.path))
+        elapsed = result["elapsed_ms"]
+        
+        problems = []
+        if result["error"]:
+            problems.append(f"임포트 오류 ({result['error']})")
+        if result["network_attempts"]:
+            problems.append(f"네트워크 접근 시도 {len(result['network_attempts'])}회")
+        if elapsed is not None and elapsed > args.budget_ms:
+            problems.append(f"예산 {args.budget_ms:.0f} ms 초과")
+        
+        failed = failed or bool(problems)
+        elapsed_text = f"{elapsed:.1f}" if elapsed is not None else "-"
+        print(f"{module:<28} {elapsed_text:>10}  {'; '.join(problems) if problems else 'OK'}")
+    
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+"""
+키워드 추출 벤치마크
+
+benchmarks/fixtures/keyword_queries.json의 질의 세트로 로컬 키워드 추출기
+(keyword_extractor.KeywordExtractor)의 지연 시간과 기준 키워드와의 겹침 정도를 측정합니다.
+--live 옵션을 주면 Claude 3.7 키워드 추출도 호출하여 지연 시간과 겹침을 함께 비교합니다.
+
+사용법:
+    python benchmarks/keyword_bench.py
+    python benchmarks/keyword_bench.py --live   # AWS 자격 증명 필요
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+from typing import List, Dict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from keyword_extractor import default_extractor
+
+FIXTURE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "keyword_queries.json")
+
+
+def overlap(predicted: List[str], reference: List[str]) -> Dict[str, float]:
+    """대소문자를 무시한 키워드 집합의 Jaccard 유사도와 재현율"""
+    pred = {word.lower() for word in predicted}
+    ref = {word.lower() for word in reference}
+    if not pred and not ref:
+        return {"jaccard": 1.0, "recall": 1.0}
+    return {
+        "jaccard": len(pred & ref) / len(pred | ref),
+        "recall": len(pred & ref) / len(ref) if ref else 0.0
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="키워드 추출 벤치마크")
+    parser.add_argument('--repeat', type=int, default=1000, help='로컬 추출기 반복 횟수 (기본값: 1000)')
+    parser.add_argument('--live', action='store_true', help='Claude 3.7 키워드 추출과 비교 (Bedrock 호출)')
+    parser.add_argument('--verbose', action='store_true', help='질의별 결과 출력')
+    args = parser.parse_args()
+    
+    with open(FIXTURE_PATH, "r", encoding="utf-8") as f:
+        queries = json.load(f)["queries"]
+    
+    llm_server = None
+    if args.live:
+        from google_search_mcp_server import GoogleSearchServer
+        llm_server = GoogleSearchServer(llm_keywords=True)
+    
+    local_latencies, llm_latencies = [], []
+    local_scores, llm_scores, agreement = [], [], []
+    
+    for query in queries:
+        text, reference = query["text"], query["reference"].split()
+        
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            keywords = default_extractor.extract(text)
+        local_latencies.append((time.perf_counter() - start) * 1e6 / args.repeat)
+        local_scores.append(overlap(keywords, reference))
+        
+        line = f"{text}\n  local: {' '.join(keywords)}"
+        
+        if llm_server is not None:
+            start = time.perf_counter()
+            llm_keywords = llm_server._extract_keywords_with_llm(text)
+            llm_latencies.append((time.perf_counter() - start) * 1000)
+            llm_scores.append(overlap(llm_keywords, reference))
+            agreement.append(overlap(keywords, llm_keywords))
+            line += f"\n  llm:   {' '.join(llm_keywords)}"
+        
+        if args.verbose:
+            print(line + f"\n  ref:   {' '.join(reference)}")
+    
+    def mean(scores, key):
+        return statistics.mean(score[key] for score in scores)
+    
+    print(f"\n질의 수: {len(queries)}")
+    print(f"로컬 추출기  지연 시간: 평균 {statistics.mean(local_latencies):.1f} µs, 최대 {max(local_latencies):.1f} µs")
+    print(f"로컬 추출기  기준 대비: Jaccard {mean(local_scores, 'jaccard'):.2f}, 재현율 {mean(local_scores, 'recall'):.2f}")
+    
+    if llm_server is not None:
+        print(f"Claude 추출  지연 시간: 평균 {statistics.mean(llm_latencies):.0f} ms, 최대 {max(llm_latencies):.0f} ms")
+        print(f"Claude 추출  기준 대비: Jaccard {mean(llm_scores, 'jaccard'):.2f}, 재현율 {mean(llm_scores, 'recall'):.2f}")
+        print(f"로컬 vs Claude 겹침:   Jaccard {mean(agreement, 'jaccard'):.2f}, 재현율 {mean(agreement, 'recall'):.2f}")
+
+
+if __name__ == "__main__":
+    main()
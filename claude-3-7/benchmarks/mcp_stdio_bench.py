@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+"""
+MCP stdio 동시 호출 벤치마크
+
+mcp.py를 자식 프로세스로 실행하고 stdio(줄 단위 JSON-RPC)로 initialize 후
+같은 도구를 N번 호출합니다. 요청을 하나씩 보내고 응답을 기다리는 순차 모드와
+N개 요청을 한꺼번에 보내는 동시 모드의 총 소요 시간을 비교하여
+도구 실행이 이벤트 루프를 막지 않고 겹쳐서 실행되는지 확인합니다.
+
+사용법:
+    python benchmarks/mcp_stdio_bench.py -n 8
+    python benchmarks/mcp_stdio_bench.py -n 16 --tool extract_keywords --args '{"text": "서울 맛집 추천"}'
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+from concurrent.futures import as_completed
+from typing import Dict, Any
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+from mcp_session import MCPStdioSession
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MCP stdio 동시 호출 벤치마크")
+    parser.add_argument('-n', type=int, default=8, help='호출 횟수 (기본값: 8)')
+    parser.add_argument('--tool', default='search', help='호출할 도구 (기본값: search)')
+    parser.add_argument('--args', default='{"query": "Amazon Bedrock Claude"}', help='도구 인자 (JSON)')
+    args = parser.parse_args()
+    
+    tool_args = json.loads(args.args)
+    session = MCPStdioSession([sys.executable, os.path.join(APP_DIR, "mcp.py")], cwd=APP_DIR)
+    
+    try:
+        start = time.perf_counter()
+        session.start()
+        print(f"initialize 핸드셰이크: {(time.perf_counter() - start) * 1000:.0f} ms")
+        
+        # 캐시 효과를 피하기 위해 호출마다 인자 변경
+        def call_args(index: int, mode: str) -> Dict[str, Any]:
+            return {key: f"{value} {mode}{index}" if isinstance(value, str) else value for key, value in tool_args.items()}
+        
+        # 순차 모드: 응답을 받은 뒤 다음 요청 전송
+        sequential = []
+        start = time.perf_counter()
+        for index in range(args.n):
+            sent = time.perf_counter()
+            session.call_tool_async(args.tool, call_args(index, "s")).exception()
+            sequential.append((time.perf_counter() - sent) * 1000)
+        sequential_total = (time.perf_counter() - start) * 1000
+        
+        # 동시 모드: N개 요청을 한꺼번에 전송 (파이프라이닝) 후 도착 순서대로 응답 수집
+        start = time.perf_counter()
+        futures = [session.call_tool_async(args.tool, call_args(index, "c")) for index in range(args.n)]
+        concurrent, errors = [], 0
+        for future in as_completed(futures):
+            concurrent.append((time.perf_counter() - start) * 1000)
+            errors += future.exception() is not None
+        concurrent_total = (time.perf_counter() - start) * 1000
+        
+        print(f"\n도구: {args.tool}, 호출 {args.n}회")
+        print(f"순차: 총 {sequential_total:,.0f} ms (호출당 평균 {statistics.mean(sequential):,.0f} ms)")
+        print(f"동시: 총 {concurrent_total:,.0f} ms (첫 응답 {min(concurrent):,.0f} ms, 마지막 응답 {max(concurrent):,.0f} ms)")
+        print(f"겹침 효과: x{sequential_total / concurrent_total:.1f}, 오류 응답 {errors}건")
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
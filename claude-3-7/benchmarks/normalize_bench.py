@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+"""
+업로드 문서 정리(text_normalizer) 벤치마크
+
+기존 방식(추출한 텍스트를 그대로 프롬프트에 사용)과 text_normalizer로 정리한 텍스트의 추정 토큰 수를 비교합니다.
+말뭉치는 실행할 때 생성합니다.
+- report.pdf: 페이지마다 머리글/바닥글(쪽 번호), 하이픈으로 나뉜 단어, 불필요한 공백이 있는 보고서
+- plain.pdf: 머리글/바닥글이 없는 보고서 (본문이 잘못 지워지지 않는지 확인하는 대조군)
+- article.html: 스타일, 스크립트, 메뉴가 포함된 웹 페이지
+- guide.md: 링크, 배지 이미지, 참조 정의가 많은 Markdown 문서
+- README.md: 저장소의 실제 README
+
+본문 보존율은 생성한 본문 문장이 정리 후에도 모두 남아 있는 비율입니다 (README는 해당 없음).
+
+사용법:
+    python benchmarks/normalize_bench.py
+    python benchmarks/normalize_bench.py --pages 300
+"""
+import os
+import re
+import sys
+import time
+import argparse
+import tempfile
+from typing import Dict, List, Tuple
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+from document_parser import iter_document
+from document_index import estimate_tokens
+from text_normalizer import TextNormalizer
+from document_parse_bench import make_pdf
+
+TOPICS = ["revenue", "logistics", "headcount", "cloud spending", "customer retention", "supplier risk"]
+
+
+def _sentence(index: int) -> str:
+    topic = TOPICS[index % len(TOPICS)]
+    return (f"Finding {index}: {topic} changed by {index * 7 % 23} percent compared with the previous "
+            f"quarter, driven mainly by region {index % 11} and product line {index % 29}.")
+
+
+def _hyphenate(sentence: str) -> List[str]:
+    # 조판된 PDF처럼 긴 문장을 단어 중간에서 하이픈으로 나눔
+    words = sentence.split(" ")
+    half = len(words) // 2
+    word = words[half]
+    if len(word) > 5 and word.isalpha():
+        cut = len(word) // 2
+        return [" ".join(words[:half] + [word[:cut] + "-"]), " ".join([word[cut:]] + words[half + 1:])]
+    return [" ".join(words[:half]), " ".join(words[half:])]
+
+
+def make_report_pdf(path: str, pages: int, furniture: bool) -> List[str]:
+    """보고서 PDF 생성 후 본문 문장 목록 반환"""
+    sentences: List[str] = []
+    
+    def page_lines(page: int) -> List[str]:
+        lines = []
+        if furniture:
+            lines += ["ACME Corporation  -  Annual Operations Report 2025", f"Section {page // 10 + 1}: Regional results"]
+        for line in range(20):
+            sentence = _sentence(page * 100 + line)
+            sentences.append(sentence)
+            if furniture and line % 3 == 0:
+                lines += _hyphenate(sentence)
+            elif furniture and line % 3 == 1:
+                lines.append(sentence.replace(" ", "   "))
+            else:
+                lines.append(sentence)
+        if furniture:
+            lines += ["Confidential - internal use only", f"Page {page} of {pages}"]
+        return lines
+    
+    make_pdf(path, pages=pages, page_lines=page_lines)
+    return sentences
+
+
+def make_html(sections: int) -> Tuple[bytes, List[str]]:
+    """스타일/스크립트/메뉴가 포함된 HTML과 본문 문장 목록 반환"""
+    sentences = [_sentence(index) for index in range(sections * 5)]
+    style = "<style>" + " ".join(f".c{i} {{ margin: {i}px; color: #{i:06x}; }}" for i in range(200)) + "</style>"
+    script = "<script>" + " ".join(f"window.track{i} = function(e) {{ return e.target.id + '{i}'; }};" for i in range(150)) + "</script>"
+    nav = "<nav><ul>" + "".join(f'<li><a href="/menu/{i}" class="nav-link c{i}">Menu {i}</a></li>' for i in range(20)) + "</ul></nav>"
+    body = "".join(
+        f'<section class="c{index}"><h2>Section {index}</h2>'
+        + "".join(f'<p class="text c{index}">{sentence}</p>' for sentence in sentences[index * 5:(index + 1) * 5])
+        + "</section>"
+        for index in range(sections)
+    )
+    html = f"<!DOCTYPE html><html><head><title>Report</title>{style}{script}</head><body>{nav}<main>{body}</main>" \
+           f"<footer><p>&copy; 2025 ACME &middot; <a href='/privacy'>Privacy</a></p></footer>{script}</body></html>"
+    return html.encode("utf-8"), sentences
+
+
+def make_markdown(sections: int) -> Tuple[bytes, List[str]]:
+    """링크/배지/참조 정의가 많은 Markdown과 본문 문장 목록 반환"""
+    sentences = [_sentence(index) for index in range(sections * 4)]
+    lines = ["# Operations Guide", "",
+             " ".join(f"[![badge{i}](https://img.shields.io/badge/build-passing-green?style=flat&logo=x{i})](https://ci.example.com/{i})"
+                      for i in range(8)), ""]
+    for index in range(sections):
+        lines += [f"## Section {index}", ""]
+        for sentence in sentences[index * 4:(index + 1) * 4]:
+            lines.append(f"- **Note:** {sentence} See [the dashboard](https://dashboards.example.com/ops/{index}?tab=summary&range=90d).")
+        lines += ["", "<!-- reviewed by ops team -->", ""]
+    lines += [f"[ref{i}]: https://docs.example.com/reference/{i}" for i in range(40)]
+    return "\n".join(lines).encode("utf-8"), sentences
+
+
+def _squash(text: str) -> str:
+    return re.sub(r"\s+", " ", text)
+
+
+def measure(name: str, data: bytes, file_ext: str, sentences: List[str]) -> Dict:
+    """추출 결과를 그대로 쓸 때와 정리했을 때의 토큰 수 비교"""
+    parts = list(iter_document(data, file_ext))
+    raw = "".join(parts)
+    normalizer = TextNormalizer()
+    start = time.perf_counter()
+    text = normalizer.normalize(parts, file_ext)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    
+    squashed = _squash(text)
+    kept = sum(1 for sentence in sentences if _squash(sentence) in squashed)
+    return {
+        "name": name,
+        "raw_tokens": estimate_tokens(raw),
+        "tokens": estimate_tokens(text),
+        "elapsed_ms": elapsed_ms,
+        "kept": f"{kept / len(sentences):.1%}" if sentences else "-"
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="업로드 문서 정리 벤치마크 (정리 전후 토큰 수)")
+    parser.add_argument('--pages', type=int, default=100, help='PDF 페이지 수')
+    parser.add_argument('--workdir', default=tempfile.gettempdir(), help='생성한 PDF 보관 디렉터리')
+    
+    args = parser.parse_args()
+    
+    corpus = []
+    for name, furniture in (("report.pdf", True), ("plain.pdf", False)):
+        path = os.path.join(args.workdir, f"normalize_{args.pages}p_{name}")
+        sentences = make_report_pdf(path, args.pages, furniture)
+        with open(path, "rb") as f:
+            corpus.append((name, f.read(), ".pdf", sentences))
+    html, sentences = make_html(args.pages // 2)
+    corpus.append(("article.html", html, ".html", sentences))
+    markdown, sentences = make_markdown(args.pages // 2)
+    corpus.append(("guide.md", markdown, ".md", sentences))
+    with open(os.path.join(os.path.dirname(APP_DIR), "README.md"), "rb") as f:
+        corpus.append(("README.md", f.read(), ".md", []))
+    
+    print(f"{'문서':<14} {'정리 전 토큰':>12} {'정리 후 토큰':>12} {'절감':>7} {'본문 보존':>9} {'시간(ms)':>9}")
+    total_raw = total = 0
+    for name, data, file_ext, sentences in corpus:
+        result = measure(name, data, file_ext, sentences)
+        total_raw += result["raw_tokens"]
+        total += result["tokens"]
+        print(f"{name:<14} {result['raw_tokens']:>12,} {result['tokens']:>12,} "
+              f"{1 - result['tokens'] / result['raw_tokens']:>7.1%} {result['kept']:>9} {result['elapsed_ms']:>9.1f}")
+    print(f"{'합계':<14} {total_raw:>12,} {total:>12,} {1 - total / total_raw:>7.1%}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+"""
+DuckDuckGo 검색 결과 파서 벤치마크
+
+저장된 SERP 픽스처(benchmarks/fixtures/ddg_serp_*.html)를 대상으로
+기존 BeautifulSoup 전체 트리 파싱과 이벤트 기반 파서(DuckDuckGoResultParser)의
+CPU 시간과 메모리 할당량을 비교합니다.
+
+사용법:
+    python benchmarks/serp_parser_bench.py --repeat 200 --max-results 5
+"""
+import os
+import sys
+import glob
+import time
+import argparse
+import tracemalloc
+from typing import Callable, List, Dict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from duckduckgo_mcp_server import parse_results
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def parse_results_soup(html: str, max_results: int = 5) -> List[Dict[str, str]]:
+    """기존 방식: 전체 BeautifulSoup 트리 생성 후 CSS 선택자로 결과 추출"""
+    from bs4 import BeautifulSoup
+    
+    soup = BeautifulSoup(html, 'html.parser')
+    results = []
+    for result in soup.select('.result'):
+        title_elem = result.select_one('.result__title')
+        snippet_elem = result.select_one('.result__snippet')
+        link_elem = result.select_one('.result__url')
+        
+        if title_elem and snippet_elem:
+            url = link_elem.get_text().strip() if link_elem else ""
+            results.append({
+                "title": title_elem.get_text().strip(),
+                "content": snippet_elem.get_text().strip(),
+                "url": url
+            })
+            if len(results) >= max_results:
+                break
+    return results
+
+
+def measure(parser: Callable, html: str, max_results: int, repeat: int) -> Dict[str, float]:
+    """CPU 시간(ms/회)과 1회 파싱 시 최대 메모리 사용량을 측정"""
+    parser(html, max_results)  # 워밍업
+    
+    start = time.process_time()
+    for _ in range(repeat):
+        parser(html, max_results)
+    cpu_ms = (time.process_time() - start) * 1000 / repeat
+    
+    tracemalloc.start()
+    parser(html, max_results)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    return {"cpu_ms": cpu_ms, "peak_kb": peak / 1024}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DuckDuckGo SERP 파서 벤치마크")
+    parser.add_argument('--repeat', type=int, default=200, help='반복 횟수 (기본값: 200)')
+    parser.add_argument('--max-results', type=int, default=5, help='추출할 결과 수 (기본값: 5)')
+    args = parser.parse_args()
+    
+    parsers = {"event(html.parser)": parse_results}
+    try:
+        import bs4  # noqa: F401
+        parsers["bs4(full tree)"] = parse_results_soup
+    except ImportError:
+        print("beautifulsoup4가 설치되어 있지 않아 기존 파서 비교를 건너뜁니다.\n")
+    
+    print(f"{'fixture':<20} {'parser':<20} {'cpu ms/op':>10} {'peak KB':>10} {'results':>8}")
+    for path in sorted(glob.glob(os.path.join(FIXTURE_DIR, "ddg_serp_*.html"))):
+        with open(path, "r", encoding="utf-8") as f:
+            html = f.read()
+        name = os.path.basename(path)
+        
+        expected = None
+        for parser_name, parse in parsers.items():
+            stats = measure(parse, html, args.max_results, args.repeat)
+            results = parse(html, args.max_results)
+            print(f"{name:<20} {parser_name:<20} {stats['cpu_ms']:>10.3f} {stats['peak_kb']:>10.1f} "
+                  f"{len(results):>8}")
+            
+            # 제목/스니펫이 기존 파서와 동일한지 확인 (공백 차이는 무시)
+            summary = [(" ".join(r["title"].split()), " ".join(r["content"].split())) for r in results]
+            if expected is None:
+                expected = summary
+            elif summary != expected:
+                print(f"  경고: {parser_name} 결과가 다른 파서와 다릅니다")
+
+
+if __name__ == "__main__":
+    main()
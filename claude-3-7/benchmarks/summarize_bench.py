@@ -0,0 +1,204 @@
+#!/usr/bin/env python
+"""
+큰 문서 map-reduce 요약 벤치마크
+
+기존 방식(문서 전체를 한 번의 호출에 넣음)과 document_summarizer의 map-reduce 요약(조각 요약을 동시 호출 수 제한 안에서
+실행한 뒤 합치기 단계를 스트리밍)을 비교합니다.
+Bedrock 호출은 입력 토큰 수에 비례하는 지연을 흉내 내는 가짜 클라이언트로 대신하므로 AWS 자격 증명 없이 실행됩니다.
+- whole: 문서 전체를 한 번에 요약 (입력이 모델 컨텍스트 한도를 넘으면 실패)
+- map-reduce cN: 동시 호출 N개, 빈 캐시
+- repeat: 같은 문서에 다른 요약 질문 (조각 요약 캐시 재사용)
+
+마지막으로 요약 경로 판별(is_summary_request)을 검사합니다. 문서를 요약해 달라는 요청만 요약 경로로 보내고,
+"요약 통계 표"처럼 요약이라는 단어가 들어간 내용 질문은 검색 경로에 남아야 합니다.
+
+사용법:
+    python benchmarks/summarize_bench.py
+    python benchmarks/summarize_bench.py --routing-only
+    python benchmarks/summarize_bench.py --pages 500 --concurrency 1 4 8 --latency 0.5
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+from typing import Any, Dict, List
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+from document_index import estimate_tokens
+from document_summarizer import DocumentSummarizer, SummaryCache, is_summary_request
+from normalize_bench import _sentence
+
+# 모델 컨텍스트 한도 (토큰)
+CONTEXT_LIMIT = 200000
+
+QUESTIONS = ["이 문서를 요약해 주세요.", "Give me a one-paragraph summary of the report."]
+
+# 요약 경로로 보내야 하는 질문
+SUMMARY_QUESTIONS = QUESTIONS + [
+    "요약해줘", "문서 요약 부탁해", "핵심만 간단히 요약해 줄래?", "전체 내용을 정리해 줘", "이 보고서 개요 알려줘",
+    "Summarize this document", "Can you summarize the paper?", "tl;dr", "What's the overview of this document?"
+]
+
+# 검색 경로에 남아야 하는 질문 (요약 표/항목을 묻는 내용 질문)
+RETRIEVAL_QUESTIONS = [
+    "3장의 요약 통계 표 값은?", "요약 통계에서 평균은?", "표 2의 개요 항목 설명에 나온 금액",
+    "what does the summary table say", "Summary statistics for Q3 revenue?", "Who wrote the executive summary section?"
+]
+
+
+class FakeBedrock:
+    """입력 토큰 수에 비례해 지연되는 Bedrock 런타임 클라이언트 흉내 (동시 호출 수 기록)"""
+    
+    def __init__(self, latency: float, ms_per_1k_tokens: float):
+        self.latency = latency
+        self.ms_per_1k_tokens = ms_per_1k_tokens
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+    
+    def _wait(self, body: Dict[str, Any]) -> int:
+        tokens = sum(estimate_tokens(message["content"]) for message in body["messages"])
+        if tokens > CONTEXT_LIMIT:
+            raise ValueError(f"ValidationException: input is too long ({tokens:,} tokens)")
+        time.sleep(self.latency + tokens / 1000 * self.ms_per_1k_tokens / 1000)
+        return tokens
+    
+    def invoke_model(self, modelId: str, body: str) -> Dict[str, Any]:
+        body = json.loads(body)
+        with self._lock:
+            self.calls += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            tokens = self._wait(body)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+        summary = "- " + body["messages"][0]["content"][-600:].replace("\n", " ")
+        payload = {"content": [{"type": "text", "text": summary}], "usage": {"input_tokens": tokens, "output_tokens": 150}}
+        return {"body": _Body(json.dumps(payload).encode("utf-8"))}
+    
+    def invoke_model_with_response_stream(self, modelId: str, body: str) -> Dict[str, Any]:
+        body = json.loads(body)
+        with self._lock:
+            self.calls += 1
+        tokens = self._wait(body)
+        
+        def events():
+            yield {"chunk": {"bytes": json.dumps({"type": "message_start", "message": {"usage": {"input_tokens": tokens}}})}}
+            for word in range(200):
+                time.sleep(0.002)
+                yield {"chunk": {"bytes": json.dumps({"type": "content_block_delta", "delta": {"type": "text_delta", "text": f"word{word} "}})}}
+            yield {"chunk": {"bytes": json.dumps({"type": "message_delta", "usage": {"output_tokens": 200}})}}
+        return {"body": events()}
+
+
+class _Body:
+    def __init__(self, data: bytes):
+        self.data = data
+    
+    def read(self) -> bytes:
+        return self.data
+
+
+def make_text(pages: int) -> str:
+    """페이지당 20문장인 보고서 텍스트 생성"""
+    return "\n\n".join("\n".join(_sentence(page * 100 + line) for line in range(20)) for page in range(pages))
+
+
+def run_whole(client: FakeBedrock, text: str, question: str) -> Dict[str, Any]:
+    """기존 방식: 문서 전체를 한 번의 스트리밍 호출에 넣음"""
+    payload = {"messages": [{"role": "user", "content": f"{question}\n\n{text}"}]}
+    start = time.perf_counter()
+    try:
+        response = client.invoke_model_with_response_stream(modelId="fake", body=json.dumps(payload))
+        first_token = None
+        for _ in response["body"]:
+            if first_token is None:
+                first_token = time.perf_counter() - start
+        return {"ok": True, "first_token_ms": first_token * 1000, "total_ms": (time.perf_counter() - start) * 1000}
+    except ValueError as e:
+        return {"ok": False, "error": str(e), "total_ms": (time.perf_counter() - start) * 1000}
+
+
+def run_map_reduce(summarizer: DocumentSummarizer, client: FakeBedrock, text: str, question: str) -> Dict[str, Any]:
+    """map-reduce 요약: 조각 요약 후 합치기 단계를 스트리밍"""
+    start = time.perf_counter()
+    result = summarizer.map(client, "fake", text)
+    first_token = None
+    for _ in summarizer.reduce_stream(client, "fake", question, result["summaries"]):
+        if first_token is None:
+            first_token = time.perf_counter() - start
+    return {
+        "ok": True,
+        "chunks": result["chunks"],
+        "cached": result["cached"],
+        "map_ms": result["elapsed_ms"],
+        "first_token_ms": first_token * 1000,
+        "total_ms": (time.perf_counter() - start) * 1000
+    }
+
+
+def check_routing() -> int:
+    """요약 경로 판별이 기대와 다른 질문 수"""
+    failures = 0
+    for expected, questions in ((True, SUMMARY_QUESTIONS), (False, RETRIEVAL_QUESTIONS)):
+        for question in questions:
+            if is_summary_request(question) != expected:
+                failures += 1
+                print(f"  실패: {question!r} 요약 요청={not expected} (기대 {expected})")
+    total = len(SUMMARY_QUESTIONS) + len(RETRIEVAL_QUESTIONS)
+    print(f"  요약 요청 {len(SUMMARY_QUESTIONS)}개, 검색 질문 {len(RETRIEVAL_QUESTIONS)}개 중 통과 {total - failures}/{total}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="큰 문서 map-reduce 요약 벤치마크 (가짜 Bedrock 클라이언트)")
+    parser.add_argument('--pages', type=int, default=400, help='문서 페이지 수 (페이지당 약 2,700자)')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 8], help='비교할 동시 호출 수')
+    parser.add_argument('--latency', type=float, default=0.3, help='호출당 기본 지연(초)')
+    parser.add_argument('--ms-per-1k-tokens', type=float, default=40, help='입력 1천 토큰당 추가 지연(ms)')
+    parser.add_argument('--routing-only', action='store_true', help='요약 경로 판별 검사만 실행')
+    
+    args = parser.parse_args()
+    
+    if args.routing_only:
+        print("요약 경로 판별:")
+        sys.exit(1 if check_routing() else 0)
+    
+    text = make_text(args.pages)
+    print(f"입력: {args.pages}페이지, {len(text):,}자, 약 {estimate_tokens(text):,} 토큰 (컨텍스트 한도 {CONTEXT_LIMIT:,})")
+    print(f"{'방식':<18} {'조각':>5} {'캐시':>5} {'호출':>5} {'최대 동시':>9} {'map(ms)':>9} {'첫 토큰(ms)':>12} {'전체(ms)':>10}")
+    
+    client = FakeBedrock(args.latency, args.ms_per_1k_tokens)
+    result = run_whole(client, text, QUESTIONS[0])
+    if result["ok"]:
+        print(f"{'whole':<18} {1:>5} {'-':>5} {client.calls:>5} {1:>9} {'-':>9} {result['first_token_ms']:>12.0f} {result['total_ms']:>10.0f}")
+    else:
+        print(f"{'whole':<18} 실패: {result['error']}")
+    
+    rows: List[tuple] = []
+    summarizer = None
+    for concurrency in args.concurrency:
+        client = FakeBedrock(args.latency, args.ms_per_1k_tokens)
+        summarizer = DocumentSummarizer(concurrency=concurrency, cache=SummaryCache(root=None))
+        rows.append((f"map-reduce c{concurrency}", client, run_map_reduce(summarizer, client, text, QUESTIONS[0])))
+    # 마지막 요약기로 다른 질문 (조각 요약은 캐시에서 재사용)
+    client = FakeBedrock(args.latency, args.ms_per_1k_tokens)
+    rows.append(("repeat", client, run_map_reduce(summarizer, client, text, QUESTIONS[1])))
+    
+    for name, client, result in rows:
+        print(f"{name:<18} {result['chunks']:>5} {result['cached']:>5} {client.calls:>5} {client.max_in_flight:>9} "
+              f"{result['map_ms']:>9.0f} {result['first_token_ms']:>12.0f} {result['total_ms']:>10.0f}")
+    
+    print("\n요약 경로 판별:")
+    if check_routing():
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,40 @@
 #!/usr/bin/env python
 import datetime
-import pytz
 import json
 import argparse
-from typing import Dict, Any
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
+
+from zoneinfo import ZoneInfo
+
+# 요일/월 이름 테이블 (호출마다 새로 만들지 않도록 모듈 상수로 유지)
+WEEKDAY_KR = ("월요일", "화요일", "수요일", "목요일", "금요일", "토요일", "일요일")
+WEEKDAY_EN = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+MONTH_KR = ("1월", "2월", "3월", "4월", "5월", "6월", "7월", "8월", "9월", "10월", "11월", "12월")
+MONTH_EN = ("January", "February", "March", "April", "May", "June", "July",
+            "August", "September", "October", "November", "December")
+
+# 시간대 조회 실패 시 사용하는 기본 시간대 (Asia/Seoul, UTC+9)
+FALLBACK_TIMEZONE = "Asia/Seoul"
+FALLBACK_TZINFO = datetime.timezone(datetime.timedelta(hours=9), "KST")
+
+
+@lru_cache(maxsize=128)
+def get_zone(timezone: str) -> Tuple[datetime.tzinfo, Optional[str]]:
+    """
+    시간대 객체를 한 번만 생성하여 캐시합니다.
+    
+    Args:
+        timezone: IANA 시간대 이름 (예: "Asia/Seoul")
+        
+    Returns:
+        (시간대 객체, 오류 메시지) 튜플 - 알 수 없는 시간대이면 UTC+9 고정 시간대와 오류 메시지
+    """
+    try:
+        return ZoneInfo(timezone), None
+    except Exception as e:
+        return FALLBACK_TZINFO, f"알 수 없는 시간대 '{timezone}': {str(e)}"
+
 
 class DatetimeMCPServer:
     """현재 날짜/시간 정보를 제공하는 서버 클래스"""
@@ -16,184 +47,271 @@ class DatetimeMCPServer:
             timezone: 사용할 기본 시간대 (기본값: "Asia/Seoul")
         """
         self.timezone = timezone
+        self._resolver = None
+    
+    def now(self, timezone: Optional[str] = None) -> datetime.datetime:
+        """
+        지정된 시간대의 현재 시각을 반환합니다.
+        
+        Args:
+            timezone: 시간대 이름 (기본값: 서버 기본 시간대)
+        
+        Returns:
+            시간대 정보가 포함된 datetime (시간대 오류 시 UTC+9)
+        """
+        tz, _ = get_zone(timezone or self.timezone)
+        return datetime.datetime.now(tz)
+    
+    def _snapshot(self, timezone: Optional[str] = None,
+                  instant: Optional[datetime.datetime] = None) -> Tuple[datetime.datetime, str, Optional[str]]:
+        """
+        한 시점을 지정된 시간대로 변환합니다.
+        
+        Args:
+            timezone: 시간대 이름 (기본값: 서버 기본 시간대)
+            instant: 기준 시점 (기본값: 현재 시각)
+        
+        Returns:
+            (현지 시각, 실제 적용된 시간대 이름, 오류 메시지) 튜플
+        """
+        timezone = timezone or self.timezone
+        tz, error = get_zone(timezone)
+        if error is not None:
+            print(f"시간 정보 가져오기 중 오류: {error}")
+            timezone = FALLBACK_TIMEZONE
+        now = instant.astimezone(tz) if instant is not None else datetime.datetime.now(tz)
+        return now, timezone, error
+    
+    def _time_info(self, now: datetime.datetime, timezone: str) -> Dict[str, Any]:
+        """현지 시각으로부터 시간 정보 생성"""
+        offset_seconds = now.utcoffset().total_seconds()
+        offset_hours = offset_seconds / 3600
+        return {
+            "hour": now.hour,
+            "minute": now.minute,
+            "second": now.second,
+            "ampm": "오전" if now.hour < 12 else "오후",
+            "hour_12": now.hour % 12 if now.hour % 12 != 0 else 12,
+            "timezone": timezone,
+            "timezone_name": now.tzname(),
+            "timezone_offset": int(offset_hours) if offset_hours.is_integer() else offset_hours,
+            "timestamp": now.timestamp()
+        }
+    
+    def _date_info(self, now: datetime.datetime) -> Dict[str, Any]:
+        """현지 시각으로부터 날짜 정보 생성"""
+        weekday = now.weekday()
+        return {
+            "year": now.year,
+            "month": now.month,
+            "day": now.day,
+            "weekday": weekday,  # 0=월요일, 6=일요일
+            "weekday_kr": WEEKDAY_KR[weekday],
+            "weekday_en": WEEKDAY_EN[weekday],
+            "month_name_kr": MONTH_KR[now.month - 1],
+            "month_name_en": MONTH_EN[now.month - 1],
+            "day_of_year": now.timetuple().tm_yday,
+            "week_of_year": now.isocalendar()[1],
+            "is_leap_year": self._is_leap_year(now.year),
+            "days_in_month": self._days_in_month(now.year, now.month)
+        }
     
-    def get_current_time(self) -> Dict[str, Any]:
+    def _period_info(self, now: datetime.datetime, time_info: Dict[str, Any]) -> Dict[str, Any]:
+        """오늘/올해 경과 및 남은 시간 정보 생성 (일광 절약 시간 전환일도 실제 경과 시간으로 계산)"""
+        tz = now.tzinfo
+        start_of_day = datetime.datetime(now.year, now.month, now.day, tzinfo=tz)
+        next_day = now.date() + datetime.timedelta(days=1)
+        end_of_day = datetime.datetime(next_day.year, next_day.month, next_day.day, tzinfo=tz)
+        start_of_year = datetime.datetime(now.year, 1, 1, tzinfo=tz)
+        end_of_year = datetime.datetime(now.year + 1, 1, 1, tzinfo=tz)
+        
+        # 같은 tzinfo끼리의 뺄셈은 벽시계 기준이므로 UTC로 변환 후 계산
+        now_utc = now.astimezone(datetime.timezone.utc)
+        
+        return {
+            "iso_format": now.isoformat(),
+            "elapsed_seconds_today": int((now_utc - start_of_day.astimezone(datetime.timezone.utc)).total_seconds()),
+            "remaining_seconds_today": int((end_of_day.astimezone(datetime.timezone.utc) - now_utc).total_seconds()),
+            "elapsed_days_this_year": (now.date() - start_of_year.date()).days,
+            "remaining_days_this_year": (end_of_year.date() - now.date()).days - 1,
+            "datetime_kr": now.strftime("%Y년 %m월 %d일 ") + f"{time_info['ampm']} {time_info['hour_12']}시 {time_info['minute']}분"
+        }
+    
+    def get_current_time(self, instant: Optional[datetime.datetime] = None) -> Dict[str, Any]:
         """
         현재 시간 정보를 가져옵니다.
         
+        Args:
+            instant: 기준 시점 (기본값: 현재 시각)
+        
         Returns:
             시간 정보를 담은 딕셔너리
         """
-        # 현재 시간 정보 가져오기 (지정된 시간대 사용)
-        try:
-            tz = pytz.timezone(self.timezone)
-            now = datetime.datetime.now(tz)
-            
-            return {
-                "hour": now.hour,
-                "minute": now.minute,
-                "second": now.second,
-                "ampm": "오전" if now.hour < 12 else "오후",
-                "hour_12": now.hour % 12 if now.hour % 12 != 0 else 12,
-                "timezone": self.timezone,
-                "timezone_name": tz.tzname(now),
-                "timezone_offset": int(tz.utcoffset(now).total_seconds() / 3600),
-                "timestamp": now.timestamp()
-            }
-        except Exception as e:
-            print(f"시간 정보 가져오기 중 오류: {str(e)}")
-            # Asia/Seoul 시간대 강제 적용 (UTC+9)
-            now = datetime.datetime.now(datetime.timezone(datetime.timedelta(hours=9)))
-            return {
-                "hour": now.hour,
-                "minute": now.minute,
-                "second": now.second,
-                "ampm": "오전" if now.hour < 12 else "오후",
-                "hour_12": now.hour % 12 if now.hour % 12 != 0 else 12,
-                "timezone": "Asia/Seoul",
-                "timezone_name": "KST",
-                "timezone_offset": 9,
-                "timestamp": now.timestamp(),
-                "error": str(e)
-            }
+        now, timezone, error = self._snapshot(instant=instant)
+        time_info = self._time_info(now, timezone)
+        if error is not None:
+            time_info["error"] = error
+        return time_info
     
-    def get_current_date(self) -> Dict[str, Any]:
+    def get_current_date(self, instant: Optional[datetime.datetime] = None) -> Dict[str, Any]:
         """
         현재 날짜 정보를 가져옵니다.
         
+        Args:
+            instant: 기준 시점 (기본값: 현재 시각)
+        
         Returns:
             날짜 정보를 담은 딕셔너리
         """
-        try:
-            tz = pytz.timezone(self.timezone)
-            now = datetime.datetime.now(tz)
-            
-            # 한국어 요일 변환
-            weekday_kr = ["월요일", "화요일", "수요일", "목요일", "금요일", "토요일", "일요일"]
-            weekday_en = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
-            month_kr = ["1월", "2월", "3월", "4월", "5월", "6월", "7월", "8월", "9월", "10월", "11월", "12월"]
-            
-            return {
-                "year": now.year,
-                "month": now.month,
-                "day": now.day,
-                "weekday": now.weekday(),  # 0=월요일, 6=일요일
-                "weekday_kr": weekday_kr[now.weekday()],
-                "weekday_en": weekday_en[now.weekday()],
-                "month_name_kr": month_kr[now.month - 1],
-                "month_name_en": now.strftime("%B"),
-                "day_of_year": now.timetuple().tm_yday,
-                "week_of_year": int(now.strftime("%V")),
-                "is_leap_year": self._is_leap_year(now.year),
-                "days_in_month": self._days_in_month(now.year, now.month)
-            }
-        except Exception as e:
-            print(f"날짜 정보 가져오기 중 오류: {str(e)}")
-            # Asia/Seoul 시간대 강제 적용 (UTC+9)
-            now = datetime.datetime.now(datetime.timezone(datetime.timedelta(hours=9)))
-            
-            # 한국어 요일 변환
-            weekday_kr = ["월요일", "화요일", "수요일", "목요일", "금요일", "토요일", "일요일"]
-            weekday_en = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
-            month_kr = ["1월", "2월", "3월", "4월", "5월", "6월", "7월", "8월", "9월", "10월", "11월", "12월"]
-            
-            return {
-                "year": now.year,
-                "month": now.month,
-                "day": now.day,
-                "weekday": now.weekday(),
-                "weekday_kr": weekday_kr[now.weekday()],
-                "weekday_en": weekday_en[now.weekday()],
-                "month_name_kr": month_kr[now.month - 1],
-                "month_name_en": now.strftime("%B"),
-                "day_of_year": now.timetuple().tm_yday,
-                "week_of_year": int(now.strftime("%V")),
-                "is_leap_year": self._is_leap_year(now.year),
-                "days_in_month": self._days_in_month(now.year, now.month),
-                "error": str(e)
-            }
+        now, _, error = self._snapshot(instant=instant)
+        date_info = self._date_info(now)
+        if error is not None:
+            date_info["error"] = error
+        return date_info
     
-    def get_datetime_info(self) -> Dict[str, Any]:
+    def get_datetime_info(self, timezone: Optional[str] = None,
+                          instant: Optional[datetime.datetime] = None) -> Dict[str, Any]:
         """
         현재 날짜와 시간 정보를 모두 가져옵니다.
+        모든 값은 한 번 캡처한 시점에서 계산되므로 초/자정 경계에서도 서로 일치합니다.
+        
+        Args:
+            timezone: 시간대 이름 (기본값: 서버 기본 시간대)
+            instant: 기준 시점 (기본값: 현재 시각)
         
         Returns:
             날짜와 시간 정보를 담은 딕셔너리
         """
-        date_info = self.get_current_date()
-        time_info = self.get_current_time()
+        now, timezone, error = self._snapshot(timezone, instant)
+        time_info = self._time_info(now, timezone)
         
-        # 추가 정보 계산
-        try:
-            tz = pytz.timezone(self.timezone)
-            now = datetime.datetime.now(tz)
-            
-            # 오늘이 지난 시간 계산 (일 시작부터)
-            start_of_day = now.replace(hour=0, minute=0, second=0, microsecond=0)
-            elapsed_seconds = (now - start_of_day).total_seconds()
-            
-            # 오늘 남은 시간 계산
-            end_of_day = start_of_day + datetime.timedelta(days=1)
-            remaining_seconds = (end_of_day - now).total_seconds()
-            
-            # 올해 지난 일수와 남은 일수
-            start_of_year = tz.localize(datetime.datetime(now.year, 1, 1))
-            end_of_year = tz.localize(datetime.datetime(now.year + 1, 1, 1))
-            elapsed_days = (now - start_of_year).days
-            remaining_days = (end_of_year - now).days
-            
-            # ISO 표준 날짜/시간 문자열
-            iso_format = now.isoformat()
+        combined_info = {**self._date_info(now), **time_info, **self._period_info(now, time_info)}
+        if error is not None:
+            combined_info["error"] = error
+        return combined_info
+    
+    def get_datetime_info_many(self, timezones: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        여러 시간대의 날짜/시간 정보를 같은 시점 기준으로 한 번에 가져옵니다.
+        
+        Args:
+            timezones: 시간대 이름 리스트 (예: ["Asia/Seoul", "America/New_York"])
+        
+        Returns:
+            시간대 이름별 날짜/시간 정보 딕셔너리 (입력 순서 유지)
+        """
+        instant = datetime.datetime.now(datetime.timezone.utc)
+        return {timezone: self.get_datetime_info(timezone, instant) for timezone in dict.fromkeys(timezones)}
+    
+    def _parse_datetime(self, value: str) -> datetime.datetime:
+        """ISO 형식 날짜/시간 문자열을 설정된 시간대의 datetime으로 변환"""
+        parsed = datetime.datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+        now = self.now()
+        if parsed.tzinfo is None:
+            # zoneinfo 시간대는 replace로 붙여도 서머타임 오프셋이 올바르게 계산됨
+            return parsed.replace(tzinfo=now.tzinfo)
+        return parsed.astimezone(now.tzinfo)
+    
+    def calculate_time_difference(self, from_date: str, to_date: Optional[str] = None) -> Dict[str, Any]:
+        """
+        두 날짜/시간 사이의 차이를 계산합니다.
+        날짜만 주어진 경우(YYYY-MM-DD) 시각을 무시하고 달력 기준 일수를 계산합니다.
+        
+        Args:
+            from_date: 시작 날짜/시간 (ISO 형식)
+            to_date: 끝 날짜/시간 (ISO 형식, 기본값: 현재 시각)
             
-            # 추가 정보 합치기
-            additional_info = {
-                "iso_format": iso_format,
-                "elapsed_seconds_today": int(elapsed_seconds),
-                "remaining_seconds_today": int(remaining_seconds),
-                "elapsed_days_this_year": elapsed_days,
-                "remaining_days_this_year": remaining_days,
-                "datetime_kr": now.strftime("%Y년 %m월 %d일 ") + f"{time_info['ampm']} {time_info['hour_12']}시 {time_info['minute']}분"
-            }
+        Returns:
+            차이 정보를 담은 딕셔너리 (days가 음수이면 to_date가 from_date보다 과거)
+        """
+        date_only = len(from_date.strip()) <= 10 and (to_date is None or len(to_date.strip()) <= 10)
+        start = self._parse_datetime(from_date)
+        end = self._parse_datetime(to_date) if to_date else self.now()
+        
+        if date_only:
+            days = (end.date() - start.date()).days
+            total_seconds = days * 86400
+        else:
+            total_seconds = int((end.astimezone(datetime.timezone.utc) - start.astimezone(datetime.timezone.utc)).total_seconds())
+            days = int(total_seconds / 86400)
+        
+        # 년/개월/일 단위 분해 (달력 기준)
+        earlier, later = (start.date(), end.date()) if days >= 0 else (end.date(), start.date())
+        months = (later.year - earlier.year) * 12 + later.month - earlier.month
+        if later.day < earlier.day:
+            months -= 1
+        anchor_year = earlier.year + (earlier.month - 1 + months) // 12
+        anchor_month = (earlier.month - 1 + months) % 12 + 1
+        anchor_day = min(earlier.day, self._days_in_month(anchor_year, anchor_month))
+        remainder_days = (later - datetime.date(anchor_year, anchor_month, anchor_day)).days
+        
+        return {
+            "from": start.date().isoformat() if date_only else start.isoformat(),
+            "to": end.date().isoformat() if date_only else end.isoformat(),
+            "days": days,
+            "weeks": abs(days) // 7,
+            "total_seconds": total_seconds,
+            "hours": abs(total_seconds) // 3600,
+            "years": months // 12,
+            "months": months % 12,
+            "remainder_days": remainder_days,
+            "direction": "future" if total_seconds > 0 else "past" if total_seconds < 0 else "same",
+            "date_only": date_only
+        }
+    
+    def format_time_difference(self, diff: Dict[str, Any]) -> str:
+        """
+        날짜/시간 차이 정보를 가독성 좋게 포맷팅합니다.
+        
+        Args:
+            diff: calculate_time_difference 결과
             
-            # 딕셔너리 통합
-            combined_info = {**date_info, **time_info, **additional_info}
-            return combined_info
+        Returns:
+            포맷팅된 차이 정보 문자열
+        """
+        formatted_text = f"## 날짜/시간 차이\n\n"
+        formatted_text += f"* **기간:** {diff['from']} → {diff['to']}\n"
+        formatted_text += f"* **일수:** {abs(diff['days'])}일 ({'이후' if diff['days'] >= 0 else '이전'})\n"
+        formatted_text += f"* **환산:** {diff['years']}년 {diff['months']}개월 {diff['remainder_days']}일 / {diff['weeks']}주\n"
+        if not diff["date_only"]:
+            formatted_text += f"* **시간:** {diff['hours']}시간\n"
+        
+        return formatted_text
+    
+    def _get_resolver(self):
+        """날짜 표현 해석기 지연 생성"""
+        if self._resolver is None:
+            from datetime_resolver import DatetimeResolver
+            self._resolver = DatetimeResolver(self)
+        return self._resolver
+    
+    def resolve_expression(self, text: str) -> Optional[Dict[str, Any]]:
+        """
+        질의의 날짜/시간 표현을 로컬에서 계산합니다 (datetime_resolver.DatetimeResolver 사용).
+        
+        Args:
+            text: 사용자 질의
             
-        except Exception as e:
-            print(f"종합 날짜/시간 정보 생성 중 오류: {str(e)}")
+        Returns:
+            계산 결과 딕셔너리 또는 날짜/시간 표현이 없으면 None
+        """
+        return self._get_resolver().resolve(text)
+    
+    def format_resolution(self, resolution: Dict[str, Any]) -> str:
+        """
+        날짜/시간 표현 계산 결과를 모델에 전달할 형태로 포맷팅합니다.
+        
+        Args:
+            resolution: resolve_expression 결과
             
-            try:
-                # Asia/Seoul 시간대 강제 적용 (UTC+9)
-                now = datetime.datetime.now(datetime.timezone(datetime.timedelta(hours=9)))
-                
-                # 오늘이 지난 시간 계산 (일 시작부터)
-                start_of_day = now.replace(hour=0, minute=0, second=0, microsecond=0)
-                elapsed_seconds = (now - start_of_day).total_seconds()
-                
-                # 오늘 남은 시간 계산
-                end_of_day = start_of_day + datetime.timedelta(days=1)
-                remaining_seconds = (end_of_day - now).total_seconds()
-                
-                # ISO 표준 날짜/시간 문자열
-                iso_format = now.isoformat()
-                
-                # 추가 정보 (최소한)
-                additional_info = {
-                    "iso_format": iso_format,
-                    "elapsed_seconds_today": int(elapsed_seconds),
-                    "remaining_seconds_today": int(remaining_seconds),
-                    "datetime_kr": now.strftime("%Y년 %m월 %d일") + f" {time_info['ampm']} {time_info['hour_12']}시 {time_info['minute']}분"
-                }
-                
-                # 딕셔너리 통합
-                combined_info = {**date_info, **time_info, **additional_info, "error": str(e)}
-                return combined_info
-                
-            except Exception as inner_e:
-                print(f"백업 시간 정보 생성 중 오류: {str(inner_e)}")
-                # 기본 정보만 반환
-                combined_info = {**date_info, **time_info, "error": f"{str(e)} (추가 오류: {str(inner_e)})"}
-                return combined_info
+        Returns:
+            포맷팅된 계산 결과 문자열
+        """
+        return self._get_resolver().format_facts(resolution)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """로컬 날짜 표현 해석기 통계 반환"""
+        return {"resolver": self._resolver.get_stats() if self._resolver is not None else {}}
     
     def _is_leap_year(self, year: int) -> bool:
         """윤년 여부 확인"""
@@ -270,12 +388,32 @@ class DatetimeMCPServer:
         formatted_text += f"**ISO 형식:** {dt_info['iso_format']}\n"
         
         return formatted_text
-
+    
+    def format_datetime_info_many(self, infos: Dict[str, Dict[str, Any]]) -> str:
+        """
+        여러 시간대의 날짜/시간 정보를 표로 포맷팅합니다.
+        
+        Args:
+            infos: get_datetime_info_many 결과
+            
+        Returns:
+            포맷팅된 정보 문자열
+        """
+        formatted_text = f"## 시간대별 현재 날짜/시간\n\n"
+        formatted_text += "| 시간대 | 날짜 | 시각 | UTC 오프셋 |\n|---|---|---|---|\n"
+        for timezone, info in infos.items():
+            offset = info['timezone_offset']
+            note = " (알 수 없는 시간대, Asia/Seoul 기준)" if "error" in info else ""
+            formatted_text += f"| {timezone}{note} | {info['year']}년 {info['month']}월 {info['day']}일 {info['weekday_kr']} "
+            formatted_text += f"| {info['ampm']} {info['hour_12']}:{info['minute']:02d} | UTC{'+' if offset >= 0 else ''}{offset} |\n"
+        
+        return formatted_text
 
 def main():
     """CLI 인터페이스로 날짜/시간 정보 제공"""
     parser = argparse.ArgumentParser(description="날짜/시간 정보 CLI")
     parser.add_argument('--timezone', default="Asia/Seoul", help='사용할 시간대 (기본값: Asia/Seoul)')
+    parser.add_argument('--timezones', nargs='+', help='여러 시간대를 같은 시점 기준으로 비교 (예: Asia/Seoul America/New_York)')
     parser.add_argument('--format', choices=['time', 'date', 'full', 'json'], default='full', 
                        help='출력 형식 (time=시간만, date=날짜만, full=모두, json=JSON 형식)')
     
@@ -283,6 +421,14 @@ def main():
     
     server = DatetimeMCPServer(timezone=args.timezone)
     
+    if args.timezones:
+        infos = server.get_datetime_info_many(args.timezones)
+        if args.format == 'json':
+            print(json.dumps(infos, ensure_ascii=False, indent=2))
+        else:
+            print(server.format_datetime_info_many(infos))
+        return
+    
     if args.format == 'time':
         time_info = server.get_current_time()
         if args.format == 'json':
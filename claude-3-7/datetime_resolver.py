@@ -0,0 +1,505 @@
+#!/usr/bin/env python
+import re
+import json
+import time
+import datetime
+import argparse
+import threading
+import unicodedata
+from typing import Dict, Any, List, Optional, Tuple
+
+WEEKDAY_KR = ["월요일", "화요일", "수요일", "목요일", "금요일", "토요일", "일요일"]
+WEEKDAY_EN = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+MONTH_EN = ["January", "February", "March", "April", "May", "June", "July",
+            "August", "September", "October", "November", "December"]
+
+# 양력 고정 기념일 - (월, 일, 한국어 이름, 영어 이름)
+# 설날/추석 등 음력 기념일은 계산하지 않고 모델에 맡김
+HOLIDAYS = {
+    "크리스마스": (12, 25, "크리스마스", "Christmas"),
+    "성탄절": (12, 25, "크리스마스", "Christmas"),
+    "christmas": (12, 25, "크리스마스", "Christmas"),
+    "xmas": (12, 25, "크리스마스", "Christmas"),
+    "신정": (1, 1, "새해 첫날", "New Year's Day"),
+    "새해": (1, 1, "새해 첫날", "New Year's Day"),
+    "new year's day": (1, 1, "새해 첫날", "New Year's Day"),
+    "new year": (1, 1, "새해 첫날", "New Year's Day"),
+    "삼일절": (3, 1, "삼일절", "Independence Movement Day"),
+    "어린이날": (5, 5, "어린이날", "Children's Day"),
+    "현충일": (6, 6, "현충일", "Memorial Day"),
+    "광복절": (8, 15, "광복절", "Liberation Day"),
+    "개천절": (10, 3, "개천절", "National Foundation Day"),
+    "한글날": (10, 9, "한글날", "Hangul Day"),
+    "발렌타인데이": (2, 14, "발렌타인데이", "Valentine's Day"),
+    "밸런타인데이": (2, 14, "발렌타인데이", "Valentine's Day"),
+    "valentine's day": (2, 14, "발렌타인데이", "Valentine's Day"),
+    "화이트데이": (3, 14, "화이트데이", "White Day"),
+    "할로윈": (10, 31, "할로윈", "Halloween"),
+    "핼러윈": (10, 31, "할로윈", "Halloween"),
+    "halloween": (10, 31, "할로윈", "Halloween"),
+    "연말": (12, 31, "연말", "New Year's Eve"),
+    "new year's eve": (12, 31, "연말", "New Year's Eve"),
+}
+
+# 오늘 기준 상대 일자 표현 - 표현: 일 오프셋
+RELATIVE_DAYS = {
+    "오늘": 0, "금일": 0, "내일": 1, "명일": 1, "모레": 2, "내일모레": 2, "글피": 3,
+    "어제": -1, "어저께": -1, "그제": -2, "그저께": -2, "엊그제": -2,
+    "today": 0, "tomorrow": 1, "yesterday": -1,
+    "the day after tomorrow": 2, "the day before yesterday": -2,
+}
+
+# 오프셋 단위 - 단위 표현: (종류, 배수)
+OFFSET_UNITS = {
+    "분": ("minutes", 1), "시간": ("hours", 1), "일": ("days", 1), "주": ("days", 7), "주일": ("days", 7),
+    "개월": ("months", 1), "달": ("months", 1), "년": ("months", 12),
+    "minute": ("minutes", 1), "hour": ("hours", 1), "day": ("days", 1), "week": ("days", 7),
+    "month": ("months", 1), "year": ("months", 12),
+}
+
+# 주 단위 표현 - 표현: 주 오프셋
+WEEK_PREFIXES = {"이번": 0, "금주": 0, "다음": 1, "담": 1, "차주": 1, "다다음": 2, "지난": -1, "저번": -1, "전": -1}
+
+_KR_WEEKDAY_CHARS = "월화수목금토일"
+_EN_WEEKDAY_PATTERN = "monday|tuesday|wednesday|thursday|friday|saturday|sunday"
+_EN_MONTH_PATTERN = "jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?"
+
+
+def _alternation(words) -> str:
+    return "|".join(re.escape(word) for word in sorted(words, key=len, reverse=True))
+
+
+# 날짜 표현 패턴 (우선순위 순서)
+EXPRESSION_PATTERNS = [
+    ("iso", re.compile(r"(\d{4})[-./](\d{1,2})[-./](\d{1,2})")),
+    ("korean_date", re.compile(r"(?:(\d{4})\s*년\s*)?(\d{1,2})\s*월\s*(\d{1,2})\s*일")),
+    ("english_date", re.compile(rf"\b({_EN_MONTH_PATTERN})\.?\s+(\d{{1,2}})(?:st|nd|rd|th)?(?:,?\s*(\d{{4}}))?\b")),
+    ("korean_offset", re.compile(r"(\d+)\s*(주일|개월|시간|분|일|주|달|년)\s*(후|뒤|전|이후|있다가|지나서)")),
+    ("english_offset", re.compile(r"\bin\s+(\d+)\s+(minute|hour|day|week|month|year)s?\b|\b(\d+)\s+(minute|hour|day|week|month|year)s?\s+(ago|later|from now|from today)\b")),
+    ("korean_weekday", re.compile(rf"(?:({_alternation(WEEK_PREFIXES)})\s*주\s*)?([{_KR_WEEKDAY_CHARS}])요일")),
+    ("english_weekday", re.compile(rf"\b(?:(this|next|last|coming)\s+)?({_EN_WEEKDAY_PATTERN})\b")),
+    ("holiday", re.compile(_alternation(HOLIDAYS))),
+    ("relative_day", re.compile(_alternation(RELATIVE_DAYS))),
+]
+
+# 질의 유형 판별 패턴
+TIME_QUESTION = re.compile(r"몇\s*시(?!간)|현재\s*시각|지금\s*시간|what\s+time|current\s+time|time\s+is\s+it")
+DATE_QUESTION = re.compile(r"며칠|몇\s*일|날짜|요일|what\s+(?:day|date)|which\s+day|the\s+date|today'?s\s+date")
+COUNT_QUESTION = re.compile(r"며칠|몇\s*일|얼마|몇\s*주|몇\s*달|몇\s*개월|몇\s*년|how\s+(?:many|long)|d-?day|디데이")
+EXPLICIT_COUNT = re.compile(r"얼마나|how\s+(?:many|long)|d-?day|디데이")
+UNTIL_CUE = re.compile(r"까지|남았|남은|\buntil\b|\btill\b|\bleft\b|\bremaining\b|\baway\b")
+SINCE_CUE = re.compile(r"부터|이후|이래|지났|지난지|경과|흘렀|됐|\bsince\b|\bago\b|\belapsed\b|\bpassed\b")
+# 질문 표현 없이도 기간 계산으로 보는 표현 ("since 2020-03-01", "until christmas")
+STANDALONE_RANGE = re.compile(r"\bsince\b|\buntil\b|\btill\b")
+
+# 날짜 표현을 제외하고 남아도 되는 질문/요청 표현 (여러 글자 단어와 조사가 붙지 않는 질문어만)
+# 한 글자 조사(은/는/이/가 ...)는 FILLER_ENDINGS로만 허용하여 '주가', '일' 같은 내용어가 질문 표현으로 분해되지 않도록 함
+FILLER_WORDS = """
+지금 현재 이제 오늘 몇 뭐 무슨 어떤 무엇 시각 요일 며칠 날짜 얼마 얼마나 개월
+까지 부터 이후 로부터 이래 남았 남은 지났 지나 지난지 경과 흘렀 됐 되었 알려 알려줘 줘 주세요 줄래 해줘 계산 디데이 째
+what whats what's time date day days weekday is it are there the a how many much long until till left
+remaining since ago elapsed passed now current today tell me please of week to from be will was before away in at on
+""".split()
+
+# 단독으로는 내용어일 수 있는 한 글자 단위 (주가, 분, 일 ...) - '몇'/'무슨' 바로 뒤에 올 때만 질문 표현 ("몇 시", "무슨 날")
+FILLER_UNITS = "시 분 초 일 날 주 달 년".split()
+FILLER_UNIT_PREFIXES = ("몇", "무슨")
+_UNIT_PHRASE = re.compile(rf"({'|'.join(FILLER_UNIT_PREFIXES)})\s+(?=[{''.join(FILLER_UNITS)}])")
+
+FILLER_STEMS = frozenset(FILLER_WORDS) | frozenset(prefix + unit for prefix in FILLER_UNIT_PREFIXES for unit in FILLER_UNITS)
+FILLER_ENDINGS = ("", "야", "이야", "요", "예요", "이에요", "인가요", "인가", "인지", "이지", "일까", "일까요", "이니", "니",
+                  "냐", "이냐", "나요", "나", "어", "어요", "었어", "었어요", "었나요", "았어", "았어요", "았나요", "습니까",
+                  "죠", "지", "지요", "게", "이게", "는지", "은지", "됐어", "됐나요", "이", "가", "은", "는", "이었어", "이었어요",
+                  "이었나요", "였어", "였어요", "였나요")
+# 날짜 표현 바로 뒤에 붙은 조사 ("내일은", "3일 후는") - 띄어 쓴 한 글자 토큰("어제 일")은 내용어로 봄
+_ATTACHED_PARTICLE = re.compile(r"^(?:은|는|이|가|을|를|에|에는|의|로|으로|도)(?![가-힣])")
+_FILLER_MAX = max(len(stem) for stem in FILLER_STEMS)
+
+WORD_PATTERN = re.compile(r"[가-힣]+|[a-z']+|\d+")
+
+
+def normalize_query(text: str) -> str:
+    """NFC 정규화, 소문자 변환, 공백 정리"""
+    return " ".join(unicodedata.normalize("NFC", text).lower().split())
+
+
+def _topic_particle(word: str) -> str:
+    """한국어 주제 조사(은/는) 선택 - 숫자는 한국어 발음 기준"""
+    last = word.rstrip()[-1:] if word.strip() else ""
+    if "가" <= last <= "힣":
+        return "은" if (ord(last) - 0xAC00) % 28 else "는"
+    if last.isdigit():
+        return "은" if last in "013678" else "는"
+    return "은(는)"
+
+
+def _add_months(value: datetime.datetime, months: int) -> datetime.datetime:
+    """월 단위 더하기 (말일은 해당 월의 마지막 날로 보정)"""
+    month_index = value.month - 1 + months
+    year, month = value.year + month_index // 12, month_index % 12 + 1
+    next_month = datetime.date(year + month // 12, month % 12 + 1, 1)
+    last_day = (next_month - datetime.timedelta(days=1)).day
+    return value.replace(year=year, month=month, day=min(value.day, last_day))
+
+
+class DatetimeResolver:
+    """모델 호출 없이 질의의 날짜/시간 표현을 해석하고 계산하는 클래스"""
+    
+    def __init__(self, server):
+        """
+        DatetimeResolver 초기화
+        
+        Args:
+            server: 현재 시각과 날짜 차이 계산을 제공하는 DatetimeMCPServer 인스턴스
+        """
+        self.server = server
+        self._lock = threading.Lock()
+        self._stats = {"queries": 0, "resolved": 0, "short_circuit": 0, "handed_off": 0, "total_ms": 0.0}
+    
+    def _match_expression(self, text: str, now: datetime.datetime) -> Optional[Dict[str, Any]]:
+        """
+        질의에서 첫 번째 날짜 표현을 찾아 대상 시각으로 변환
+        
+        Returns:
+            {"kind", "span", "label", "target", "has_time", "name_kr", "name_en", "year_given"} 또는 None
+        """
+        for kind, pattern in EXPRESSION_PATTERNS:
+            match = pattern.search(text)
+            if not match:
+                continue
+            try:
+                resolved = self._to_target(kind, match, now)
+            except ValueError:
+                # 2월 30일처럼 존재하지 않는 날짜
+                continue
+            if resolved is None:
+                continue
+            resolved.update({"kind": kind, "span": match.span(), "label": match.group().strip()})
+            return resolved
+        return None
+    
+    def _to_target(self, kind: str, match, now: datetime.datetime) -> Optional[Dict[str, Any]]:
+        """정규식 매치를 대상 시각으로 변환"""
+        today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        result = {"has_time": False, "name_kr": None, "name_en": None, "year_given": True}
+        
+        if kind in ("iso", "korean_date", "english_date"):
+            if kind == "english_date":
+                month_text, day_text, year_text = match.groups()
+                month = next(i for i, name in enumerate(MONTH_EN, 1) if name.lower().startswith(month_text[:3]))
+            else:
+                year_text, month_text, day_text = match.groups()
+                month = int(month_text)
+            result["year_given"] = year_text is not None
+            result["target"] = today.replace(year=int(year_text) if year_text else today.year, month=month, day=int(day_text))
+        
+        elif kind in ("korean_offset", "english_offset"):
+            groups = [group for group in match.groups() if group is not None]
+            if kind == "english_offset" and match.group(1) is None:
+                amount, unit, direction = groups
+                sign = -1 if direction == "ago" else 1
+            elif kind == "english_offset":
+                amount, unit = groups
+                sign = 1
+            else:
+                amount, unit, direction = groups
+                sign = -1 if direction == "전" else 1
+            unit_kind, multiplier = OFFSET_UNITS[unit]
+            delta = int(amount) * multiplier * sign
+            if unit_kind == "months":
+                result["target"] = _add_months(today, delta)
+            elif unit_kind == "days":
+                result["target"] = today + datetime.timedelta(days=delta)
+            else:
+                result["target"] = now + datetime.timedelta(**{unit_kind: delta})
+                result["has_time"] = True
+        
+        elif kind in ("korean_weekday", "english_weekday"):
+            prefix, weekday_text = match.groups()
+            if kind == "korean_weekday":
+                weekday = _KR_WEEKDAY_CHARS.index(weekday_text)
+            else:
+                weekday = [name.lower() for name in WEEKDAY_EN].index(weekday_text)
+            
+            if kind == "korean_weekday" and prefix is not None:
+                # "다음 주 금요일": 월요일 시작 주 기준
+                monday = today - datetime.timedelta(days=today.weekday())
+                result["target"] = monday + datetime.timedelta(days=7 * WEEK_PREFIXES[prefix] + weekday)
+            elif prefix == "this":
+                monday = today - datetime.timedelta(days=today.weekday())
+                result["target"] = monday + datetime.timedelta(days=weekday)
+            elif prefix == "last":
+                days_back = (today.weekday() - weekday) % 7 or 7
+                result["target"] = today - datetime.timedelta(days=days_back)
+            else:
+                # 접두어 없음/next/coming: 다가오는 해당 요일 (next는 오늘 제외)
+                days_ahead = (weekday - today.weekday()) % 7
+                if prefix in ("next", "coming") and days_ahead == 0:
+                    days_ahead = 7
+                result["target"] = today + datetime.timedelta(days=days_ahead)
+        
+        elif kind == "holiday":
+            month, day, result["name_kr"], result["name_en"] = HOLIDAYS[match.group()]
+            result["year_given"] = False
+            result["target"] = today.replace(month=month, day=day)
+        
+        elif kind == "relative_day":
+            offset = RELATIVE_DAYS[match.group()]
+            if offset == 0:
+                return None
+            result["target"] = today + datetime.timedelta(days=offset)
+        
+        return result
+    
+    def _is_filler(self, token: str) -> bool:
+        """토큰이 질문/요청 표현으로만 이루어졌는지 확인"""
+        if token.isdigit():
+            return False
+        for ending in FILLER_ENDINGS:
+            if ending and not token.endswith(ending):
+                continue
+            stem = token[:len(token) - len(ending)] if ending else token
+            if self._composed_of_stems(stem):
+                return True
+        return False
+    
+    def _composed_of_stems(self, text: str) -> bool:
+        """문자열이 FILLER_STEMS의 연결로 분해되는지 확인"""
+        if not text:
+            return False
+        reachable = [True] + [False] * len(text)
+        for end in range(1, len(text) + 1):
+            for start in range(max(0, end - _FILLER_MAX), end):
+                if reachable[start] and text[start:end] in FILLER_STEMS:
+                    reachable[end] = True
+                    break
+        return reachable[-1]
+    
+    def _leftover_words(self, text: str, span: Optional[Tuple[int, int]]) -> List[str]:
+        """날짜 표현과 질문 표현을 제외하고 남은 내용어"""
+        if span is not None:
+            text = text[:span[0]] + " " + _ATTACHED_PARTICLE.sub("", text[span[1]:], count=1)
+        # "몇 시 몇 분" -> "몇시 몇분" (단위는 질문어와 붙어 있을 때만 질문 표현으로 인정)
+        text = _UNIT_PHRASE.sub(r"\1", text)
+        return [word for word in WORD_PATTERN.findall(text) if not self._is_filler(word)]
+    
+    def resolve(self, text: str) -> Optional[Dict[str, Any]]:
+        """
+        질의의 날짜/시간 표현을 해석하고 답을 계산합니다.
+        
+        Args:
+            text: 사용자 질의
+        
+        Returns:
+            {"intent", "expression", "target", "facts", "confident", "answer", "elapsed_ms"} 딕셔너리,
+            날짜/시간 질의가 아니면 None
+        """
+        start = time.perf_counter()
+        query = normalize_query(text)
+        now = self.server.now()
+        korean = re.search(r"[가-힣]", query) is not None
+        
+        expression = self._match_expression(query, now)
+        asks_time = TIME_QUESTION.search(query) is not None
+        asks_date = DATE_QUESTION.search(query) is not None
+        asks_count = COUNT_QUESTION.search(query) is not None
+        
+        intent = None
+        if expression is not None and expression["kind"] not in ("korean_offset", "english_offset", "relative_day"):
+            # 기념일/날짜/요일까지 남은 기간 또는 지난 기간
+            # "며칠이야?"는 날짜 질문이므로 까지/부터 표현이나 명시적인 기간 질문이 있을 때만 기간 계산
+            asks_range = asks_count or STANDALONE_RANGE.search(query) is not None
+            if SINCE_CUE.search(query) and asks_range:
+                intent = "since"
+            elif UNTIL_CUE.search(query) and asks_range or EXPLICIT_COUNT.search(query):
+                intent = "until"
+        if intent is None:
+            if asks_time and (expression is None or expression["has_time"]):
+                intent = "time"
+            elif asks_date or expression is not None:
+                intent = "date"
+        
+        with self._lock:
+            self._stats["queries"] += 1
+        if intent is None:
+            return None
+        
+        if intent in ("until", "since"):
+            expression = self._align_year(expression, now, intent)
+        target = expression["target"] if expression is not None else now
+        leftover = self._leftover_words(query, expression["span"] if expression is not None else None)
+        
+        facts = self._build_facts(intent, expression, target, now)
+        answer = self._render_answer(intent, expression, facts, korean)
+        confident = not leftover
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        
+        with self._lock:
+            self._stats["resolved"] += 1
+            self._stats["short_circuit" if confident else "handed_off"] += 1
+            self._stats["total_ms"] += elapsed_ms
+        
+        return {
+            "intent": intent,
+            "expression": expression["label"] if expression is not None else None,
+            "target": target.isoformat(),
+            "facts": facts,
+            "confident": confident,
+            "leftover": leftover,
+            "answer": answer,
+            "elapsed_ms": elapsed_ms
+        }
+    
+    def _align_year(self, expression: Dict[str, Any], now: datetime.datetime, intent: str) -> Dict[str, Any]:
+        """연도가 없는 날짜는 '까지'면 다가오는 날짜, '부터'면 지난 날짜로 맞춤"""
+        if expression["year_given"]:
+            return expression
+        today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        target = expression["target"]
+        if intent == "until" and target < today:
+            target = target.replace(year=target.year + 1)
+        elif intent == "since" and target > today:
+            target = target.replace(year=target.year - 1)
+        return {**expression, "target": target}
+    
+    def _build_facts(self, intent: str, expression: Optional[Dict[str, Any]],
+                     target: datetime.datetime, now: datetime.datetime) -> Dict[str, Any]:
+        """모델에 전달하거나 템플릿에 사용할 계산 결과"""
+        facts = {
+            "now": now.isoformat(timespec="seconds"),
+            "timezone": self.server.timezone,
+            "target_date": target.date().isoformat(),
+            "target_weekday_kr": WEEKDAY_KR[target.weekday()],
+            "target_weekday_en": WEEKDAY_EN[target.weekday()],
+        }
+        if intent == "time" or (expression is not None and expression["has_time"]):
+            facts["target_time"] = target.strftime("%H:%M")
+        if intent in ("until", "since"):
+            diff = self.server.calculate_time_difference(now.date().isoformat(), target.date().isoformat())
+            facts.update({
+                "days": diff["days"],
+                "weeks": diff["weeks"],
+                "years": diff["years"],
+                "months": diff["months"],
+                "remainder_days": diff["remainder_days"]
+            })
+        return facts
+    
+    def _render_answer(self, intent: str, expression: Optional[Dict[str, Any]], facts: Dict[str, Any], korean: bool) -> str:
+        """계산 결과를 한 문장 답변으로 변환"""
+        target = datetime.datetime.fromisoformat(facts["target_date"])
+        if korean:
+            date_text = f"{target.year}년 {target.month}월 {target.day}일 {facts['target_weekday_kr']}"
+        else:
+            date_text = f"{facts['target_weekday_en']}, {MONTH_EN[target.month - 1]} {target.day}, {target.year}"
+        
+        if "target_time" in facts:
+            hour, minute = (int(part) for part in facts["target_time"].split(":"))
+            if korean:
+                time_text = f"{'오전' if hour < 12 else '오후'} {hour % 12 or 12}시 {minute}분"
+            else:
+                time_text = f"{hour % 12 or 12}:{minute:02d} {'AM' if hour < 12 else 'PM'}"
+        
+        if expression is None:
+            label = "지금"
+        else:
+            label = (expression["name_kr"] if korean else expression["name_en"]) or expression["label"]
+        
+        if intent == "time":
+            if korean:
+                return f"{label}{_topic_particle(label)} {date_text} {time_text}입니다 ({facts['timezone']})."
+            if expression is None:
+                return f"It is {time_text} on {date_text} ({facts['timezone']})."
+            return f"{label[:1].upper() + label[1:]}, it will be {time_text} on {date_text} ({facts['timezone']})."
+        
+        if intent == "date":
+            if expression is None:
+                label = "오늘" if korean else "Today"
+            if korean:
+                suffix = f" {time_text}" if "target_time" in facts else ""
+                return f"{label}{_topic_particle(label)} {date_text}{suffix}입니다."
+            suffix = f" at {time_text}" if "target_time" in facts else ""
+            return f"{label[:1].upper() + label[1:]} is {date_text}{suffix}."
+        
+        days = facts["days"]
+        # 날짜 자체가 표현인 경우 ("2020-03-01") 날짜를 한 번만 표시
+        if expression["kind"] in ("iso", "korean_date", "english_date"):
+            label = date_text
+        else:
+            label = f"{label}({date_text})" if korean else f"{label} ({date_text})"
+        parts = [(facts["years"], "년", "year"), (facts["months"], "개월", "month"), (facts["remainder_days"], "일", "day")]
+        
+        if korean:
+            span_text = " ".join(f"{value}{unit}" for value, unit, _ in parts if value)
+            if days == 0:
+                return f"오늘이 바로 {label}입니다."
+            if days > 0:
+                return f"{label}까지 {days}일 남았습니다."
+            detail = f" (약 {span_text})" if facts["years"] or facts["months"] else ""
+            return f"{label}부터 오늘까지 {-days}일이 지났습니다{detail}."
+        
+        span_text = ", ".join(f"{value} {unit}{'s' if value != 1 else ''}" for value, _, unit in parts if value)
+        if days == 0:
+            return f"Today is {label}."
+        if days > 0:
+            return f"{label[:1].upper() + label[1:]} is {days} day{'s' if days != 1 else ''} away."
+        detail = f" (about {span_text})" if facts["years"] or facts["months"] else ""
+        return f"{-days} day{'s' if days != -1 else ''} have passed since {label}{detail}."
+    
+    def format_facts(self, resolution: Dict[str, Any]) -> str:
+        """
+        모델에 전달할 계산 결과를 포맷팅합니다.
+        
+        Args:
+            resolution: resolve 결과
+        
+        Returns:
+            포맷팅된 계산 결과 문자열
+        """
+        facts = resolution["facts"]
+        formatted_text = f"## 날짜 계산 결과 (로컬 계산)\n\n"
+        formatted_text += f"* **기준 시각:** {facts['now']} ({facts['timezone']})\n"
+        if resolution["expression"]:
+            formatted_text += f"* **질의 표현:** {resolution['expression']}\n"
+        formatted_text += f"* **대상 날짜:** {facts['target_date']} ({facts['target_weekday_kr']})\n"
+        if "target_time" in facts:
+            formatted_text += f"* **대상 시각:** {facts['target_time']}\n"
+        if "days" in facts:
+            formatted_text += f"* **오늘 기준 차이:** {facts['days']:+d}일 ({facts['years']}년 {facts['months']}개월 {facts['remainder_days']}일)\n"
+        formatted_text += f"* **계산 요약:** {resolution['answer']}\n"
+        
+        return formatted_text
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """해석 통계 반환"""
+        with self._lock:
+            stats = dict(self._stats)
+        stats["avg_ms"] = round(stats.pop("total_ms") / stats["resolved"], 3) if stats["resolved"] else 0.0
+        return stats
+
+
+def main():
+    """CLI 인터페이스로 날짜 표현 해석"""
+    from datetime_mcp_server import DatetimeMCPServer
+    
+    parser = argparse.ArgumentParser(description="날짜/시간 표현 해석 CLI")
+    parser.add_argument('text', help='해석할 질의')
+    parser.add_argument('--timezone', default="Asia/Seoul", help='사용할 시간대 (기본값: Asia/Seoul)')
+    parser.add_argument('--json', action='store_true', help='결과를 JSON으로 출력')
+    
+    args = parser.parse_args()
+    
+    server = DatetimeMCPServer(timezone=args.timezone)
+    resolution = server.resolve_expression(args.text)
+    
+    if resolution is None:
+        print("날짜/시간 질의가 아닙니다.")
+    elif args.json:
+        print(json.dumps(resolution, ensure_ascii=False, indent=2))
+    elif resolution["confident"]:
+        print(resolution["answer"])
+    else:
+        print(server.format_resolution(resolution))
+
+if __name__ == "__main__":
+    main()
@@ -1,43 +1,136 @@
 #!/usr/bin/env python
 import os
 import sys
-import subprocess
 import json
 import time
-import signal
 import atexit
-from typing import Dict, Any, List, Optional, Union
+import copy
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Union, Callable, Tuple
+
+from mcp_session import MCPSessionBase, MCPStdioSession, MCPHttpSession
+from service_registry import get_registry
+
+
+class _InFlightCall:
+    """진행 중인 요청 하나의 결과를 공유하기 위한 컨테이너"""
+    
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """동일한 요청이 동시에 들어오면 한 번만 실행하고 결과를 공유하는 클래스"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _InFlightCall] = {}
+        self._stats = {"calls": 0, "executions": 0, "coalesced": 0, "errors": 0}
+    
+    @staticmethod
+    def make_key(tool_name: str, args: Dict[str, Any]) -> str:
+        """
+        도구 이름과 인자로 정규화된 키 생성
+        
+        Args:
+            tool_name: 도구 이름
+            args: 도구 인자 (문자열 값의 공백은 정규화됨)
+            
+        Returns:
+            정규화된 요청 키
+        """
+        canonical_args = {
+            name: " ".join(value.split()) if isinstance(value, str) else value
+            for name, value in args.items()
+        }
+        return json.dumps([tool_name, canonical_args], sort_keys=True, ensure_ascii=False, default=str)
+    
+    def do(self, key: str, fn: Callable, *args, **kwargs) -> Any:
+        """
+        같은 키의 요청이 진행 중이면 그 결과를 기다리고, 아니면 직접 실행
+        
+        Args:
+            key: 요청 키 (make_key로 생성)
+            fn: 실행할 함수
+            
+        Returns:
+            함수 실행 결과 (병합된 호출자는 결과의 복사본을 받음)
+        """
+        with self._lock:
+            self._stats["calls"] += 1
+            call = self._calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = _InFlightCall()
+                self._calls[key] = call
+                self._stats["executions"] += 1
+            else:
+                self._stats["coalesced"] += 1
+        
+        if not is_leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result)
+        
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except Exception as e:
+            call.error = e
+            with self._lock:
+                self._stats["errors"] += 1
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """병합 통계 반환"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["in_flight"] = len(self._calls)
+        stats["coalesced_ratio"] = stats["coalesced"] / stats["calls"] if stats["calls"] else 0.0
+        return stats
+
+
+# 프로세스 전역 single-flight 그룹 (Streamlit 세션 스레드 간 공유)
+_single_flight = SingleFlight()
+
+# 서버 없이 call_batch를 처리할 때 사용하는 실행기
+_batch_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="mcp-batch")
+
 
 class UnifiedMCPClient:
     """통합 MCP 클라이언트 - 모든 MCP 서비스에 대한 인터페이스 제공"""
     
-    def __init__(self, config_path: str = None):
+    def __init__(self, config_path: str = None, use_server: Optional[bool] = None, server_url: Optional[str] = None):
         """
         UnifiedMCPClient 초기화
         
         Args:
             config_path: MCP 설정 파일 경로 (기본값: mcp_config.json)
+            use_server: 검색/키워드 도구를 별도 MCP 서버 프로세스에서 실행할지 여부
+                        (기본값: MCP_USE_SERVER 환경 변수, 서버를 사용할 수 없으면 프로세스 내 서비스 사용)
+            server_url: 공유 HTTP 도구 서버 URL (기본값: MCP_SERVER_URL 환경 변수, 지정하면 use_server보다 우선)
         """
         self.config_path = config_path or os.environ.get("MCP_CONFIG", "mcp_config.json")
-        self.services = {}
-        self._server_process = None
+        # 프로세스 전역 레지스트리 - 서비스는 처음 사용할 때 한 번만 생성되고 모든 클라이언트가 공유
+        self.services = get_registry(self.config_path)
+        self._session: Optional[MCPSessionBase] = None
         
-        # 기존 MCP 서비스 동적 로드
-        self._load_services()
-    
-    def _load_services(self):
-        """설정된 서비스 로드"""
-        try:
-            # datetime 서비스 로드
-            from datetime_mcp_server import DatetimeServer
-            self.services["datetime"] = DatetimeServer(timezone="Asia/Seoul")
-            
-            # search 서비스 로드
-            from google_search_mcp_server import GoogleSearchServer
-            self.services["search"] = GoogleSearchServer(max_results=5)
-            
-        except Exception as e:
-            print(f"서비스 로드 중 오류: {str(e)}", file=sys.stderr)
+        if server_url is None:
+            server_url = os.environ.get("MCP_SERVER_URL") or None
+        if use_server is None:
+            use_server = os.environ.get("MCP_USE_SERVER", "").lower() in ("1", "true", "yes")
+        if server_url:
+            self.connect_mcp_server(server_url)
+        elif use_server:
+            self.start_mcp_server()
     
     # === 날짜/시간 서비스 메서드 ===
     def get_current_time(self):
@@ -76,6 +169,44 @@ class UnifiedMCPClient:
             return self.services["datetime"].format_datetime_info(dt_info)
         raise ValueError("날짜/시간 서비스를 사용할 수 없습니다.")
     
+    def get_datetime_info_many(self, timezones: List[str]) -> Dict[str, Dict[str, Any]]:
+        """여러 시간대의 날짜/시간 정보를 같은 시점 기준으로 가져오기"""
+        if "datetime" in self.services:
+            return self.services["datetime"].get_datetime_info_many(timezones)
+        raise ValueError("날짜/시간 서비스를 사용할 수 없습니다.")
+    
+    def format_datetime_info_many(self, infos: Dict[str, Dict[str, Any]]) -> str:
+        """여러 시간대의 날짜/시간 정보 포맷팅"""
+        if "datetime" in self.services:
+            return self.services["datetime"].format_datetime_info_many(infos)
+        raise ValueError("날짜/시간 서비스를 사용할 수 없습니다.")
+    
+    def calculate_time_difference(self, from_date: str, to_date: Optional[str] = None) -> Dict[str, Any]:
+        """두 날짜/시간 사이의 차이 계산"""
+        if "datetime" in self.services:
+            return self.services["datetime"].calculate_time_difference(from_date, to_date)
+        raise ValueError("날짜/시간 서비스를 사용할 수 없습니다.")
+    
+    def resolve_datetime(self, text: str) -> Optional[Dict[str, Any]]:
+        """
+        질의의 날짜/시간 표현을 로컬에서 계산
+        
+        Args:
+            text: 사용자 질의
+            
+        Returns:
+            계산 결과 딕셔너리 (confident가 True이면 answer를 그대로 응답으로 사용 가능) 또는 None
+        """
+        if "datetime" in self.services:
+            return self.services["datetime"].resolve_expression(text)
+        raise ValueError("날짜/시간 서비스를 사용할 수 없습니다.")
+    
+    def format_datetime_resolution(self, resolution: Dict[str, Any]) -> str:
+        """날짜/시간 표현 계산 결과 포맷팅"""
+        if "datetime" in self.services:
+            return self.services["datetime"].format_resolution(resolution)
+        raise ValueError("날짜/시간 서비스를 사용할 수 없습니다.")
+    
     # === 검색 서비스 메서드 ===
     def search(self, query: str, max_results: int = None) -> List[Dict[str, str]]:
         """
@@ -88,8 +219,19 @@ class UnifiedMCPClient:
         Returns:
             검색 결과 리스트 (딕셔너리)
         """
+        key = SingleFlight.make_key("search", {"query": query, "max_results": max_results})
+        return _single_flight.do(key, self._search, query, max_results)
+    
+    def _search(self, query: str, max_results: Optional[int]) -> List[Dict[str, str]]:
+        """MCP 서버 세션이 있으면 서버에서, 없으면 프로세스 내 서비스로 검색 (서버 사용 시 로컬 서비스는 실패할 때만 생성)"""
+        arguments = {"query": query}
+        if max_results is not None:
+            arguments["max_results"] = max_results
+        data = self._call_remote("search", arguments)
+        if data is not None:
+            return data["results"]
         if "search" in self.services:
-            return self.services["search"].search(query)
+            return self.services["search"].search(query, max_results=max_results)
         raise ValueError("검색 서비스를 사용할 수 없습니다.")
     
     def extract_keywords(self, text: str) -> List[str]:
@@ -102,10 +244,38 @@ class UnifiedMCPClient:
         Returns:
             추출된 키워드 리스트
         """
+        key = SingleFlight.make_key("extract_keywords", {"text": text})
+        return _single_flight.do(key, self._extract_keywords, text)
+    
+    def _extract_keywords(self, text: str) -> List[str]:
+        """MCP 서버 세션이 있으면 서버에서, 없으면 프로세스 내 서비스로 키워드 추출"""
+        data = self._call_remote("extract_keywords", {"text": text})
+        if data is not None:
+            return data["keywords"]
         if "search" in self.services:
             return self.services["search"].extract_keywords(text)
         raise ValueError("검색 서비스를 사용할 수 없습니다.")
     
+    def _call_remote(self, tool_name: str, arguments: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        MCP 서버 세션으로 도구 호출
+        
+        Args:
+            tool_name: 도구 이름
+            arguments: 도구 인자
+            
+        Returns:
+            구조화된 도구 결과 (세션이 없거나 호출에 실패하면 None - 호출자가 프로세스 내 서비스로 처리)
+        """
+        session = self._session
+        if session is None or not session.alive:
+            return None
+        try:
+            return session.call_tool(tool_name, arguments).get("structuredContent")
+        except Exception as e:
+            print(f"MCP 서버 도구 호출 실패, 프로세스 내 서비스로 처리: {tool_name} ({str(e)})", file=sys.stderr)
+            return None
+    
     def format_results(self, results: List[Dict[str, str]]) -> str:
         """
         검색 결과 포맷팅
@@ -116,10 +286,99 @@ class UnifiedMCPClient:
         Returns:
             포맷팅된 문자열
         """
+        if self._session is not None and self._session.alive:
+            # 원격 서버 사용 중에는 포맷팅만을 위해 로컬 검색 서비스(boto3 클라이언트 등)를 만들지 않음
+            from google_search_mcp_server import GoogleSearchServer
+            return GoogleSearchServer.format_results(results)
         if "search" in self.services:
             return self.services["search"].format_results(results)
         raise ValueError("검색 서비스를 사용할 수 없습니다.")
     
+    # === 도구 이름 기반 호출 (Bedrock tool use) ===
+    def call_tool(self, name: str, arguments: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        MCP 도구 이름과 인자로 호출 (검색/키워드는 서버 세션이 있으면 서버에서 실행)
+        
+        Args:
+            name: 도구 이름 (tool_schemas.py 참고)
+            arguments: 도구 인자
+            
+        Returns:
+            {"text": 모델에 전달할 포맷팅된 결과, "data": 구조화된 결과}
+        """
+        args = arguments or {}
+        
+        def require(field: str) -> Any:
+            if field not in args:
+                raise ValueError(f"'{name}' 도구에 '{field}' 인자가 필요합니다.")
+            return args[field]
+        
+        if name == "get_current_time":
+            data = self.get_current_time()
+            return {"text": self.format_time(data), "data": data}
+        if name == "get_current_date":
+            data = self.get_current_date()
+            return {"text": self.format_date(data), "data": data}
+        if name == "get_datetime_info":
+            data = self.get_datetime_info()
+            return {"text": self.format_datetime_info(data), "data": data}
+        if name == "get_datetime_info_many":
+            data = self.get_datetime_info_many(require("timezones"))
+            return {"text": self.format_datetime_info_many(data), "data": data}
+        if name == "calculate_time_difference":
+            data = self.calculate_time_difference(require("from_date"), args.get("to_date"))
+            return {"text": self.get_service("datetime").format_time_difference(data), "data": data}
+        if name == "resolve_datetime_expression":
+            resolution = self.resolve_datetime(require("text"))
+            text = self.format_datetime_resolution(resolution) if resolution else "날짜/시간 표현을 찾을 수 없습니다."
+            return {"text": text, "data": {"resolution": resolution}}
+        if name == "search":
+            results = self.search(require("query"), max_results=args.get("max_results"))
+            return {"text": self.format_results(results), "data": {"results": results}}
+        if name == "extract_keywords":
+            keywords = self.extract_keywords(require("text"))
+            return {"text": f"추출된 키워드: {', '.join(keywords)}", "data": {"keywords": keywords}}
+        raise ValueError(f"알 수 없는 도구: {name}")
+    
+    def call_batch(self, calls: List[Tuple[str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """
+        여러 도구를 동시에 호출 - MCP 서버 세션이 있으면 batch 도구로 한 번의 왕복에 처리
+        
+        Args:
+            calls: (도구 이름, 인자) 리스트
+            
+        Returns:
+            요청 순서와 같은 결과 리스트
+            (각 항목: {"tool", "ok", "text", "data", "error", "elapsed_ms"}, 실패한 항목은 ok=False와 error 메시지)
+        """
+        batch = {"calls": [{"tool": name, "arguments": arguments} for name, arguments in calls]}
+        data = self._call_remote("batch", batch)
+        if data is not None:
+            return [{
+                "tool": item["tool"],
+                "ok": item["ok"],
+                "text": item.get("text", ""),
+                "data": item.get("data"),
+                "error": item["error"]["message"] if item.get("error") else None,
+                "elapsed_ms": item["elapsed_ms"]
+            } for item in data["results"]]
+        
+        # 서버가 없으면 프로세스 내에서 동시에 실행
+        def run_item(call: Tuple[str, Dict[str, Any]]) -> Dict[str, Any]:
+            name, arguments = call
+            start = time.perf_counter()
+            try:
+                result = self.call_tool(name, arguments)
+                item = {"tool": name, "ok": True, "text": result["text"], "data": result["data"], "error": None}
+            except Exception as e:
+                item = {"tool": name, "ok": False, "text": "", "data": None, "error": str(e)}
+            item["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 1)
+            return item
+        
+        if len(calls) == 1:
+            return [run_item(calls[0])]
+        return list(_batch_executor.map(run_item, calls))
+    
     # === 확장 가능한 구조로 새로운 서비스 메서드 추가 ===
     def get_service(self, service_name: str) -> Any:
         """
@@ -135,82 +394,123 @@ class UnifiedMCPClient:
             return self.services[service_name]
         raise ValueError(f"'{service_name}' 서비스를 찾을 수 없습니다.")
     
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        클라이언트 성능 지표 반환
+        
+        Returns:
+            지표 이름별 통계 딕셔너리
+        """
+        stats = {"single_flight": _single_flight.get_stats(), "services": self.services.get_stats()}
+        if self._session is not None:
+            stats["mcp_session"] = self._session.get_stats()
+            # 서버 측 도구 실행/캐시 지표
+            server_stats = self._call_remote("get_mcp_stats", {})
+            if server_stats is not None:
+                stats["mcp_server"] = server_stats
+        
+        # get_stats를 제공하는 서비스의 상태 추가 (지표 조회만으로 서비스를 생성하지 않도록 생성된 서비스만)
+        for service_name, service in self.services.warm_items():
+            if hasattr(service, "get_stats"):
+                stats[service_name] = service.get_stats()
+        
+        return stats
+    
     def start_mcp_server(self):
-        """별도 프로세스로 MCP 서버 시작 (필요한 경우)"""
-        if self._server_process is not None:
+        """별도 프로세스로 MCP 서버를 시작하고 영속 stdio 세션 연결 (initialize 핸드셰이크로 준비 확인)"""
+        if self._session is not None and self._session.alive:
             print("MCP 서버가 이미 실행 중입니다.", file=sys.stderr)
             return
         
         try:
             # mcp.py를 별도 프로세스로 실행
-            script_path = os.path.join(os.path.dirname(__file__), "mcp.py")
-            cmd = [sys.executable, script_path]
+            script_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "mcp.py")
             
             # 환경 변수 설정
             env = os.environ.copy()
             if self.config_path:
-                env["MCP_CONFIG"] = self.config_path
+                env["MCP_CONFIG"] = os.path.abspath(self.config_path)
             
-            # 서버 프로세스 시작
-            self._server_process = subprocess.Popen(
-                cmd, 
-                env=env,
-                stdout=subprocess.PIPE, 
-                stderr=subprocess.PIPE,
-                universal_newlines=True
-            )
+            session = MCPStdioSession([sys.executable, script_path], env=env, cwd=os.path.dirname(script_path))
+            start = time.perf_counter()
+            info = session.start()
+            self._session = session
             
             # 종료 시 정리를 위한 핸들러 등록
             atexit.register(self.stop_mcp_server)
             
-            # 서버가 시작될 때까지 잠시 대기
-            time.sleep(1.0)
+            server_name = info.get("serverInfo", {}).get("name", "MCP 서버")
+            print(f"{server_name}에 연결되었습니다 ({(time.perf_counter() - start) * 1000:.0f} ms).", file=sys.stderr)
+        
+        except Exception as e:
+            print(f"MCP 서버 시작 실패, 프로세스 내 서비스를 사용합니다: {str(e)}", file=sys.stderr)
+            self._session = None
+    
+    def connect_mcp_server(self, url: str):
+        """
+        HTTP로 공유 MCP 도구 서버에 연결 (여러 앱 컨테이너가 하나의 검색 캐시/키워드 클라이언트를 공유)
+        
+        Args:
+            url: JSON-RPC 엔드포인트 URL (예: http://localhost:8765/mcp)
+        """
+        if self._session is not None and self._session.alive:
+            print("MCP 서버에 이미 연결되어 있습니다.", file=sys.stderr)
+            return
+        
+        session = MCPHttpSession(url)
+        try:
+            start = time.perf_counter()
+            info = session.start()
+            self._session = session
+            atexit.register(self.stop_mcp_server)
             
-            if self._server_process.poll() is not None:
-                # 서버가 종료된 경우 오류 확인
-                _, stderr = self._server_process.communicate()
-                print(f"MCP 서버 시작 실패: {stderr}", file=sys.stderr)
-                self._server_process = None
-            else:
-                print("MCP 서버가 시작되었습니다.", file=sys.stderr)
+            server_name = info.get("serverInfo", {}).get("name", "MCP 서버")
+            print(f"{server_name}({url})에 연결되었습니다 ({(time.perf_counter() - start) * 1000:.0f} ms).", file=sys.stderr)
         
         except Exception as e:
-            print(f"MCP 서버 시작 중 오류: {str(e)}", file=sys.stderr)
-            self._server_process = None
+            print(f"MCP 서버 연결 실패, 프로세스 내 서비스를 사용합니다: {url} ({str(e)})", file=sys.stderr)
+            session.close()
+            self._session = None
     
     def stop_mcp_server(self):
-        """MCP 서버 중지 (필요한 경우)"""
-        if self._server_process is None:
+        """MCP 서버 세션 종료 (필요한 경우)"""
+        if self._session is None:
             return
         
         try:
-            # SIGINT 시그널 전송 (Ctrl+C와 동일)
-            self._server_process.send_signal(signal.SIGINT)
-            
-            # 정상 종료 대기
-            try:
-                self._server_process.wait(timeout=5)
-            except subprocess.TimeoutExpired:
-                # 타임아웃된 경우 강제 종료
-                self._server_process.terminate()
-                try:
-                    self._server_process.wait(timeout=2)
-                except subprocess.TimeoutExpired:
-                    self._server_process.kill()
-            
-            self._server_process = None
+            self._session.close()
             print("MCP 서버가 중지되었습니다.", file=sys.stderr)
-            
         except Exception as e:
             print(f"MCP 서버 중지 중 오류: {str(e)}", file=sys.stderr)
+        finally:
+            self._session = None
+
+
+_default_client: Optional[UnifiedMCPClient] = None
+_default_client_lock = threading.Lock()
+
+
+def get_client() -> UnifiedMCPClient:
+    """
+    프로세스 전역 기본 클라이언트 반환 (처음 호출 시 생성)
+    
+    Returns:
+        UnifiedMCPClient 인스턴스
+    """
+    global _default_client
+    if _default_client is None:
+        with _default_client_lock:
+            if _default_client is None:
+                _default_client = UnifiedMCPClient()
+    return _default_client
 
 
-# 기존 코드와의 호환성을 위한 클래스
+# 기존 코드와의 호환성을 위한 클래스 (모두 기본 클라이언트를 공유)
 class DatetimeMCPClient:
     """날짜/시간 MCP 클라이언트 (호환성 유지)"""
     
     def __init__(self, timezone: str = "Asia/Seoul"):
-        self._unified_client = UnifiedMCPClient()
+        self._unified_client = get_client()
     
     def get_current_time(self):
         return self._unified_client.get_current_time()
@@ -231,20 +531,19 @@ class DatetimeMCPClient:
         return self._unified_client.format_datetime_info(dt_info)
     
     def calculate_time_difference(self, from_date: str, to_date: Optional[str] = None):
-        # 필요하다면 이 메서드도 통합 클라이언트로 이동 가능
-        return self._unified_client.get_service("datetime").calculate_time_difference(from_date, to_date)
+        return self._unified_client.calculate_time_difference(from_date, to_date)
 
 
 class GoogleSearchMCPClient:
     """Google 검색 MCP 클라이언트 (호환성 유지)"""
     
     def __init__(self, max_results: int = 5):
-        self._unified_client = UnifiedMCPClient()
+        self._unified_client = get_client()
         self._max_results = max_results
     
     def search(self, query: str, max_results: int = None):
         max_results = max_results or self._max_results
-        return self._unified_client.search(query)
+        return self._unified_client.search(query, max_results=max_results)
     
     def extract_keywords(self, text: str):
         return self._unified_client.extract_keywords(text)
@@ -0,0 +1,213 @@
+#!/usr/bin/env python
+import sys
+import json
+import uuid
+import types
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, Optional
+
+# 클라이언트가 initialize에서 보낸 버전을 그대로 수용하고, 없으면 이 버전으로 응답
+PROTOCOL_VERSION = "2024-11-05"
+
+# JSON-RPC 오류 코드
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INTERNAL_ERROR = -32603
+
+
+class MCPHttpTransport:
+    """
+    MCP 서버를 HTTP로 제공하는 전송 계층 (streamable HTTP 방식의 JSON 응답 모드)
+    
+    POST {path}에 JSON-RPC 메시지(또는 배치 배열)를 보내면 application/json으로 응답합니다.
+    여러 앱 컨테이너가 하나의 도구 서버(검색 캐시, 키워드 클라이언트)를 공유할 수 있습니다.
+    """
+    
+    def __init__(self, mcp_server, host: str = "127.0.0.1", port: int = 8765, path: str = "/mcp",
+                 request_timeout: float = 120.0):
+        """
+        MCPHttpTransport 초기화
+        
+        Args:
+            mcp_server: 도구 핸들러를 제공하는 MCPServer 인스턴스
+            host: 바인딩할 주소 (기본값: 127.0.0.1 - 컨테이너에서는 0.0.0.0)
+            port: 포트 (0이면 임의 포트)
+            path: JSON-RPC 엔드포인트 경로
+            request_timeout: 요청 하나의 최대 처리 시간(초)
+        """
+        self.mcp_server = mcp_server
+        self.host = host
+        self.port = port
+        self.path = path
+        self.request_timeout = request_timeout
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        self._sessions: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._stats = {"http_requests": 0, "messages": 0, "errors": 0, "sessions": 0}
+    
+    async def dispatch(self, message: Dict[str, Any], session_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        JSON-RPC 메시지 하나 처리
+        
+        Args:
+            message: JSON-RPC 요청 또는 알림
+            session_id: Mcp-Session-Id 헤더 값
+        
+        Returns:
+            JSON-RPC 응답 (알림이면 None)
+        """
+        self._stats["messages"] += 1
+        if not isinstance(message, dict) or "method" not in message:
+            return self._error(None, INVALID_REQUEST, "잘못된 JSON-RPC 요청")
+        
+        request_id = message.get("id")
+        method = message["method"]
+        params = message.get("params") or {}
+        
+        # 알림(id 없음)은 응답하지 않음
+        if request_id is None:
+            return None
+        
+        try:
+            if method == "initialize":
+                result = {
+                    "protocolVersion": params.get("protocolVersion", PROTOCOL_VERSION),
+                    "capabilities": self.mcp_server.capabilities,
+                    "serverInfo": self.mcp_server.server_info
+                }
+            elif method == "ping":
+                result = {}
+            elif method == "tools/list":
+                result = await self.mcp_server._handle_list_tools(types.SimpleNamespace(params=params))
+            elif method == "tools/call":
+                request = types.SimpleNamespace(params=types.SimpleNamespace(
+                    name=params.get("name"),
+                    arguments=params.get("arguments") or {}
+                ))
+                result = await self.mcp_server._handle_call_tool(request)
+            else:
+                return self._error(request_id, METHOD_NOT_FOUND, f"알 수 없는 메서드: {method}")
+        except Exception as e:
+            with self._lock:
+                self._stats["errors"] += 1
+            # McpError는 code 속성에 JSON-RPC 오류 코드를 담고 있음
+            code = getattr(e, "code", INTERNAL_ERROR)
+            return self._error(request_id, code if isinstance(code, int) else INTERNAL_ERROR, str(e))
+        
+        return {"jsonrpc": "2.0", "id": request_id, "result": result}
+    
+    @staticmethod
+    def _error(request_id: Any, code: int, message: str) -> Dict[str, Any]:
+        """JSON-RPC 오류 응답 생성"""
+        return {"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}}
+    
+    async def _dispatch_body(self, body: Any, session_id: Optional[str]) -> Any:
+        """단일 메시지 또는 배치 배열 처리 (배치 안의 요청은 동시에 실행)"""
+        if isinstance(body, list):
+            responses = await asyncio.gather(*[self.dispatch(message, session_id) for message in body])
+            return [response for response in responses if response is not None] or None
+        return await self.dispatch(body, session_id)
+    
+    def _make_handler(self):
+        """요청 스레드에서 이벤트 루프로 메시지를 넘기는 HTTP 핸들러 클래스 생성"""
+        transport = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            
+            def log_message(self, format, *args):
+                # 요청마다 stderr에 로그를 남기지 않음
+                pass
+            
+            def _send_json(self, status: int, payload: Any, headers: Optional[Dict[str, str]] = None):
+                body = json.dumps(payload, ensure_ascii=False).encode("utf-8") if payload is not None else b""
+                self.send_response(status)
+                if payload is not None:
+                    self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def do_GET(self):
+                if self.path == "/health":
+                    self._send_json(200, {"status": "ok", "server": transport.mcp_server.server_info, **transport.get_stats()})
+                else:
+                    # 서버 → 클라이언트 SSE 스트림은 제공하지 않음
+                    self._send_json(405, {"error": "GET은 /health만 지원합니다."})
+            
+            def do_DELETE(self):
+                with transport._lock:
+                    transport._sessions.pop(self.headers.get("Mcp-Session-Id"), None)
+                self._send_json(200, None)
+            
+            def do_POST(self):
+                with transport._lock:
+                    transport._stats["http_requests"] += 1
+                if self.path != transport.path:
+                    self._send_json(404, {"error": f"엔드포인트는 {transport.path}입니다."})
+                    return
+                
+                try:
+                    length = int(self.headers.get("Content-Length", 0))
+                    body = json.loads(self.rfile.read(length).decode("utf-8"))
+                except ValueError:
+                    self._send_json(400, transport._error(None, PARSE_ERROR, "JSON 파싱 실패"))
+                    return
+                
+                headers = {}
+                session_id = self.headers.get("Mcp-Session-Id")
+                if isinstance(body, dict) and body.get("method") == "initialize":
+                    session_id = uuid.uuid4().hex
+                    with transport._lock:
+                        transport._sessions[session_id] = {"client": (body.get("params") or {}).get("clientInfo", {})}
+                        transport._stats["sessions"] += 1
+                if session_id:
+                    headers["Mcp-Session-Id"] = session_id
+                
+                future = asyncio.run_coroutine_threadsafe(transport._dispatch_body(body, session_id), transport._loop)
+                try:
+                    response = future.result(timeout=transport.request_timeout)
+                except Exception as e:
+                    future.cancel()
+                    with transport._lock:
+                        transport._stats["errors"] += 1
+                    request_id = body.get("id") if isinstance(body, dict) else None
+                    self._send_json(500, transport._error(request_id, INTERNAL_ERROR, f"요청 처리 실패: {str(e)}"), headers)
+                    return
+                
+                # 알림만 있는 요청은 본문 없이 202
+                self._send_json(200 if response is not None else 202, response, headers)
+        
+        return Handler
+    
+    async def serve(self):
+        """HTTP 서버를 백그라운드 스레드에서 실행하고, 도구 핸들러는 현재 이벤트 루프에서 실행"""
+        self._loop = asyncio.get_running_loop()
+        self._httpd = ThreadingHTTPServer((self.host, self.port), self._make_handler())
+        self._httpd.daemon_threads = True
+        self.port = self._httpd.server_address[1]
+        threading.Thread(target=self._httpd.serve_forever, name="mcp-http", daemon=True).start()
+        print(f"통합 MCP 서버가 http://{self.host}:{self.port}{self.path} 에서 실행 중입니다.", file=sys.stderr)
+        
+        try:
+            await asyncio.Event().wait()
+        finally:
+            self.close()
+    
+    def close(self):
+        """HTTP 서버 종료"""
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """전송 계층 통계 반환"""
+        with self._lock:
+            return {**self._stats, "active_sessions": len(self._sessions)}
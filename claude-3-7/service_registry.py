@@ -0,0 +1,201 @@
+#!/usr/bin/env python
+import os
+import sys
+import json
+import time
+import argparse
+import importlib
+import threading
+from typing import Dict, Any, List, Optional, Iterator, Tuple
+
+# 설정 파일에 services 항목이 없을 때 사용하는 기본 서비스 구성 (mcp.py와 동일)
+DEFAULT_SERVICES = [
+    {
+        "name": "datetime",
+        "module": "datetime_mcp_server",
+        "class": "DatetimeServer",
+        "params": {"timezone": "Asia/Seoul"}
+    },
+    {
+        "name": "search",
+        "module": "search_dispatcher",
+        "class": "SearchDispatcher",
+        "params": {"max_results": 5}
+    }
+]
+
+
+def load_service_config(config_path: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    설정 파일에서 서비스 구성 읽기
+    
+    Args:
+        config_path: MCP 설정 파일 경로 (작업 디렉터리에 없으면 이 모듈 옆에서 찾음)
+    
+    Returns:
+        서비스 구성 리스트 (파일이 없거나 읽을 수 없으면 DEFAULT_SERVICES)
+    """
+    config_path = config_path or os.environ.get("MCP_CONFIG", "mcp_config.json")
+    candidates = [config_path]
+    if not os.path.isabs(config_path):
+        candidates.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), config_path))
+    
+    for path in candidates:
+        if not os.path.exists(path):
+            continue
+        try:
+            with open(path, "r") as f:
+                return json.load(f).get("services", DEFAULT_SERVICES)
+        except Exception as e:
+            print(f"설정 파일 로드 실패: {str(e)}", file=sys.stderr)
+            break
+    return DEFAULT_SERVICES
+
+
+class ServiceRegistry:
+    """서비스를 처음 사용할 때 한 번만 생성하는 스레드 안전 지연 레지스트리"""
+    
+    def __init__(self, services_config: List[Dict[str, Any]]):
+        """
+        ServiceRegistry 초기화 (이 시점에는 모듈을 임포트하거나 서비스를 생성하지 않음)
+        
+        Args:
+            services_config: 서비스 구성 리스트 (name, module, class, params)
+        """
+        self._specs: Dict[str, Dict[str, Any]] = {spec["name"]: spec for spec in services_config}
+        self._instances: Dict[str, Any] = {}
+        self._errors: Dict[str, str] = {}
+        self._init_ms: Dict[str, float] = {}
+        self._locks: Dict[str, threading.Lock] = {name: threading.Lock() for name in self._specs}
+    
+    def _create(self, name: str) -> Any:
+        """서비스 모듈을 임포트하고 인스턴스 생성"""
+        spec = self._specs[name]
+        start = time.perf_counter()
+        module = importlib.import_module(spec["module"])
+        instance = getattr(module, spec["class"])(**spec.get("params", {}))
+        self._init_ms[name] = round((time.perf_counter() - start) * 1000, 1)
+        print(f"서비스 '{name}' 로드 완료 ({self._init_ms[name]:.0f} ms)", file=sys.stderr)
+        return instance
+    
+    def get(self, name: str) -> Optional[Any]:
+        """
+        서비스 인스턴스 반환 (첫 호출 시 생성, 동시 호출은 생성이 끝날 때까지 대기)
+        
+        Args:
+            name: 서비스 이름 ("datetime", "search" 등)
+        
+        Returns:
+            서비스 인스턴스 (등록되지 않았거나 생성에 실패한 경우 None)
+        """
+        instance = self._instances.get(name)
+        if instance is not None or name not in self._specs:
+            return instance
+        
+        with self._locks[name]:
+            if name in self._instances:
+                return self._instances[name]
+            if name in self._errors:
+                return None
+            try:
+                self._instances[name] = self._create(name)
+            except Exception as e:
+                # 실패도 기록하여 매 호출마다 임포트를 재시도하지 않음 (reset으로 재시도 가능)
+                self._errors[name] = str(e)
+                print(f"서비스 '{name}' 로드 실패: {str(e)}", file=sys.stderr)
+                return None
+        return self._instances[name]
+    
+    def __contains__(self, name: str) -> bool:
+        """서비스 사용 가능 여부 (아직 생성되지 않았으면 이 시점에 생성)"""
+        return self.get(name) is not None
+    
+    def __getitem__(self, name: str) -> Any:
+        instance = self.get(name)
+        if instance is None:
+            raise KeyError(name)
+        return instance
+    
+    def names(self) -> List[str]:
+        """등록된 서비스 이름 목록"""
+        return list(self._specs)
+    
+    def warm_items(self) -> Iterator[Tuple[str, Any]]:
+        """이미 생성된 서비스만 (이름, 인스턴스)로 순회 - 새 서비스를 생성하지 않음"""
+        return iter(list(self._instances.items()))
+    
+    def warm(self, names: Optional[List[str]] = None, background: bool = False):
+        """
+        서비스를 미리 생성 (첫 요청의 지연을 없애고 싶을 때)
+        
+        Args:
+            names: 생성할 서비스 이름 (기본값: 전체)
+            background: True이면 데몬 스레드에서 생성
+        """
+        targets = names or self.names()
+        if background:
+            threading.Thread(target=self.warm, args=(targets,), name="service-warmup", daemon=True).start()
+            return
+        for name in targets:
+            self.get(name)
+    
+    def reset(self, name: str):
+        """생성 실패 기록을 지워 다음 사용 시 다시 생성하도록 함"""
+        with self._locks[name]:
+            self._errors.pop(name, None)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        서비스별 초기화 상태 반환
+        
+        Returns:
+            서비스 이름별 {warm, init_ms, error} 딕셔너리
+        """
+        stats = {}
+        for name in self._specs:
+            stats[name] = {
+                "warm": name in self._instances,
+                "init_ms": self._init_ms.get(name),
+            }
+            if name in self._errors:
+                stats[name]["error"] = self._errors[name]
+        return stats
+
+
+# 설정 파일 경로별 프로세스 전역 레지스트리
+_registries: Dict[str, ServiceRegistry] = {}
+_registries_lock = threading.Lock()
+
+
+def get_registry(config_path: Optional[str] = None) -> ServiceRegistry:
+    """
+    설정 파일에 해당하는 프로세스 전역 레지스트리 반환 (같은 설정이면 항상 같은 인스턴스)
+    
+    Args:
+        config_path: MCP 설정 파일 경로 (기본값: MCP_CONFIG 환경 변수 또는 mcp_config.json)
+    
+    Returns:
+        ServiceRegistry 인스턴스
+    """
+    config_path = config_path or os.environ.get("MCP_CONFIG", "mcp_config.json")
+    key = os.path.abspath(config_path)
+    with _registries_lock:
+        if key not in _registries:
+            _registries[key] = ServiceRegistry(load_service_config(config_path))
+        return _registries[key]
+
+
+def main():
+    """CLI 인터페이스로 서비스 초기화 시간 확인"""
+    parser = argparse.ArgumentParser(description="MCP 서비스 레지스트리")
+    parser.add_argument('services', nargs='*', help='생성할 서비스 이름 (생략하면 전체)')
+    parser.add_argument('--config', default=None, help='MCP 설정 파일 경로')
+    
+    args = parser.parse_args()
+    
+    registry = get_registry(args.config)
+    registry.warm(args.services or None)
+    print(json.dumps(registry.get_stats(), ensure_ascii=False, indent=2))
+
+if __name__ == "__main__":
+    main()
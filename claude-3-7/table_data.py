@@ -0,0 +1,329 @@
+#!/usr/bin/env python
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import pandas as pd
+
+from document_parser import BufferStream, Buffer, ProgressCallback
+
+# 표 모드로 처리하는 확장자
+TABLE_EXTENSIONS = (".csv", ".xls", ".xlsx")
+
+# 한 번에 읽는 행 수
+READ_CHUNK_ROWS = 50000
+
+# 프로필에 넣는 예시 행 수, 범주형 열의 상위 값 수, 셀 값 최대 길이
+SAMPLE_ROWS = 3
+TOP_VALUES = 5
+MAX_CELL_CHARS = 40
+
+# query_table 결과 행 수 기본값/최댓값
+DEFAULT_QUERY_LIMIT = 20
+MAX_QUERY_LIMIT = 50
+
+AGGREGATIONS = ("count", "sum", "mean", "median", "min", "max", "nunique", "std")
+
+
+def _cell(value: Any) -> str:
+    """프로필에 넣을 셀 값 문자열 (긴 값은 자름)"""
+    text = str(value)
+    return text if len(text) <= MAX_CELL_CHARS else text[:MAX_CELL_CHARS - 1] + "…"
+
+
+def iter_csv_chunks(data: Buffer, progress: Optional[ProgressCallback] = None) -> Iterator[pd.DataFrame]:
+    """CSV를 READ_CHUNK_ROWS 행씩 읽기 (진행률은 읽은 바이트 기준)"""
+    with BufferStream(data) as stream:
+        total = len(stream.getbuffer())
+        for chunk in pd.read_csv(stream, chunksize=READ_CHUNK_ROWS):
+            yield chunk
+            if progress:
+                progress(min(stream.tell(), total), total)
+
+
+def iter_excel_chunks(data: Buffer, progress: Optional[ProgressCallback] = None) -> Iterator[pd.DataFrame]:
+    """Excel 첫 시트를 읽기 전용 스트리밍 모드로 READ_CHUNK_ROWS 행씩 읽기"""
+    with BufferStream(data) as stream:
+        try:
+            from openpyxl import load_workbook
+            workbook = load_workbook(stream, read_only=True, data_only=True)
+        except Exception:
+            # openpyxl이 읽지 못하는 형식(.xls)은 pandas 엔진으로 한 번에 읽음
+            stream.seek(0)
+            yield pd.read_excel(stream)
+            if progress:
+                progress(1, 1)
+            return
+        
+        try:
+            sheet = workbook.worksheets[0]
+            total = sheet.max_row or 0
+            rows = sheet.iter_rows(values_only=True)
+            header = next(rows, None)
+            if header is None:
+                return
+            columns = [str(name) if name is not None else f"Unnamed: {index}" for index, name in enumerate(header)]
+            
+            batch: List[tuple] = []
+            done = 1
+            for row in rows:
+                batch.append(row[:len(columns)])
+                if len(batch) >= READ_CHUNK_ROWS:
+                    done += len(batch)
+                    yield pd.DataFrame(batch, columns=columns)
+                    batch = []
+                    if progress and total:
+                        progress(min(done, total), total)
+            if batch:
+                done += len(batch)
+                yield pd.DataFrame(batch, columns=columns)
+            if progress:
+                progress(total or done, total or done)
+        finally:
+            workbook.close()
+
+
+class TableData:
+    """업로드한 표 데이터와 프롬프트용 요약 프로필 (원본 행은 프롬프트에 넣지 않고 query_table로만 조회)"""
+    
+    def __init__(self, frame: pd.DataFrame, name: str = "", load_ms: float = 0.0):
+        """
+        TableData 초기화
+        
+        Args:
+            frame: 표 데이터
+            name: 파일 이름 (프로필 표시용)
+            load_ms: 읽는 데 걸린 시간(ms)
+        """
+        self.frame = frame
+        self.name = name
+        self.load_ms = load_ms
+        self.profile = self._build_profile()
+        self._lock = threading.Lock()
+        self._stats = {"queries": 0, "errors": 0, "query_ms": 0.0}
+    
+    @classmethod
+    def load(cls, data: Buffer, file_ext: str, name: str = "", progress: Optional[ProgressCallback] = None) -> "TableData":
+        """
+        업로드 버퍼에서 표 데이터를 청크 단위로 읽어 생성
+        
+        Args:
+            data: 파일 내용
+            file_ext: 파일 확장자 ('.csv', '.xls', '.xlsx')
+            name: 파일 이름
+            progress: (처리량, 전체량)으로 호출되는 진행률 콜백
+        
+        Returns:
+            TableData 인스턴스
+        """
+        start = time.perf_counter()
+        chunks = iter_csv_chunks if file_ext.lower() == ".csv" else iter_excel_chunks
+        try:
+            frames = list(chunks(data, progress))
+        except Exception as e:
+            raise Exception(f"파일 처리 중 오류가 발생했습니다 ({file_ext}): {str(e)}")
+        frame = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+        # 청크마다 다르게 추론된 형식(예: 결측값이 있는 정수 열)을 전체 기준으로 다시 추론
+        frame = frame.infer_objects()
+        return cls(frame, name, round((time.perf_counter() - start) * 1000, 1))
+    
+    def _column_summary(self, column: str) -> str:
+        """열 하나의 통계 요약"""
+        series = self.frame[column]
+        if pd.api.types.is_bool_dtype(series):
+            counts = series.value_counts()
+            return ", ".join(f"{value}: {count:,}" for value, count in counts.items())
+        if pd.api.types.is_numeric_dtype(series):
+            if series.notna().sum() == 0:
+                return "값 없음"
+            return (f"최소 {series.min():,.4g}, 최대 {series.max():,.4g}, 평균 {series.mean():,.4g}, "
+                    f"중앙값 {series.median():,.4g}")
+        if pd.api.types.is_datetime64_any_dtype(series):
+            return f"{series.min()} ~ {series.max()}"
+        counts = series.astype(str)[series.notna()].value_counts().head(TOP_VALUES)
+        return "상위 값: " + ", ".join(f"{_cell(value)} ({count:,})" for value, count in counts.items())
+    
+    def _build_profile(self) -> str:
+        """스키마, 열별 통계, 예시 행으로 구성한 프롬프트용 프로필"""
+        frame = self.frame
+        lines = [
+            f"표 데이터{f' ({self.name})' if self.name else ''}: {len(frame):,}행 × {len(frame.columns)}열",
+            "원본 행은 포함하지 않았습니다. 구체적인 값, 필터링, 집계가 필요하면 query_table 도구로 조회하세요.",
+            "",
+            "| 열 | 형식 | 결측 | 고유값 | 통계 |",
+            "|---|---|---|---|---|"
+        ]
+        for column in frame.columns:
+            series = frame[column]
+            lines.append(f"| {_cell(column)} | {series.dtype} | {int(series.isna().sum()):,} | "
+                         f"{int(series.nunique(dropna=True)):,} | {self._column_summary(column)} |")
+        
+        if len(frame):
+            lines.extend(["", f"예시 행 ({min(SAMPLE_ROWS, len(frame))}행):"])
+            sample = frame.head(SAMPLE_ROWS).apply(lambda column: column.map(_cell))
+            lines.append(sample.to_string(index=False))
+        return "\n".join(lines)
+    
+    def _filter(self, frame: pd.DataFrame, condition: Dict[str, Any]) -> pd.DataFrame:
+        """필터 조건 하나 적용"""
+        column, op, value = condition.get("column"), condition.get("op"), condition.get("value")
+        if column not in frame.columns:
+            raise ValueError(f"알 수 없는 열: {column}")
+        series = frame[column]
+        if op == "isnull":
+            return frame[series.isna()]
+        if op == "notnull":
+            return frame[series.notna()]
+        if op == "contains":
+            return frame[series.astype(str).str.contains(str(value), case=False, regex=False, na=False)]
+        if op == "in":
+            return frame[series.isin(value if isinstance(value, list) else [value])]
+        comparisons = {
+            "==": series.__eq__, "!=": series.__ne__, ">": series.__gt__,
+            ">=": series.__ge__, "<": series.__lt__, "<=": series.__le__
+        }
+        if op not in comparisons:
+            raise ValueError(f"지원하지 않는 연산자: {op}")
+        return frame[comparisons[op](value)]
+    
+    def query(self, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        query_table 도구 실행
+        
+        Args:
+            arguments: filters, columns, group_by, aggregations, sort_by, descending, limit
+        
+        Returns:
+            {"text": 결과 표 문자열, "data": {"matched_rows", "returned_rows", "columns"}}
+        """
+        start = time.perf_counter()
+        try:
+            frame = self.frame
+            for condition in arguments.get("filters") or []:
+                frame = self._filter(frame, condition)
+            matched_rows = len(frame)
+            
+            unknown = [column for column in (arguments.get("columns") or []) + (arguments.get("group_by") or [])
+                       + list(arguments.get("aggregations") or {})
+                       if column not in frame.columns]
+            if unknown:
+                raise ValueError(f"알 수 없는 열: {', '.join(unknown)}")
+            
+            group_by = arguments.get("group_by") or []
+            aggregations = arguments.get("aggregations") or {}
+            invalid = [func for func in aggregations.values() if func not in AGGREGATIONS]
+            if invalid:
+                raise ValueError(f"지원하지 않는 집계 함수: {', '.join(invalid)}")
+            
+            if group_by:
+                grouped = frame.groupby(group_by, dropna=False)
+                result = grouped.agg(aggregations).reset_index() if aggregations else grouped.size().reset_index(name="rows")
+            elif aggregations:
+                result = pd.DataFrame([{f"{column}_{func}": frame[column].agg(func) for column, func in aggregations.items()}])
+            else:
+                result = frame[arguments["columns"]] if arguments.get("columns") else frame
+            
+            if arguments.get("sort_by"):
+                if arguments["sort_by"] not in result.columns:
+                    raise ValueError(f"정렬할 수 없는 열: {arguments['sort_by']}")
+                result = result.sort_values(arguments["sort_by"], ascending=not arguments.get("descending", False))
+            
+            limit = max(1, min(int(arguments.get("limit") or DEFAULT_QUERY_LIMIT), MAX_QUERY_LIMIT))
+            shown = result.head(limit)
+            text = shown.to_string(index=False, max_colwidth=MAX_CELL_CHARS * 2) if len(shown) else "조건에 맞는 행이 없습니다."
+            text = f"조건에 맞는 행: {matched_rows:,} / 결과 {len(result):,}행 중 {len(shown)}행 표시\n\n{text}"
+        except Exception:
+            with self._lock:
+                self._stats["errors"] += 1
+            raise
+        finally:
+            with self._lock:
+                self._stats["queries"] += 1
+                self._stats["query_ms"] += (time.perf_counter() - start) * 1000
+        
+        return {
+            "text": text,
+            "data": {"matched_rows": matched_rows, "returned_rows": len(shown), "columns": [str(c) for c in shown.columns]}
+        }
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        표 데이터 지표 반환
+        
+        Returns:
+            행/열 수, 메모리 사용량, 로드 시간, 프로필 길이, 조회 횟수와 평균 시간
+        """
+        with self._lock:
+            queries = self._stats["queries"]
+            return {
+                "rows": len(self.frame),
+                "columns": len(self.frame.columns),
+                "memory_mb": round(float(self.frame.memory_usage(deep=True).sum()) / 1024 / 1024, 1),
+                "load_ms": self.load_ms,
+                "profile_chars": len(self.profile),
+                "queries": queries,
+                "errors": self._stats["errors"],
+                "avg_query_ms": round(self._stats["query_ms"] / queries, 2) if queries else 0.0
+            }
+
+
+# 문서 내용 해시별 표 데이터 (프로세스 전역, 최근 사용한 표만 유지)
+MAX_TABLES = 8
+_tables: "OrderedDict[str, TableData]" = OrderedDict()
+_tables_lock = threading.Lock()
+
+
+def get_table(key: str, load: Callable[[], TableData]) -> TableData:
+    """
+    표 데이터 반환 (같은 키의 표는 한 번만 읽음)
+    
+    Args:
+        key: 문서 키 (document_store.content_key)
+        load: 표가 없을 때 TableData를 만드는 함수
+    
+    Returns:
+        TableData 인스턴스
+    """
+    with _tables_lock:
+        table = _tables.get(key)
+        if table is not None:
+            _tables.move_to_end(key)
+            return table
+    
+    table = load()
+    with _tables_lock:
+        table = _tables.setdefault(key, table)
+        _tables.move_to_end(key)
+        while len(_tables) > MAX_TABLES:
+            _tables.popitem(last=False)
+    return table
+
+
+def main():
+    """CLI 인터페이스로 표 프로필과 조회 확인"""
+    parser = argparse.ArgumentParser(description="표 데이터 프로필/조회")
+    parser.add_argument('path', help='CSV/Excel 파일 경로')
+    parser.add_argument('--query', default=None, help='query_table 인자 (JSON)')
+    
+    args = parser.parse_args()
+    
+    with open(args.path, "rb") as f:
+        data = f.read()
+    try:
+        table = TableData.load(data, os.path.splitext(args.path)[1], os.path.basename(args.path))
+        print(table.profile)
+        if args.query:
+            print()
+            print(table.query(json.loads(args.query))["text"])
+    except Exception as e:
+        print(str(e), file=sys.stderr)
+        sys.exit(1)
+    print(json.dumps(table.get_stats(), ensure_ascii=False, indent=2), file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+"""
+MCPServer._run_tool 도구별 통계 테스트 - 실패한 도구 호출이 errors로 집계되는지 확인
+
+MCP SDK가 설치되어 있지 않으면 mcp.py가 사용하는 이름만 가진 최소 모듈로 대신합니다
+(통계 집계는 SDK와 무관하며 서버 전송 계층은 사용하지 않음).
+
+사용법:
+    python -m pytest tests/test_mcp_tool_stats.py
+"""
+import os
+import sys
+import time
+import types
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+
+def _install_sdk_stub():
+    try:
+        import modelcontextprotocol.sdk.types  # noqa: F401
+        return
+    except ImportError:
+        pass
+    
+    class McpError(Exception):
+        def __init__(self, code, message):
+            super().__init__(message)
+            self.code = code
+            self.message = message
+    
+    modules = {name: types.ModuleType(name) for name in (
+        "modelcontextprotocol", "modelcontextprotocol.sdk", "modelcontextprotocol.sdk.server",
+        "modelcontextprotocol.sdk.server.stdio", "modelcontextprotocol.sdk.types"
+    )}
+    modules["modelcontextprotocol.sdk.server"].Server = object
+    modules["modelcontextprotocol.sdk.server.stdio"].StdioServerTransport = object
+    sdk_types = modules["modelcontextprotocol.sdk.types"]
+    sdk_types.CallToolRequestSchema = object()
+    sdk_types.ListToolsRequestSchema = object()
+    sdk_types.ErrorCode = types.SimpleNamespace(InternalError=-32603, InvalidParams=-32602, MethodNotFound=-32601)
+    sdk_types.McpError = McpError
+    sys.modules.update(modules)
+
+
+_install_sdk_stub()
+import mcp  # noqa: E402
+
+
+def make_server(tool_limits):
+    """서비스 로드 없이 _run_tool에 필요한 상태만 가진 MCPServer"""
+    server = mcp.MCPServer.__new__(mcp.MCPServer)
+    server.tool_limits = tool_limits
+    server._executor = ThreadPoolExecutor(max_workers=2)
+    server._semaphores = {}
+    server._tool_stats = {}
+    return server
+
+
+def failing_tool():
+    # _execute_tool과 같이 도구 오류를 McpError로 감싸서 던짐
+    raise mcp.McpError(mcp.ErrorCode.InternalError, "도구 실행 오류")
+
+
+def slow_tool():
+    time.sleep(0.3)
+    return "done"
+
+
+@pytest.mark.parametrize("tool_limits", [{"extract_keywords": {"concurrency": 2, "timeout": 5}}, {}],
+                         ids=["limited", "unlimited"])
+def test_failing_tool_increments_errors(tool_limits):
+    server = make_server(tool_limits)
+    with pytest.raises(mcp.McpError):
+        asyncio.run(server._run_tool("extract_keywords", failing_tool))
+    
+    stats = server.get_stats()["extract_keywords"]
+    assert stats["calls"] == 1
+    assert stats["errors"] == 1
+    assert stats["timeouts"] == 0
+
+
+def test_timeout_is_not_counted_as_error():
+    server = make_server({"search": {"concurrency": 1, "timeout": 0.05}})
+    with pytest.raises(mcp.McpError):
+        asyncio.run(server._run_tool("search", slow_tool))
+    server._executor.shutdown(wait=True)
+    
+    stats = server.get_stats()["search"]
+    assert stats["timeouts"] == 1
+    assert stats["errors"] == 0
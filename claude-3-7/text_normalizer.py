@@ -0,0 +1,350 @@
+#!/usr/bin/env python
+import os
+import re
+import sys
+import json
+import time
+import argparse
+import threading
+from html.parser import HTMLParser
+from collections import Counter
+from typing import Any, Dict, Iterable, List
+
+from document_index import estimate_tokens
+
+# 추출/정리 결과 형식 버전 - document_parser 추출 방식이나 정리 규칙이 바뀌면 올림
+# (document_store 문서 키에 포함되므로 이전 버전으로 저장된 문서는 다시 수집됨)
+TEXT_VERSION = 3
+
+# 페이지 위/아래에서 머리글/바닥글 후보로 볼 줄 수
+HEADER_LINES = 2
+FOOTER_LINES = 2
+
+# 전체 페이지 중 이 비율 이상(최소 3페이지)에 같은 위치로 반복되면 머리글/바닥글로 판단
+REPEAT_RATIO = 0.5
+MIN_REPEAT_PAGES = 3
+
+# 숫자만 다른 줄(쪽 번호 등)을 같은 줄로 볼 최대 길이 - 긴 본문 줄이 숫자만 달라 지워지지 않도록
+PAGE_NUMBER_LINE_CHARS = 50
+
+# 문서 전체에서 중복을 제거할 최소 줄 길이 (짧은 줄은 연속으로 반복될 때만 제거)
+DEDUP_MIN_CHARS = 40
+
+# 내용을 버리는 HTML 태그와 줄을 바꾸는 블록 태그
+HTML_SKIP_TAGS = frozenset("script style noscript template svg iframe object canvas".split())
+HTML_BLOCK_TAGS = frozenset("""
+address article aside blockquote br dd details div dl dt fieldset figcaption figure footer form h1 h2 h3 h4 h5 h6
+header hr li main nav ol p pre section summary table tbody thead tfoot tr ul title
+""".split())
+# Markdown 인라인 HTML로 제거할 태그 (List<String> 같은 제네릭 표기는 태그로 보지 않음)
+HTML_INLINE_TAGS = frozenset("""
+a abbr audio b big body button caption center cite code col colgroup del dfn em font head html i img input ins kbd
+label link mark meta option picture q s samp select small source span strike strong sub sup td textarea th time track
+u var video wbr
+""".split())
+HTML_TAGS = HTML_SKIP_TAGS | HTML_BLOCK_TAGS | HTML_INLINE_TAGS
+
+# 페이지 단위로 추출되는 형식 (머리글/바닥글 제거 대상)과 들여쓰기를 유지할 형식
+PAGED_EXTENSIONS = (".pdf",)
+INDENTED_EXTENSIONS = (".md", ".markdown", ".txt")
+HTML_EXTENSIONS = (".html", ".htm")
+MARKDOWN_EXTENSIONS = (".md", ".markdown")
+
+_SPACES = re.compile(r"[ \t\f\v\u00a0\u200b]+")
+_BLANK_LINES = re.compile(r"\n{3,}")
+_HYPHENATED = re.compile(r"([A-Za-z])-\n([a-z])")
+_DIGITS = re.compile(r"\d+")
+_MD_IMAGE = re.compile(r"!\[([^\]]*)\]\([^)]*\)")
+_MD_LINK = re.compile(r"\[([^\]]+)\]\([^)]*\)")
+_MD_REFERENCE = re.compile(r"^\s{0,3}\[[^\]]+\]:\s*\S+.*$", re.MULTILINE)
+# 굵게 표기 - "__"는 공백/여는 괄호 뒤에서 시작해 공백/문장 부호 앞에서 끝날 때만 인정 (__init__, self.__dict__ 같은 식별자 보존)
+_MD_EMPHASIS = re.compile(r"\*\*(?=\S)(.+?)(?<=\S)\*\*|(?<![^\s(\[])__(?=\S)(.+?)(?<=\S)__(?=[\s,;:!?)\]]|\.(?!\w)|$)")
+# 코드 펜스 줄(```/~~~), 펜스 코드 블록 전체와 인라인 코드 - 마크업 제거에서 제외하고 그대로 복원
+_MD_FENCE = re.compile(r"^ {0,3}(`{3,}|~{3,})")
+_MD_CODE = re.compile(r"^ {0,3}(`{3,}|~{3,})[^\n]*\n.*?(?:^ {0,3}\1[ \t]*$|\Z)|(`+)(?!`).+?(?<!`)\2(?!`)",
+                      re.MULTILINE | re.DOTALL)
+_CODE_PLACEHOLDER = re.compile(r"\x00(\d+)\x00")
+_HTML_COMMENT = re.compile(r"<!--.*?-->", re.DOTALL)
+_HTML_TAG = re.compile(r"</?([A-Za-z][A-Za-z0-9-]*)(\s[^<>]*)?/?>")
+
+
+class _HTMLTextExtractor(HTMLParser):
+    """HTML에서 화면에 보이는 텍스트만 모으는 파서 (스크립트/스타일 제외, 블록 태그는 줄바꿈)"""
+    
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts: List[str] = []
+        self._skip_depth = 0
+    
+    def handle_starttag(self, tag, attrs):
+        if tag in HTML_SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag in HTML_BLOCK_TAGS:
+            self.parts.append("\n")
+        elif tag in ("td", "th"):
+            self.parts.append(" ")
+    
+    def handle_startendtag(self, tag, attrs):
+        if tag in HTML_BLOCK_TAGS:
+            self.parts.append("\n")
+    
+    def handle_endtag(self, tag):
+        if tag in HTML_SKIP_TAGS:
+            self._skip_depth = max(self._skip_depth - 1, 0)
+        elif tag in HTML_BLOCK_TAGS:
+            self.parts.append("\n")
+    
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self.parts.append(data)
+
+
+def strip_html(text: str) -> str:
+    """
+    HTML 태그, 스크립트, 스타일을 제거하고 보이는 텍스트만 반환
+    
+    Args:
+        text: HTML 문서
+    
+    Returns:
+        텍스트
+    """
+    extractor = _HTMLTextExtractor()
+    extractor.feed(text)
+    extractor.close()
+    return "".join(extractor.parts)
+
+
+def strip_markdown(text: str) -> str:
+    """
+    Markdown에서 토큰만 차지하는 표기 제거 (링크/이미지 주소, 참조 정의, 강조 기호, 인라인 HTML)
+    제목(#)과 목록 기호는 문서 구조를 알려주므로 유지하고, 펜스 코드 블록과 인라인 코드는 그대로 둠
+    
+    Args:
+        text: Markdown 문서
+    
+    Returns:
+        텍스트
+    """
+    code: List[str] = []
+    
+    def protect(match) -> str:
+        code.append(match.group(0))
+        return f"\x00{len(code) - 1}\x00"
+    
+    text = _MD_CODE.sub(protect, text.replace("\x00", ""))
+    text = _HTML_COMMENT.sub("", text)
+    text = _MD_IMAGE.sub(r"\1", text)
+    text = _MD_LINK.sub(r"\1", text)
+    text = _MD_REFERENCE.sub("", text)
+    text = _MD_EMPHASIS.sub(lambda match: match.group(1) or match.group(2), text)
+    text = _HTML_TAG.sub(lambda match: "" if match.group(1) in HTML_TAGS else match.group(0), text)
+    return _CODE_PLACEHOLDER.sub(lambda match: code[int(match.group(1))], text)
+
+
+def _line_signature(line: str) -> str:
+    # 짧은 줄은 숫자를 무시하고 비교 (쪽 번호가 들어간 머리글/바닥글)
+    line = line.strip().lower()
+    return _DIGITS.sub("#", line) if len(line) <= PAGE_NUMBER_LINE_CHARS else line
+
+
+def remove_page_furniture(pages: List[str]) -> List[str]:
+    """
+    여러 페이지의 같은 위치(위/아래 몇 줄)에 반복되는 머리글과 바닥글 제거
+    
+    Args:
+        pages: 페이지별 텍스트
+    
+    Returns:
+        머리글/바닥글을 제거한 페이지별 텍스트
+    """
+    if len(pages) < MIN_REPEAT_PAGES:
+        return pages
+    
+    # 빈 줄은 위치 계산에서만 건너뛰고 원래 줄 구조(문단 사이 빈 줄)는 유지
+    page_lines = [page.split("\n") for page in pages]
+    content_rows = [[row for row, line in enumerate(lines) if line.strip()] for lines in page_lines]
+    headers: Counter = Counter()
+    footers: Counter = Counter()
+    for lines, rows in zip(page_lines, content_rows):
+        headers.update({_line_signature(lines[row]) for row in rows[:HEADER_LINES]})
+        footers.update({_line_signature(lines[row]) for row in rows[-FOOTER_LINES:]})
+    
+    threshold = max(MIN_REPEAT_PAGES, REPEAT_RATIO * len(pages))
+    repeated_headers = {signature for signature, count in headers.items() if count >= threshold}
+    repeated_footers = {signature for signature, count in footers.items() if count >= threshold}
+    if not repeated_headers and not repeated_footers:
+        return pages
+    
+    cleaned = []
+    for lines, rows in zip(page_lines, content_rows):
+        start, end = 0, len(rows)
+        while start < min(HEADER_LINES, end) and _line_signature(lines[rows[start]]) in repeated_headers:
+            start += 1
+        while end > max(start, len(rows) - FOOTER_LINES) and _line_signature(lines[rows[end - 1]]) in repeated_footers:
+            end -= 1
+        removed = set(rows[:start]) | set(rows[end:])
+        text = "\n".join(line for row, line in enumerate(lines) if row not in removed)
+        cleaned.append(text if text.endswith("\n") else text + "\n")
+    return cleaned
+
+
+def collapse_whitespace(text: str, keep_indent: bool = False) -> str:
+    """
+    하이픈으로 나뉜 영어 단어를 잇고, 연속 공백과 빈 줄을 줄이며 줄 앞뒤 공백 제거
+    
+    Args:
+        text: 텍스트
+        keep_indent: 줄 앞 들여쓰기 유지 여부 (Markdown/텍스트의 코드 블록, 중첩 목록) -
+            설정하면 펜스 코드 블록(```/~~~) 안의 줄은 줄 끝 공백만 제거하고 그대로 유지
+    
+    Returns:
+        정리된 텍스트
+    """
+    text = text.replace("\r\n", "\n").replace("\r", "\n").replace("\u00ad", "")
+    lines = []
+    fence = None
+    for line in text.split("\n"):
+        if keep_indent:
+            marker = _MD_FENCE.match(line)
+            if fence is None and marker:
+                fence = marker.group(1)
+            elif fence is not None:
+                if marker and marker.group(1)[0] == fence[0] and len(marker.group(1)) >= len(fence):
+                    fence = None
+                lines.append(line.rstrip())
+                continue
+        content = line.lstrip(" \t")
+        indent = line[:len(line) - len(content)] if keep_indent and content else ""
+        lines.append(indent + _SPACES.sub(" ", content).strip())
+    text = _HYPHENATED.sub(r"\1\2", "\n".join(lines))
+    return _BLANK_LINES.sub("\n\n", text).strip() + "\n"
+
+
+def deduplicate_lines(text: str) -> str:
+    """
+    연속으로 반복되는 줄과 문서 전체에서 이미 나온 긴 줄 제거 (펜스 코드 블록 안의 줄은 유지)
+    
+    Args:
+        text: 텍스트
+    
+    Returns:
+        중복 줄을 제거한 텍스트
+    """
+    seen = set()
+    lines = []
+    previous = None
+    fence = None
+    for line in text.split("\n"):
+        marker = _MD_FENCE.match(line)
+        if fence is None and marker:
+            fence = marker.group(1)
+        elif fence is not None:
+            if marker and marker.group(1)[0] == fence[0] and len(marker.group(1)) >= len(fence):
+                fence = None
+            lines.append(line)
+            previous = None
+            continue
+        if line and line == previous:
+            continue
+        if len(line) >= DEDUP_MIN_CHARS:
+            if line in seen:
+                continue
+            seen.add(line)
+        lines.append(line)
+        previous = line
+    return "\n".join(lines)
+
+
+class TextNormalizer:
+    """추출한 문서 텍스트를 프롬프트에 넣기 전에 정리하여 토큰을 줄이는 전처리기"""
+    
+    def __init__(self):
+        """TextNormalizer 초기화"""
+        self._lock = threading.Lock()
+        self._stats = {"documents": 0, "chars_before": 0, "chars_after": 0, "tokens_before": 0, "tokens_after": 0,
+                       "elapsed_ms": 0.0}
+    
+    def normalize(self, parts: Iterable[str], file_ext: str) -> str:
+        """
+        추출 결과(페이지/섹션 조각)를 정리한 텍스트로 변환
+        
+        Args:
+            parts: document_parser.iter_document가 생성하는 텍스트 조각
+            file_ext: 파일 확장자 (마크업 제거와 머리글/바닥글 제거 여부 결정)
+        
+        Returns:
+            정리된 텍스트
+        """
+        file_ext = file_ext.lower()
+        parts = list(parts)
+        start = time.perf_counter()
+        raw_chars = sum(len(part) for part in parts)
+        raw_tokens = sum(estimate_tokens(part) for part in parts)
+        
+        if file_ext in PAGED_EXTENSIONS:
+            parts = remove_page_furniture(parts)
+        text = "".join(parts)
+        del parts
+        if file_ext in HTML_EXTENSIONS:
+            text = strip_html(text)
+        elif file_ext in MARKDOWN_EXTENSIONS:
+            text = strip_markdown(text)
+        text = deduplicate_lines(collapse_whitespace(text, keep_indent=file_ext in INDENTED_EXTENSIONS))
+        
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        with self._lock:
+            self._stats["documents"] += 1
+            self._stats["chars_before"] += raw_chars
+            self._stats["chars_after"] += len(text)
+            self._stats["tokens_before"] += raw_tokens
+            self._stats["tokens_after"] += estimate_tokens(text)
+            self._stats["elapsed_ms"] += elapsed_ms
+        return text
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        정리 지표 반환
+        
+        Returns:
+            처리한 문서 수, 정리 전후 문자/토큰 수, 토큰 절감률, 처리 시간
+        """
+        with self._lock:
+            stats = dict(self._stats)
+        stats["elapsed_ms"] = round(stats["elapsed_ms"], 1)
+        stats["token_reduction"] = round(1 - stats["tokens_after"] / stats["tokens_before"], 3) if stats["tokens_before"] else 0.0
+        return stats
+
+
+# 프로세스 전역 전처리기 (지표를 세션 간 공유)
+default_normalizer = TextNormalizer()
+
+
+def normalize_document(parts: Iterable[str], file_ext: str) -> str:
+    """기본 전처리기로 추출 결과 정리"""
+    return default_normalizer.normalize(parts, file_ext)
+
+
+def main():
+    """CLI 인터페이스로 문서 정리 결과 확인"""
+    parser = argparse.ArgumentParser(description="업로드 문서 텍스트 정리 (마크업, 머리글/바닥글, 공백, 중복 줄 제거)")
+    parser.add_argument('path', help='문서 파일 경로')
+    parser.add_argument('--chars', type=int, default=2000, help='출력할 최대 문자 수')
+    
+    args = parser.parse_args()
+    
+    from document_parser import iter_document
+    file_ext = os.path.splitext(args.path)[1]
+    with open(args.path, "rb") as f:
+        data = f.read()
+    try:
+        text = normalize_document(iter_document(data, file_ext), file_ext)
+    except Exception as e:
+        print(str(e), file=sys.stderr)
+        sys.exit(1)
+    
+    print(json.dumps(default_normalizer.get_stats(), ensure_ascii=False, indent=2))
+    print(text[:args.chars])
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+#!/usr/bin/env python
+from typing import Dict, Any, List, Optional
+
+# MCP 도구 스키마 - MCP 서버의 tools/list와 Bedrock tool use가 같은 정의를 사용
+
+# 날짜/시간 서비스 도구
+DATETIME_TOOLS = [
+    {
+        "name": "get_current_time",
+        "description": "현재 시간 정보를 반환합니다",
+        "inputSchema": {
+            "type": "object",
+            "properties": {},
+            "required": []
+        }
+    },
+    {
+        "name": "get_current_date",
+        "description": "현재 날짜 정보를 반환합니다",
+        "inputSchema": {
+            "type": "object",
+            "properties": {},
+            "required": []
+        }
+    },
+    {
+        "name": "get_datetime_info",
+        "description": "현재 날짜와 시간의 종합 정보를 반환합니다",
+        "inputSchema": {
+            "type": "object",
+            "properties": {},
+            "required": []
+        }
+    },
+    {
+        "name": "get_datetime_info_many",
+        "description": "여러 시간대의 현재 날짜/시간을 같은 시점 기준으로 비교합니다",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "timezones": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "IANA 시간대 이름 목록 (예: [\"Asia/Seoul\", \"America/New_York\"])"
+                }
+            },
+            "required": ["timezones"]
+        }
+    },
+    {
+        "name": "calculate_time_difference",
+        "description": "두 날짜/시간 사이의 차이를 계산합니다",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "from_date": {
+                    "type": "string",
+                    "description": "시작 날짜/시간 (ISO 형식, 예: 2020-03-01)"
+                },
+                "to_date": {
+                    "type": "string",
+                    "description": "끝 날짜/시간 (ISO 형식, 기본값: 현재 시각)"
+                }
+            },
+            "required": ["from_date"]
+        }
+    },
+    {
+        "name": "resolve_datetime_expression",
+        "description": "'3일 후', '다음 주 금요일', 'since 2020-03-01' 같은 날짜 표현을 계산합니다",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "text": {
+                    "type": "string",
+                    "description": "날짜 표현이 포함된 질의"
+                }
+            },
+            "required": ["text"]
+        }
+    }
+]
+
+# 검색 서비스 도구
+SEARCH_TOOLS = [
+    {
+        "name": "search",
+        "description": "웹 검색을 수행합니다",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "검색 쿼리"
+                },
+                "max_results": {
+                    "type": "integer",
+                    "description": "최대 결과 수 (기본값: 5, 최대 100)",
+                    "default": 5
+                }
+            },
+            "required": ["query"]
+        }
+    },
+    {
+        "name": "extract_keywords",
+        "description": "텍스트에서 중요 키워드를 추출합니다",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "text": {
+                    "type": "string",
+                    "description": "키워드를 추출할 텍스트"
+                }
+            },
+            "required": ["text"]
+        }
+    }
+]
+
+# 서버 지표 도구 (서비스와 무관하게 항상 제공)
+STATS_TOOL = {
+    "name": "get_mcp_stats",
+    "description": "MCP 서버의 도구별 실행 통계와 결과 캐시 적중률을 반환합니다",
+    "inputSchema": {
+        "type": "object",
+        "properties": {},
+        "required": []
+    }
+}
+
+# 여러 도구를 한 번의 요청으로 동시에 실행하는 서버 도구
+BATCH_TOOL = {
+    "name": "batch",
+    "description": "여러 도구 호출을 동시에 실행하고 항목별 결과, 오류, 소요 시간을 한 번에 반환합니다",
+    "inputSchema": {
+        "type": "object",
+        "properties": {
+            "calls": {
+                "type": "array",
+                "description": "실행할 도구 호출 목록 (최대 16개, 결과는 같은 순서로 반환)",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "tool": {
+                            "type": "string",
+                            "description": "도구 이름"
+                        },
+                        "arguments": {
+                            "type": "object",
+                            "description": "도구 인자"
+                        }
+                    },
+                    "required": ["tool"]
+                }
+            }
+        },
+        "required": ["calls"]
+    }
+}
+
+# 업로드한 표 데이터(CSV/Excel)를 앱에서 직접 조회하는 로컬 도구 (MCP 서버에는 등록하지 않음)
+TABLE_TOOLS = [
+    {
+        "name": "query_table",
+        "description": "업로드한 표 데이터를 필터링, 그룹화, 집계, 정렬하여 결과 행을 반환합니다 (원본 행은 프롬프트에 없으므로 값이 필요하면 이 도구로 조회)",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "filters": {
+                    "type": "array",
+                    "description": "모두 만족하는 행만 선택 (AND)",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "column": {
+                                "type": "string",
+                                "description": "열 이름"
+                            },
+                            "op": {
+                                "type": "string",
+                                "enum": ["==", "!=", ">", ">=", "<", "<=", "contains", "in", "isnull", "notnull"],
+                                "description": "비교 연산자 (contains: 부분 문자열, in: 값 목록)"
+                            },
+                            "value": {
+                                "description": "비교 값 (in은 배열, isnull/notnull은 생략)"
+                            }
+                        },
+                        "required": ["column", "op"]
+                    }
+                },
+                "columns": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "반환할 열 (생략하면 전체)"
+                },
+                "group_by": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "그룹화할 열 (집계를 생략하면 그룹별 행 수)"
+                },
+                "aggregations": {
+                    "type": "object",
+                    "description": "열 이름 -> 집계 함수 (count, sum, mean, median, min, max, nunique, std)",
+                    "additionalProperties": {
+                        "type": "string",
+                        "enum": ["count", "sum", "mean", "median", "min", "max", "nunique", "std"]
+                    }
+                },
+                "sort_by": {
+                    "type": "string",
+                    "description": "정렬할 열"
+                },
+                "descending": {
+                    "type": "boolean",
+                    "description": "내림차순 정렬 여부 (기본값: false)"
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "반환할 최대 행 수 (기본값: 20, 최대 50)"
+                }
+            },
+            "required": []
+        }
+    }
+]
+
+# 서비스 이름별 도구 목록
+SERVICE_TOOLS: Dict[str, List[Dict[str, Any]]] = {
+    "datetime": DATETIME_TOOLS,
+    "search": SEARCH_TOOLS
+}
+
+
+def get_tool_names(service_name: str) -> List[str]:
+    """서비스가 제공하는 도구 이름 목록 (알 수 없는 서비스는 빈 목록)"""
+    return [tool["name"] for tool in SERVICE_TOOLS.get(service_name, [])]
+
+
+def to_bedrock_tools(names: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """
+    MCP 도구 스키마를 Bedrock(Anthropic Messages API) tools 형식으로 변환
+    
+    Args:
+        names: 포함할 도구 이름 (기본값: 모든 서비스 도구, 이름을 지정하면 로컬 표 도구도 포함 가능)
+    
+    Returns:
+        name, description, input_schema를 가진 도구 정의 리스트
+    """
+    tools = [tool for service_tools in SERVICE_TOOLS.values() for tool in service_tools]
+    if names is not None:
+        tools = [tool for tool in tools + TABLE_TOOLS if tool["name"] in names]
+    return [{"name": tool["name"], "description": tool["description"], "input_schema": tool["inputSchema"]} for tool in tools]
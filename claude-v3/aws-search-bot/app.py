@@ -21,23 +21,12 @@ import requests
 from bs4 import BeautifulSoup
 
 
-import nltk
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
-try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('stopwords')
-
-
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
+# NLTK 리소스는 첫 사용 시 번들 경로(nltk_data)에서 지연 로드 (NLTK_OFFLINE=1이면 다운로드 안 함)
+from nltk_loader import get_stopwords, tokenize
 
 def extract_keywords(text):
-    stop_words = set(stopwords.words('english'))
-    words = word_tokenize(text.lower())
+    stop_words = get_stopwords('english')
+    words = tokenize(text.lower())
 
     filtered_words = [word for word in words if word not in stop_words and word.isalnum()]
 
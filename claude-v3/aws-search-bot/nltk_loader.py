@@ -0,0 +1,132 @@
+import os
+import re
+import sys
+import threading
+from typing import List, FrozenSet
+
+# 번들된 NLTK 리소스 경로 (없으면 NLTK_DATA 환경 변수 또는 NLTK 기본 경로 사용)
+VENDORED_NLTK_DATA = os.environ.get(
+    "NLTK_DATA",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "nltk_data")
+)
+
+# 오프라인 모드에서는 어떤 경우에도 nltk.download를 호출하지 않음
+OFFLINE = os.environ.get("NLTK_OFFLINE", "").lower() in ("1", "true", "yes")
+
+# NLTK stopwords 리소스가 없을 때 사용하는 영어 불용어 테이블
+BUNDLED_ENGLISH_STOPWORDS = frozenset("""
+i me my myself we our ours ourselves you you're you've you'll you'd your yours yourself yourselves
+he him his himself she she's her hers herself it it's its itself they them their theirs themselves
+what which who whom this that that'll these those am is are was were be been being have has had
+having do does did doing a an the and but if or because as until while of at by for with about
+against between into through during before after above below to from up down in out on off over
+under again further then once here there when where why how all any both each few more most other
+some such no nor not only own same so than too very s t can will just don don't should should've
+now d ll m o re ve y ain aren aren't couldn couldn't didn didn't doesn doesn't hadn hadn't hasn
+hasn't haven haven't isn isn't ma mightn mightn't mustn mustn't needn needn't shan shan't shouldn
+shouldn't wasn wasn't weren weren't won won't wouldn wouldn't
+""".split())
+
+_lock = threading.Lock()
+_stopwords = {}
+_punkt_available = None
+
+
+def _find_or_download(resource_path: str, package: str) -> bool:
+    """
+    NLTK 리소스를 찾고, 온라인 모드이면 번들 경로로 다운로드
+    
+    Args:
+        resource_path: nltk.data.find에 사용할 경로 (예: 'corpora/stopwords')
+        package: nltk.download 패키지 이름 (예: 'stopwords')
+    
+    Returns:
+        리소스 사용 가능 여부
+    """
+    import nltk
+    
+    if VENDORED_NLTK_DATA not in nltk.data.path:
+        nltk.data.path.insert(0, VENDORED_NLTK_DATA)
+    
+    try:
+        nltk.data.find(resource_path)
+        return True
+    except LookupError:
+        pass
+    
+    if OFFLINE:
+        return False
+    
+    try:
+        os.makedirs(VENDORED_NLTK_DATA, exist_ok=True)
+        if nltk.download(package, download_dir=VENDORED_NLTK_DATA, quiet=True):
+            nltk.data.find(resource_path)
+            return True
+    except Exception as e:
+        print(f"NLTK 리소스 다운로드 실패 ({package}): {str(e)}", file=sys.stderr)
+    return False
+
+
+def get_stopwords(language: str = "english") -> FrozenSet[str]:
+    """
+    불용어 집합 반환 (첫 호출 시 한 번만 로드)
+    
+    Args:
+        language: NLTK stopwords 언어 이름
+    
+    Returns:
+        불용어 집합 (리소스가 없으면 번들 영어 테이블)
+    """
+    if language in _stopwords:
+        return _stopwords[language]
+    
+    with _lock:
+        if language not in _stopwords:
+            words = None
+            if _find_or_download("corpora/stopwords", "stopwords"):
+                try:
+                    from nltk.corpus import stopwords
+                    words = frozenset(stopwords.words(language))
+                except Exception as e:
+                    print(f"NLTK 불용어 로드 실패: {str(e)}", file=sys.stderr)
+            _stopwords[language] = words if words is not None else BUNDLED_ENGLISH_STOPWORDS
+    return _stopwords[language]
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    단어 토큰화 (punkt가 있으면 word_tokenize, 없으면 정규식 토큰화)
+    
+    Args:
+        text: 입력 텍스트
+    
+    Returns:
+        토큰 리스트
+    """
+    global _punkt_available
+    
+    if _punkt_available is None:
+        with _lock:
+            if _punkt_available is None:
+                _punkt_available = _find_or_download("tokenizers/punkt", "punkt")
+    
+    if _punkt_available:
+        try:
+            from nltk.tokenize import word_tokenize
+            return word_tokenize(text)
+        except LookupError:
+            # 최신 NLTK는 punkt_tab 리소스를 요구함
+            if _find_or_download("tokenizers/punkt_tab", "punkt_tab"):
+                from nltk.tokenize import word_tokenize
+                return word_tokenize(text)
+            _punkt_available = False
+    
+    return re.findall(r"\w+|[^\w\s]", text)
+
+
+if __name__ == "__main__":
+    # 빌드 시 리소스를 번들 경로에 미리 받아두기: python nltk_loader.py
+    OFFLINE = False
+    for resource_path, package in [("corpora/stopwords", "stopwords"), ("tokenizers/punkt", "punkt"), ("tokenizers/punkt_tab", "punkt_tab")]:
+        status = "OK" if _find_or_download(resource_path, package) else "실패"
+        print(f"{package}: {status} ({VENDORED_NLTK_DATA})")